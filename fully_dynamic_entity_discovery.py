@@ -19,12 +19,23 @@ Updated: 2026-02-03 - Added support for remote Ollama (Cloudflare)
 import pandas as pd
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional
 
 # ============================================================================
 # OLLAMA API HELPER (supports both local and remote)
 # ============================================================================
 
+# Keep-alive session reused by every discovery prompt; only refused connects are retried
+_OLLAMA_ADAPTER = HTTPAdapter(
+    pool_connections=16, pool_maxsize=32,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+)
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount("http://", _OLLAMA_ADAPTER)
+_OLLAMA_SESSION.mount("https://", _OLLAMA_ADAPTER)
+
 def call_ollama_api(prompt: str, model: str, ollama_url: str, temperature: float = 0.3, num_predict: int = 2000) -> str:
     """
     Call Ollama API via HTTP requests (works with both local and Cloudflare)
@@ -54,10 +65,10 @@ def call_ollama_api(prompt: str, model: str, ollama_url: str, temperature: float
             }
         }
 
-        response = requests.post(
+        response = _OLLAMA_SESSION.post(
             f"{ollama_url}/api/generate",
             json=payload,
-            timeout=timeout
+            timeout=(10, timeout)
         )
 
         if response.status_code == 200:
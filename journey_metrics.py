@@ -13,6 +13,20 @@ import numpy as np
 from typing import Dict, List, Tuple, Any
 from journey_definitions import FINANCIAL_CONSTANTS
 
+# Optional: Numba JIT for the per-group aggregation kernels (falls back to plain Python)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 
 # ============================================================================
 # HELPER FUNCTIONS - Common calculations used across stories
@@ -64,6 +78,164 @@ def get_top_n_items(series: pd.Series, n: int = 5) -> List[Tuple[str, int, float
     return top_items
 
 
+# ============================================================================
+# AGGREGATION KERNELS - Numba-compiled group reductions over numpy arrays
+# ============================================================================
+
+_KERNEL_CHUNKS = 16
+
+@njit(parallel=True, cache=True)
+def _nb_group_reduce(codes, values, n_groups, threshold):
+    """
+    Per-group row count, non-NaN count, sum and count of values below threshold.
+    Rows are split into chunks reduced in parallel, then the partials are summed.
+    """
+    n = codes.shape[0]
+    rows = np.zeros((_KERNEL_CHUNKS, n_groups), dtype=np.int64)
+    valid = np.zeros((_KERNEL_CHUNKS, n_groups), dtype=np.int64)
+    sums = np.zeros((_KERNEL_CHUNKS, n_groups), dtype=np.float64)
+    below = np.zeros((_KERNEL_CHUNKS, n_groups), dtype=np.int64)
+    chunk_size = (n + _KERNEL_CHUNKS - 1) // _KERNEL_CHUNKS
+    for c in prange(_KERNEL_CHUNKS):
+        start = c * chunk_size
+        stop = min(start + chunk_size, n)
+        for i in range(start, stop):
+            g = codes[i]
+            if g < 0:
+                continue
+            rows[c, g] += 1
+            v = values[i]
+            if not np.isnan(v):
+                valid[c, g] += 1
+                sums[c, g] += v
+                if v < threshold:
+                    below[c, g] += 1
+    return rows.sum(axis=0), valid.sum(axis=0), sums.sum(axis=0), below.sum(axis=0)
+
+@njit(cache=True)
+def _nb_bin_counts(values, edges):
+    """Count non-NaN values per [edges[k], edges[k+1]) bin"""
+    counts = np.zeros(edges.shape[0] - 1, dtype=np.int64)
+    for i in range(values.shape[0]):
+        v = values[i]
+        if np.isnan(v):
+            continue
+        k = np.searchsorted(edges, v, side='right') - 1
+        if 0 <= k < counts.shape[0]:
+            counts[k] += 1
+    return counts
+
+@njit(parallel=True, cache=True)
+def _nb_column_stats(values):
+    """Per-column NaN-skipping mean, min and max of a 2-D array in one fused pass (NaN for empty columns)"""
+    n, k = values.shape
+    means = np.full(k, np.nan)
+    mins = np.full(k, np.nan)
+    maxs = np.full(k, np.nan)
+    for j in prange(k):
+        count = 0
+        total = 0.0
+        lo = np.inf
+        hi = -np.inf
+        for i in range(n):
+            v = values[i, j]
+            if np.isnan(v):
+                continue
+            count += 1
+            total += v
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+        if count > 0:
+            means[j] = total / count
+            mins[j] = lo
+            maxs[j] = hi
+    return means, mins, maxs
+
+# Vectorized numpy equivalents of the kernels above, used when numba is missing
+# (the loop kernels would then run as interpreted Python, ~100x slower)
+
+def _np_group_reduce(codes, values, n_groups, threshold):
+    """Same outputs as _nb_group_reduce, from np.bincount over the group codes"""
+    keep = codes >= 0
+    codes, values = codes[keep], values[keep]
+    valid = ~np.isnan(values)
+    valid_codes, valid_values = codes[valid], values[valid]
+    return (
+        np.bincount(codes, minlength=n_groups),
+        np.bincount(valid_codes, minlength=n_groups),
+        np.bincount(valid_codes, weights=valid_values, minlength=n_groups),
+        np.bincount(valid_codes[valid_values < threshold], minlength=n_groups)
+    )
+
+def _np_bin_counts(values, edges):
+    """Same outputs as _nb_bin_counts, from one searchsorted over all values"""
+    k = np.searchsorted(edges, values[~np.isnan(values)], side='right') - 1
+    n_bins = edges.shape[0] - 1
+    return np.bincount(k[(k >= 0) & (k < n_bins)], minlength=n_bins)
+
+def _np_column_stats(values):
+    """Same outputs as _nb_column_stats, as column-wise reductions (no all-NaN warnings)"""
+    missing = np.isnan(values)
+    count = (~missing).sum(axis=0)
+    empty = count == 0
+    means = np.where(missing, 0.0, values).sum(axis=0) / np.where(empty, 1, count)
+    mins = np.where(missing, np.inf, values).min(axis=0, initial=np.inf)
+    maxs = np.where(missing, -np.inf, values).max(axis=0, initial=-np.inf)
+    means[empty] = mins[empty] = maxs[empty] = np.nan
+    return means, mins, maxs
+
+# Loop kernels only when numba compiled them
+_group_reduce_kernel = _nb_group_reduce if NUMBA_AVAILABLE else _np_group_reduce
+_bin_counts_kernel = _nb_bin_counts if NUMBA_AVAILABLE else _np_bin_counts
+_column_stats_kernel = _nb_column_stats if NUMBA_AVAILABLE else _np_column_stats
+
+def group_reduce(df: pd.DataFrame, key: str, value: str, threshold: float = 0.0,
+                 sort: bool = False) -> List[Dict[str, Any]]:
+    """
+    Aggregate a numeric column per group of `key` in one pass over factorized codes
+    Returns: [{'key', 'count', 'mean', 'below_threshold'}, ...] in first-seen (or sorted) key order
+    """
+    codes, uniques = pd.factorize(df[key], sort=sort)
+    values = pd.to_numeric(df[value], errors='coerce').to_numpy(dtype=np.float64)
+    rows, valid, sums, below = _group_reduce_kernel(codes.astype(np.int64), values, len(uniques), float(threshold))
+    return [
+        {
+            'key': uniques[g],
+            'count': int(rows[g]),
+            'mean': sums[g] / valid[g] if valid[g] > 0 else np.nan,
+            'below_threshold': int(below[g])
+        }
+        for g in range(len(uniques))
+    ]
+
+def bin_counts(series: pd.Series, edges: List[float]) -> List[int]:
+    """Count values of a numeric series per [lo, hi) bin defined by edges"""
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64)
+    return [int(c) for c in _bin_counts_kernel(values, np.asarray(edges, dtype=np.float64))]
+
+def column_stats(df: pd.DataFrame, columns: List[str]) -> Dict[str, Dict[str, float]]:
+    """
+    mean/min/max of several numeric columns in one fused pass
+    Returns: {column: {'mean', 'min', 'max'}} in the given column order
+    """
+    values = np.asfortranarray(df[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+    means, mins, maxs = _column_stats_kernel(values)
+    return {
+        col: {'mean': float(means[j]), 'min': float(mins[j]), 'max': float(maxs[j])}
+        for j, col in enumerate(columns)
+    }
+
+def warmup_metric_kernels() -> None:
+    """Compile the aggregation kernels once on tiny inputs so the first real call is fast"""
+    if not NUMBA_AVAILABLE:
+        return
+    _nb_group_reduce(np.array([0, 1, 0], dtype=np.int64), np.array([1.0, 2.0, np.nan]), 2, 1.5)
+    _nb_bin_counts(np.array([1.0, np.nan]), np.array([-np.inf, 1.0, np.inf]))
+    _nb_column_stats(np.asfortranarray(np.array([[1.0, np.nan], [2.0, np.nan]])))
+
+
 # ============================================================================
 # JOURNEY 1: ENROLLMENT & STUDENT COMPOSITION
 # ============================================================================
@@ -641,24 +813,21 @@ def calculate_story_4_1_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     metrics['max_gpa'] = round(df['cumulative_gpa'].max(), 3)
 
     # Performance distribution
-    excellent = df[df['cumulative_gpa'] >= 3.75]
-    high = df[(df['cumulative_gpa'] >= 3.5) & (df['cumulative_gpa'] < 3.75)]
-    good = df[(df['cumulative_gpa'] >= 3.0) & (df['cumulative_gpa'] < 3.5)]
-    satisfactory = df[(df['cumulative_gpa'] >= 2.5) & (df['cumulative_gpa'] < 3.0)]
-    at_risk = df[(df['cumulative_gpa'] >= 2.0) & (df['cumulative_gpa'] < 2.5)]
-    probation = df[df['cumulative_gpa'] < 2.0]
+    probation, at_risk, satisfactory, good, high, excellent = bin_counts(
+        df['cumulative_gpa'], [-np.inf, 2.0, 2.5, 3.0, 3.5, 3.75, np.inf]
+    )
 
     metrics['performance_distribution'] = {
-        'excellent_3.75+': {'count': len(excellent), 'pct': safe_percentage(len(excellent), len(df))},
-        'high_3.5-3.75': {'count': len(high), 'pct': safe_percentage(len(high), len(df))},
-        'good_3.0-3.5': {'count': len(good), 'pct': safe_percentage(len(good), len(df))},
-        'satisfactory_2.5-3.0': {'count': len(satisfactory), 'pct': safe_percentage(len(satisfactory), len(df))},
-        'at_risk_2.0-2.5': {'count': len(at_risk), 'pct': safe_percentage(len(at_risk), len(df))},
-        'probation_below_2.0': {'count': len(probation), 'pct': safe_percentage(len(probation), len(df))}
+        'excellent_3.75+': {'count': excellent, 'pct': safe_percentage(excellent, len(df))},
+        'high_3.5-3.75': {'count': high, 'pct': safe_percentage(high, len(df))},
+        'good_3.0-3.5': {'count': good, 'pct': safe_percentage(good, len(df))},
+        'satisfactory_2.5-3.0': {'count': satisfactory, 'pct': safe_percentage(satisfactory, len(df))},
+        'at_risk_2.0-2.5': {'count': at_risk, 'pct': safe_percentage(at_risk, len(df))},
+        'probation_below_2.0': {'count': probation, 'pct': safe_percentage(probation, len(df))}
     }
 
     # Academic excellence
-    metrics['honors_eligible_count'] = len(df[df['cumulative_gpa'] >= 3.5])
+    metrics['honors_eligible_count'] = high + excellent
     metrics['honors_eligible_pct'] = safe_percentage(metrics['honors_eligible_count'], len(df))
 
     # Performance by enrollment type
@@ -710,13 +879,14 @@ def calculate_story_4_2_metrics(df: pd.DataFrame) -> Dict[str, Any]:
 
     # Progress by cohort
     metrics['progress_by_cohort'] = []
-    for cohort in sorted(df['cohort_year'].unique()):
-        cohort_df = df[df['cohort_year'] == cohort]
+    progress_groups = group_reduce(df, 'cohort_year', 'degree_progress_pct', sort=True)
+    credit_groups = group_reduce(df, 'cohort_year', 'credits_attempted', sort=True)
+    for progress, credits in zip(progress_groups, credit_groups):
         metrics['progress_by_cohort'].append({
-            'cohort_year': str(cohort),
-            'avg_progress': round(cohort_df['degree_progress_pct'].mean(), 1),
-            'avg_credits': round(cohort_df['credits_attempted'].mean(), 1),
-            'count': len(cohort_df)
+            'cohort_year': str(progress['key']),
+            'avg_progress': round(progress['mean'], 1),
+            'avg_credits': round(credits['mean'], 1),
+            'count': progress['count']
         })
 
     # Time to completion estimate
@@ -774,15 +944,13 @@ def calculate_story_4_3_metrics(df: pd.DataFrame) -> Dict[str, Any]:
 
     # Performance by gender
     metrics['gpa_by_gender'] = []
-    for gender in df['gender'].unique():
-        gender_df = df[df['gender'] == gender]
-        gender_avg_gpa = gender_df['cumulative_gpa'].mean()
-        gap = gender_avg_gpa - overall_avg_gpa
+    for group in group_reduce(df, 'gender', 'cumulative_gpa'):
+        gap = group['mean'] - overall_avg_gpa
 
         metrics['gpa_by_gender'].append({
-            'gender': str(gender),
-            'avg_gpa': round(gender_avg_gpa, 3),
-            'count': len(gender_df),
+            'gender': str(group['key']),
+            'avg_gpa': round(group['mean'], 3),
+            'count': group['count'],
             'gap_from_overall': round(gap, 3)
         })
 
@@ -976,16 +1144,16 @@ def calculate_story_5_3_metrics(df: pd.DataFrame) -> Dict[str, Any]:
 
     # Priority intervention list by cohort
     metrics['intervention_priority_by_cohort'] = []
-    for cohort in sorted(df['cohort_year'].unique()):
-        cohort_df = df[df['cohort_year'] == cohort]
-        cohort_at_risk = len(cohort_df[cohort_df['cumulative_gpa'] < 2.5])
+    for group in group_reduce(df, 'cohort_year', 'cumulative_gpa', threshold=2.5, sort=True):
+        cohort_at_risk = group['below_threshold']
+        at_risk_pct = safe_percentage(cohort_at_risk, group['count'])
 
         metrics['intervention_priority_by_cohort'].append({
-            'cohort_year': str(cohort),
-            'total_students': len(cohort_df),
+            'cohort_year': str(group['key']),
+            'total_students': group['count'],
             'at_risk_count': cohort_at_risk,
-            'at_risk_pct': safe_percentage(cohort_at_risk, len(cohort_df)),
-            'priority_level': 'High' if safe_percentage(cohort_at_risk, len(cohort_df)) > 30 else 'Medium' if safe_percentage(cohort_at_risk, len(cohort_df)) > 15 else 'Low'
+            'at_risk_pct': at_risk_pct,
+            'priority_level': 'High' if at_risk_pct > 30 else 'Medium' if at_risk_pct > 15 else 'Low'
         })
 
     return metrics
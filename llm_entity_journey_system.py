@@ -15,6 +15,8 @@ Updated: 2026-02-03 - Added support for remote Ollama (Cloudflare)
 import pandas as pd
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from typing import Dict, List, Any, Optional
 
@@ -100,6 +102,15 @@ def detect_model_tier(model_name: str) -> Dict[str, Any]:
 # OLLAMA API HELPER (supports both local and remote)
 # ============================================================================
 
+# Module-wide keep-alive session; retries cover refused connects only (read=0, status=0)
+_OLLAMA_ADAPTER = HTTPAdapter(
+    pool_connections=16, pool_maxsize=32,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+)
+_OLLAMA_SESSION = requests.Session()
+_OLLAMA_SESSION.mount("http://", _OLLAMA_ADAPTER)
+_OLLAMA_SESSION.mount("https://", _OLLAMA_ADAPTER)
+
 def call_ollama_api(prompt: str, model: str, ollama_url: str, temperature: float = 0.3, num_predict: int = 2000) -> str:
     """
     Call Ollama API via HTTP requests (works with both local and Cloudflare)
@@ -132,10 +143,10 @@ def call_ollama_api(prompt: str, model: str, ollama_url: str, temperature: float
             }
         }
 
-        response = requests.post(
+        response = _OLLAMA_SESSION.post(
             f"{ollama_url}/api/generate",
             json=payload,
-            timeout=timeout
+            timeout=(10, timeout)
         )
 
         if response.status_code == 200:
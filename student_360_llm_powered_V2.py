@@ -28,27 +28,69 @@ Changes from V1:
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import altair as alt
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import hashlib
+import html
+import importlib
 import psutil
 import platform
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 import re
+import gc
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+
+class _LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# Worker threads need the script run context to use st.cache_* and emit st.* messages
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+
+def script_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool whose workers run inside the current Streamlit script run context"""
+    if add_script_run_ctx is None:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=add_script_run_ctx,
+                              initargs=(None, get_script_run_ctx()))
+
+
+# Only a few tabs build Plotly Express / Altair charts; import them when first used, not at startup
+px = _LazyModule('plotly.express')
+alt = _LazyModule('altair')
 
 # Import journey generation modules
 try:
     from journey_definitions import ALL_JOURNEYS, FINANCIAL_CONSTANTS
     from journey_assembler import generate_all_journeys, validate_dataset_for_journeys
+    from journey_metrics import warmup_metric_kernels, column_stats, NUMBA_AVAILABLE
     JOURNEY_MODULES_AVAILABLE = True
 except ImportError as e:
     JOURNEY_MODULES_AVAILABLE = False
+    NUMBA_AVAILABLE = False
     print(f"Warning: Journey modules not available: {e}")
 
 # Import LLM-driven entity journey system
@@ -67,6 +109,15 @@ except ImportError as e:
     FULLY_DYNAMIC_DISCOVERY_AVAILABLE = False
     print(f"Warning: Fully dynamic discovery system not available: {e}")
 
+# Serialize Plotly figures with orjson when it is installed (faster st.plotly_chart payloads)
+try:
+    import orjson  # noqa: F401
+    import plotly.io as pio
+    pio.json.config.default_engine = 'orjson'
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ====================================================================================
 # PAGE CONFIGURATION
 # ====================================================================================
@@ -234,6 +285,54 @@ def inject_custom_css():
         line-height: 1.8;
     }
 
+    /* Journey story analysis flow (Complete Journeys tab) */
+    .story-flow-card {
+        color: white;
+        padding: 1.2rem;
+        border-radius: 12px;
+        margin-bottom: 0.5rem;
+    }
+    .story-flow-label {
+        font-size: 0.75rem;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+        opacity: 0.9;
+        margin-bottom: 0.4rem;
+        font-weight: 600;
+    }
+    .story-flow-text {
+        font-size: 0.95rem;
+        line-height: 1.6;
+        opacity: 0.95;
+    }
+    .story-flow-arrow {
+        text-align: center;
+        font-size: 2rem;
+        margin: 0.5rem 0;
+    }
+    .story-flow-card.situation { background: linear-gradient(135deg, #3b82f6, #2563eb); box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3); }
+    .story-flow-card.insights { background: linear-gradient(135deg, #8b5cf6, #7c3aed); box-shadow: 0 4px 12px rgba(139, 92, 246, 0.3); }
+    .story-flow-card.impact { background: linear-gradient(135deg, #10b981, #059669); box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3); }
+    .story-flow-card.actions { background: linear-gradient(135deg, #f59e0b, #d97706); box-shadow: 0 4px 12px rgba(245, 158, 11, 0.3); margin-bottom: 1rem; }
+    .story-flow-card.situation + .story-flow-arrow { color: #3b82f6; }
+    .story-flow-card.insights + .story-flow-arrow { color: #8b5cf6; }
+    .story-flow-card.impact + .story-flow-arrow { color: #10b981; }
+
+    /* Journey story detail sections (Complete Journeys tab) */
+    .story-detail {
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid;
+        margin-bottom: 1rem;
+        color: #1e293b;
+        line-height: 1.6;
+    }
+    .story-detail.narrative { background: rgba(139, 92, 246, 0.1); border-left-color: #8b5cf6; }
+    .story-detail.insights { background: rgba(59, 130, 246, 0.1); border-left-color: #3b82f6; }
+    .story-detail.impact { background: rgba(34, 197, 94, 0.1); border-left-color: #22c55e; }
+    .story-detail.findings { background: rgba(251, 146, 60, 0.1); border-left-color: #fb923c; line-height: 1.8; }
+    .story-detail.action { background: rgba(245, 158, 11, 0.1); border-left-color: #f59e0b; line-height: 1.8; }
+
     /* Alert boxes */
     .alert-success {
         background: rgba(16, 185, 129, 0.2);
@@ -784,10 +883,25 @@ def get_optimized_llm_params(ollama_url: str = None) -> dict:
 # OLLAMA CONNECTION & HEALTH CHECK
 # ====================================================================================
 
+# Seconds to wait for the TCP connection; the read timeout is set per call
+OLLAMA_CONNECT_TIMEOUT = 10
+
+@st.cache_resource(show_spinner=False)
+def get_ollama_session(ollama_url: str) -> requests.Session:
+    """Keep-alive HTTP session per Ollama server, shared across reruns so calls reuse pooled connections"""
+    session = requests.Session()
+    # Sized for concurrent prompt fan-out; read=0 and status=0 keep retries to failed connects,
+    # so a slow /api/tags probe or generate call is never re-sent
+    retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 def check_ollama_connection(ollama_url: str) -> bool:
     """Basic connectivity check to Ollama server"""
     try:
-        response = requests.get(f"{ollama_url}/api/tags", timeout=5)
+        response = get_ollama_session(ollama_url).get(f"{ollama_url}/api/tags", timeout=5)
         return response.status_code == 200
     except:
         return False
@@ -806,7 +920,7 @@ def verify_ollama_health(ollama_url: str) -> dict:
         # Dynamic timeout: longer for remote, shorter for local
         timeout = 20 if "cloudflare" in ollama_url.lower() or ollama_url.startswith("https://") else 10
 
-        response = requests.get(f"{ollama_url}/api/tags", timeout=timeout)
+        response = get_ollama_session(ollama_url).get(f"{ollama_url}/api/tags", timeout=timeout)
         if response.status_code == 200:
             health['connected'] = True
             data = response.json()
@@ -844,7 +958,6 @@ def ensure_ollama_connection(ollama_url: str, auto_reconnect: bool = True, max_r
         if not auto_reconnect or attempt == max_retries - 1:
             break
 
-        import time
         time.sleep(1)  # Wait before retry
 
     return False, [], health.get('error', 'Connection failed')
@@ -853,7 +966,7 @@ def fetch_remote_system_resources(ollama_url: str) -> Optional[dict]:
     """Fetch system resources from remote Ollama server"""
     try:
         # Check if remote Ollama is accessible
-        response = requests.get(f"{ollama_url}/api/tags", timeout=15)
+        response = get_ollama_session(ollama_url).get(f"{ollama_url}/api/tags", timeout=15)
         if response.status_code == 200:
             # Since Ollama API doesn't expose system resources,
             # we return typical Google Colab resources when connected to remote
@@ -887,7 +1000,7 @@ def fetch_remote_system_resources(ollama_url: str) -> Optional[dict]:
 # LLM QUERY ENGINE
 # ====================================================================================
 
-def query_ollama(
+def _ollama_generate_request(
     prompt: str,
     model: str,
     ollama_url: str,
@@ -900,8 +1013,8 @@ def query_ollama(
     timeout: int = None,
     auto_optimize: bool = True,
     seed: int = None
-) -> str:
-    """Query Ollama with optimized parameters"""
+) -> Tuple[dict, int]:
+    """/api/generate payload with optimized options, plus the read timeout to use for it"""
 
     # Get optimized parameters if enabled
     if auto_optimize:
@@ -944,16 +1057,23 @@ def query_ollama(
     if is_cloudflare and timeout:
         timeout = timeout * 6  # 6x multiplier for Cloudflare
 
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "options": options
+    }
+    return payload, timeout or 120
+
+def query_ollama(prompt: str, model: str, ollama_url: str, **kwargs) -> str:
+    """Query Ollama with optimized parameters (keyword options as in _ollama_generate_request)"""
+    payload, timeout = _ollama_generate_request(prompt, model, ollama_url, **kwargs)
+
     try:
-        response = requests.post(
+        response = get_ollama_session(ollama_url).post(
             f"{ollama_url}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": options
-            },
-            timeout=timeout or 120
+            json=payload,
+            timeout=(OLLAMA_CONNECT_TIMEOUT, timeout)
         )
 
         if response.status_code == 200:
@@ -968,6 +1088,56 @@ def query_ollama(
     except Exception as e:
         return f"[ERROR] {str(e)}"
 
+def stream_ollama(prompt: str, model: str, ollama_url: str, errors: List[str], **kwargs) -> Iterator[str]:
+    """
+    Like query_ollama, but yields the response text piece by piece as Ollama generates it.
+    Failures go to errors instead of the stream, so a cut-off answer is never mistaken for a complete one.
+    """
+    payload, timeout = _ollama_generate_request(prompt, model, ollama_url, **kwargs)
+    payload["stream"] = True
+
+    try:
+        with get_ollama_session(ollama_url).post(
+            f"{ollama_url}/api/generate",
+            json=payload,
+            timeout=(OLLAMA_CONNECT_TIMEOUT, timeout),
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                errors.append(f"HTTP {response.status_code}")
+                return
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                # Ollama reports mid-generation failures as an in-stream {"error": ...} line
+                if 'error' in chunk:
+                    errors.append(str(chunk['error']))
+                    return
+                yield chunk.get('response', '')
+                if chunk.get('done'):
+                    break
+
+    except requests.exceptions.Timeout:
+        errors.append("Request timeout")
+    except requests.exceptions.ConnectionError:
+        errors.append("Connection failed")
+    except Exception as e:
+        errors.append(str(e))
+
+def query_ollama_many(prompts: List[str], model: str, ollama_url: str, max_workers: int = 6, **kwargs) -> List[str]:
+    """
+    Send independent prompts to Ollama concurrently; responses come back in prompt order.
+    The server only overlaps them when started with OLLAMA_NUM_PARALLEL > 1 (otherwise it queues them).
+    """
+    if len(prompts) <= 1:
+        return [query_ollama(prompt, model, ollama_url, **kwargs) for prompt in prompts]
+
+    # Create the pooled session on the script thread so the workers share it
+    get_ollama_session(ollama_url)
+    with script_thread_pool(min(max_workers, len(prompts))) as pool:
+        return list(pool.map(lambda prompt: query_ollama(prompt, model, ollama_url, **kwargs), prompts))
+
 def clean_json_string(json_str: str) -> str:
     """Clean JSON string from markdown code blocks"""
     json_str = re.sub(r'```json\s*', '', json_str)
@@ -1059,8 +1229,9 @@ def auto_discover_insights(df: pd.DataFrame, model: str, url: str) -> Dict[str,
     }
 
     # Prepare data summary
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    kinds = column_kinds(df)
+    numeric_cols = kinds['numeric']
+    categorical_cols = kinds['categorical']
     date_cols = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
 
     # 1. DATA QUALITY ANALYSIS
@@ -1842,8 +2013,9 @@ def generate_enriched_discoveries(df: pd.DataFrame, insights: Dict[str, Any], mo
     quality_issues = insights.get('data_quality', {}).get('quality_issues', [])
 
     # Prepare comprehensive context for LLM
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    kinds = column_kinds(df)
+    numeric_cols = kinds['numeric']
+    categorical_cols = kinds['categorical']
 
     data_summary = f"""
 Dataset Analysis Summary:
@@ -1962,8 +2134,9 @@ def generate_rule_based_discoveries(df: pd.DataFrame, insights: Dict[str, Any])
     patterns = insights.get('patterns', {}).get('categorical', [])
     quality_issues = insights.get('data_quality', {}).get('quality_issues', [])
 
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    kinds = column_kinds(df)
+    numeric_cols = kinds['numeric']
+    categorical_cols = kinds['categorical']
 
     # Discovery 1: Dataset Overview
     discoveries.append({
@@ -2115,8 +2288,9 @@ def generate_deep_analysis_with_llm(df: pd.DataFrame, insights: Dict[str, Any],
     total_records = insights.get('data_quality', {}).get('total_records', len(df))
     total_columns = insights.get('data_quality', {}).get('total_columns', len(df.columns))
 
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    kinds = column_kinds(df)
+    numeric_cols = kinds['numeric']
+    categorical_cols = kinds['categorical']
 
     # Build comprehensive context
     context = f"""
@@ -2534,9 +2708,10 @@ def generate_business_insights(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
     # Get column analysis
-    numeric_cols = [col for col in df.select_dtypes(include=[np.number]).columns
+    kinds = column_kinds(df)
+    numeric_cols = [col for col in kinds['numeric']
                    if not is_id_column(col, df[col], df)]
-    categorical_cols = [col for col in df.select_dtypes(include=['object', 'category']).columns
+    categorical_cols = [col for col in kinds['categorical']
                        if not is_id_column(col, df[col], df)]
     datetime_cols = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
 
@@ -3246,7 +3421,7 @@ def generate_business_insights(df: pd.DataFrame) -> Dict[str, Any]:
 # ==================== CHART GENERATION ====================
 
 def create_chart(df: pd.DataFrame, chart_type: str, x_col: str, y_col: str,
-                color_col: Optional[str] = None, agg_func: str = 'sum') -> alt.Chart:
+                color_col: Optional[str] = None, agg_func: str = 'sum') -> 'alt.Chart':
     """Create enhanced Altair charts with advanced styling and interactivity"""
 
     # Validate input data
@@ -3596,7 +3771,7 @@ def score_column_importance(col_name: str, col_data: pd.Series, df: pd.DataFrame
 
     # Correlation with other numeric columns (score: +5-15)
     if pd.api.types.is_numeric_dtype(col_data):
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        numeric_cols = column_kinds(df)['numeric']
         # Check if this column is actually in the numeric columns
         if len(numeric_cols) > 1 and col_name in numeric_cols:
             try:
@@ -4169,8 +4344,9 @@ def analyze_chart_patterns(df: pd.DataFrame) -> Dict[str, Any]:
     analysis['column_importance'].sort(key=lambda x: x['score'], reverse=True)
 
     # Categorize columns with characteristics
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    kinds = column_kinds(df)
+    numeric_cols = kinds['numeric']
+    categorical_cols = kinds['categorical']
     datetime_cols = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
 
     # Filter out ID columns from analysis
@@ -4878,8 +5054,9 @@ def generate_data_story(df: pd.DataFrame, insights: Dict[str, Any], model: str,
     """
     try:
         # Extract context from existing insights
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        kinds = column_kinds(df)
+        numeric_cols = kinds['numeric']
+        categorical_cols = kinds['categorical']
 
         # Build comprehensive context
         context = f"""
@@ -5376,6 +5553,26 @@ def apply_universal_column_mapping(df):
     # Return mapped dataframe and log
     return mapped_df, mapping_log
 
+GPA_TIER_EDGES = np.array([-np.inf, 2.5, 3.5, np.inf])
+
+# At-risk share (%) above 15 is HIGH and above 25 is CRITICAL; searchsorted's left side keeps the bounds exclusive
+_SEV_BINS = np.array([15, 25])
+_SEV_LABELS = ("🟢 MODERATE", "🟠 HIGH", "🔴 CRITICAL")
+
+def pct(count, total) -> float:
+    """count as a percentage of total; 0.0 when total is zero"""
+    return float(count) * 100.0 / total if total else 0.0
+
+def pct_array(counts, total) -> np.ndarray:
+    """Several counts as percentages of the same total in one vectorized divide; zeros when total is zero"""
+    counts = np.asarray(counts, dtype=float)
+    return counts * (100.0 / total) if total else np.zeros_like(counts)
+
+def gpa_tier_counts(gpa: np.ndarray) -> Tuple[int, int, int]:
+    """Count (at_risk <2.5, mid 2.5-3.5, high >=3.5) GPAs in one histogram pass; NaNs are ignored"""
+    counts, _ = np.histogram(gpa[~np.isnan(gpa)], bins=GPA_TIER_EDGES)
+    return int(counts[0]), int(counts[1]), int(counts[2])
+
 def calculate_core_metrics(df: pd.DataFrame) -> dict:
     """Calculate core metrics from student data"""
     metrics = {
@@ -5388,9 +5585,8 @@ def calculate_core_metrics(df: pd.DataFrame) -> dict:
 
     # Performance tiers
     if 'cumulative_gpa' in df.columns:
-        metrics['high_performers'] = len(df[df['cumulative_gpa'] >= 3.5])
-        metrics['mid_performers'] = len(df[(df['cumulative_gpa'] >= 2.5) & (df['cumulative_gpa'] < 3.5)])
-        metrics['at_risk'] = len(df[df['cumulative_gpa'] < 2.5])
+        gpa = df['cumulative_gpa'].to_numpy(dtype=float, na_value=np.nan)
+        metrics['at_risk'], metrics['mid_performers'], metrics['high_performers'] = gpa_tier_counts(gpa)
 
     # UAE nationals - handle multiple formats (country codes AND full names)
     if 'nationality' in df.columns:
@@ -5413,72 +5609,539 @@ def calculate_core_metrics(df: pd.DataFrame) -> dict:
             )
 
         metrics['uae_nationals'] = int(uae_mask.sum())
-        metrics['uae_percentage'] = (metrics['uae_nationals'] / metrics['total_students'] * 100) if metrics['total_students'] > 0 else 0
+        metrics['uae_percentage'] = pct(metrics['uae_nationals'], metrics['total_students'])
     else:
         metrics['uae_nationals'] = 0
         metrics['uae_percentage'] = 0
 
     # Financial aid coverage
-    if metrics['total_tuition'] > 0:
-        metrics['aid_coverage_pct'] = (metrics['total_aid'] / metrics['total_tuition'] * 100)
-    else:
-        metrics['aid_coverage_pct'] = 0
+    metrics['aid_coverage_pct'] = pct(metrics['total_aid'], metrics['total_tuition']) if metrics['total_tuition'] > 0 else 0
 
     return metrics
 
 # ====================================================================================
-# VISUALIZATION HELPERS
+# CACHED AGGREGATIONS
 # ====================================================================================
 
-def create_plotly_chart(chart_type: str, data: dict, title: str) -> go.Figure:
-    """Create Plotly chart with dark theme"""
-
-    if chart_type == "bar":
-        fig = go.Figure(data=[go.Bar(
-            x=data['x'],
-            y=data['y'],
-            marker_color='#6366f1'
-        )])
-
-    elif chart_type == "pie":
-        fig = go.Figure(data=[go.Pie(
-            labels=data['labels'],
-            values=data['values'],
-            hole=0.4,
-            marker_colors=['#6366f1', '#10b981', '#f59e0b', '#ef4444', '#3b82f6']
-        )])
-
-    elif chart_type == "histogram":
-        fig = go.Figure(data=[go.Histogram(
-            x=data['values'],
-            nbinsx=30,
-            marker_color='#6366f1'
-        )])
-
-    elif chart_type == "scatter":
-        fig = go.Figure(data=[go.Scatter(
-            x=data['x'],
-            y=data['y'],
-            mode='markers',
-            marker=dict(color='#6366f1', size=8, opacity=0.6)
-        )])
+def dataset_key(df: pd.DataFrame) -> str:
+    """Stable content key for a DataFrame, hashed once per loaded frame and reused as a cache key"""
+    cached = st.session_state.get('dataset_key')
+    if cached and cached[0] == id(df) and cached[1] == df.shape:
+        return cached[2]
 
-    else:
-        fig = go.Figure()
-
-    # Apply dark theme
-    fig.update_layout(
-        template="plotly_dark",
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(30, 41, 59, 0.85)',
-        font=dict(color='white', size=14),
-        title=dict(text=title, font=dict(size=18, color='#6366f1')),
-        height=400,
-        margin=dict(l=40, r=40, t=60, b=40)
+    try:
+        digest = hashlib.md5(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        # Unhashable cells (lists/dicts) - fall back to object identity
+        digest = hashlib.md5(str(id(df)).encode())
+    digest.update('|'.join(map(str, df.columns)).encode())
+    key = f"{digest.hexdigest()}-{df.shape[0]}x{df.shape[1]}"
+
+    st.session_state.dataset_key = (id(df), df.shape, key)
+    return key
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _schema_column_kinds(schema: Tuple[Tuple[Any, str], ...], _dtypes: pd.Series) -> Dict[str, List[Any]]:
+    """Column lists by dtype kind for one (column, dtype) schema; matches the select_dtypes includes used here"""
+    is_bool = _dtypes.map(pd.api.types.is_bool_dtype)
+    is_numeric = _dtypes.map(pd.api.types.is_numeric_dtype) & ~is_bool
+    is_object = _dtypes.map(pd.api.types.is_object_dtype)
+    is_category = _dtypes.map(lambda dtype: isinstance(dtype, pd.CategoricalDtype))
+    is_datetime = _dtypes.map(pd.api.types.is_datetime64_dtype)
+    columns = _dtypes.index
+    return {
+        'numeric': columns[is_numeric.to_numpy(dtype=bool)].tolist(),
+        'object': columns[is_object.to_numpy(dtype=bool)].tolist(),
+        'categorical': columns[(is_object | is_category).to_numpy(dtype=bool)].tolist(),
+        'datetime': columns[is_datetime.to_numpy(dtype=bool)].tolist(),
+    }
+
+def column_kinds(df: pd.DataFrame) -> Dict[str, List[Any]]:
+    """numeric / object / categorical (object + category) / datetime column lists of df, classified once per schema"""
+    dtypes = df.dtypes
+    return _schema_column_kinds(tuple(zip(dtypes.index, dtypes.astype(str))), dtypes)
+
+@st.cache_data(show_spinner=False)
+def cached_value_counts(data_key: str, _df: pd.DataFrame, column: str, n: Optional[int] = None,
+                        sort_index: bool = False) -> pd.Series:
+    """value_counts() of a column, computed once per dataset (data_key) instead of per render"""
+    counts = _df[column].value_counts()
+    if sort_index:
+        counts = counts.sort_index()
+    return counts.head(n) if n else counts
+
+@st.cache_data(show_spinner=False)
+def cached_group_agg(data_key: str, _df: pd.DataFrame, by: str, value: str, how: str = 'sum',
+                     n: Optional[int] = None) -> pd.Series:
+    """groupby(by)[value].<how>() sorted descending, computed once per dataset (data_key)"""
+    result = _df.groupby(by)[value].agg(how)
+    if n and pd.api.types.is_numeric_dtype(result):
+        # Partial selection of the top n instead of sorting every group
+        return result.nlargest(n)
+    result = result.sort_values(ascending=False)
+    return result.head(n) if n else result
+
+# Low-cardinality columns that the journey overviews and analysis tabs count and group by repeatedly
+CATEGORICAL_COLUMNS = ('nationality', 'enrollment_enrollment_status', 'current_program',
+                       'payment_status', 'gender', 'cohort_year', 'housing_status', 'residence_hall')
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def categorical_view(data_key: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of df with its low-cardinality string columns stored as pandas categoricals, built once per dataset.
+
+    Covers CATEGORICAL_COLUMNS plus any other object column with fewer unique values than half its rows,
+    so renamed or extra columns of uploaded datasets get the same treatment.
+    value_counts()/groupby() on the copy hash small integer codes instead of Python strings.
+    The loaded frame itself is left untouched (other code fills/assigns new string values).
+    """
+    present = [col for col in CATEGORICAL_COLUMNS if col in _df.columns]
+    present += [col for col in column_kinds(_df)['object']
+                if col not in present and _df[col].nunique(dropna=False) < 0.5 * len(_df)]
+    return _df.astype({col: 'category' for col in present})
+
+@st.cache_data(show_spinner=False)
+def categorical_counts(data_key: str, _df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """value_counts() of every present CATEGORICAL_COLUMNS column, shared by all journey overviews"""
+    df = categorical_view(data_key, _df)
+    return {col: df[col].value_counts() for col in CATEGORICAL_COLUMNS if col in df.columns}
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def valid_gpa_values(data_key: str, _df: pd.DataFrame) -> np.ndarray:
+    """Read-only float array of non-null cumulative_gpa values, materialized once per dataset"""
+    gpa = _df['cumulative_gpa'].dropna().to_numpy(dtype=float)
+    gpa.flags.writeable = False
+    return gpa
+
+def sorted_value_counts(series: pd.Series) -> pd.Series:
+    """value_counts().sort_index() in one linear pass: bincount on categorical codes, else np.unique"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        return pd.Series(counts, index=series.cat.categories)[counts > 0]
+    try:
+        keys, counts = np.unique(series.dropna().to_numpy(), return_counts=True)
+    except TypeError:
+        # Mixed-type object column - let pandas hash it
+        return series.value_counts().sort_index()
+    return pd.Series(counts, index=keys)
+
+TUITION_COLUMN_CANDIDATES = ('Total_Tuition', 'total_tuition', 'tuition', 'Tuition', 'tuition_fees', 'fees')
+AID_COLUMN_CANDIDATES = ('Total_Aid', 'total_aid', 'aid', 'Aid', 'financial_aid', 'scholarship')
+
+@st.cache_data(show_spinner=False)
+def resolve_journey_columns(columns: Tuple[str, ...]) -> SimpleNamespace:
+    """Resolve tuition/aid column names and presence flags once per column layout"""
+    present = set(columns)
+    return SimpleNamespace(
+        tuition=next((col for col in TUITION_COLUMN_CANDIDATES if col in present), None),
+        aid=next((col for col in AID_COLUMN_CANDIDATES if col in present), None),
+        has_nationality='nationality' in present,
+        has_status='enrollment_enrollment_status' in present,
+        has_cohort='cohort_year' in present,
+        has_gender='gender' in present,
+        has_program='current_program' in present,
+        has_payment='payment_status' in present,
+        has_gpa='cumulative_gpa' in present,
+        has_credit_hours='total_credit_hours' in present,
     )
 
+@st.cache_data(show_spinner=False)
+def journey_overview_aggs(data_key: str, _df: pd.DataFrame, journey_idx: int) -> Dict[str, Any]:
+    """All breakdowns one complete-journey overview tab charts, computed together once per dataset"""
+    df = categorical_view(data_key, _df)
+    cols = resolve_journey_columns(tuple(df.columns))
+    counts = categorical_counts(data_key, _df)
+    aggs = {}
+
+    # Each branch pulls the columns it needs once into locals and works on those Series
+    if journey_idx == 0:  # Enrollment
+        if cols.has_nationality:
+            aggs['nat_counts'] = counts['nationality'].head(10)
+            aggs['uae_count'] = int(counts['nationality'].get('United Arab Emirates', 0))
+            aggs['intl_count'] = len(df) - aggs['uae_count']
+        if cols.has_status:
+            aggs['status_counts'] = counts['enrollment_enrollment_status']
+        if cols.has_cohort:
+            aggs['cohort_counts'] = counts['cohort_year'].sort_index()
+        if cols.has_gender:
+            aggs['gender_counts'] = counts['gender']
+        if cols.has_program:
+            aggs['prog_counts'] = counts['current_program'].head(8)
+
+    elif journey_idx == 1:  # Revenue
+        tuition_col = cols.tuition
+        aid_col = cols.aid
+        nationality = df['nationality'] if cols.has_nationality else None
+        program = df['current_program'] if cols.has_program else None
+        if tuition_col:
+            tuition = df[tuition_col]
+            aggs['tuition_values'] = tuition.dropna()
+            if nationality is not None:
+                aggs['rev_by_nat'] = tuition.groupby(nationality, observed=True, sort=False).sum().nlargest(10)
+            if program is not None:
+                aggs['rev_by_prog'] = tuition.groupby(program, observed=True, sort=False).sum().nlargest(8)
+        else:
+            if nationality is not None:
+                aggs['nat_counts'] = counts['nationality'].head(10)
+            if cols.has_cohort:
+                aggs['cohort_counts'] = counts['cohort_year'].sort_index()
+            if program is not None:
+                aggs['prog_counts'] = counts['current_program'].head(8)
+        if aid_col:
+            aid = df[aid_col].to_numpy(dtype=float, na_value=np.nan)
+            aggs['aid_recipients'] = int(np.count_nonzero(aid > 0))
+            aggs['no_aid'] = int(np.count_nonzero(aid == 0))
+        elif cols.has_status:
+            aggs['status_counts'] = counts['enrollment_enrollment_status']
+        if cols.has_payment:
+            aggs['pay_counts'] = counts['payment_status']
+        elif cols.has_gender:
+            aggs['gender_counts'] = counts['gender']
+
+    elif journey_idx == 2:  # Operations
+        if cols.has_status:
+            aggs['status_counts'] = counts['enrollment_enrollment_status']
+        if cols.has_cohort:
+            aggs['cohort_counts'] = counts['cohort_year'].sort_index()
+
+    elif journey_idx == 3:  # Academics
+        if cols.has_gpa:
+            # One NaN-free array (shared with Retention and Risk) feeds tier counts and the histogram
+            gpa = valid_gpa_values(data_key, _df)
+            at_risk, mid, high = gpa_tier_counts(gpa)
+            aggs['gpa_values'] = gpa
+            aggs['gpa_tiers'] = [high, mid, at_risk]
+            gpa_series = df['cumulative_gpa']
+            if cols.has_program:
+                aggs['gpa_by_prog'] = gpa_series.groupby(df['current_program'], observed=True, sort=False).mean().nlargest(8)
+            if cols.has_nationality:
+                aggs['gpa_by_nat'] = gpa_series.groupby(df['nationality'], observed=True, sort=False).mean().nlargest(10)
+        if cols.has_credit_hours:
+            aggs['credit_values'] = df['total_credit_hours'].dropna()
+
+    elif journey_idx == 4:  # Retention
+        if cols.has_status:
+            aggs['status_counts'] = counts['enrollment_enrollment_status']
+        if cols.has_gpa:
+            aggs['gpa_values'] = valid_gpa_values(data_key, _df)
+
+    elif journey_idx == 5:  # Risk
+        if cols.has_gpa:
+            at_risk, mid, high = gpa_tier_counts(valid_gpa_values(data_key, _df))
+            aggs['gpa_risk'] = [at_risk, mid + high]
+        if cols.has_payment:
+            aggs['pay_counts'] = counts['payment_status']
+
+    return aggs
+
+# Role -> accepted column names (first present wins) for the AI analysis tabs
+ANALYSIS_COLUMN_CANDIDATES = {
+    'housing': ('room_number', 'housing_status', 'residence_hall', 'housing', 'residence', 'dormitory'),
+    'gpa': ('gpa', 'cumulative_gpa', 'cgpa'),
+    'aid': ('financial_aid_monetary_amount', 'financial_aid', 'aid', 'scholarship', 'scholarship_amount'),
+    'nationality': ('nationality', 'country', 'citizenship', 'origin'),
+    'gender': ('gender', 'sex'),
+}
+
+@st.cache_data(show_spinner=False)
+def resolve_analysis_columns(columns: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+    """Resolve every ANALYSIS_COLUMN_CANDIDATES role against one column set, once per column layout"""
+    present = set(columns)
+    return {role: next((col for col in candidates if col in present), None)
+            for role, candidates in ANALYSIS_COLUMN_CANDIDATES.items()}
+
+@st.cache_data(show_spinner=False)
+def housing_tab_metrics(data_key: str, _df: pd.DataFrame) -> Dict[str, Any]:
+    """On/off-campus counts and GPAs for the Housing tab, computed once per dataset"""
+    resolved = resolve_analysis_columns(tuple(_df.columns))
+    housing_col = resolved['housing']
+    if not housing_col:
+        return {'housing_col': None}
+
+    total = len(_df)
+    housing = categorical_view(data_key, _df)[housing_col]
+    housed = housing.notna().to_numpy()
+    on_campus = int(np.count_nonzero(housed))
+    gpa_col = resolved['gpa']
+    on_campus_gpa = off_campus_gpa = 0
+    if gpa_col:
+        # Both campus GPAs from one grouped pass over the GPA column
+        gpa_by_housing = _df[gpa_col].groupby(housed).mean()
+        on_campus_gpa = gpa_by_housing.get(True, np.nan)
+        off_campus_gpa = gpa_by_housing.get(False, np.nan)
+
+    return {
+        'housing_col': housing_col,
+        'on_campus': on_campus,
+        'off_campus': total - on_campus,
+        'housing_utilization': pct(on_campus, total),
+        'gpa_col': gpa_col,
+        'on_campus_gpa': on_campus_gpa,
+        'off_campus_gpa': off_campus_gpa,
+        'unique_residences': int(housing.nunique()),
+    }
+
+@st.cache_data(show_spinner=False)
+def financial_tab_metrics(data_key: str, _df: pd.DataFrame) -> Dict[str, Any]:
+    """Aid recipient count and average award for the Financial tab, computed once per dataset"""
+    aid_col = resolve_analysis_columns(tuple(_df.columns))['aid']
+    aid_recipients = 0
+    avg_aid_amount = 0
+    if aid_col:
+        aid = _df[aid_col]
+        # Filter to positive awards once, then count and average in one aggregation
+        aid_stats = aid[aid > 0].agg(['count', 'mean'])
+        aid_recipients = int(aid_stats['count'])
+        avg_aid_amount = aid_stats['mean'] if aid_recipients > 0 else 0
+    return {'aid_col': aid_col, 'aid_recipients': aid_recipients, 'avg_aid_amount': avg_aid_amount}
+
+@st.cache_data(show_spinner=False)
+def demographics_tab_metrics(data_key: str, _df: pd.DataFrame) -> Dict[str, Any]:
+    """Top-3 nationality concentration and gender split for the Demographics tab, once per dataset"""
+    resolved = resolve_analysis_columns(tuple(_df.columns))
+    nationality_col = resolved['nationality']
+    gender_col = resolved['gender']
+
+    # Grouping runs on the categorical view (integer codes) where the column is a known categorical
+    df = categorical_view(data_key, _df)
+
+    top_3_concentration = 0
+    if nationality_col and len(df) > 0:
+        # Partial top-3 selection over unsorted group sizes instead of sorting every nationality
+        top_nat = df.groupby(nationality_col, sort=False, observed=True).size().nlargest(3)
+        top_3_concentration = float(top_nat.sum() / len(df) * 100)
+
+    gender_distribution = {}
+    if gender_col:
+        gender_distribution = {str(k): int(v) for k, v in df[gender_col].value_counts().items()}
+
+    return {
+        'nationality_col': nationality_col,
+        'gender_col': gender_col,
+        'top_3_concentration': top_3_concentration,
+        'gender_distribution': gender_distribution,
+    }
+
+@st.cache_data(show_spinner=False)
+def build_full_metrics(data_key: str, _df: pd.DataFrame) -> dict:
+    """Core metrics plus every derived figure the analysis tabs show, computed once per dataset"""
+    metrics = calculate_core_metrics(_df)
+    metrics.update(housing_tab_metrics(data_key, _df))
+    metrics.update(financial_tab_metrics(data_key, _df))
+    metrics.update(demographics_tab_metrics(data_key, _df))
+
+    total = metrics['total_students']
+    at_risk = metrics.get('at_risk', 0)
+    high_performers = metrics.get('high_performers', 0)
+
+    # Everyone outside the at-risk and high tiers (students without a GPA included)
+    metrics['mid_tier_students'] = total - at_risk - high_performers
+    metrics['international_students'] = total - metrics['uae_nationals']
+    metrics['net_revenue'] = metrics['total_tuition'] - metrics['total_aid']
+
+    # Every share of the student body in one vectorized divide
+    shares = {
+        'mid_tier_pct': metrics['mid_tier_students'],
+        'at_risk_pct': at_risk,
+        'high_perf_pct': high_performers,
+        'success_rate': total - at_risk,
+        'international_pct': metrics['international_students'],
+        'aid_recipients_pct': metrics['aid_recipients'],
+    }
+    if metrics['housing_col']:
+        shares['off_campus_pct'] = metrics['off_campus']
+    metrics.update(zip(shares, pct_array(list(shares.values()), total).tolist()))
+
+    metrics['risk_severity'] = _SEV_LABELS[int(np.searchsorted(_SEV_BINS, metrics['at_risk_pct']))]
+    return metrics
+
+def approx_memory_mb(df: pd.DataFrame, sample_size: int = 1000) -> float:
+    """Memory footprint in MB: exact shallow size plus the string payload of object columns estimated from a row sample"""
+    total = df.memory_usage(deep=False).sum()
+    object_cols = column_kinds(df)['object']
+    if len(object_cols):
+        n = min(sample_size, len(df))
+        sample = df[object_cols].sample(n, random_state=0) if n < len(df) else df[object_cols]
+        payload = (sample.memory_usage(deep=True, index=False) - sample.memory_usage(deep=False, index=False)).sum()
+        total += payload * len(df) / max(n, 1)
+    return total / (1024 ** 2)
+
+@st.cache_data(show_spinner=False)
+def lineage_stats(data_key: str, _df: pd.DataFrame) -> Dict[str, Any]:
+    """Column metadata and full-frame scans behind the Data Lineage and Data Explorer tabs, once per dataset"""
+    # Null and non-null counts from one missing-value mask pass instead of isnull().sum() plus count()
+    nulls = pd.Series(_df.isna().to_numpy().sum(axis=0), index=_df.columns)
+    kinds = column_kinds(_df)
+    return {
+        'columns': _df.columns.tolist(),
+        'numeric_cols': kinds['numeric'],
+        'categorical_cols': kinds['object'],
+        'datetime_cols': kinds['datetime'],
+        'memory_mb': approx_memory_mb(_df),
+        'counts': len(_df) - nulls,
+        'nulls': nulls,
+        'dtypes': _df.dtypes.astype(str),
+        'unique': _df.nunique(),
+    }
+
+@st.cache_data(show_spinner=False)
+def data_preview(data_key: str, _df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """First n rows for the Data Explorer preview, sliced once per dataset"""
+    return _df.head(n).copy()
+
+def _prompt_value(value, ndigits: int = 3):
+    """Prompt-ready copy of a JSON value with floats rounded to ndigits places"""
+    if isinstance(value, float):
+        return round(value, ndigits)
+    if isinstance(value, dict):
+        return {k: _prompt_value(v, ndigits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_prompt_value(v, ndigits) for v in value]
+    return value
+
+def _compact_json(value) -> str:
+    """Whitespace-free JSON with rounded floats; pretty-printing roughly doubles the prompt's token count"""
+    return json.dumps(_prompt_value(value), separators=(',', ':'), default=str)
+
+@st.cache_data(show_spinner=False)
+def qa_prompt_context(data_key: str, _df: pd.DataFrame, _metrics: dict) -> Tuple[str, str]:
+    """Compact metrics and data summary JSON for the Q&A prompt, serialized once per dataset"""
+    # The *_col entries only record which source column each tab read from
+    metrics = {k: v for k, v in _metrics.items() if not k.endswith('_col')}
+    data_summary = {
+        'total_records': len(_df),
+        'columns': lineage_stats(data_key, _df)['columns'][:30],
+        'sample_stats': numeric_sample_stats(data_key, _df)
+    }
+    return _compact_json(metrics), _compact_json(data_summary)[:1000]
+
+@st.cache_data(show_spinner=False)
+def numeric_sample_stats(data_key: str, _df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """mean/min/max of the first ten numeric columns, the Data Explorer Q&A context, once per dataset"""
+    numeric_cols = column_kinds(_df)['numeric'][:10]
+    if NUMBA_AVAILABLE:
+        # One fused compiled pass over the numeric block instead of three pandas reductions per column
+        return column_stats(_df, numeric_cols)
+
+    return {
+        col: {
+            'mean': float(_df[col].mean()),
+            'min': float(_df[col].min()),
+            'max': float(_df[col].max())
+        }
+        for col in numeric_cols
+    }
+
+# ====================================================================================
+# VISUALIZATION HELPERS
+# ====================================================================================
+
+# Shared st.plotly_chart config (built once, reused by every chart render)
+PLOTLY_CHART_CONFIG = {'staticPlot': False, 'displaylogo': False, 'responsive': True}
+
+# Shared dark-theme layout for the complete-journey overview charts (built once at import)
+JOURNEY_CHART_LAYOUT = go.Layout(
+    template="plotly_dark",
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(30, 41, 59, 0.85)',
+    font=dict(color='white', size=14),
+    height=400,
+    margin=dict(l=40, r=40, t=60, b=40)
+)
+JOURNEY_PIE_COLORS = ['#6366f1', '#10b981', '#f59e0b', '#ef4444', '#3b82f6']
+
+def _journey_fig(trace, title: str) -> go.Figure:
+    """Wrap a single trace in a figure using the shared journey layout"""
+    fig = go.Figure(data=[trace], layout=JOURNEY_CHART_LAYOUT)
+    fig.layout.title = dict(text=title, font=dict(size=18, color='#6366f1'))
     return fig
 
+def _journey_bar(series: pd.Series, title: str) -> go.Figure:
+    """Bar chart of a series (index on x, values on y)"""
+    return _journey_fig(go.Bar(x=series.index, y=series.to_numpy(), marker_color='#6366f1'), title)
+
+def _journey_pie(labels, values, title: str) -> go.Figure:
+    """Donut chart from explicit labels and values"""
+    return _journey_fig(go.Pie(labels=labels, values=values, hole=0.4, marker_colors=JOURNEY_PIE_COLORS), title)
+
+def _journey_counts_pie(series: pd.Series, title: str) -> go.Figure:
+    """Donut chart of a value_counts() series"""
+    return _journey_pie(series.index, series.to_numpy(), title)
+
+def _journey_histogram(values, title: str) -> go.Figure:
+    """30-bin histogram of raw values"""
+    return _journey_fig(go.Histogram(x=values, nbinsx=30, marker_color='#6366f1'), title)
+
+def build_journey_figs(aggs: Dict[str, Any], journey_idx: int) -> Dict[str, go.Figure]:
+    """Build every overview figure for one complete journey from its aggregations, keyed by chart id"""
+    figs = {}
+
+    if journey_idx == 0:  # Enrollment
+        if 'nat_counts' in aggs:
+            figs['nat'] = _journey_bar(aggs['nat_counts'], "Top 10 Nationalities")
+            figs['uae_intl'] = _journey_pie(["UAE Nationals", "International"], [aggs['uae_count'], aggs['intl_count']], "UAE vs International Distribution")
+        if 'status_counts' in aggs:
+            figs['status'] = _journey_counts_pie(aggs['status_counts'], "Enrollment Status")
+        if 'cohort_counts' in aggs:
+            figs['cohort'] = _journey_bar(aggs['cohort_counts'], "Enrollment Trends by Cohort")
+        if 'gender_counts' in aggs:
+            figs['gender'] = _journey_counts_pie(aggs['gender_counts'], "Gender Distribution")
+        if 'prog_counts' in aggs:
+            figs['programs'] = _journey_bar(aggs['prog_counts'], "Top Programs by Enrollment")
+
+    elif journey_idx == 1:  # Revenue
+        if 'rev_by_nat' in aggs:
+            figs['rev_nat'] = _journey_bar(aggs['rev_by_nat'], "Revenue by Nationality")
+        if 'nat_counts' in aggs:
+            figs['nat_dist'] = _journey_bar(aggs['nat_counts'], "Student Distribution by Nationality")
+        if 'tuition_values' in aggs:
+            figs['tuition_dist'] = _journey_histogram(aggs['tuition_values'], "Tuition Distribution")
+        if 'cohort_counts' in aggs:
+            figs['cohort_fb'] = _journey_bar(aggs['cohort_counts'], "Students by Cohort")
+        if 'aid_recipients' in aggs:
+            figs['aid'] = _journey_pie(["With Financial Aid", "No Aid"], [aggs['aid_recipients'], aggs['no_aid']], "Financial Aid Recipients")
+        if 'status_counts' in aggs:
+            figs['status_fb'] = _journey_counts_pie(aggs['status_counts'], "Enrollment Status")
+        if 'rev_by_prog' in aggs:
+            figs['rev_prog'] = _journey_bar(aggs['rev_by_prog'], "Revenue by Program")
+        if 'prog_counts' in aggs:
+            figs['prog_fb'] = _journey_bar(aggs['prog_counts'], "Students by Program")
+        if 'pay_counts' in aggs:
+            figs['payment'] = _journey_counts_pie(aggs['pay_counts'], "Payment Status Distribution")
+        if 'gender_counts' in aggs:
+            figs['gender_fb'] = _journey_counts_pie(aggs['gender_counts'], "Gender Distribution")
+
+    elif journey_idx == 2:  # Operations
+        if 'status_counts' in aggs:
+            figs['op_status'] = _journey_counts_pie(aggs['status_counts'], "Operational Status")
+        if 'cohort_counts' in aggs:
+            figs['cohort_ops'] = _journey_bar(aggs['cohort_counts'], "Students by Cohort")
+
+    elif journey_idx == 3:  # Academics
+        if 'gpa_values' in aggs:
+            figs['gpa_dist'] = _journey_histogram(aggs['gpa_values'], "GPA Distribution")
+            figs['perf_tiers'] = _journey_pie(["High Performers (≥3.5)", "Mid Performers (2.5-3.5)", "At Risk (<2.5)"], aggs['gpa_tiers'], "Performance Tiers")
+        if 'gpa_by_prog' in aggs:
+            figs['gpa_prog'] = _journey_bar(aggs['gpa_by_prog'], "Average GPA by Program")
+        if 'gpa_by_nat' in aggs:
+            figs['gpa_nat'] = _journey_bar(aggs['gpa_by_nat'], "Average GPA by Nationality")
+        if 'credit_values' in aggs:
+            figs['credits'] = _journey_histogram(aggs['credit_values'], "Credit Hours Distribution")
+
+    elif journey_idx == 4:  # Retention
+        if 'status_counts' in aggs:
+            figs['retention_status'] = _journey_counts_pie(aggs['status_counts'], "Student Status")
+        if 'gpa_values' in aggs:
+            figs['retention_gpa'] = _journey_histogram(aggs['gpa_values'], "GPA Distribution")
+
+    elif journey_idx == 5:  # Risk
+        if 'gpa_risk' in aggs:
+            figs['risk_gpa'] = _journey_pie(["At Risk (<2.5 GPA)", "Acceptable (≥2.5)"], aggs['gpa_risk'], "Academic Risk Assessment")
+        if 'pay_counts' in aggs:
+            figs['risk_payment'] = _journey_counts_pie(aggs['pay_counts'], "Payment Risk")
+
+    return figs
+
 # ====================================================================================
 # LLM CONTENT GENERATION FUNCTIONS
 # ====================================================================================
@@ -5959,6 +6622,70 @@ def _generate_rich_statistical_insight(viz: dict, df: pd.DataFrame, total_studen
             top_list = ", ".join([f"{k} ({v:,})" for k, v in top_3.items()])
             return f"{col_name} distribution: {unique_vals} categories. Top 3: {top_list} ({top_3_pct:.1f}% combined). Pattern shows {'high concentration in few categories' if top_3_pct > 60 else 'balanced distribution'}."
 
+# Visualizations per batched insight prompt; larger batches get unreliable on small models
+INSIGHT_BATCH_SIZE = 8
+
+# Read timeout (seconds) for an insight prompt, batched or not
+INSIGHT_TIMEOUT = 90
+
+# query_ollama results that mean the server is unreachable or too slow, so re-asking per item won't help
+_OLLAMA_UNAVAILABLE = ("[ERROR] Request timeout", "[ERROR] Connection failed")
+
+_INSIGHT_TASK = "Provide 3-4 sentence insight: NUMBERS, PATTERN, ROOT CAUSE, IMPACT, ACTION"
+
+def _parse_insight(response: str) -> Optional[str]:
+    """The 'insight' string of a single-visualization LLM response, or None"""
+    if not response or response.startswith('[ERROR]'):
+        return None
+    result = extract_json_from_response(response)
+    return result['insight'] if result and result.get('insight') else None
+
+def batched_viz_insights(viz_blocks: List[str], context_line: str, model: str, url: str) -> List[Optional[str]]:
+    """
+    One insight per visualization description, asked for INSIGHT_BATCH_SIZE at a time in a single prompt.
+    A batch whose JSON doesn't parse into the right number of insights is retried as concurrent per-item prompts;
+    after a timeout or connection failure the remaining visualizations are skipped instead.
+    Returns None where no LLM insight could be produced.
+    """
+    insights = []
+    for start in range(0, len(viz_blocks), INSIGHT_BATCH_SIZE):
+        batch = viz_blocks[start:start + INSIGHT_BATCH_SIZE]
+        numbered = "\n\n".join(f"Visualization {i}:\n{block}" for i, block in enumerate(batch, 1))
+        batch_prompt = f"""For each of the following {len(batch)} visualizations: {_INSIGHT_TASK}
+
+{numbered}
+
+{context_line}
+
+Return JSON with exactly {len(batch)} insight strings, in the same order:
+{{"insights": ["...", "..."]}}"""
+
+        response = query_ollama(batch_prompt, model, url, temperature=0.7, num_predict=min(350 * len(batch), 2048),
+                                timeout=INSIGHT_TIMEOUT, auto_optimize=True)
+        if response in _OLLAMA_UNAVAILABLE:
+            insights.extend([None] * (len(viz_blocks) - start))
+            break
+        result = extract_json_from_response(response) if response and not response.startswith('[ERROR]') else None
+        batch_insights = result.get('insights') if isinstance(result, dict) else None
+
+        if isinstance(batch_insights, list) and len(batch_insights) == len(batch):
+            insights.extend(str(insight) if insight else None for insight in batch_insights)
+            continue
+
+        # Fallback: one prompt per visualization, sent concurrently
+        item_prompts = [f"""{block}
+
+{context_line}
+
+{_INSIGHT_TASK}
+
+Return JSON:
+{{"insight": "..."}}""" for block in batch]
+        responses = query_ollama_many(item_prompts, model, url, temperature=0.7, num_predict=350, timeout=INSIGHT_TIMEOUT, auto_optimize=True)
+        insights.extend(_parse_insight(response) for response in responses)
+
+    return insights
+
 def generate_dynamic_visualizations_llm(metrics: dict, df: pd.DataFrame, model: str, url: str, context_type: str = "executive_summary") -> dict:
     """
     TRUE LLM-DRIVEN APPROACH: AI analyzes data and recommends visualizations
@@ -5987,8 +6714,9 @@ def generate_dynamic_visualizations_llm(metrics: dict, df: pd.DataFrame, model:
     # ====================================================================================
 
     available_columns = df.columns.tolist()
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+    kinds = column_kinds(df)
+    numeric_cols = kinds['numeric']
+    categorical_cols = kinds['object']
 
     # Calculate detailed statistics for ALL numeric columns (not just first 5)
     numeric_stats = {}
@@ -6618,54 +7346,53 @@ Return ONLY valid JSON. NO markdown, NO explanations outside JSON."""
 
     st.success(f"✅ Phase 1 complete: {len(visualizations)} visualizations selected (rule-based, {context_type} focus)")
 
+    # Statistical stand-ins used where the LLM gave no usable answer
+    statistical_fallbacks = 0
+
     try:
 
         # CHUNK 2: Enrich each visualization with deep insights
         st.info(f"⏳ Phase 2/2: Generating deep insights for {len(visualizations)} visualizations... (1-2 minutes)")
 
-        enriched_visualizations = []
-        for i, viz in enumerate(visualizations[:6]):  # Limit to 6
-            with st.spinner(f"Analyzing {viz.get('title', 'visualization')} ({i+1}/{min(len(visualizations), 6)})..."):
-                # Get column data for context
-                col_name = viz.get('data_column', '')
-                col_context = ""
-                if col_name and col_name in df.columns:
-                    if df[col_name].dtype in ['int64', 'float64']:
-                        col_data = df[col_name].dropna()
-                        if len(col_data) > 0:
-                            col_context = f"Column stats: mean={col_data.mean():.2f}, median={col_data.median():.2f}, std={col_data.std():.2f}, min={col_data.min():.2f}, max={col_data.max():.2f}"
-                    else:
-                        col_counts = df[col_name].value_counts().head(5)
-                        col_context = f"Top values: {', '.join([f'{k}:{v}' for k, v in col_counts.items()])}"
+        # Describe every visualization up front, then ask for all insights in one batched prompt
+        viz_blocks = []
+        for viz in visualizations[:6]:  # Limit to 6
+            # Get column data for context
+            col_name = viz.get('data_column', '')
+            col_context = ""
+            if col_name and col_name in df.columns:
+                if df[col_name].dtype in ['int64', 'float64']:
+                    col_data = df[col_name].dropna()
+                    if len(col_data) > 0:
+                        col_context = f"Column stats: mean={col_data.mean():.2f}, median={col_data.median():.2f}, std={col_data.std():.2f}, min={col_data.min():.2f}, max={col_data.max():.2f}"
+                else:
+                    col_counts = df[col_name].value_counts().head(5)
+                    col_context = f"Top values: {', '.join([f'{k}:{v}' for k, v in col_counts.items()])}"
 
-                chunk2_prompt = f"""Analyze: {viz.get('title', '')}
+            viz_blocks.append(f"""Analyze: {viz.get('title', '')}
 Column: {viz.get('data_column', '')}
-{col_context}
-
-Context: {total_students} students, GPA {avg_gpa:.2f}, {high_performers} high, {at_risk} at-risk
-
-Provide 3-4 sentence insight: NUMBERS, PATTERN, ROOT CAUSE, IMPACT, ACTION
-
-Return JSON:
-{{"insight": "..."}}"""
-
-                chunk2_response = query_ollama(chunk2_prompt, model, url, temperature=0.7, num_predict=350, timeout=90, auto_optimize=True)
+{col_context}""")
+
+        with st.spinner(f"Analyzing {len(viz_blocks)} visualizations..."):
+            chunk2_insights = batched_viz_insights(
+                viz_blocks,
+                f"Context: {total_students} students, GPA {avg_gpa:.2f}, {high_performers} high, {at_risk} at-risk",
+                model,
+                url
+            )
 
-                if chunk2_response and not chunk2_response.startswith('[ERROR]'):
-                    chunk2_result = extract_json_from_response(chunk2_response)
-                    if chunk2_result and 'insight' in chunk2_result:
-                        viz['insight'] = chunk2_result['insight']
-                        st.success(f"✅ LLM insight generated for {viz.get('title', 'viz')}")
-                    else:
-                        # Rich statistical fallback
-                        viz['insight'] = _generate_rich_statistical_insight(viz, df, total_students, high_performers, at_risk, avg_gpa)
-                        st.info(f"📊 Statistical insight generated for {viz.get('title', 'viz')}")
-                else:
-                    # Rich statistical fallback
-                    viz['insight'] = _generate_rich_statistical_insight(viz, df, total_students, high_performers, at_risk, avg_gpa)
-                    st.info(f"📊 Statistical insight generated for {viz.get('title', 'viz')}")
+        enriched_visualizations = []
+        for viz, insight in zip(visualizations[:6], chunk2_insights):
+            if insight:
+                viz['insight'] = insight
+                st.success(f"✅ LLM insight generated for {viz.get('title', 'viz')}")
+            else:
+                # Rich statistical fallback
+                viz['insight'] = _generate_rich_statistical_insight(viz, df, total_students, high_performers, at_risk, avg_gpa)
+                statistical_fallbacks += 1
+                st.info(f"📊 Statistical insight generated for {viz.get('title', 'viz')}")
 
-                enriched_visualizations.append(viz)
+            enriched_visualizations.append(viz)
 
         st.success(f"✅ Phase 2 complete: {len(enriched_visualizations)} visualizations enriched")
 
@@ -7001,71 +7728,71 @@ Return JSON:
         enriched_findings = []
         enriched_recommendations = []
 
-        # Enrich each finding
-        for i, finding_obj in enumerate(basic_findings):
-            with st.spinner(f"Enriching finding {i+1}/3..."):
-                finding_text = finding_obj["finding"]
-                context = finding_obj["context"]
-
-                # Try LLM enrichment
-                llm_prompt = f"""Enrich this finding with ROOT CAUSE and IMPACT:
+        # Build every finding and recommendation prompt, then send them to Ollama together
+        finding_prompts = [f"""Enrich this finding with ROOT CAUSE and IMPACT:
 
-Finding: {finding_text}
+Finding: {finding_obj["finding"]}
 
 Context: {total_students} students, GPA {avg_gpa:.2f}, {unique_nationalities} nations
 
 Provide ROOT CAUSE (why this pattern exists) and IMPACT (business consequence).
 
 JSON:
-{{"root_cause": "...", "impact": "..."}}"""
-
-                llm_response = query_ollama(llm_prompt, model, url, temperature=0.7, num_predict=200, timeout=60, auto_optimize=True)
-
-                if llm_response and not llm_response.startswith('[ERROR]'):
-                    llm_result = extract_json_from_response(llm_response)
-                    if llm_result and 'root_cause' in llm_result and 'impact' in llm_result:
-                        enriched = f"{finding_text} ROOT CAUSE: {llm_result['root_cause']} IMPACT: {llm_result['impact']}"
-                        enriched_findings.append(enriched)
-                        st.success(f"✅ LLM enrichment for finding {i+1}")
-                        continue
-
-                # Fallback: Statistical enrichment
-                enriched = _enrich_finding_statistical(finding_text, context, df)
-                enriched_findings.append(enriched)
-                st.info(f"📊 Statistical enrichment for finding {i+1}")
-
-        # Enrich each recommendation
-        for i, rec_obj in enumerate(basic_recommendations):
-            with st.spinner(f"Enriching recommendation {i+1}/3..."):
-                rec_text = rec_obj["recommendation"]
-                context = rec_obj["context"]
+{{"root_cause": "...", "impact": "..."}}""" for finding_obj in basic_findings]
 
-                # Try LLM enrichment
-                llm_prompt = f"""Enrich this recommendation with ACTION and EXPECTED OUTCOME:
+        rec_prompts = [f"""Enrich this recommendation with ACTION and EXPECTED OUTCOME:
 
-Recommendation: {rec_text}
+Recommendation: {rec_obj["recommendation"]}
 
 Context: {total_students} students, at-risk {at_risk}, aid {aid_coverage_pct:.1f}%
 
 Provide specific ACTION steps and EXPECTED OUTCOME with numbers.
 
 JSON:
-{{"action": "...", "expected_outcome": "..."}}"""
+{{"action": "...", "expected_outcome": "..."}}""" for rec_obj in basic_recommendations]
 
-                llm_response = query_ollama(llm_prompt, model, url, temperature=0.7, num_predict=250, timeout=60, auto_optimize=True)
+        with st.spinner(f"Enriching {len(finding_prompts)} findings and {len(rec_prompts)} recommendations in parallel..."):
+            # Each kind keeps its own output budget: findings 200 tokens, recommendations 250
+            finding_responses = query_ollama_many(finding_prompts, model, url, temperature=0.7, num_predict=200, timeout=60, auto_optimize=True)
+            rec_responses = query_ollama_many(rec_prompts, model, url, temperature=0.7, num_predict=250, timeout=60, auto_optimize=True)
 
-                if llm_response and not llm_response.startswith('[ERROR]'):
-                    llm_result = extract_json_from_response(llm_response)
-                    if llm_result and 'action' in llm_result and 'expected_outcome' in llm_result:
-                        enriched = f"{rec_text} ACTION: {llm_result['action']} EXPECTED OUTCOME: {llm_result['expected_outcome']}"
-                        enriched_recommendations.append(enriched)
-                        st.success(f"✅ LLM enrichment for recommendation {i+1}")
-                        continue
+        # Enrich each finding
+        for i, (finding_obj, llm_response) in enumerate(zip(basic_findings, finding_responses)):
+            finding_text = finding_obj["finding"]
+            context = finding_obj["context"]
+
+            if llm_response and not llm_response.startswith('[ERROR]'):
+                llm_result = extract_json_from_response(llm_response)
+                if llm_result and 'root_cause' in llm_result and 'impact' in llm_result:
+                    enriched = f"{finding_text} ROOT CAUSE: {llm_result['root_cause']} IMPACT: {llm_result['impact']}"
+                    enriched_findings.append(enriched)
+                    st.success(f"✅ LLM enrichment for finding {i+1}")
+                    continue
+
+            # Fallback: Statistical enrichment
+            enriched = _enrich_finding_statistical(finding_text, context, df)
+            enriched_findings.append(enriched)
+            statistical_fallbacks += 1
+            st.info(f"📊 Statistical enrichment for finding {i+1}")
 
-                # Fallback: Statistical enrichment
-                enriched = _enrich_recommendation_statistical(rec_text, context)
-                enriched_recommendations.append(enriched)
-                st.info(f"📊 Statistical enrichment for recommendation {i+1}")
+        # Enrich each recommendation
+        for i, (rec_obj, llm_response) in enumerate(zip(basic_recommendations, rec_responses)):
+            rec_text = rec_obj["recommendation"]
+            context = rec_obj["context"]
+
+            if llm_response and not llm_response.startswith('[ERROR]'):
+                llm_result = extract_json_from_response(llm_response)
+                if llm_result and 'action' in llm_result and 'expected_outcome' in llm_result:
+                    enriched = f"{rec_text} ACTION: {llm_result['action']} EXPECTED OUTCOME: {llm_result['expected_outcome']}"
+                    enriched_recommendations.append(enriched)
+                    st.success(f"✅ LLM enrichment for recommendation {i+1}")
+                    continue
+
+            # Fallback: Statistical enrichment
+            enriched = _enrich_recommendation_statistical(rec_text, context)
+            enriched_recommendations.append(enriched)
+            statistical_fallbacks += 1
+            st.info(f"📊 Statistical enrichment for recommendation {i+1}")
 
         st.success("✅ All phases complete: Using hybrid-enriched analysis")
 
@@ -7073,7 +7800,8 @@ JSON:
             "strategic_overview": f"Analysis of {total_students:,} students reveals key institutional patterns requiring strategic attention across academic performance, diversity, and financial sustainability.",
             "visualizations": enriched_visualizations,
             "key_findings": enriched_findings,
-            "recommendations": enriched_recommendations
+            "recommendations": enriched_recommendations,
+            "llm_complete": statistical_fallbacks == 0
         }
 
     except Exception as e:
@@ -7179,10 +7907,41 @@ JSON:
         "strategic_overview": f"Analysis of {total_students:,} students reveals key institutional patterns: Academic performance (GPA {avg_gpa:.2f}, {high_perf_pct:.1f}% high performers, {at_risk_pct:.1f}% at-risk), Diversity ({unique_nationalities} nationalities, UAE {uae_percentage:.1f}%), Financial sustainability (AED {total_aid/1000000:.1f}M aid).",
         "visualizations": visualizations,
         "key_findings": enriched_findings,
-        "recommendations": enriched_recommendations
+        "recommendations": enriched_recommendations,
+        "llm_complete": False
     }
 
 
+# Seconds a stored dynamic visualization analysis stays valid
+DYNAMIC_VIZ_TTL = 1800
+
+@st.cache_resource(show_spinner=False)
+def _dynamic_viz_store() -> tuple:
+    """Process-wide store of fully LLM-generated analyses, shared by every session"""
+    return threading.Lock(), _LRUDict(maxsize=32)
+
+def cached_dynamic_visualizations(context_type: str, model: str, url: str, data_key: str,
+                                  metrics: dict, df: pd.DataFrame) -> dict:
+    """
+    generate_dynamic_visualizations_llm memoized per (context, model, server, dataset, metrics).
+    Only results the LLM fully produced are stored, so a statistical fallback is regenerated on the next try;
+    a hit returns without re-running the function, so its phase messages only appear while it generates.
+    """
+    key = (context_type, model, url, data_key, json.dumps(metrics, sort_keys=True, default=str))
+    lock, store = _dynamic_viz_store()
+    with lock:
+        entry = store.get(key)
+        if entry and time.time() - entry[0] < DYNAMIC_VIZ_TTL:
+            store.move_to_end(key)
+            return entry[1]
+
+    result = generate_dynamic_visualizations_llm(metrics, df, model, url, context_type=context_type)
+    if result.get('llm_complete'):
+        with lock:
+            store[key] = (time.time(), result)
+    return result
+
+
 def find_matching_column(requested_col: str, df: pd.DataFrame) -> str:
     """
     Smart column matching - handles variations in column names
@@ -7326,7 +8085,7 @@ def build_dynamic_chart(spec: dict, df: pd.DataFrame):
             colors = ['#6366f1', '#8b5cf6', '#a855f7', '#c026d3', '#db2777', '#ec4899', '#f43f5e', '#ef4444', '#f97316', '#f59e0b']
 
             if aggregation == 'count':
-                value_counts = df[data_column].value_counts().head(top_n)
+                value_counts = cached_value_counts(dataset_key(df), df, data_column, top_n)
                 fig = go.Figure()
                 fig.add_trace(go.Bar(
                     x=value_counts.index,
@@ -7343,10 +8102,8 @@ def build_dynamic_chart(spec: dict, df: pd.DataFrame):
             else:
                 # Handle sum/mean aggregations if group_by specified
                 group_by = config.get('group_by', data_column)
-                if aggregation == 'sum':
-                    grouped = df.groupby(group_by)[data_column].sum().sort_values(ascending=False).head(top_n)
-                else:  # mean
-                    grouped = df.groupby(group_by)[data_column].mean().sort_values(ascending=False).head(top_n)
+                grouped = cached_group_agg(dataset_key(df), df, group_by, data_column,
+                                           'sum' if aggregation == 'sum' else 'mean', top_n)
 
                 fig = go.Figure()
                 fig.add_trace(go.Bar(
@@ -7640,6 +8397,25 @@ def build_dynamic_chart(spec: dict, df: pd.DataFrame):
 
     return None
 
+@st.cache_resource(show_spinner=False, max_entries=128)
+def cached_dynamic_chart(data_key: str, spec_key: str, _spec: dict, _df: pd.DataFrame) -> Optional[go.Figure]:
+    """build_dynamic_chart output, built once per (dataset, spec) and handed to st.plotly_chart as the Figure itself"""
+    return build_dynamic_chart(_spec, _df)
+
+def dynamic_chart_figure(spec: dict, df: pd.DataFrame) -> Optional[go.Figure]:
+    """Cached figure for an LLM visualization spec, keyed by the spec's canonical JSON"""
+    return cached_dynamic_chart(dataset_key(df), json.dumps(spec, sort_keys=True, default=str), spec, df)
+
+def dynamic_chart_figures(specs: List[dict], df: pd.DataFrame, max_workers: int = 8) -> List[Optional[go.Figure]]:
+    """dynamic_chart_figure for several specs, built concurrently (pandas aggregation releases the GIL) in spec order"""
+    data_key = dataset_key(df)
+    spec_keys = [json.dumps(spec, sort_keys=True, default=str) for spec in specs]
+    if len(specs) <= 1:
+        return [cached_dynamic_chart(data_key, key, spec, df) for key, spec in zip(spec_keys, specs)]
+
+    with script_thread_pool(min(max_workers, len(specs))) as pool:
+        return list(pool.map(lambda key, spec: cached_dynamic_chart(data_key, key, spec, df), spec_keys, specs))
+
 
 def generate_journey_story_llm(journey_name: str, metrics: dict, df: pd.DataFrame, model: str, url: str) -> dict:
     """Generate journey-specific story using LLM"""
@@ -7816,7 +8592,8 @@ def deep_dive_business_discovery(df: pd.DataFrame, metrics: dict) -> dict:
 
     # Zero-GPA students (data quality or serious academic issues)
     if gpa_col and gpa_col in df.columns:
-        zero_gpa_students = len(df[df[gpa_col] == 0])
+        gpa_values = df[gpa_col].to_numpy()
+        zero_gpa_students = int(np.count_nonzero(gpa_values == 0))
         if zero_gpa_students > 0:
             discoveries['anomalies']['zero_gpa'] = {
                 'count': zero_gpa_students,
@@ -7826,7 +8603,7 @@ def deep_dive_business_discovery(df: pd.DataFrame, metrics: dict) -> dict:
             }
 
         # Perfect GPA students
-        perfect_gpa_students = len(df[df[gpa_col] == 4.0])
+        perfect_gpa_students = int(np.count_nonzero(gpa_values == 4.0))
         if perfect_gpa_students > 0:
             discoveries['anomalies']['perfect_gpa'] = {
                 'count': perfect_gpa_students,
@@ -9072,7 +9849,7 @@ def generate_comprehensive_overview_llm(metrics: dict, df: pd.DataFrame, model:
     total_students = metrics.get('total_students', 0)
 
     # Enrollment composition metrics
-    active_students = len(df[df.get('enrollment_enrollment_status', pd.Series()) == 'Active']) if 'enrollment_enrollment_status' in df.columns else 0
+    active_students = int(np.count_nonzero(df['enrollment_enrollment_status'].to_numpy() == 'Active')) if 'enrollment_enrollment_status' in df.columns else 0
     unique_nationalities = metrics.get('unique_nationalities', 0)
 
     # Academic performance metrics
@@ -9083,7 +9860,8 @@ def generate_comprehensive_overview_llm(metrics: dict, df: pd.DataFrame, model:
     high_performer_pct = round((high_performers / total_students * 100), 1) if total_students > 0 else 0
 
     # Growth & retention metrics
-    cohort_counts = df['cohort_year'].value_counts().sort_index() if 'cohort_year' in df.columns else pd.Series()
+    data_key = dataset_key(df)
+    cohort_counts = sorted_value_counts(df['cohort_year']) if 'cohort_year' in df.columns else pd.Series()
     total_cohorts = len(cohort_counts)
     latest_cohort_size = int(cohort_counts.iloc[-1]) if len(cohort_counts) > 0 else 0
     avg_cohort_size = int(cohort_counts.mean()) if len(cohort_counts) > 0 else 0
@@ -9091,13 +9869,13 @@ def generate_comprehensive_overview_llm(metrics: dict, df: pd.DataFrame, model:
     # Top nationalities
     top_nationalities = []
     if 'nationality' in df.columns:
-        nat_counts = df['nationality'].value_counts().head(5)
+        nat_counts = cached_value_counts(data_key, df, 'nationality', 5)
         top_nationalities = [f"{k}: {int(v)} ({round(v/len(df)*100, 1)}%)" for k, v in nat_counts.items()]
 
     # Enrollment status distribution
     status_dist = []
     if 'enrollment_enrollment_status' in df.columns:
-        status_counts = df['enrollment_enrollment_status'].value_counts()
+        status_counts = cached_value_counts(data_key, df, 'enrollment_enrollment_status')
         status_dist = [f"{k}: {int(v)} ({round(v/len(df)*100, 1)}%)" for k, v in status_counts.items()]
 
     prompt = f"""You are analyzing a comprehensive student dataset for a higher education institution. Generate detailed insights for 3 main sections.
@@ -9220,6 +9998,84 @@ Focus on data-driven insights, business implications, and actionable recommendat
 # SESSION STATE INITIALIZATION
 # ====================================================================================
 
+class _LRUDict(OrderedDict):
+    """Size-capped dict that evicts the least recently used entry on insert"""
+
+    def __init__(self, *args, maxsize: int = 4, **kwargs):
+        self.maxsize = maxsize
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+def _llm_cache_put(key: str, value):
+    """Store a generated LLM result in the session's bounded LLM cache"""
+    st.session_state.llm_cache[key] = value
+
+def summarize_journeys(journeys: List[Dict]) -> Dict[str, Any]:
+    """Pre-aggregate journey fields into flat arrays so UI summaries need no per-rerun loops"""
+    return {
+        'count': len(journeys),
+        'total_stages': int(sum(j.get('total_stages', 0) for j in journeys)),
+        'names': [j.get('entity_name', '') for j in journeys],
+        'entity_types': [j.get('entity_type', '') for j in journeys],
+        'priorities': np.array([j.get('priority', 5) for j in journeys], dtype=np.int8),
+    }
+
+def _store_journeys(key: str, journeys: List[Dict]) -> Dict[str, Any]:
+    """Cache generated journeys together with their pre-aggregated stats"""
+    _llm_cache_put(key, journeys)
+    stats = summarize_journeys(journeys or [])
+    st.session_state.journey_stats[key] = stats
+    return stats
+
+def _journey_stats(key: str, journeys: List[Dict]) -> Dict[str, Any]:
+    """Return the stored stats for cached journeys, rebuilding them if missing"""
+    stats = st.session_state.journey_stats.get(key)
+    if stats is None or stats['count'] != len(journeys):
+        stats = _store_journeys(key, journeys)
+    return stats
+
+def journey_overview_figs(data_key: str, df: pd.DataFrame, journey_idx: int) -> Dict[str, go.Figure]:
+    """Overview figures for one complete journey, replayed from session state until the dataset changes"""
+    if st.session_state.get('journey_figs_key') != data_key:
+        st.session_state.journey_figs = {}
+        st.session_state.journey_figs_key = data_key
+    figs = st.session_state.journey_figs.get(journey_idx)
+    if figs is None:
+        figs = build_journey_figs(journey_overview_aggs(data_key, df, journey_idx), journey_idx)
+        st.session_state.journey_figs[journey_idx] = figs
+    return figs
+
+def free_llm_memory():
+    """Drop all cached LLM/journey results for this session and reclaim memory"""
+    st.session_state.llm_cache.clear()
+    st.session_state.qa_answers.clear()
+    st.session_state.qa_last = None
+    st.session_state.journey_stats.clear()
+    st.session_state.journey_figs = {}
+    st.session_state.journey_figs_key = None
+    st.session_state.complete_journeys = None
+    st.session_state.journey_generation_metadata = None
+    for context in AI_ANALYSIS_TABS:
+        st.session_state.pop(f'{context}_analysis', None)
+    gc.collect()
+
+@st.cache_resource(show_spinner=False)
+def warmup_journey_kernels() -> bool:
+    """Compile the journey metric kernels once per server process, before any generation run"""
+    if JOURNEY_MODULES_AVAILABLE:
+        warmup_metric_kernels()
+    return JOURNEY_MODULES_AVAILABLE
+
 def initialize_session_state():
     """Initialize Streamlit session state variables"""
     if 'data' not in st.session_state:
@@ -9240,8 +10096,20 @@ def initialize_session_state():
     if 'selected_model' not in st.session_state:
         st.session_state.selected_model = None
 
-    if 'llm_cache' not in st.session_state:
-        st.session_state.llm_cache = {}
+    if not isinstance(st.session_state.get('llm_cache'), _LRUDict):
+        st.session_state.llm_cache = _LRUDict(st.session_state.get('llm_cache') or {}, maxsize=4)
+
+    # Data Explorer answers keyed by (model, url, dataset_key, question); qa_last is the one on screen
+    if 'qa_answers' not in st.session_state:
+        st.session_state.qa_answers = _LRUDict(maxsize=32)
+        st.session_state.qa_last = None
+
+    if 'journey_stats' not in st.session_state:
+        st.session_state.journey_stats = {}
+
+    if 'journey_figs' not in st.session_state:
+        st.session_state.journey_figs = {}
+        st.session_state.journey_figs_key = None
 
     if 'complete_journeys' not in st.session_state:
         st.session_state.complete_journeys = None
@@ -9265,4666 +10133,4506 @@ def initialize_session_state():
         st.session_state.show_connection_help = False
 
 # ====================================================================================
-# MAIN APPLICATION
+# TAB 1: TRUE LLM-DRIVEN EXECUTIVE SUMMARY
 # ====================================================================================
 
-def main():
-    """Main application entry point"""
+# Finding and recommendation cards; each section is joined into one HTML block and sent in one st.markdown call
+_EXEC_FINDING_CARD = """
+<div style='background: rgba(59, 130, 246, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 0.8rem;'>
+    <strong style='color: #60a5fa;'>Finding {idx}:</strong> {finding}
+</div>
+"""
+_EXEC_PRIORITY_REC_CARD = """
+<div style='background: {bg_gradient}; padding: 1.5rem; border-radius: 8px;
+            border-left: 4px solid {border_color}; margin-bottom: 1rem;'>
+    <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.8rem;'>
+        <h4 style='color: {border_color}; margin: 0;'>
+            {marker}
+            Recommendation {idx} - {priority} Priority
+        </h4>
+        <span style='background: rgba(0,0,0,0.3); padding: 0.3rem 0.8rem;
+                    border-radius: 12px; font-size: 0.85rem; color: #cbd5e1;'>
+            {timeline}
+        </span>
+    </div>
+    <p style='color: #e2e8f0; margin-bottom: 0.8rem; line-height: 1.6; font-size: 1.05rem;'>
+        <strong>Action:</strong> {action}
+    </p>
+    <p style='color: #a5b4fc; margin-bottom: 0.8rem; line-height: 1.6;'>
+        <strong>📊 Expected Impact:</strong> {expected_impact}
+    </p>
+    <p style='color: #cbd5e1; margin-bottom: 0; line-height: 1.6; font-size: 0.95rem;'>
+        <strong>💰 Investment:</strong> {investment}
+    </p>
+</div>
+"""
+_EXEC_SIMPLE_REC_CARD = """
+<div style='background: linear-gradient(135deg, rgba(16, 185, 129, 0.1) 0%, rgba(5, 150, 105, 0.1) 100%);
+            padding: 1.2rem; border-radius: 8px; border-left: 4px solid #10b981; margin-bottom: 1rem;'>
+    <h4 style='color: #10b981; margin-top: 0;'>Recommendation {idx}</h4>
+    <p style='color: #e2e8f0; margin-bottom: 0; line-height: 1.6;'>
+        {rec}
+    </p>
+</div>
+"""
 
-    # Initialize
-    inject_custom_css()
-    initialize_session_state()
+# Border colour, background and marker per recommendation priority (unknown priorities render as MEDIUM)
+_EXEC_PRIORITY_COLORS = {
+    'CRITICAL': ('#ef4444', 'rgba(239, 68, 68, 0.15)', '🔴'),
+    'HIGH': ('#f59e0b', 'rgba(245, 158, 11, 0.15)', '🟠'),
+    'MEDIUM': ('#10b981', 'rgba(16, 185, 129, 0.15)', '🟢')
+}
+
+def _exec_recommendation_card(idx: int, rec: Any) -> str:
+    """One Executive Summary recommendation card: enriched dict format with priority, or a plain string"""
+    if not isinstance(rec, dict):
+        return _EXEC_SIMPLE_REC_CARD.format(idx=idx, rec=rec)
+
+    priority = rec.get('priority', 'MEDIUM')
+    border_color, bg_gradient, marker = _EXEC_PRIORITY_COLORS.get(priority, _EXEC_PRIORITY_COLORS['MEDIUM'])
+    return _EXEC_PRIORITY_REC_CARD.format(
+        idx=idx,
+        priority=priority,
+        border_color=border_color,
+        bg_gradient=bg_gradient,
+        marker=marker,
+        timeline=rec.get('timeline', 'short-term').replace('_', ' ').title(),
+        action=rec.get('action', ''),
+        expected_impact=rec.get('expected_impact', ''),
+        investment=rec.get('investment', 'TBD')
+    )
 
-    # Header
-    st.markdown("""
-    <div class="hero-section">
-        <div class="hero-title">🎓 Student 360 AI-Powered Analytics <span style="font-size: 0.5em; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 4px 12px; border-radius: 20px; margin-left: 10px;">V2.0</span></div>
-        <div class="hero-subtitle">Transform Student Data into Strategic Intelligence with Large Language Models</div>
+def _render_tab_executive_summary(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '📊 Executive Summary' tab"""
+    st.header("🤖 Executive Summary - AI-Driven Dynamic Analytics")
+    st.markdown("*The AI analyzes your data and decides what visualizations to create*")
+
+    # Description box
+    st.markdown(f"""
+    <div style='background: linear-gradient(135deg, rgba(99, 102, 241, 0.15), rgba(139, 92, 246, 0.15)); padding: 1.2rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid #6366f1;'>
+        <strong>🧠 True LLM-Driven Approach:</strong> Unlike traditional dashboards where developers hardcode which graphs to show,
+        this system asks the <strong>AI to analyze your {metrics.get('total_students', 0):,} students</strong> and <strong>recommend the most insightful visualizations</strong>.
+        The LLM acts as your data analyst, choosing graph types, data columns, and insights based on what patterns it finds in YOUR data.
     </div>
     """, unsafe_allow_html=True)
 
-    # ====================================================================================
-    # SIDEBAR - EXACT IMPLEMENTATION FROM GEN_STORYTELLING_APP.PY
-    # ====================================================================================
-    with st.sidebar:
-        st.markdown("### 📚 Help & Documentation")
-        st.caption("🎓 Student 360 AI-Powered Analytics")
+    if not st.session_state.ollama_connected:
+        st.warning("⚠️ Connect to Ollama to enable AI-driven dynamic visualization generation")
 
-        # Version info
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 8px 12px; border-radius: 8px; margin: 10px 0;">
-            <div style="color: white; font-weight: 600; font-size: 0.9em;">Version 2.0</div>
-            <div style="color: rgba(255,255,255,0.8); font-size: 0.75em;">Production Release • Feb 2026</div>
-            <div style="color: rgba(255,255,255,0.9); font-size: 0.7em; margin-top: 4px;">✨ Pre-loaded Dataset</div>
+    # Generate dynamic visualizations button
+    if st.session_state.ollama_connected:
+        if st.button("🤖 Let AI Analyze Data & Create Visualizations", key="exec_dynamic_btn", type="primary", width="stretch"):
+            with st.spinner("🔄 AI is analyzing your data, identifying patterns, and recommending optimal visualizations... This may take 20-40 seconds"):
+                viz_result = cached_dynamic_visualizations("executive_summary", model, url, dataset_key(df), metrics, df)
+                _llm_cache_put('exec_dynamic_viz', viz_result)
+
+    # Display AI-generated visualizations if available
+    if 'exec_dynamic_viz' in st.session_state.llm_cache:
+        viz_result = st.session_state.llm_cache['exec_dynamic_viz']
+
+        # AI Strategic Overview
+        st.markdown(f"""
+        <div class="insight-card" style="background: linear-gradient(135deg, rgba(99, 102, 241, 0.15), rgba(139, 92, 246, 0.15)); border-left: 4px solid #6366f1; margin-bottom: 2rem;">
+            <div class="insight-title">🎯 AI Strategic Analysis</div>
+            <div class="insight-text" style="font-size: 1.1rem; line-height: 1.8;">{viz_result.get('strategic_overview', '')}</div>
         </div>
         """, unsafe_allow_html=True)
 
         st.divider()
 
-        # ====================================================================================
-        # GETTING STARTED GUIDE
-        # ====================================================================================
-        st.markdown("### 📋 Getting Started")
-        st.caption("🔄 **App Version: 3.1** - Function Rename Fix (No More Cache!) ✨")
-        st.caption("---")
-
-        # Status indicators
-        ollama_status = st.session_state.get('ollama_connected', False)
-        data_loaded = st.session_state.data is not None
+        # Key Metrics Dashboard (Static - Always show core metrics)
+        st.markdown("### 📊 Core Institutional Metrics")
 
-        if ollama_status:
-            st.success("✅ Ollama Connected")
-            st.caption("Ready to generate AI-powered insights")
-        else:
-            st.warning("⚠️ Ollama Not Connected")
-            st.caption("Configure connection below")
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Total Students", f"{metrics.get('total_students', 0):,}")
+        with col2:
+            st.metric("Average GPA", f"{metrics.get('avg_gpa', 0):.2f}")
+        with col3:
+            st.metric("High Performers", f"{metrics.get('high_performers', 0):,}",
+                     f"{metrics.get('high_performers', 0)/metrics.get('total_students', 1)*100:.1f}%")
+        with col4:
+            st.metric("UAE Nationals", f"{metrics.get('uae_percentage', 0):.1f}%")
+        with col5:
+            st.metric("At-Risk", f"{metrics.get('at_risk', 0):,}",
+                     f"{metrics.get('at_risk', 0)/metrics.get('total_students', 1)*100:.1f}%",
+                     delta_color="inverse")
 
-        if data_loaded:
-            st.success("✅ Data Loaded")
-            st.caption(f"{len(st.session_state.data):,} student records")
-        else:
-            st.info("📁 No Data Loaded")
-            st.caption("Upload CSV in Data Source section")
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Nationalities", metrics.get('unique_nationalities', 0))
+        with col2:
+            st.metric("Tuition Revenue", f"AED {metrics.get('total_tuition', 0)/1000000:.1f}M")
+        with col3:
+            st.metric("Financial Aid", f"AED {metrics.get('total_aid', 0)/1000000:.1f}M")
+        with col4:
+            st.metric("Aid Coverage", f"{metrics.get('aid_coverage_pct', 0):.1f}%")
+        with col5:
+            st.metric("Revenue/Student", f"AED {metrics.get('total_tuition', 0)/metrics.get('total_students', 1) if metrics.get('total_students', 0) > 0 else 0:,.0f}")
 
         st.divider()
 
-        # ====================================================================================
-        # LLM & PROMPT ENHANCEMENT GUIDE
-        # ====================================================================================
-        if st.button("🧠 LLM & Prompt Enhancement Guide", width='stretch', type="secondary"):
-            st.session_state.show_llm_guide = not st.session_state.get('show_llm_guide', False)
+        # ========================================================================
+        # DYNAMIC AI-RECOMMENDED VISUALIZATIONS
+        # ========================================================================
+        st.markdown("### 📈 AI-Recommended Visualizations")
+        st.caption(f"The AI analyzed your data and recommends {len(viz_result.get('visualizations', []))} visualizations")
 
-        if st.session_state.get('show_llm_guide', False):
-            with st.expander("📖 LLM Enhancement Techniques Used", expanded=True):
-                st.markdown("""
-                <style>
-                .guide-content {
-                    background-color: #1e1e1e;
-                    color: #e0e0e0;
-                    padding: 20px;
-                    border-radius: 10px;
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                }
-                .guide-content h2 {
-                    color: #4CAF50;
-                    border-bottom: 2px solid #4CAF50;
-                    padding-bottom: 10px;
-                }
-                .guide-content h3 {
-                    color: #2196F3;
-                }
-                .guide-content h4 {
-                    color: #FF9800;
-                }
-                .guide-content table {
-                    background-color: #2d2d2d;
-                    color: #e0e0e0;
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 10px 0;
-                }
-                .guide-content th {
-                    background-color: #3d3d3d;
-                    color: #4CAF50;
-                    padding: 10px;
-                    border: 1px solid #555;
-                }
-                .guide-content td {
-                    padding: 8px;
-                    border: 1px solid #555;
-                }
-                .guide-content code {
-                    background-color: #2d2d2d;
-                    color: #ffa500;
-                    padding: 2px 6px;
-                    border-radius: 3px;
-                }
-                .guide-content pre {
-                    background-color: #2d2d2d;
-                    color: #e0e0e0;
-                    padding: 15px;
-                    border-radius: 5px;
-                    border-left: 4px solid #4CAF50;
-                    overflow-x: auto;
-                }
-                .guide-content blockquote {
-                    background-color: #2d2d2d;
-                    border-left: 4px solid #2196F3;
-                    padding: 10px 20px;
-                    margin: 10px 0;
-                    color: #e0e0e0;
-                }
-                .guide-content ul, .guide-content ol {
-                    color: #e0e0e0;
-                }
-                .guide-content strong {
-                    color: #FFD700;
-                }
-                </style>
-                <div class="guide-content">
+        visualizations = viz_result.get('visualizations', [])
 
-                <h2>🎯 Prompt Enhancement Strategies</h2>
+        if visualizations:
+            # Display visualizations in grid (2 columns)
+            for idx in range(0, len(visualizations), 2):
+                cols = st.columns(2)
 
-                ### 1. **Modular Prompt System**
-                We use specialized prompts for different narrative types:
+                for col_idx, col in enumerate(cols):
+                    viz_idx = idx + col_idx
+                    if viz_idx < len(visualizations):
+                        viz_spec = visualizations[viz_idx]
 
-                **Example - Business Context Prompt:**
-                ```
-                You are a higher education business analyst...
+                        with col:
+                            st.markdown(f"#### {viz_spec.get('title', 'Visualization')}")
+                            st.caption(f"**Why this matters:** {viz_spec.get('reasoning', '')}")
 
-                Write a compelling 3-4 sentence paragraph that:
-                1. Explains WHY this analysis matters
-                2. Connects to strategic goals
-                3. Sets up business importance
-                4. Uses professional language
+                            # Build dynamic chart from AI specification
+                            chart = dynamic_chart_figure(viz_spec, df)
 
-                Do NOT include raw numbers.
-                Focus on strategic importance.
-                ```
+                            if chart:
+                                st.plotly_chart(chart, width="stretch")
 
-                **Example - Data Insights Prompt:**
-                ```
-                You are a university data analyst...
+                                # Display AI-generated insight
+                                st.info(f"**AI Insight:** {viz_spec.get('insight', '')}")
+                            else:
+                                st.warning(f"Could not generate chart for: {viz_spec.get('data_column', 'unknown column')}")
 
-                Write comprehensive analysis (6-8 sentences):
-                1. Analyze patterns and trends
-                2. Make comparisons
-                3. Identify correlations
-                4. Include 8-10 specific numbers
-                5. Use "The data reveals...", "Notably..."
-                ```
+            st.divider()
 
-                ---
+            # ========================================================================
+            # KEY FINDINGS (AI-Generated)
+            # ========================================================================
+            st.markdown("### 🔍 Key Findings")
 
-                ## ⚙️ LLM Parameter Optimization
+            key_findings = viz_result.get('key_findings', [])
+            if key_findings:
+                st.markdown(''.join(_EXEC_FINDING_CARD.format(idx=idx, finding=finding)
+                                    for idx, finding in enumerate(key_findings, 1)), unsafe_allow_html=True)
 
-                ### 2. **Auto-Optimization System**
-                The app detects your hardware and adjusts parameters:
+            st.divider()
 
-                | Your Hardware | Context Size | Tokens | Speed |
-                |--------------|--------------|---------|--------|
-                | **High-end** (16GB+ RAM, GPU) | 8192 | 2048 | ⚡⚡⚡ |
-                | **Medium** (8GB+ RAM) | 4096 | 1024 | ⚡⚡ |
-                | **Cloudflare** | 4096 | 1024 | ⚡ |
-                | **Low-end** (<8GB RAM) | 2048 | 512 | ⚡ |
+            # ========================================================================
+            # RECOMMENDATIONS (AI-Generated with Priority & ROI)
+            # ========================================================================
+            st.markdown("### 💡 AI-Generated Strategic Recommendations")
 
-                **Key Parameters:**
-                - `num_ctx`: Context window (2048-8192)
-                - `num_predict`: Max tokens generated
-                - `num_batch`: Parallel processing
-                - `num_thread`: CPU cores used
-                - `timeout`: 6x multiplier for Cloudflare
+            # Handles both the old format (string) and the enriched format (dict with priority, impact, timeline, investment)
+            recommendations = viz_result.get('recommendations', [])
+            if recommendations:
+                st.markdown(''.join(_exec_recommendation_card(idx, rec)
+                                    for idx, rec in enumerate(recommendations, 1)), unsafe_allow_html=True)
 
-                ---
+        else:
+            st.warning("No visualizations generated. Try regenerating with the button above.")
 
-                ## 🧠 Temperature Control
 
-                ### 3. **Task-Specific Temperatures**
+# ====================================================================================
+# TAB 2: DATA STORYTELLING AI DRIVEN WITH TEMPLATE GUIDANCE
+# ====================================================================================
 
-                | Task | Temp | Why |
-                |------|------|-----|
-                | **Data Analysis** | 0.3-0.4 | Factual, precise |
-                | **Business Context** | 0.4-0.5 | Professional, focused |
-                | **Opening Narrative** | 0.5-0.7 | Engaging, creative |
-                | **Recommendations** | 0.6-0.7 | Strategic variety |
+def _render_tab_guided_journeys(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '📖 Data Storytelling AI Driven with Template Guidance' tab"""
+    st.header("📖 Data Storytelling AI Driven with Template Guidance")
+    st.caption("AI identifies entities from your data and creates comprehensive journey stories tracking their lifecycle")
 
-                **Example Implementation:**
-                ```python
-                # Analytical content
-                query_ollama(prompt, model, url,
-                    temperature=0.3)  # Precise
+    # Explanation box (collapsed once journeys are cached so reruns skip the long help HTML)
+    with st.expander("ℹ️ About Template-Guided Discovery", expanded='entity_journeys' not in st.session_state.llm_cache):
+        st.markdown(f"""<div style='background: linear-gradient(135deg, rgba(99, 102, 241, 0.15), rgba(139, 92, 246, 0.15)); padding: 1.2rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid #6366f1;'>
+<p style='margin: 0; color: #e2e8f0;'><strong>🎯 Entity-Based Journey System:</strong> Unlike traditional dashboards that show aggregate statistics,
+this system uses AI to <strong>identify meaningful entities</strong> (student cohorts, programs, services, revenue segments) from your dataset
+and <strong>tracks their complete lifecycle</strong> through multiple stages with data-driven narratives.</p>
+<p style='margin: 0.5rem 0 0 0; color: #cbd5e1; font-size: 0.9rem;'>
+<strong>How it works:</strong><br>
+• <strong>Phase 1:</strong> AI analyzes your {metrics.get('total_students', 0):,} students and identifies exactly 6 meaningful entities<br>
+• <strong>Phase 2:</strong> AI defines 4-6 lifecycle stages for each entity<br>
+• <strong>Phase 3:</strong> AI generates compelling narratives for each stage using actual data
+</p>
+<p style='margin: 0.8rem 0 0 0; padding-top: 0.8rem; border-top: 1px solid rgba(99, 102, 241, 0.3); color: #cbd5e1; font-size: 0.9rem;'>
+<strong>🚀 Journeys are based on:</strong><br>
+• ✅ Dataset structure analysis (all {len(df.columns)} columns examined)<br>
+• ✅ Sample data patterns (first 5 rows analyzed for insights)<br>
+• ✅ Entity lifecycle concept (things that evolve: beginning → middle → end)<br>
+• ✅ Entity types: Student, Program, Financial Aid, Enrollment, Campus, Revenue<br>
+• ✅ AI pattern recognition of what constitutes a meaningful "journey"<br>
+• ✅ Status transitions (Active → At-Risk → Successful/Failed)
+</p>
+<p style='margin: 0.8rem 0 0 0; padding-top: 0.8rem; border-top: 1px solid rgba(99, 102, 241, 0.3); color: #cbd5e1; font-size: 0.9rem;'>
+<strong>📋 Stages within each journey are based on:</strong><br>
+• ✅ Your actual dataset columns and values<br>
+• ✅ The specific entity identified by AI<br>
+• ✅ Chronological/logical progression (enrollment → performance → outcomes)<br>
+• ✅ LLM's understanding of higher education lifecycles<br>
+• ✅ Data-driven insights specific to your institution's context
+</p>
+</div>""", unsafe_allow_html=True)
 
-                # Creative content
-                query_ollama(prompt, model, url,
-                    temperature=0.7)  # Varied
-                ```
+    if not st.session_state.ollama_connected:
+        st.warning("⚠️ Connect to Ollama to generate entity journeys")
+    elif not LLM_ENTITY_JOURNEY_AVAILABLE:
+        st.error("❌ LLM Entity Journey System module not found. Please ensure llm_entity_journey_system.py is available.")
+    else:
+        # Button to generate entity journeys
+        col_btn, col_info = st.columns([2, 3])
+        with col_btn:
+            if st.button("🚀 Generate Entity Journeys", key="generate_entity_journeys_btn", type="primary", width='stretch'):
+                # Test connection first
+                st.info(f"🔍 Testing connection to: {url}")
+                try:
+                    test_response = get_ollama_session(url).get(f"{url}/api/tags", timeout=10)
+                    if test_response.status_code == 200:
+                        st.success(f"✅ Connection OK - {len(test_response.json()['models'])} models available")
+                    else:
+                        st.error(f"❌ Connection failed: HTTP {test_response.status_code}")
+                        st.stop()
+                except Exception as conn_err:
+                    st.error(f"❌ Connection test failed: {str(conn_err)}")
+                    st.warning("💡 Make sure your Colab tunnel is running if using Cloudflare")
+                    st.stop()
 
-                ---
+                try:
+                    # Capture print logs in a container
+                    log_container = st.container()
+                    import sys
+                    from io import StringIO
 
-                ## 📊 Metrics Formatting
+                    # Create a custom stdout to capture prints
+                    captured_output = StringIO()
+                    old_stdout = sys.stdout
+                    sys.stdout = captured_output
 
-                ### 4. **Data-Driven Prompts**
+                    try:
+                        with st.spinner("🔄 Phase 1/3: Identifying meaningful entities from dataset..."):
+                            st.info(f"📊 Analyzing {len(df)} rows with {len(df.columns)} columns...")
+                            # Generate complete entity journeys using LLM
+                            entity_journeys = generate_complete_llm_journeys(df, model, url)
+                            journey_stats = _store_journeys('entity_journeys', entity_journeys)
+                    finally:
+                        # Restore stdout
+                        sys.stdout = old_stdout
+
+                    # Show captured logs in expander
+                    captured_logs = captured_output.getvalue()
+                    if captured_logs:
+                        with st.expander("📋 Show Generation Logs (for debugging)"):
+                            st.text(captured_logs)
+
+                    if entity_journeys:
+                        st.success(f"✅ Generated {journey_stats['count']} entity journeys with {journey_stats['total_stages']} total stages!")
+                    else:
+                        st.error("❌ No entity journeys generated (empty result)")
+                        st.warning("💡 The logs above show what happened. Possible causes:")
+                        st.warning("- LLM failed to generate valid JSON (check logs for 'JSON parsing error')")
+                        st.warning("- Dataset too small or lacks clear patterns")
+                        st.warning("- LLM timed out during generation (check logs for 'timeout')")
+                except Exception as e:
+                    st.error(f"❌ Error generating entity journeys: {str(e)}")
+                    st.error(f"Error type: {type(e).__name__}")
+                    import traceback
+                    with st.expander("🔍 Show detailed error"):
+                        st.code(traceback.format_exc())
+                    st.warning("💡 Troubleshooting:")
+                    st.warning("1. Check Streamlit Cloud logs for full error")
+                    st.warning("2. Verify Colab tunnel is running (if using Cloudflare)")
+                    st.warning("3. Try with a smaller dataset first")
+                    st.warning("4. Check if model exists: " + model)
 
-                We format metrics for LLM consumption:
+        with col_info:
+            st.info("⏱️ **Estimated time:** 5-15 minutes depending on dataset complexity. The AI will make multiple LLM calls to build comprehensive stories.")
 
-                **Raw Metrics:**
-                ```python
-                {
-                    'total_students': 1000,
-                    'avg_gpa': 3.234567,
-                    'revenue': 75500000
-                }
-                ```
+        # Display entity journeys if available
+        if 'entity_journeys' in st.session_state.llm_cache:
+            entity_journeys = st.session_state.llm_cache['entity_journeys']
 
-                **Formatted for Prompt:**
-                ```
-                - Total Students: 1,000
-                - Average GPA: 3.2
-                - Total Revenue: AED 75.5M
-                - High Performers: 450 (45.0%)
-                ```
+            if not entity_journeys:
+                st.warning("No entity journeys generated. Try again or check your dataset.")
+            else:
+                st.markdown("---")
+                st.markdown(f"### 🎯 {len(entity_journeys)} Entity Journeys Discovered")
+                journey_stats = _journey_stats('entity_journeys', entity_journeys)
+                st.caption(f"*AI identified {journey_stats['count']} meaningful entities and tracked their lifecycle through {journey_stats['total_stages']} total stages*")
+
+                # Display each entity journey
+                for journey_idx, journey in enumerate(entity_journeys, 1):
+                    entity_type_colors = {
+                        # Lifecycle entity types
+                        'student_lifecycle': ('#3b82f6', 'rgba(59, 130, 246, 0.1)'),
+                        'program_lifecycle': ('#8b5cf6', 'rgba(139, 92, 246, 0.1)'),
+                        'aid_lifecycle': ('#10b981', 'rgba(16, 185, 129, 0.1)'),
+                        'enrollment_lifecycle': ('#06b6d4', 'rgba(6, 182, 212, 0.1)'),
+                        'campus_lifecycle': ('#f59e0b', 'rgba(245, 158, 11, 0.1)'),
+                        'revenue_lifecycle': ('#22c55e', 'rgba(34, 197, 94, 0.1)'),
+                        'facility_lifecycle': ('#eab308', 'rgba(234, 179, 8, 0.1)'),
+                        # Legacy types (for backward compatibility)
+                        'student_cohort': ('#3b82f6', 'rgba(59, 130, 246, 0.1)'),
+                        'program': ('#8b5cf6', 'rgba(139, 92, 246, 0.1)'),
+                        'service': ('#06b6d4', 'rgba(6, 182, 212, 0.1)'),
+                        'revenue_segment': ('#10b981', 'rgba(16, 185, 129, 0.1)'),
+                        'operational': ('#f59e0b', 'rgba(245, 158, 11, 0.1)')
+                    }
 
-                ---
+                    # Unpack journey fields once per iteration
+                    entity_name = journey['entity_name']
+                    entity_type = journey.get('entity_type', 'student_lifecycle')
+                    total_stages = journey['total_stages']
+                    priority = journey.get('priority', 5)
+                    stages = journey.get('stages', [])
+                    description = journey.get('description', '')
+                    student_count = journey.get('student_count', 'N/A')
+                    why_important = journey.get('why_important', 'Strategic entity for institutional performance')
+                    color, bg_color = entity_type_colors.get(entity_type, ('#6366f1', 'rgba(99, 102, 241, 0.1)'))
+
+                    # Priority colors
+                    if priority >= 8:
+                        priority_color = '#dc2626'
+                        priority_label = '🚨 CRITICAL'
+                    elif priority >= 6:
+                        priority_color = '#f97316'
+                        priority_label = '⚡ HIGH'
+                    elif priority >= 4:
+                        priority_color = '#eab308'
+                        priority_label = '💡 MEDIUM'
+                    else:
+                        priority_color = '#10b981'
+                        priority_label = '✅ STANDARD'
 
-                ## 🔄 Context Chaining
+                    # Entity Journey Card Header
+                    with st.expander(f"**{journey_idx}. {entity_name}** ({total_stages} stages) - {priority_label}", expanded=(journey_idx <= 2)):
+                        # Entity Overview
+                        st.markdown(f"""<div style='background: {bg_color}; padding: 1.5rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid {color};'>
+<div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.8rem;'>
+<div>
+    <h3 style='font-size: 1.3rem; font-weight: 700; color: {color}; margin: 0 0 0.3rem 0;'>{entity_name}</h3>
+    <div style='color: #94a3b8; font-size: 0.85rem; text-transform: uppercase; letter-spacing: 0.5px;'>{entity_type.replace('_', ' ')}</div>
+</div>
+<div style='text-align: right;'>
+    <span style='background: {priority_color}; color: white; padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.75rem; font-weight: 600; display: inline-block;'>{priority_label}</span>
+</div>
+</div>
+<p style='color: #e2e8f0; font-size: 1rem; line-height: 1.6; margin-bottom: 0.8rem;'>{description}</p>
+<div style='background: rgba(0,0,0,0.2); padding: 0.9rem; border-radius: 6px;'>
+<p style='color: #e2e8f0; margin: 0; line-height: 1.6;'>
+    <strong style='color: #60a5fa;'>📊 Students:</strong> {student_count}
+</p>
+<p style='color: #e2e8f0; margin: 0.5rem 0 0 0; line-height: 1.6;'>
+    <strong style='color: #34d399;'>💡 Why Important:</strong> {why_important}
+</p>
+</div>
+</div>""", unsafe_allow_html=True)
 
-                ### 5. **Progressive Context Building**
+                        # Journey Stages
+                        st.markdown("#### 📋 Journey Lifecycle Stages")
+
+                        for stage_idx, stage in enumerate(stages, 1):
+                            stage_color = color
+                            stage_icon = ['🔵', '🟢', '🟡', '🟠', '🔴', '🟣'][min(stage_idx - 1, 5)]
+
+                            # Unpack stage fields once per iteration
+                            stage_order = stage.get('stage_order', stage_idx)
+                            stage_name = stage.get('stage_name', 'Unknown Stage')
+                            stage_description = stage.get('description', '')
+                            narrative_text = stage.get('narrative_text', 'No narrative available.')
+                            key_metrics = stage.get('key_metrics', [])
+                            insights = stage.get('insights', [])
+                            recommendations = stage.get('recommendations', [])
+                            visualizations = stage.get('visualizations', [])
+
+                            # Stage Header
+                            st.markdown(f"""<div style='display: flex; align-items: center; gap: 0.75rem; margin-bottom: 1rem; margin-top: 1.5rem;'>
+<span style='font-size: 2rem;'>{stage_icon}</span>
+<div style='flex: 1;'>
+    <h4 style='color: {stage_color}; margin: 0; font-size: 1.2rem;'>Stage {stage_order}: {stage_name}</h4>
+    <p style='color: #94a3b8; margin: 0.2rem 0 0 0; font-size: 0.9rem;'>{stage_description}</p>
+</div>
+</div>""", unsafe_allow_html=True)
 
-                Each component receives context from previous:
+                            # Stage Narrative (like Executive Summary findings)
+                            st.markdown(f"""<div style='background: rgba(59, 130, 246, 0.1); padding: 1.2rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 1rem;'>
+<strong style='color: #60a5fa; font-size: 0.9rem;'>📖 STAGE NARRATIVE</strong>
+<p style='color: #e2e8f0; margin: 0.5rem 0 0 0; line-height: 1.6; font-size: 1rem;'>{narrative_text}</p>
+</div>""", unsafe_allow_html=True)
 
-                ```python
-                # Step 1: Business Context
-                context = generate_business_context(...)
+                            # Key Metrics (like Executive Summary recommendations)
+                            if key_metrics:
+                                st.markdown(f"""<div style='background: rgba(59, 130, 246, 0.15); padding: 1.2rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 1rem;'>
+<h4 style='color: #60a5fa; margin: 0 0 0.8rem 0; font-size: 0.95rem;'>📊 KEY METRICS</h4>
+{''.join([f"<p style='color: #e2e8f0; margin: 0 0 0.6rem 0; line-height: 1.6;'><strong style='color: #60a5fa;'>{m.get('metric', '')}:</strong> {m.get('value', '')} <span style='color: #a5b4fc; font-size: 0.9rem;'>({m.get('significance', '')})</span></p>" for m in key_metrics])}
+</div>""", unsafe_allow_html=True)
 
-                # Step 2: Data Insights (with context)
-                insights = generate_insights(
-                    context={'business': context}
-                )
+                            # Insights (like Executive Summary findings)
+                            if insights:
+                                for idx, insight in enumerate(insights, 1):
+                                    st.markdown(f"""<div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #10b981; margin-bottom: 0.8rem;'>
+<strong style='color: #34d399;'>💡 Insight {idx}:</strong> <span style='color: #e2e8f0;'>{insight}</span>
+</div>""", unsafe_allow_html=True)
 
-                # Step 3: Impact (with both)
-                impact = generate_impact(
-                    context={
-                        'business': context,
-                        'insights': insights
-                    }
-                )
-                ```
+                            # Recommendations (like Executive Summary recommendations)
+                            if recommendations:
+                                st.markdown(f"""<div style='background: rgba(245, 158, 11, 0.15); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #f59e0b; margin-bottom: 1rem;'>
+<h4 style='color: #fbbf24; margin: 0 0 0.8rem 0; font-size: 0.95rem;'>🎯 RECOMMENDATIONS</h4>
+{''.join([f"<p style='color: #e2e8f0; margin: 0 0 0.6rem 0; line-height: 1.6;'><strong style='color: #fbbf24;'>→</strong> {rec}</p>" for rec in recommendations])}
+</div>""", unsafe_allow_html=True)
 
-                **Benefit:** Each narrative builds on previous,
-                creating coherent stories.
+                            # Display LLM-recommended visualizations
+                            if visualizations and LLM_ENTITY_JOURNEY_AVAILABLE:
+                                # Get entity data for visualization
+                                entity_data = filter_dataset_for_entity(df, journey)
+
+                                # Try to generate visualizations first
+                                successful_viz = []
+                                for viz_idx, viz_spec in enumerate(visualizations, 1):
+                                    fig = generate_visualization(entity_data, viz_spec)
+                                    if fig:
+                                        successful_viz.append((viz_idx, viz_spec, fig))
+
+                                # Only show header if we have successful visualizations
+                                if successful_viz:
+                                    st.markdown("<h4 style='color: #e2e8f0; margin-top: 1.5rem;'>📊 Data Visualizations</h4>", unsafe_allow_html=True)
+                                    st.caption("*AI-selected visualizations to illustrate this stage*")
+
+                                    # Display the successful visualizations
+                                    for viz_idx, viz_spec, fig in successful_viz:
+                                        viz_title = viz_spec.get('title', f'Visualization {viz_idx}')
+                                        viz_desc = viz_spec.get('description', '')
+                                        viz_purpose = viz_spec.get('chart_purpose', '')
+
+                                        # Display chart with description (Executive Summary style)
+                                        st.markdown(f"""<div style='background: rgba(99, 102, 241, 0.1); padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #6366f1;'>
+<h5 style='color: #818cf8; margin: 0 0 0.5rem 0; font-size: 1rem;'>{viz_title}</h5>
+<p style='color: #cbd5e1; margin: 0; font-size: 0.9rem;'><strong>Why this matters:</strong> {viz_desc}</p>
+{f"<p style='color: #a5b4fc; margin: 0.5rem 0 0 0; font-size: 0.85rem; font-style: italic;'>💡 {viz_purpose}</p>" if viz_purpose else ''}
+</div>""", unsafe_allow_html=True)
+                                        st.plotly_chart(fig, width='stretch', key=f"viz_{journey_idx}_{stage_idx}_{viz_idx}", config=PLOTLY_CHART_CONFIG)
 
-                ---
+                st.markdown("---")
+                st.success("✅ All entity journeys loaded successfully!")
 
-                ## 🛡️ Fallback System
+        else:
+            # Show prompt to generate entity journeys
+            st.info("💡 Click 'Generate Entity Journeys' to let the AI analyze your dataset and create comprehensive entity lifecycle stories")
 
-                ### 6. **3-Tier Quality Assurance**
+            # Example entity types
+            st.markdown("### 🎯 Example Lifecycle Entities")
+            st.markdown("""
+            The AI will identify **ENTITIES** that have **LIFECYCLES** and **STATUS CHANGES**:
 
-                ```
-                Tier 1: Try LLM Generation
-                   ↓ (if fails)
-                Tier 2: Statistical Enrichment
-                   ↓ (if fails)
-                Tier 3: Template-Based Content
-                ```
+            **🎓 Student Entity**
+            - Lifecycle: Enrollment → Academic Progress → Performance Status → Graduation/Dropout
+            - Example Journey: "Student Academic Journey" tracking progression from entry to exit
 
-                **Result:** 100% uptime, always functional
+            **📚 Academic Program Entity**
+            - Lifecycle: Program Launch → Growth → Maturity → Optimization
+            - Example Journey: "Academic Program Lifecycle" showing how programs evolve
 
-                ---
+            **💰 Financial Aid Entity**
+            - Lifecycle: Application → Approval → Disbursement → Impact Assessment
+            - Example Journey: "Financial Aid Journey" tracking aid effectiveness
 
-                ## 🎨 Real-World Example
+            **🏢 Campus/Facility Entity**
+            - Lifecycle: Opening → Expansion → Optimization
+            - Example Journey: "Campus Operations Journey" or "Dormitory Lifecycle"
 
-                ### Complete Narrative Generation:
+            **📈 Enrollment Entity**
+            - Lifecycle: Application → Acceptance → Registration → Retention
+            - Example Journey: "Enrollment Journey" tracking student acquisition
 
-                **Input Metrics:**
-                ```
-                total_students: 1000
-                housed_students: 663
-                occupancy_rate: 66.3%
-                avg_gpa_housed: 3.1
-                avg_gpa_not_housed: 2.8
-                ```
-
-                **Generated Opening:**
-                > "Our analysis reveals striking patterns in housing
-                > impact: 663 students (66.3%) live on campus, and
-                > they outperform off-campus peers by 0.3 GPA points
-                > (3.1 vs 2.8). This 10.7% performance advantage
-                > translates to measurable retention value..."
+            **💵 Revenue Entity**
+            - Lifecycle: Tuition Assessment → Payment → Collection → Revenue Recognition
+            - Example Journey: "Revenue Journey" tracking financial flows
 
-                **Why it works:**
-                - Specific numbers (663, 66.3%, 3.1, 2.8)
-                - Comparative analysis (10.7% advantage)
-                - Business impact (retention value)
-                - Engaging narrative flow
+            ---
 
-                ---
+            **Each entity will have:**
+            - Multiple lifecycle stages showing progression
+            - Data-driven narratives for each stage
+            - Nationality/demographic breakdowns in the stories
+            - Performance metrics and status indicators
+            - Actionable insights and recommendations
+            """)
 
-                ## 📈 Recommendations for Enhancement
 
-                ### **Currently NOT Used (Opportunities):**
+# ====================================================================================
+# TAB 3: DATA STORYTELLING FULLY AI DRIVEN
+# ====================================================================================
 
-                #### A. **RAG (Retrieval Augmented Generation)**
-                - Add vector database for historical insights
-                - Reference past reports automatically
-                - **Expected Impact:** +30% contextual relevance
+def _render_tab_fully_dynamic(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '🔬 Data Storytelling Fully AI Driven' tab"""
+    st.header("🔬 Data Storytelling Fully AI Driven")
+    st.caption("Pure AI-driven entity discovery with ZERO predefined examples or guidance")
 
-                #### B. **Chain-of-Thought Prompting**
-                ```
-                "Let's analyze this step by step:
-                1. First, identify the trend...
-                2. Then, calculate the impact...
-                3. Finally, recommend actions..."
-                ```
-                - **Expected Impact:** +25% reasoning quality
+    # Explanation box (collapsed once journeys are cached so reruns skip the long help HTML)
+    with st.expander("ℹ️ About Fully Dynamic Discovery", expanded='dynamic_journeys' not in st.session_state.llm_cache):
+        st.markdown(f"""<div style='background: linear-gradient(135deg, rgba(139, 92, 246, 0.15), rgba(236, 72, 153, 0.15)); padding: 1.2rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid #8b5cf6;'>
+<p style='margin: 0; color: #e2e8f0;'><strong>🔬 PURE AUTONOMOUS DISCOVERY:</strong> This system operates with <strong>ZERO predefined templates or examples</strong>.
+The AI analyzes your {metrics.get('total_students', 0):,} students and <strong>discovers entities entirely from data patterns</strong> with no guidance on what to find.</p>
+<p style='margin: 0.5rem 0 0 0; color: #cbd5e1; font-size: 0.9rem;'>
+<strong>How it differs from guided discovery:</strong><br>
+• <strong>Guided System:</strong> AI gets examples like "Student Journey", "Program Lifecycle" → follows patterns<br>
+• <strong>Fully Dynamic:</strong> AI gets NO examples → discovers what exists in YOUR specific data<br>
+<br>
+<strong>What to expect:</strong> Unique entities specific to your institution that may not fit standard categories.
+</p>
+</div>""", unsafe_allow_html=True)
 
-                #### C. **Few-Shot Learning**
-                ```
-                "Example 1:
-                Input: {...}
-                Output: {...}
+    if not st.session_state.ollama_connected:
+        st.warning("⚠️ Connect to Ollama to enable fully dynamic discovery")
+    elif not FULLY_DYNAMIC_DISCOVERY_AVAILABLE:
+        st.error("❌ Fully Dynamic Discovery module not found. Please ensure fully_dynamic_entity_discovery.py is available.")
+    else:
+        # Button to generate fully dynamic journeys
+        col_btn, col_info = st.columns([2, 3])
+        with col_btn:
+            if st.button("🔬 Discover Entities Autonomously", key="discover_dynamic_entities_btn", type="primary", width='stretch'):
+                with st.spinner("🔄 AI is analyzing data patterns with NO guidance (this may discover unexpected entities)..."):
+                    # Generate fully dynamic journeys (NO templates, NO examples)
+                    dynamic_journeys = generate_fully_dynamic_journeys(df, model, url)
+                    journey_stats = _store_journeys('dynamic_journeys', dynamic_journeys)
+
+                    if dynamic_journeys:
+                        st.success(f"✅ DISCOVERED {journey_stats['count']} unique entities autonomously with {journey_stats['total_stages']} total lifecycle stages!")
+                    else:
+                        st.error("❌ Autonomous discovery failed. Please check your dataset and Ollama connection.")
 
-                Example 2:
-                Input: {...}
-                Output: {...}
+        with col_info:
+            st.info("⏱️ **Estimated time:** 10-20 minutes. The AI will make multiple calls to discover patterns WITHOUT any predefined examples.")
 
-                Now analyze: {...}"
-                ```
-                - **Expected Impact:** +20% consistency
+        # Display fully dynamic journeys if available
+        if 'dynamic_journeys' in st.session_state.llm_cache:
+            dynamic_journeys = st.session_state.llm_cache['dynamic_journeys']
 
-                #### D. **Ensemble Generation**
-                - Generate 3 variants, pick best
-                - Use multiple models for consensus
-                - **Expected Impact:** +35% quality
+            if not dynamic_journeys:
+                st.warning("No entities discovered autonomously. The AI may need clearer data patterns.")
+            else:
+                st.markdown("---")
+                st.markdown(f"### 🔬 {len(dynamic_journeys)} Entities Discovered Autonomously")
+                journey_stats = _journey_stats('dynamic_journeys', dynamic_journeys)
+                high_discovery = [journey_stats['names'][i] for i in np.where(journey_stats['priorities'] >= 8)[0]]
+                st.caption(f"*AI discovered {journey_stats['count']} unique entities by analyzing data patterns with ZERO guidance*")
+                if high_discovery:
+                    st.caption(f"🔬 High discovery: {', '.join(high_discovery)}")
+
+                # Display discovery method badge
+                st.markdown("""<div style='background: rgba(139, 92, 246, 0.15); padding: 0.9rem; border-radius: 6px; margin-bottom: 1rem; border-left: 4px solid #8b5cf6;'>
+<div style='font-size: 0.85rem; font-weight: 600; color: #e2e8f0; margin-bottom: 0.4rem;'>🔬 DISCOVERY METHOD: FULLY AUTONOMOUS</div>
+<div style='font-size: 0.8rem; color: #cbd5e1;'>These entities were discovered purely from data patterns. No predefined templates or examples were used.</div>
+</div>""", unsafe_allow_html=True)
 
-                #### E. **Fine-Tuning**
-                - Train on higher education reports
-                - Domain-specific vocabulary
-                - **Expected Impact:** +40% relevance
+                # Display each discovered journey
+                for journey_idx, journey in enumerate(dynamic_journeys, 1):
+                    # Unpack journey fields once per iteration
+                    entity_name = journey['entity_name']
+                    entity_type = journey.get('entity_type')
+                    priority = journey.get('priority', 5)
+                    stages = journey.get('stages', [])
+                    description = journey.get('description', '')
+                    discovery_rationale = journey.get('discovery_rationale', 'Discovered from data patterns')
+                    student_count = journey.get('student_count', 'N/A')
+                    lifecycle_indicators = ', '.join(journey.get('lifecycle_indicators', ['N/A']))
+
+                    # Use different color scheme for dynamic discoveries
+                    color = '#8b5cf6'  # Purple for dynamic discoveries
+                    bg_color = 'rgba(139, 92, 246, 0.1)'
+
+                    # Priority colors
+                    if priority >= 8:
+                        priority_color = '#8b5cf6'
+                        priority_label = '🔬 HIGH DISCOVERY'
+                    elif priority >= 6:
+                        priority_color = '#a78bfa'
+                        priority_label = '🔍 MEDIUM DISCOVERY'
+                    else:
+                        priority_color = '#c4b5fd'
+                        priority_label = '💡 STANDARD DISCOVERY'
 
-                #### F. **Prompt Caching**
-                - Cache expensive prompt processing
-                - Reuse common contexts
-                - **Expected Impact:** +50% speed
+                    # Entity Journey Card Header
+                    with st.expander(f"**{journey_idx}. {entity_name}** (Discovered: {entity_type or 'unknown'}) - {priority_label}", expanded=(journey_idx <= 2)):
+                        # Entity Overview with Discovery Rationale
+                        st.markdown(f"""<div style='background: {bg_color}; padding: 1.5rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid {color};'>
+<div style='display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;'>
+<div>
+    <div style='font-size: 1.2rem; font-weight: 700; color: #e2e8f0; margin-bottom: 0.3rem;'>{entity_name}</div>
+    <div style='color: #94a3b8; font-size: 0.85rem; text-transform: uppercase; letter-spacing: 0.5px;'>{(entity_type or 'discovered_entity').replace('_', ' ')}</div>
+</div>
+<div style='text-align: right;'>
+    <div style='background: {priority_color}; color: white; padding: 0.3rem 0.6rem; border-radius: 6px; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.3rem;'>{priority_label}</div>
+    <div style='color: #94a3b8; font-size: 0.75rem;'>Priority {priority}</div>
+</div>
+</div>
+<div style='color: #cbd5e1; font-size: 0.95rem; line-height: 1.6; margin-top: 0.75rem;'><strong>What is this entity:</strong> {description}</div>
+<div style='background: rgba(139, 92, 246, 0.2); padding: 0.8rem; border-radius: 6px; margin-top: 0.75rem; border-left: 3px solid #8b5cf6;'>
+<div style='color: #e2e8f0; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.4rem;'>🔍 Discovery Rationale (Why AI identified this as an entity)</div>
+<div style='color: #cbd5e1; font-size: 0.85rem; font-style: italic;'>{discovery_rationale}</div>
+</div>
+<div style='background: rgba(0,0,0,0.2); padding: 0.8rem; border-radius: 6px; margin-top: 0.75rem;'>
+<div style='color: #e2e8f0; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.4rem;'>📊 Entity Metrics</div>
+<div style='color: #cbd5e1; font-size: 0.85rem;'>
+    <strong>Students:</strong> {student_count} |
+    <strong>Lifecycle Indicators:</strong> {lifecycle_indicators}
+</div>
+</div>
+</div>""", unsafe_allow_html=True)
 
-                #### G. **Streaming Responses**
-                - Show progressive generation
-                - Better user experience
-                - **Expected Impact:** Perceived -70% latency
+                        # Journey Stages
+                        st.markdown("#### 📋 Discovered Lifecycle Stages")
 
-                ---
+                        for stage_idx, stage in enumerate(stages, 1):
+                            stage_icon = ['🔵', '🟢', '🟡', '🟠', '🔴', '🟣'][min(stage_idx - 1, 5)]
 
-                ## 🔬 Current System Performance
+                            # Unpack stage fields once per iteration
+                            stage_order = stage.get('stage_order', stage_idx)
+                            stage_name = stage.get('stage_name', 'Unknown Stage')
+                            stage_description = stage.get('description', '')
+                            stage_rationale = stage.get('discovery_rationale', 'Discovered from data transitions')
+                            narrative_text = stage.get('narrative_text', 'No narrative available.')
+                            key_metrics = stage.get('key_metrics', [])
+                            insights = stage.get('insights', [])
+                            recommendations = stage.get('recommendations', [])
+                            visualizations = stage.get('visualizations', [])
 
-                **Metrics:**
-                - **108 narratives** generated per journey set
-                - **Avg generation time:** 3-5 minutes (all journeys)
-                - **Success rate:** >95% with fallbacks = 100%
-                - **Context utilization:** 2048-8192 tokens
-                - **Response quality:** Professional grade
+                            st.markdown(f"""<div style='background: rgba(30, 41, 59, 0.6); border: 2px solid {color}; border-radius: 8px; padding: 1.2rem; margin-bottom: 1rem;'>
+<div style='display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.75rem;'>
+<span style='font-size: 1.5rem;'>{stage_icon}</span>
+<div style='flex: 1;'>
+    <div style='font-size: 1.1rem; font-weight: 600; color: #e2e8f0;'>Stage {stage_order}: {stage_name}</div>
+    <div style='color: #94a3b8; font-size: 0.85rem;'>{stage_description}</div>
+</div>
+</div>
 
-                **Architecture:**
-                ```
-                Data → Metrics → Prompts → LLM → Narratives → UI
-                         ↓          ↓        ↓
-                    Format    Optimize  Fallback
-                ```
+<div style='background: rgba(139, 92, 246, 0.2); padding: 0.8rem; border-radius: 6px; margin-bottom: 0.75rem; border-left: 4px solid #8b5cf6;'>
+<div style='color: #e2e8f0; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.4rem;'>🔍 Stage Discovery Rationale</div>
+<div style='color: #cbd5e1; font-size: 0.85rem; font-style: italic;'>{stage_rationale}</div>
+</div>
 
-                ---
+<div style='background: rgba(99, 102, 241, 0.15); padding: 0.9rem; border-radius: 6px; margin-bottom: 0.75rem; border-left: 4px solid #6366f1;'>
+<div style='color: #e2e8f0; font-size: 0.85rem; font-weight: 600; margin-bottom: 0.5rem;'>📖 Stage Narrative</div>
+<div style='color: #cbd5e1; font-size: 0.95rem; line-height: 1.7;'>{narrative_text}</div>
+</div>
 
-                ## 💡 Quick Tips for Best Results
+<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.75rem; margin-bottom: 0.75rem;'>
+<div style='background: rgba(59, 130, 246, 0.15); padding: 0.8rem; border-radius: 6px; border-left: 3px solid #3b82f6;'>
+    <div style='color: #60a5fa; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.5rem; text-transform: uppercase;'>📊 Key Metrics</div>
+    {''.join([f"<div style='color: #cbd5e1; font-size: 0.85rem; margin-bottom: 0.3rem; line-height: 1.5;'><strong style='color: #e2e8f0;'>{m.get('metric', '')}:</strong> {m.get('value', '')} <span style='color: #94a3b8; font-size: 0.8rem;'>({m.get('significance', '')})</span></div>" for m in key_metrics])}
+</div>
+<div style='background: rgba(16, 185, 129, 0.15); padding: 0.8rem; border-radius: 6px; border-left: 3px solid #10b981;'>
+    <div style='color: #34d399; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.5rem; text-transform: uppercase;'>💡 Insights</div>
+    {''.join([f"<div style='color: #cbd5e1; font-size: 0.85rem; margin-bottom: 0.3rem; line-height: 1.5;'>• {insight}</div>" for insight in insights])}
+</div>
+</div>
 
-                1. **Use Cloudflare tunnel** for remote access
-                2. **Select larger models** (7B+ params) for quality
-                3. **Ensure >8GB RAM** for optimal performance
-                4. **Enable auto-optimize** (default on)
-                5. **Use sample dataset** to test first
-                6. **Check Ollama logs** if generation fails
+<div style='background: rgba(245, 158, 11, 0.15); padding: 0.8rem; border-radius: 6px; border-left: 3px solid #f59e0b;'>
+<div style='color: #fbbf24; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.5rem; text-transform: uppercase;'>🎯 Recommendations</div>
+{''.join([f"<div style='color: #cbd5e1; font-size: 0.85rem; margin-bottom: 0.3rem; line-height: 1.5;'>→ {rec}</div>" for rec in recommendations])}
+</div>
+</div>""", unsafe_allow_html=True)
 
-                ---
+                            # Display visualizations if available
+                            if visualizations and LLM_ENTITY_JOURNEY_AVAILABLE:
+                                # Get entity data for visualization
+                                entity_data = filter_dataset_for_entity(df, journey)
+
+                                # Try to generate visualizations first
+                                successful_viz = []
+                                for viz_idx, viz_spec in enumerate(visualizations, 1):
+                                    fig = generate_visualization(entity_data, viz_spec)
+                                    if fig:
+                                        successful_viz.append((viz_idx, viz_spec, fig))
+
+                                # Only show header if we have successful visualizations
+                                if successful_viz:
+                                    st.markdown("<h4 style='color: #e2e8f0; margin-top: 1.5rem;'>📊 Data Visualizations</h4>", unsafe_allow_html=True)
+                                    st.caption("*AI-selected visualizations for this discovered stage*")
+
+                                    # Display the successful visualizations
+                                    for viz_idx, viz_spec, fig in successful_viz:
+                                        viz_title = viz_spec.get('title', f'Visualization {viz_idx}')
+                                        viz_desc = viz_spec.get('description', '')
+                                        viz_purpose = viz_spec.get('chart_purpose', '')
+
+                                        st.markdown(f"""<div style='background: rgba(139, 92, 246, 0.15); padding: 0.8rem; border-radius: 6px; margin-bottom: 0.5rem; border-left: 3px solid #8b5cf6;'>
+                                            <div style='font-size: 0.9rem; font-weight: 600; color: #e2e8f0; margin-bottom: 0.3rem;'>{viz_title}</div>
+                                            <div style='font-size: 0.8rem; color: #cbd5e1;'>{viz_desc}</div>
+                                            {f"<div style='font-size: 0.8rem; color: #a5b4fc; margin-top: 0.3rem; font-style: italic;'>💡 {viz_purpose}</div>" if viz_purpose else ''}
+                                            </div>""", unsafe_allow_html=True)
+                                        st.plotly_chart(fig, width='stretch', key=f"dyn_viz_{journey_idx}_{stage_idx}_{viz_idx}", config=PLOTLY_CHART_CONFIG)
 
-                ## 📚 Technical References
+                st.markdown("---")
+                st.success(f"✅ All {len(dynamic_journeys)} dynamically discovered journeys loaded successfully!")
 
-                **Implemented Techniques:**
-                - ✅ Role-based prompting
-                - ✅ Structured instructions
-                - ✅ Constraint guidance
-                - ✅ Dynamic parameter tuning
-                - ✅ Temperature control
-                - ✅ Context chaining
-                - ✅ Metrics formatting
-                - ✅ Fallback strategies
+        else:
+            # Show prompt to discover entities
+            st.info("💡 Click 'Discover Entities Autonomously' to let the AI analyze your data with ZERO predefined templates")
 
-                **Code Locations:**
-                - Prompt engineering: `journey_narratives.py`
-                - LLM optimization: `student_360_llm_powered.py:689-934`
-                - Generation pipeline: `journey_assembler.py`
-                - Metrics formatting: `journey_narratives.py:252-307`
+            # Comparison: Guided vs Fully Dynamic
+            st.markdown("### 🆚 Guided vs Fully Dynamic Discovery")
 
-                ---
+            col1, col2 = st.columns(2)
 
-                <p><em>This guide documents the production-grade LLM
-                enhancement strategies powering Student 360 Analytics.</em></p>
+            with col1:
+                st.markdown("""
+                **📖 Guided Discovery (Tab 2)**
+                - AI gets examples: "Student Journey", "Program Lifecycle", "Aid Journey"
+                - Follows proven patterns
+                - Predictable, consistent results
+                - Best for: Standard institutional analysis
+                """)
 
-                </div>
-                """, unsafe_allow_html=True)
+            with col2:
+                st.markdown("""
+                **🔬 Fully Dynamic Discovery (This Tab)**
+                - AI gets ZERO examples or templates
+                - Discovers entities purely from data patterns
+                - Unexpected, unique discoveries
+                - Best for: Finding hidden patterns specific to YOUR data
+                """)
 
-        st.divider()
+            st.markdown("---")
 
-        # ====================================================================================
-        # OLLAMA CONNECTION STATUS (From gen_storytelling_app.py lines 1116-1298)
-        # ====================================================================================
-        st.markdown("### 🔌 Ollama Connection Status")
+            st.markdown("### 🎯 What AI Might Discover")
+            st.markdown("""
+            Without predefined templates, the AI could discover unique entities like:
+            - **Payment Pattern Clusters** - Students grouped by payment behavior
+            - **Performance Trajectory Groups** - Students following similar GPA patterns
+            - **Aid-to-Success Pathways** - Different aid effectiveness patterns
+            - **Engagement Level Segments** - Students with different participation patterns
+            - **Market Risk Portfolios** - Nationality combinations affecting revenue stability
+            - **Capacity Utilization Zones** - Facility usage patterns
+
+            **The AI will discover what's ACTUALLY in your data, not what we expect to find!**
+            """)
 
-        # Determine connection status
-        is_connected = False
-        model_count = 0
-        error_msg = None
 
-        if st.session_state.get('ollama_url'):
-            if st.session_state.get('ollama_connected'):
-                is_connected = True
-                models = get_available_models(st.session_state.ollama_url)
-                model_count = len(models)
-            else:
-                health = verify_ollama_health(st.session_state.ollama_url)
-                st.session_state.health_check_count += 1
+# ====================================================================================
+# TAB 4: DATA STORYTELLING - COMPLETE JOURNEY STORIES (PreDefined+LLM Narrative)
+# ====================================================================================
 
-                if health['connected']:
-                    is_connected = True
-                    model_count = health['model_count']
-                    st.session_state.ollama_connected = True
-                else:
-                    is_connected = False
-                    error_msg = health.get('error', 'Unknown')
+# Static section headers for the journey tabs (constant HTML, defined once)
+_HDR_JOURNEY_INSIGHTS = """
+<div style='background: linear-gradient(135deg, rgba(59, 130, 246, 0.15), rgba(99, 102, 241, 0.15));
+            padding: 1.5rem; border-radius: 10px; margin: 2rem 0 1.5rem 0;
+            border-left: 5px solid #3b82f6;'>
+    <h2 style='margin: 0 0 0.5rem 0; color: #1e293b; font-size: 1.5rem;'>
+        📊 Journey Insights - Key Metrics Overview
+    </h2>
+    <p style='margin: 0; color: #475569; font-size: 0.95rem; line-height: 1.6;'>
+        Visual analytics showing the most important performance indicators for this journey.
+        These metrics provide a comprehensive view of key trends, patterns, and opportunities.
+    </p>
+</div>
+"""
 
-        # Display status
-        if is_connected:
-            st.success("✅ Connected & Active")
+_HDR_DIVERSITY = """
+<div style='background: rgba(59, 130, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #3b82f6;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>📈 Diversity & Demographics Analysis</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Distribution of students by nationality, region, and enrollment status</div>
+</div>
+"""
 
-            current_url = st.session_state.get('ollama_url', 'Unknown')
-            if 'cloudflare' in current_url.lower() or 'exalio' in current_url.lower():
-                endpoint_type = "☁️ Cloudflare"
-            elif 'localhost' in current_url.lower():
-                endpoint_type = "💻 Local"
-            else:
-                endpoint_type = "🔧 Custom"
+_HDR_ENROLLMENT_TRENDS = """
+<div style='background: rgba(139, 92, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin: 1.5rem 0 1rem 0; border-left: 4px solid #8b5cf6;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>📊 Enrollment Trends & Program Performance</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Growth patterns by cohort, gender balance, and program popularity</div>
+</div>
+"""
 
-            st.caption(f"📦 {model_count} model(s) available from {endpoint_type}")
-            if st.session_state.get('selected_model'):
-                st.caption(f"🤖 Active: {st.session_state.selected_model}")
-            st.caption(f"🕐 Health checks: {st.session_state.health_check_count}")
-        elif st.session_state.get('ollama_url'):
-            st.error("❌ Disconnected")
-            if error_msg:
-                st.caption(f"Error: {error_msg}")
+_HDR_REVENUE = """
+<div style='background: rgba(16, 185, 129, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #10b981;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>💰 Revenue Distribution & Financial Aid Analysis</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Revenue sources, tuition patterns, and financial aid allocation</div>
+</div>
+"""
 
-            col_retry1, col_retry2 = st.columns([3, 2])
-            with col_retry1:
-                if st.button("🔄 Reconnect Now", type="primary", width="stretch"):
-                    with st.spinner("🔄 Attempting to reconnect..."):
-                        import time
-                        connected, models, status_msg = ensure_ollama_connection(
-                            st.session_state.ollama_url,
-                            auto_reconnect=True,
-                            max_retries=3
-                        )
+_HDR_OPERATIONS = """
+<div style='background: rgba(139, 92, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #8b5cf6;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>⚙️ Operational Metrics & Cohort Analysis</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Student operational status, cohort distribution, and institutional capacity planning</div>
+</div>
+"""
 
-                        if connected:
-                            st.session_state.ollama_connected = True
-                            st.session_state.selected_model = models[0] if models else None
-                            st.success(f"✅ {status_msg}")
-                            st.success(f"📦 Found {len(models)} model(s)")
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            st.error(f"❌ {status_msg}")
-                            st.info("💡 **Troubleshooting:**\n- Check if Ollama is running\n- Verify URL is correct\n- Check network connection")
+_HDR_ACADEMIC_PERFORMANCE = """
+<div style='background: rgba(245, 158, 11, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #f59e0b;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>🎓 Academic Performance Overview</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>GPA distribution, performance tiers, and program excellence analysis</div>
+</div>
+"""
 
-            with col_retry2:
-                if st.button("ℹ️ Help", width="stretch"):
-                    st.session_state.show_connection_help = not st.session_state.get('show_connection_help', False)
+_HDR_DEMOGRAPHICS_WORKLOAD = """
+<div style='background: rgba(139, 92, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin: 1.5rem 0 1rem 0; border-left: 4px solid #8b5cf6;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>📊 Performance by Demographics & Workload</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Achievement patterns across nationalities and credit hour loads</div>
+</div>
+"""
 
-            if st.session_state.get('show_connection_help', False):
-                with st.expander("🔧 Connection Troubleshooting", expanded=True):
-                    st.markdown("""
-                    **Common Issues:**
+_HDR_RETENTION = """
+<div style='background: rgba(34, 197, 94, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #22c55e;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>🎯 Retention & Persistence Indicators</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Student enrollment continuity, academic standing, and retention risk factors</div>
+</div>
+"""
 
-                    1. **Ollama not running**
-                       ```bash
-                       ollama serve
-                       ```
+_HDR_RISK = """
+<div style='background: rgba(239, 68, 68, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ef4444;'>
+    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>⚠️ Risk Assessment & Early Warning Indicators</div>
+    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Academic performance risk, financial obligations, and student success predictors</div>
+</div>
+"""
 
-                    2. **Wrong URL**
-                       - Local: `http://localhost:11434`
-                       - Cloudflare: Check tunnel URL
+_HDR_JOURNEY_STORIES = """
+<div style='background: linear-gradient(135deg, rgba(139, 92, 246, 0.15), rgba(168, 85, 247, 0.15));
+            padding: 1.5rem; border-radius: 10px; margin: 2rem 0 1.5rem 0;
+            border-left: 5px solid #8b5cf6;'>
+    <h2 style='margin: 0 0 0.5rem 0; color: #1e293b; font-size: 1.5rem;'>
+        📖 Journey Stories - Detailed Narratives
+    </h2>
+    <p style='margin: 0; color: #475569; font-size: 0.95rem; line-height: 1.6;'>
+        AI-generated narratives providing business context, strategic insights, and actionable recommendations
+        for each aspect of this journey. Expand each story to explore detailed analysis.
+    </p>
+</div>
+"""
 
-                    3. **Firewall blocking**
-                       - Allow port 11434
-                       - Check antivirus settings
-
-                    4. **No models installed**
-                       ```bash
-                       ollama pull tinyllama
-                       ```
-                    """)
-        else:
-            st.warning("⚠️ Not configured")
+# One card of the per-story four-stage analysis flow, and the arrow between cards
+# (colours come from the .story-flow-* classes in inject_custom_css)
+_STORY_FLOW_CARD = """
+<div class='story-flow-card {kind}'>
+    <div class='story-flow-label'>{label}</div>
+    <div class='story-flow-text'>{content}...</div>
+</div>
+"""
+_STORY_FLOW_ARROW = "<div class='story-flow-arrow'>↓</div>"
+
+# (story field, snippet length, default, CSS kind, label) per flow stage
+_STORY_FLOW_STAGES = (
+    ('opening_narrative', 200, 'N/A', 'situation', '📌 CURRENT SITUATION'),
+    ('data_insights', 180, 'Key data patterns and trends identified', 'insights', '📈 KEY INSIGHTS'),
+    ('business_impact', 180, 'N/A', 'impact', '💼 BUSINESS IMPACT'),
+    ('action_plan', 180, 'Strategic recommendations', 'actions', '🎯 RECOMMENDED ACTIONS'),
+)
 
-        # Auto-refresh toggle
-        auto_refresh = st.checkbox(
-            "🔄 Enable Auto-refresh",
-            value=st.session_state.get('auto_refresh', False),
-            help="Automatically refresh connection status"
-        )
-        st.session_state.auto_refresh = auto_refresh
+# One heading + card of the per-story "View Full Analysis Details" expander (.story-detail classes)
+_STORY_DETAIL_SECTION = """
+##### {heading}
 
-        if not auto_refresh:
-            st.caption("❌ Auto-refresh disabled")
+<div class='story-detail {kind}'>{text}</div>
+"""
+# (heading, story field, CSS kind) per detail section
+_STORY_DETAIL_SECTIONS = (
+    ('📖 Complete Narrative', 'opening_narrative', 'narrative'),
+    ('📊 Complete Data Insights', 'data_insights', 'insights'),
+    ('💼 Full Business Impact Analysis', 'business_impact', 'impact'),
+    ('🔍 Key Findings', 'findings_summary', 'findings'),
+    ('🎯 Complete Action Plan', 'action_plan', 'action'),
+)
 
-        # Connection details
-        if st.session_state.get('ollama_url'):
-            with st.expander("📊 Connection Details", expanded=False):
-                st.markdown("**Connection Information:**")
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+# Same escapes as html.escape(quote=True), plus newline -> <br>, applied in one str.translate pass
+_HTML_BR_TABLE = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;', '\n': '<br>',
+})
+
+def _escape_br(text: str) -> str:
+    """HTML-escape text and turn newlines into <br> in a single pass"""
+    return text.translate(_HTML_BR_TABLE)
+
+def _story_snippet(text: Optional[str], limit: int, default: str = 'N/A') -> str:
+    """First `limit` chars of a story field with whitespace runs collapsed, HTML-escaped"""
+    return _escape_br(_WHITESPACE_RUN.sub(' ', (text or default)[:limit]))
+
+def _render_journey_enrollment(figs: Dict[str, go.Figure], cols: SimpleNamespace, tab_idx: int, viz_row1, viz_row2):
+    """Overview charts for the Enrollment journey tab"""
+    st.markdown(_HDR_DIVERSITY, unsafe_allow_html=True)
+
+    with viz_row1[0]:
+        if cols.has_nationality:
+            st.caption("🌍 **Nationality Distribution**")
+            st.plotly_chart(figs['nat'], width='stretch', key=f"journey_{tab_idx}_nat")
+
+    with viz_row1[1]:
+        if cols.has_nationality:
+            st.caption("🇦🇪 **UAE vs International Mix**")
+            st.plotly_chart(figs['uae_intl'], width='stretch', key=f"journey_{tab_idx}_uae_intl")
+
+    with viz_row1[2]:
+        if cols.has_status:
+            st.caption("📋 **Student Status**")
+            st.plotly_chart(figs['status'], width='stretch', key=f"journey_{tab_idx}_status")
+
+    st.markdown(_HDR_ENROLLMENT_TRENDS, unsafe_allow_html=True)
+
+    with viz_row2[0]:
+        if cols.has_cohort:
+            st.caption("📅 **Cohort Trends Over Time**")
+            st.plotly_chart(figs['cohort'], width='stretch', key=f"journey_{tab_idx}_cohort")
+
+    with viz_row2[1]:
+        if cols.has_gender:
+            st.caption("⚖️ **Gender Balance**")
+            st.plotly_chart(figs['gender'], width='stretch', key=f"journey_{tab_idx}_gender")
+
+    with viz_row2[2]:
+        if cols.has_program:
+            st.caption("🎓 **Most Popular Programs**")
+            st.plotly_chart(figs['programs'], width='stretch', key=f"journey_{tab_idx}_programs")
+
+def _render_journey_revenue(figs: Dict[str, go.Figure], cols: SimpleNamespace, tab_idx: int, viz_row1, viz_row2):
+    """Overview charts for the Revenue journey tab"""
+    # Tuition/aid columns resolved from common name variations
+    tuition_col = cols.tuition
+    aid_col = cols.aid
+
+    st.markdown(_HDR_REVENUE, unsafe_allow_html=True)
+
+    with viz_row1[0]:
+        if tuition_col and cols.has_nationality:
+            st.caption("🌍 **Revenue by Nationality**")
+            st.plotly_chart(figs['rev_nat'], width='stretch', key=f"journey_{tab_idx}_rev_nat")
+        elif cols.has_nationality:
+            # Fallback: show nationality distribution
+            st.plotly_chart(figs['nat_dist'], width='stretch', key=f"journey_{tab_idx}_nat_dist")
+
+    with viz_row1[1]:
+        if tuition_col:
+            st.caption("💵 **Tuition Fee Range**")
+            st.plotly_chart(figs['tuition_dist'], width='stretch', key=f"journey_{tab_idx}_tuition_dist")
+        elif cols.has_cohort:
+            st.caption("📅 **Students by Cohort**")
+            st.plotly_chart(figs['cohort_fb'], width='stretch', key=f"journey_{tab_idx}_cohort_fb")
+
+    with viz_row1[2]:
+        if aid_col:
+            st.caption("🎓 **Financial Aid Coverage**")
+            st.plotly_chart(figs['aid'], width='stretch', key=f"journey_{tab_idx}_aid")
+        elif cols.has_status:
+            # Fallback: show enrollment status
+            st.plotly_chart(figs['status_fb'], width='stretch', key=f"journey_{tab_idx}_status_fb")
+
+    st.markdown("**📊 Program Performance & Payment Status**")
+    with viz_row2[0]:
+        if tuition_col and cols.has_program:
+            st.plotly_chart(figs['rev_prog'], width='stretch', key=f"journey_{tab_idx}_rev_prog")
+        elif cols.has_program:
+            # Fallback: show program enrollment
+            st.plotly_chart(figs['prog_fb'], width='stretch', key=f"journey_{tab_idx}_prog_fb")
+
+    with viz_row2[1]:
+        if cols.has_payment:
+            st.plotly_chart(figs['payment'], width='stretch', key=f"journey_{tab_idx}_payment")
+        elif cols.has_gender:
+            # Fallback: show gender distribution
+            st.plotly_chart(figs['gender_fb'], width='stretch', key=f"journey_{tab_idx}_gender_fb")
+
+def _render_journey_operations(figs: Dict[str, go.Figure], cols: SimpleNamespace, tab_idx: int, viz_row1, viz_row2):
+    """Overview charts for the Operations journey tab"""
+    st.markdown(_HDR_OPERATIONS, unsafe_allow_html=True)
+
+    with viz_row1[0]:
+        if cols.has_status:
+            st.caption("📊 **Operational Status Distribution**")
+            st.plotly_chart(figs['op_status'], width='stretch', key=f"journey_{tab_idx}_op_status")
+
+    with viz_row1[1]:
+        if cols.has_cohort:
+            st.caption("📅 **Students by Cohort Year**")
+            st.plotly_chart(figs['cohort_ops'], width='stretch', key=f"journey_{tab_idx}_cohort_ops")
+
+def _render_journey_academics(figs: Dict[str, go.Figure], cols: SimpleNamespace, tab_idx: int, viz_row1, viz_row2):
+    """Overview charts for the Academics journey tab"""
+    st.markdown(_HDR_ACADEMIC_PERFORMANCE, unsafe_allow_html=True)
+
+    with viz_row1[0]:
+        if cols.has_gpa:
+            st.caption("📊 **Overall GPA Distribution**")
+            st.plotly_chart(figs['gpa_dist'], width='stretch', key=f"journey_{tab_idx}_gpa_dist")
+
+    with viz_row1[1]:
+        if cols.has_gpa:
+            st.caption("🎯 **Performance Tiers**")
+            st.plotly_chart(figs['perf_tiers'], width='stretch', key=f"journey_{tab_idx}_perf_tiers")
+
+    with viz_row1[2]:
+        if cols.has_gpa and cols.has_program:
+            st.caption("🏆 **Top Performing Programs**")
+            st.plotly_chart(figs['gpa_prog'], width='stretch', key=f"journey_{tab_idx}_gpa_prog")
+
+    st.markdown(_HDR_DEMOGRAPHICS_WORKLOAD, unsafe_allow_html=True)
+
+    with viz_row2[0]:
+        if cols.has_gpa and cols.has_nationality:
+            st.caption("🌍 **GPA by Nationality**")
+            st.plotly_chart(figs['gpa_nat'], width='stretch', key=f"journey_{tab_idx}_gpa_nat")
+
+    with viz_row2[1]:
+        if cols.has_credit_hours:
+            st.caption("📚 **Student Workload**")
+            st.plotly_chart(figs['credits'], width='stretch', key=f"journey_{tab_idx}_credits")
+
+def _render_journey_retention(figs: Dict[str, go.Figure], cols: SimpleNamespace, tab_idx: int, viz_row1, viz_row2):
+    """Overview charts for the Retention journey tab"""
+    st.markdown(_HDR_RETENTION, unsafe_allow_html=True)
+
+    with viz_row1[0]:
+        if cols.has_status:
+            st.caption("📊 **Student Enrollment Status**")
+            st.plotly_chart(figs['retention_status'], width='stretch', key=f"journey_{tab_idx}_retention_status")
+
+    with viz_row1[1]:
+        if cols.has_gpa:
+            st.caption("📈 **Academic Performance Distribution**")
+            st.plotly_chart(figs['retention_gpa'], width='stretch', key=f"journey_{tab_idx}_retention_gpa")
+
+def _render_journey_risk(figs: Dict[str, go.Figure], cols: SimpleNamespace, tab_idx: int, viz_row1, viz_row2):
+    """Overview charts for the Risk journey tab"""
+    st.markdown(_HDR_RISK, unsafe_allow_html=True)
+
+    with viz_row1[0]:
+        if cols.has_gpa:
+            st.caption("📉 **Academic Risk Levels**")
+            st.plotly_chart(figs['risk_gpa'], width='stretch', key=f"journey_{tab_idx}_risk_gpa")
+
+    with viz_row1[1]:
+        if cols.has_payment:
+            st.caption("💳 **Payment Status & Financial Risk**")
+            st.plotly_chart(figs['risk_payment'], width='stretch', key=f"journey_{tab_idx}_risk_payment")
+
+# Journey tab index -> overview renderer; only the selected journey's charts are laid out
+JOURNEY_RENDERERS = {
+    0: _render_journey_enrollment,
+    1: _render_journey_revenue,
+    2: _render_journey_operations,
+    3: _render_journey_academics,
+    4: _render_journey_retention,
+    5: _render_journey_risk,
+}
+
+def _render_tab_complete_journeys(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '📚 Data Storytelling (PreDefined+LLM Narrative)' tab"""
+    st.header("📚 Complete Journey Stories - PreDefined Structure + AI Narratives")
+    st.caption("Comprehensive analytics with pre-defined journeys enriched by LLM-generated narratives")
+
+    if not st.session_state.ollama_connected:
+        st.warning("⚠️ Connect to Ollama to generate journey narratives")
+    else:
+        st.markdown("""
+        <div style='background: linear-gradient(135deg, #7c3aed 0%, #a78bfa 100%); padding: 2rem; border-radius: 12px; margin: 2rem 0;'>
+            <h2 style='margin: 0; color: white; display: flex; align-items: center; gap: 0.75rem;'>
+                📚 Complete Journey Stories
+                <span style='background: rgba(255,255,255,0.2); padding: 0.35rem 1rem; border-radius: 20px; font-size: 0.65rem; font-weight: normal;'>COMPREHENSIVE ANALYTICS</span>
+            </h2>
+            <p style='margin: 0.75rem 0 0 0; color: #e9d5ff; font-size: 1rem; line-height: 1.6;'>
+                📖 Deep-dive into 6 comprehensive journeys with detailed stories, metrics, insights, and action plans<br>
+                🤖 AI-powered narratives combined with precise metric calculations<br>
+                💼 Executive-ready business context, ROI analysis, and strategic recommendations
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-                if is_connected:
-                    st.markdown("- Status: ✅ **Active**")
-                    st.markdown(f"- Endpoint: {endpoint_type}")
-                    st.markdown(f"- Models: {model_count} available")
-                else:
-                    st.markdown("- Status: ❌ **Disconnected**")
-                    if error_msg:
-                        st.markdown(f"- Error: `{error_msg}`")
+        if not JOURNEY_MODULES_AVAILABLE:
+            st.error("❌ Journey modules not available. Please ensure journey_definitions.py, journey_metrics.py, journey_narratives.py, and journey_assembler.py are in the same directory.")
+        else:
+            # Validate dataset
+            is_valid, missing_fields, journey_validation = validate_dataset_for_journeys(df)
+
+            if not is_valid:
+                st.warning(f"⚠️ Dataset is missing some required fields for complete journey generation: {', '.join(missing_fields)}")
+                st.caption("Some journeys may have incomplete data. The system will work with available fields.")
+
+            # Generation button
+            col_gen1, col_gen2 = st.columns([3, 1])
+            with col_gen1:
+                if st.button("🚀 Generate Complete Journey Stories (All 6 Journeys)", key="generate_complete_journeys", type="primary", width='stretch'):
+                    # Progress container
+                    progress_container = st.empty()
+                    status_container = st.empty()
+
+                    last_flush = [0.0]
+
+                    def progress_callback(stage, current, total, message, min_interval=0.5):
+                        """Update progress display, throttled to one redraw per min_interval seconds"""
+                        # Per-item stages fire once per story/component; skip redraws in between
+                        # flushes but always show the first, last and any error update.
+                        if stage in ('metrics', 'narratives', 'assembly') and 1 < current < total:
+                            now = time.monotonic()
+                            if now - last_flush[0] < min_interval:
+                                return
+                            last_flush[0] = now
+                        else:
+                            last_flush[0] = time.monotonic()
+
+                        if stage == 'validation':
+                            progress_container.progress(5)
+                            status_container.info(f"🔍 {message}")
+                        elif stage == 'metrics':
+                            progress = 5 + int((current / total) * 15)
+                            progress_container.progress(progress)
+                            status_container.info(f"📊 Calculating metrics: {current}/{total} stories")
+                        elif stage == 'narratives':
+                            progress = 20 + int((current / total) * 70)
+                            progress_container.progress(progress)
+                            status_container.info(f"✍️ Generating narratives: {current}/{total} components - {message}")
+                        elif stage == 'assembly':
+                            progress = 90 + int((current / total) * 10)
+                            progress_container.progress(progress)
+                            status_container.info(f"🔧 Assembling journeys: {current}/{total}")
+                        elif stage == 'error':
+                            status_container.error(f"❌ {message}")
+
+                    with st.spinner("🤖 Generating complete journeys... This may take 5-15 minutes depending on LLM speed"):
+                        from journey_assembler import generate_all_journeys
+
+                        # Generate all journeys
+                        journeys, metadata = generate_all_journeys(
+                            df,
+                            query_ollama,
+                            model,
+                            url,
+                            temperature=0.4,
+                            timeout=180,
+                            progress_callback=progress_callback
+                        )
 
-                st.markdown(f"- URL: `{st.session_state.ollama_url}`")
-                st.markdown(f"- Health checks: {st.session_state.health_check_count}")
+                        # Store in session state
+                        st.session_state.complete_journeys = journeys
+                        st.session_state.journey_generation_metadata = metadata
+
+                        progress_container.progress(100)
+
+                        if metadata.get('success'):
+                            duration = metadata.get('duration_seconds', 0)
+                            minutes = int(duration // 60)
+                            seconds = int(duration % 60)
+
+                            status_container.success(f"""
+                            ✅ **All journeys generated successfully!**
+                            - **{len(journeys)}** complete journeys
+                            - **{metadata['assembly']['total_stories']}** stories with full narratives
+                            - **{metadata['metrics']['total_metrics_calculated']}** metrics calculated
+                            - **{metadata['narratives']['total_components_generated']}** narrative components generated
+                            - **Time:** {minutes}m {seconds}s
+                            """)
+                        else:
+                            status_container.error(f"❌ Generation failed: {', '.join(metadata.get('errors', ['Unknown error']))}")
 
-        st.divider()
+            with col_gen2:
+                if st.session_state.complete_journeys:
+                    if st.button("🗑️ Clear", key="clear_journeys"):
+                        st.session_state.complete_journeys = None
+                        st.session_state.journey_generation_metadata = None
+                        st.rerun()
 
-        # ====================================================================================
-        # SYSTEM RESOURCES & OPTIMIZATION (From gen_storytelling_app.py lines 1300-1434)
-        # ====================================================================================
-        st.markdown("### 🖥️ System Resources & Optimization")
+            # Display complete journeys if available
+            if st.session_state.complete_journeys:
+                journeys = st.session_state.complete_journeys
 
-        is_cloudflare = st.session_state.get('ollama_server_type') == "Cloudflare"
-        cloudflare_connected = is_connected if is_cloudflare else True
+                st.markdown("---")
 
-        if is_cloudflare and not cloudflare_connected:
-            resources = None
-            opt_tier = "⚠️ Unavailable"
-            opt_desc = "Connect to Cloudflare to see resources"
-        elif is_cloudflare and cloudflare_connected:
-            remote_resources = fetch_remote_system_resources(st.session_state.get('ollama_url', ''))
-            if remote_resources:
-                resources = remote_resources
-            else:
-                resources = get_system_resources()
+                # Create tabs for each journey
+                journey_tabs = st.tabs([
+                    "📊 Journey 1: Enrollment",
+                    "💰 Journey 2: Revenue",
+                    "🏢 Journey 3: Operations",
+                    "🎓 Journey 4: Academics",
+                    "🎯 Journey 5: Retention",
+                    "⚠️ Journey 6: Risk"
+                ])
+
+                # Overview aggregations are cached per dataset (data_key), one fused pass per journey
+                data_key = dataset_key(df)
+                cols = resolve_journey_columns(tuple(df.columns))
+
+                # Display each journey in its tab
+                for tab_idx, (journey_tab, journey) in enumerate(zip(journey_tabs, journeys)):
+                    with journey_tab:
+                        # Journey header
+                        st.markdown(f"""
+                        <div style='background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%); padding: 1.5rem; border-radius: 10px; margin-bottom: 1.5rem;'>
+                            <h2 style='margin: 0; color: white;'>{journey['name']}</h2>
+                            <p style='margin: 0.5rem 0 0 0; color: #ddd6fe; font-size: 0.95rem;'>{journey['subtitle']}</p>
+                            <div style='margin-top: 1rem; display: flex; gap: 1rem;'>
+                                <span style='background: rgba(255,255,255,0.2); padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.85rem;'>
+                                    📖 {journey['story_count']} Stories
+                                </span>
+                                <span style='background: rgba(255,255,255,0.2); padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.85rem;'>
+                                    📊 {journey['total_metrics_calculated']} Metrics
+                                </span>
+                                <span style='background: rgba(255,255,255,0.2); padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.85rem;'>
+                                    ✅ {'Complete' if journey['is_complete'] else 'Partial'}
+                                </span>
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
 
-            if resources and resources['gpu_available']:
-                if resources['ram_available_gb'] > 30:
-                    opt_tier = "🚀 High-End"
-                    opt_desc = "Optimal for large models"
-                else:
-                    opt_tier = "⚡ Medium"
-                    opt_desc = "Good for most tasks"
-            else:
-                opt_tier = "💻 Basic"
-                opt_desc = "CPU-only mode"
-        else:
-            resources = get_system_resources()
+                        # JOURNEY-LEVEL VISUALIZATIONS - Most Important Metrics
+                        st.markdown(_HDR_JOURNEY_INSIGHTS, unsafe_allow_html=True)
 
-            if resources['gpu_available']:
-                if resources['ram_available_gb'] > 30:
-                    opt_tier = "🚀 High-End"
-                    opt_desc = "Optimal for large models"
-                else:
-                    opt_tier = "⚡ Medium"
-                    opt_desc = "Good for most tasks"
-            else:
-                opt_tier = "💻 Basic"
-                opt_desc = "CPU-only mode"
+                        # Create 2 rows of 3 columns for 4-6 key metrics per journey
+                        viz_row1 = st.columns(3)
+                        viz_row2 = st.columns(3)
 
-        st.info(f"**Optimization Tier:** {opt_tier}")
-        st.caption(opt_desc)
+                        # Every chart for this journey, built once per dataset from one cached
+                        # pass over df and replayed on reruns that leave df unchanged
+                        figs = journey_overview_figs(data_key, df, tab_idx)
 
-        if resources is None:
-            st.warning("⚠️ **System resources not available**")
-            st.caption("📡 Resources from: ❌ Not connected to Cloudflare")
-            st.caption("💡 Connect to Cloudflare Ollama to view remote resources")
+                        renderer = JOURNEY_RENDERERS.get(tab_idx)
+                        if renderer is not None:
+                            renderer(figs, cols, tab_idx, viz_row1, viz_row2)
 
-            col_res1, col_res2 = st.columns(2)
-            with col_res1:
-                st.caption("🔲 CPU: N/A")
-                st.caption("💾 RAM: N/A")
-            with col_res2:
-                st.caption("🎮 GPU: N/A")
-                st.caption("⚙️ CPU: N/A")
-        else:
-            if resources.get('source') == 'remote_colab':
-                st.caption(f"📡 Resources from: ☁️ Remote Colab")
-            else:
-                device_type = "💻 Laptop" if resources['ram_available_gb'] < 50 else "🖥️ Server"
-                st.caption(f"📡 Resources from: {device_type}")
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        st.markdown(_HDR_JOURNEY_STORIES, unsafe_allow_html=True)
 
-            col_res1, col_res2 = st.columns(2)
-            with col_res1:
-                st.caption(f"🔲 CPU: {resources['cpu_count']} cores")
-                st.caption(f"💾 RAM: {resources['ram_available_gb']:.1f}GB free")
-            with col_res2:
-                if resources['gpu_available']:
-                    st.caption(f"🎮 GPU: {resources.get('gpu_name', 'Available')[:15]}")
-                else:
-                    st.caption("🎮 GPU: N/A")
-                if resources.get('cpu_percent', 0) > 0:
-                    st.caption(f"⚙️ CPU: {resources['cpu_percent']:.0f}% used")
-                else:
-                    st.caption("⚙️ CPU: N/A")
+                        # Display each story
+                        for story_idx, story in enumerate(journey['stories'], 1):
+                            with st.expander(f"📄 Story {story_idx}: {story['title']}", expanded=(story_idx == 1)):
+                                # Story subtitle
+                                if story.get('subtitle'):
+                                    st.caption(f"*{story['subtitle']}*")
 
-        with st.expander("📊 View Optimization Details"):
-            if resources is None:
-                st.markdown("**Current Configuration:**")
-                st.text(f"Tier: {opt_tier}")
-                st.text("Platform: Not available (Cloudflare not connected)")
-                st.text("CPU: N/A")
-                st.text("RAM: N/A")
-                st.text("GPU: N/A")
+                                st.markdown("---")
 
-                st.markdown("---")
-                st.warning("⚠️ **Connect to Cloudflare Ollama to view remote system resources**")
-            else:
-                st.markdown("**Current Configuration:**")
-                st.text(f"Tier: {opt_tier}")
-                st.text(f"Platform: {resources.get('platform', 'Unknown')}")
-                st.text(f"CPU: {resources['cpu_count']} cores ({resources.get('cpu_percent', 0):.1f}% usage)")
-                st.text(f"RAM: {resources['ram_available_gb']:.1f}/{resources.get('ram_total_gb', 0):.1f} GB available")
-                if resources.get('ram_percent', 0) > 0:
-                    st.text(f"RAM Usage: {resources['ram_percent']:.1f}%")
-                if resources['gpu_available']:
-                    st.text(f"GPU: {resources.get('gpu_name', 'Available')}")
-                else:
-                    st.text("GPU: Not detected")
+                                # VISUAL FLOW DIAGRAM - Story Analysis
+                                st.markdown("#### 📊 Story Analysis Flow")
 
-        st.divider()
+                                # Four-stage flow: situation → insights → impact → actions, as one markdown block
+                                get_field = story.get
+                                st.markdown(_STORY_FLOW_ARROW.join(
+                                    _STORY_FLOW_CARD.format(kind=kind, label=label,
+                                                            content=_story_snippet(get_field(field), limit, default))
+                                    for field, limit, default, kind, label in _STORY_FLOW_STAGES
+                                ), unsafe_allow_html=True)
 
-        # ====================================================================================
-        # VERSION 1.0 RELEASE NOTES
-        # ====================================================================================
-        with st.expander("📝 Version 1.0 Release Notes", expanded=False):
-            st.markdown("""
-            **🎉 What's New in Version 1.0**
+                                st.markdown("---")
 
-            **Major Features:**
-            - ✅ **5 Advanced AI-Driven Analysis Tabs**
-              - Academic Analytics with AI-driven deep analysis
-              - Housing Insights with impact analysis
-              - Financial Intelligence with sustainability metrics
-              - Demographics Deep Dive with diversity analysis
-              - Risk & Success Analysis with predictive insights
+                                # Detailed sections in expander
+                                with st.expander("📋 View Full Analysis Details", expanded=False):
+                                    # Narrative, insights, impact, findings and action plan in one markdown block
+                                    st.markdown(''.join(
+                                        _STORY_DETAIL_SECTION.format(heading=heading, kind=kind, text=_escape_br(get_field(field, 'N/A')))
+                                        for heading, field, kind in _STORY_DETAIL_SECTIONS
+                                    ), unsafe_allow_html=True)
 
-            - ✅ **Context-Aware Visualizations**
-              - AI automatically recommends relevant charts for each context
-              - 6 visualization types per analysis tab
-              - Intelligent data column selection
 
-            - ✅ **Strategic Insights & Recommendations**
-              - Root cause analysis for all findings
-              - Business impact quantification
-              - Priority-coded actionable recommendations
-              - LLM-enriched insights for every visualization
+# ====================================================================================
+# TAB 5: ACADEMIC ANALYTICS - HYBRID AI-DRIVEN
+# ====================================================================================
 
-            **Technical Improvements:**
-            - Hybrid approach: Rule-based + LLM enrichment
-            - Optimized for performance and reliability
-            - Enhanced error handling and fallbacks
-            - Deep data profiling for better AI insights
+# Insight and recommendation cards shared by the AI analysis tabs (5-9)
+_AI_INSIGHT_CARD = """
+<div class="insight-card">
+    <div class="insight-title">{title}</div>
+    <div class="insight-text">{text}</div>
+</div>
+"""
+_RECOMMENDATION_CARD = """
+<div class="recommendation-card">
+    <div class="recommendation-priority">{marker} Priority {rank}</div>
+    <div class="recommendation-text">{text}</div>
+</div>
+"""
 
-            **Release Date:** February 2, 2026
-            **Status:** Production Release
-            """)
+# Priority marker by recommendation rank: 🔴 first, 🟠 second, 🟢 for the rest
+_PRI = ("🔴", "🟠", "🟢", "🟢", "🟢")
 
-        st.divider()
+def _recommendation_cards_html(recommendations: List[Any]) -> str:
+    """All recommendation cards as one HTML blob, marked by priority rank"""
+    return ''.join(
+        _RECOMMENDATION_CARD.format(marker=_PRI[min(rank - 1, 4)],
+                                    rank=rank, text=_escape_br(str(rec)))
+        for rank, rec in enumerate(recommendations, 1)
+    )
 
-        # ====================================================================================
-        # DATA SOURCE (From gen_storytelling_app.py lines 1436-1632)
-        # ====================================================================================
-        st.markdown("### 📁 Data Source")
+def _findings_markdown(findings: List[Any]) -> str:
+    """Numbered key findings as one markdown block (one paragraph per finding)"""
+    return '\n\n'.join(f"**Finding {i}:** {finding}" for i, finding in enumerate(findings, 1))
 
-        if not st.session_state.get('ollama_connected'):
-            st.info("💡 **You can load data without Ollama connection** - AI features will be available once you connect")
+def _analysis_markup(analysis: dict, insight_title: str) -> Dict[str, Any]:
+    """Insight, findings and recommendation markup for an AI analysis"""
+    return {
+        'insights': [
+            _AI_INSIGHT_CARD.format(title=insight_title, text=html.escape(str(viz_spec.get('insight'))))
+            if viz_spec.get('insight') else ''
+            for viz_spec in analysis.get('visualizations', [])
+        ],
+        'findings': _findings_markdown(analysis.get('key_findings', [])),
+        'recommendations': _recommendation_cards_html(analysis.get('recommendations', [])),
+    }
 
-        data_source = st.radio(
-            "Choose data source:",
-            options=["Pre-loaded Dataset (Student_360_View)", "Upload File", "Use Sample Dataset"],
-            index=0,
-            key="data_source_selector"
+# Per-tab labels of the shared AI analysis section (tabs 5-9), keyed by LLM context type
+AI_ANALYSIS_TABS = {
+    'academic': SimpleNamespace(
+        button_label="🤖 Generate Academic Performance Analysis & Visualizations",
+        button_key="academic_btn",
+        insight_title="🎓 Academic Insight",
+        overview_heading="### 🎯 Academic Performance Analysis",
+        viz_heading="### 📊 AI-Recommended Academic Visualizations",
+        viz_noun="academic visualizations",
+        reasoning_default="Academic performance indicator",
+        findings_heading="### 🔍 Key Academic Findings",
+        recommendations_heading="### 💡 Academic Intervention Recommendations",
+        connect_warning="⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered academic analysis.",
+    ),
+    'housing': SimpleNamespace(
+        button_label="🤖 Generate Housing Impact Analysis & Visualizations",
+        button_key="housing_btn",
+        insight_title="🏠 Housing Insight",
+        overview_heading="### 🏠 Housing Impact Analysis",
+        viz_heading="### 📊 AI-Recommended Housing Visualizations",
+        viz_noun="housing-related visualizations",
+        reasoning_default="Housing performance indicator",
+        findings_heading="### 🔍 Key Housing Findings",
+        recommendations_heading="### 💡 Housing Strategy Recommendations",
+        connect_warning="⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered housing analysis.",
+    ),
+    'financial': SimpleNamespace(
+        button_label="🤖 Generate Financial Sustainability Analysis & Visualizations",
+        button_key="finance_btn",
+        insight_title="💰 Financial Insight",
+        overview_heading="### 💰 Financial Sustainability Analysis",
+        viz_heading="### 📊 AI-Recommended Financial Visualizations",
+        viz_noun="financial visualizations",
+        reasoning_default="Financial performance indicator",
+        findings_heading="### 🔍 Key Financial Findings",
+        recommendations_heading="### 💡 Financial Strategy Recommendations",
+        connect_warning="⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered financial analysis.",
+    ),
+    'demographics': SimpleNamespace(
+        button_label="🤖 Generate Diversity & Inclusion Analysis & Visualizations",
+        button_key="demo_btn",
+        insight_title="🌍 Demographic Insight",
+        overview_heading="### 🌍 Diversity & Inclusion Analysis",
+        viz_heading="### 📊 AI-Recommended Demographic Visualizations",
+        viz_noun="demographic visualizations",
+        reasoning_default="Demographic indicator",
+        findings_heading="### 🔍 Key Demographic Findings",
+        recommendations_heading="### 💡 Diversity & Recruitment Strategy Recommendations",
+        connect_warning="⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered diversity analysis.",
+    ),
+    'risk': SimpleNamespace(
+        button_label="🤖 Generate Risk & Success Analysis & Visualizations",
+        button_key="risk_btn",
+        insight_title="⚠️ Risk Insight",
+        overview_heading="### ⚠️ Risk & Success Strategic Analysis",
+        viz_heading="### 📊 AI-Recommended Risk Analysis Visualizations",
+        viz_noun="risk analysis visualizations",
+        reasoning_default="Risk indicator",
+        findings_heading="### 🔍 Key Risk & Success Findings",
+        recommendations_heading="### 💡 Intervention & Success Strategy Recommendations",
+        connect_warning="⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered risk analysis.",
+    ),
+}
+
+def _render_ai_analysis(df: pd.DataFrame, metrics: dict, context: str):
+    """Generate button plus the LLM analysis (overview, charts, findings, recommendations) of one AI tab"""
+    cfg = AI_ANALYSIS_TABS[context]
+    data_key = dataset_key(df)
+    state_key = f'{context}_analysis'
+
+    if st.session_state.ollama_connected and st.button(cfg.button_label, key=cfg.button_key, type="primary", width='stretch'):
+
+        # Generate context-focused analysis using hybrid approach; kept in session state so it survives tab switches
+        analysis = cached_dynamic_visualizations(
+            context,
+            st.session_state.selected_model,
+            st.session_state.ollama_url,
+            data_key,
+            metrics,
+            df
         )
+        # Card markup is built once here and stored with the analysis, not on every rerun
+        markup = _analysis_markup(analysis, cfg.insight_title) if analysis else None
+        st.session_state[state_key] = (data_key, analysis, markup)
 
-        if data_source == "Pre-loaded Dataset (Student_360_View)":
-            st.caption("📊 Student 360 View Dataset - Comprehensive student analytics data")
+    elif not st.session_state.ollama_connected:
+        st.warning(cfg.connect_warning)
 
-            # Define the path to the pre-loaded dataset (works locally and on cloud)
-            import os
-            # Try multiple path options for flexibility
-            script_dir = os.path.dirname(os.path.abspath(__file__))
+    # Render the last analysis generated for this dataset, if any
+    stored = st.session_state.get(state_key)
+    if stored and stored[0] == data_key:
+        _, analysis, markup = stored
+        if analysis:
 
-            # Option 1: data folder in same directory as script
-            path_option_1 = os.path.join(script_dir, "data", "Student_360_View.csv")
-            # Option 2: data folder in parent directory
-            path_option_2 = os.path.join(os.path.dirname(script_dir), "data", "Student_360_View.csv")
-            # Option 3: Original local path (for backward compatibility)
-            path_option_3 = r"D:\exalio_work\RFP\Ankbut\MVP\cons\Sample DataSet\Student_360_View.csv"
+            # Display strategic overview
+            st.markdown(cfg.overview_heading)
+            st.info(analysis.get('strategic_overview', ''))
 
-            # Find which path exists
-            preloaded_dataset_path = None
-            for path in [path_option_1, path_option_2, path_option_3]:
-                if os.path.exists(path):
-                    preloaded_dataset_path = path
-                    break
+            st.divider()
 
-            if preloaded_dataset_path is None:
-                # Default to option 1 for error message
-                preloaded_dataset_path = path_option_1
+            # Display visualizations with insights
+            st.markdown(cfg.viz_heading)
+            viz_list = analysis.get('visualizations', [])
+            st.caption(f"The AI analyzed your data and recommends {len(viz_list)} {cfg.viz_noun}")
 
-            # Check if already loaded
-            if st.session_state.get('data') is not None and st.session_state.get('data_source_type') == 'preloaded':
-                df = st.session_state.data
-                st.success(f"📄 ✅ Pre-loaded dataset active | {len(df)} rows × {len(df.columns)} columns")
+            # Build every chart up front in parallel, then render in order
+            figs = dynamic_chart_figures(viz_list, df)
 
-                with st.expander("📊 Dataset Information"):
-                    st.markdown(f"""
-                    **Dataset:** Student_360_View.csv
-                    **Rows:** {len(df):,}
-                    **Columns:** {len(df.columns)}
-                    **Source:** {preloaded_dataset_path}
-                    """)
+            for i, viz_spec in enumerate(viz_list):
+                with st.container():
+                    st.markdown(f"#### {viz_spec.get('title', f'Visualization {i+1}')}")
+                    st.caption(f"**Why this matters:** {viz_spec.get('reasoning', cfg.reasoning_default)}")
 
-                    st.dataframe(df.head(5), width="stretch")
+                    # Display the prebuilt chart
+                    fig = figs[i]
+                    if fig:
+                        st.plotly_chart(fig, width='stretch', key=f"{context}_viz_{i}")
+                    else:
+                        st.warning(f"⚠️ Could not generate chart for: {viz_spec.get('data_column', 'unknown')}")
 
-                if st.button("🔄 Reload Dataset", key="reload_preloaded"):
-                    st.session_state.force_reload = True
-                    st.rerun()
-            else:
-                # Load the pre-loaded dataset
-                try:
-                    if os.path.exists(preloaded_dataset_path):
-                        with st.spinner("Loading pre-loaded dataset..."):
-                            df = pd.read_csv(preloaded_dataset_path, encoding='utf-8', low_memory=False)
+                    # Display AI insight
+                    if viz_spec.get('insight', ''):
+                        st.markdown(markup['insights'][i], unsafe_allow_html=True)
 
-                            if df is not None and not df.empty:
-                                set_main_data(df)
-                                st.session_state.data_source_type = 'preloaded'
-                                st.session_state.uploaded_filename = 'Student_360_View.csv'
-                                st.success(f"📄 ✅ Pre-loaded dataset loaded successfully | {len(df)} rows × {len(df.columns)} columns")
+                    st.divider()
 
-                                with st.expander("📊 Dataset Preview"):
-                                    st.dataframe(df.head(10), width="stretch")
+            # Display key findings
+            st.markdown(cfg.findings_heading)
+            if analysis.get('key_findings', []):
+                st.markdown(markup['findings'])
 
-                                st.info("💡 Dataset is ready for analysis. Navigate to Analytics tabs to explore insights.")
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to load dataset - file is empty")
-                    else:
-                        st.error(f"❌ Pre-loaded dataset not found at: {preloaded_dataset_path}")
-                        st.info("💡 Please ensure the dataset file exists at the specified location or use 'Upload File' option.")
-                except Exception as e:
-                    st.error(f"❌ Error loading pre-loaded dataset: {str(e)}")
-                    st.info("💡 Try using 'Upload File' option instead.")
+            st.divider()
 
-        elif data_source == "Upload File":
-            st.caption("Choose a file (CSV, Excel, or TXT)")
+            # Display recommendations: priority-coloured cards (first = high priority), sent as one markdown block
+            st.markdown(cfg.recommendations_heading)
+            if analysis.get('recommendations', []):
+                st.markdown(markup['recommendations'], unsafe_allow_html=True)
 
-            uploaded_file = st.file_uploader(
-                "Drag and drop file here",
-                type=['csv', 'xlsx', 'xls', 'txt'],
-                help="Limit 200MB per file • CSV, XLSX, XLS, TXT",
-                label_visibility="collapsed"
-            )
+@st.fragment
+def _render_tab_academic(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '🎓 Academic Analytics' tab"""
+    st.header("🎓 Academic Analytics - AI-Driven Deep Analysis")
+    st.caption("The AI analyzes academic performance patterns and recommends targeted interventions")
 
-            if uploaded_file is not None:
-                st.caption(f"📄 {uploaded_file.name}")
-                st.caption(f"{uploaded_file.size / 1024:.1f}KB")
+    # Academic-focused metrics
+    col1, col2, col3, col4 = st.columns(4)
 
-                already_loaded = (
-                    st.session_state.get('uploaded_filename') == uploaded_file.name and
-                    st.session_state.get('data') is not None
-                )
+    with col1:
+        st.metric("High Performers", f"{metrics.get('high_performers', 0):,}",
+                 f"{metrics['high_perf_pct']:.1f}%")
 
-                if already_loaded:
-                    df = st.session_state.data
-                    st.success(f"📄 ✅ Already loaded (preserving data transformations) | {len(df)} rows × {len(df.columns)} columns")
+    with col2:
+        st.metric("Average GPA", f"{metrics.get('avg_gpa', 0):.2f}")
 
-                    datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
-                    if datetime_cols:
-                        st.info(f"🔄 Transformations applied: {len(datetime_cols)} datetime column(s) converted")
+    with col3:
+        st.metric("At-Risk Students", f"{metrics.get('at_risk', 0):,}",
+                 delta=f"-{metrics['at_risk_pct']:.1f}%",
+                 delta_color="inverse")
 
-                    if st.button("🔄 Reload Original File (discard transformations)", width="stretch", key="reload_original_file"):
-                        st.session_state.force_reload = True
-                        st.rerun()
-                else:
-                    try:
-                        if uploaded_file.name.endswith('.csv') or uploaded_file.name.endswith('.txt'):
-                            df = load_csv_file(uploaded_file)
-                        else:
-                            df = load_excel_file(uploaded_file)
+    with col4:
+        st.metric("Mid-Performers", f"{metrics['mid_tier_students']:,}",
+                 f"{metrics['mid_tier_pct']:.1f}%")
 
-                        if df is not None:
-                            set_main_data(df)
-                            st.session_state.uploaded_filename = uploaded_file.name
-                            st.session_state.force_reload = False
-                            st.success(f"📄 ✅ Loaded successfully | {len(df)} rows × {len(df.columns)} columns")
+    st.divider()
 
-                            with st.expander("📊 Data Preview (first 5 rows)"):
-                                st.dataframe(df.head(5), width="stretch")
+    # AI Analysis Button and the cached LLM analysis it produces
+    _render_ai_analysis(df, metrics, 'academic')
 
-                            # Show comprehensive 136-column mapping status
-                            mapping_log = st.session_state.get('mapping_log', [])
-                            with st.expander("📊 Complete 136-Column Catalog Status", expanded=False):
-                                st.markdown("### Universal Column Catalog - Data Availability Report")
-                                st.markdown("*Showing all 136 columns from the universal catalog with their status in your dataset*")
 
-                                # Import the universal catalog
-                                try:
-                                    from universal_columns_catalog import UNIVERSAL_COLUMNS_CATALOG
+# ====================================================================================
+# TAB 6: HOUSING INSIGHTS - AI-DRIVEN
+# ====================================================================================
 
-                                    # Categorize columns by status
-                                    mapped_columns = []
-                                    present_columns = []
-                                    missing_columns = []
+@st.fragment
+def _render_tab_housing(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '🏠 Housing Insights' tab"""
+    st.header("🏠 Housing Insights - AI-Driven Deep Analysis")
+    st.caption("The AI analyzes housing patterns, occupancy trends, and their impact on student success")
+
+    # Housing split and its GPA impact (precomputed with the dataset's metrics)
+    if metrics['housing_col']:
+        on_campus = metrics['on_campus']
+        off_campus = metrics['off_campus']
+        housing_utilization = metrics['housing_utilization']
+        gpa_col = metrics['gpa_col']
+        on_campus_gpa = metrics['on_campus_gpa']
+        off_campus_gpa = metrics['off_campus_gpa']
+
+        # Housing-focused metrics
+        col1, col2, col3, col4 = st.columns(4)
 
-                                    for col_name, col_info in UNIVERSAL_COLUMNS_CATALOG.items():
-                                        if col_name in df.columns:
-                                            # Check if it was mapped from a different name
-                                            was_mapped = any(col_name in log for log in mapping_log)
-                                            if was_mapped:
-                                                # Find the original name
-                                                original_name = None
-                                                for log in mapping_log:
-                                                    if col_name in log:
-                                                        original_name = log.split("'")[1]  # Extract original name
-                                                        break
-                                                mapped_columns.append((col_name, col_info.description, original_name))
-                                            else:
-                                                present_columns.append((col_name, col_info.description))
-                                        else:
-                                            missing_columns.append((col_name, col_info.description))
+        with col1:
+            st.metric("On-Campus Residents", f"{on_campus:,}",
+                     f"{housing_utilization:.1f}%")
 
-                                    # Summary metrics
-                                    col1, col2, col3, col4 = st.columns(4)
-                                    with col1:
-                                        st.metric("📋 Total Catalog", "136 columns", help="Complete universal catalog size")
-                                    with col2:
-                                        st.metric("✅ Available", f"{len(mapped_columns) + len(present_columns)}",
-                                                 delta=f"{(len(mapped_columns) + len(present_columns))/136*100:.1f}%")
-                                    with col3:
-                                        st.metric("🔄 Mapped", f"{len(mapped_columns)}",
-                                                 help="Columns that were translated from different names")
-                                    with col4:
-                                        st.metric("⚠️ Missing", f"{len(missing_columns)}",
-                                                 delta=f"{len(missing_columns)/136*100:.1f}%", delta_color="inverse")
+        with col2:
+            st.metric("Off-Campus Students", f"{off_campus:,}",
+                     f"{metrics['off_campus_pct']:.1f}%")
 
-                                    st.markdown("---")
+        with col3:
+            if gpa_col and on_campus_gpa > 0:
+                st.metric("On-Campus Avg GPA", f"{on_campus_gpa:.2f}",
+                         delta=f"{on_campus_gpa - off_campus_gpa:+.2f}" if off_campus_gpa > 0 else None)
+            else:
+                st.metric("Housing Utilization", f"{housing_utilization:.1f}%")
 
-                                    # Create tabs for different statuses
-                                    status_tab1, status_tab2, status_tab3 = st.tabs(["✅ Available Columns", "🔄 Mapped Columns", "⚠️ Missing Columns"])
+        with col4:
+            if gpa_col and off_campus_gpa > 0:
+                st.metric("Off-Campus Avg GPA", f"{off_campus_gpa:.2f}",
+                         delta=f"{off_campus_gpa - on_campus_gpa:+.2f}" if on_campus_gpa > 0 else None)
+            else:
+                # Count unique residence halls if available
+                st.metric("Residence Options", f"{metrics['unique_residences']:,}")
 
-                                    with status_tab1:
-                                        st.markdown(f"**{len(present_columns)} columns present** with standard names (no mapping needed)")
-                                        if present_columns:
-                                            # Group by category
-                                            from universal_columns_catalog import UNIVERSAL_COLUMNS_CATALOG
-                                            for col_name, description in sorted(present_columns):
-                                                col_info = UNIVERSAL_COLUMNS_CATALOG.get(col_name, {})
-                                                category = col_info.category.value if hasattr(col_info, 'category') else 'Other'
-                                                st.markdown(f"- **`{col_name}`** ({category})")
-                                                if description:
-                                                    st.markdown(f"  <small style='color: #94a3b8;'>{description}</small>", unsafe_allow_html=True)
+        st.divider()
 
-                                    with status_tab2:
-                                        st.markdown(f"**{len(mapped_columns)} columns mapped** from non-standard names")
-                                        if mapped_columns:
-                                            for col_name, description, original_name in sorted(mapped_columns):
-                                                col_info = UNIVERSAL_COLUMNS_CATALOG.get(col_name, {})
-                                                category = col_info.category.value if hasattr(col_info, 'category') else 'Other'
-                                                st.markdown(f"- **`{original_name}`** → **`{col_name}`** ({category})")
-                                                if description:
-                                                    st.markdown(f"  <small style='color: #94a3b8;'>{description}</small>", unsafe_allow_html=True)
+        # AI Analysis Button and the cached LLM analysis it produces
+        _render_ai_analysis(df, metrics, 'housing')
+    else:
+        st.info("Housing data not available in current dataset. Please ensure your dataset includes housing-related columns (e.g., 'room_number', 'housing_status', 'residence_hall').")
 
-                                    with status_tab3:
-                                        st.markdown(f"**{len(missing_columns)} columns not present** in your dataset (optional columns)")
-                                        st.info("💡 These columns are part of the universal catalog but not in your current data file. The application will function normally with graceful fallbacks.")
 
-                                        if missing_columns:
-                                            # Group by category
-                                            missing_by_category = {}
-                                            for col_name, description in missing_columns:
-                                                col_info = UNIVERSAL_COLUMNS_CATALOG.get(col_name, {})
-                                                category = col_info.category.value if hasattr(col_info, 'category') else 'Other'
-                                                if category not in missing_by_category:
-                                                    missing_by_category[category] = []
-                                                missing_by_category[category].append((col_name, description))
+# ====================================================================================
+# TAB 7: FINANCIAL INTELLIGENCE - AI-DRIVEN
+# ====================================================================================
 
-                                            # Show by category
-                                            for category in sorted(missing_by_category.keys()):
-                                                with st.expander(f"📁 {category} ({len(missing_by_category[category])} columns)", expanded=False):
-                                                    for col_name, description in sorted(missing_by_category[category]):
-                                                        st.markdown(f"- **`{col_name}`**")
-                                                        if description:
-                                                            st.markdown(f"  <small style='color: #94a3b8;'>{description}</small>", unsafe_allow_html=True)
+@st.fragment
+def _render_tab_financial(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '💰 Financial Intelligence' tab"""
+    st.header("💰 Financial Intelligence - AI-Driven Deep Analysis")
+    st.caption("The AI analyzes financial sustainability, aid effectiveness, and revenue optimization strategies")
 
-                                except ImportError:
-                                    # Fallback if catalog not available
-                                    st.warning("⚠️ Universal catalog module not found. Showing basic mapping info.")
-                                    st.success(f"✅ Successfully mapped {len(mapping_log)} columns to standardized format")
-                                    for log_entry in mapping_log[:10]:
-                                        st.text(f"  • {log_entry}")
-                                    if len(mapping_log) > 10:
-                                        st.text(f"  ... and {len(mapping_log) - 10} more")
+    # Calculate financial metrics
+    total_tuition = metrics.get('total_tuition', 0)
+    total_aid = metrics.get('total_aid', 0)
+    aid_coverage_pct = metrics['aid_coverage_pct']
+    net_revenue = metrics['net_revenue']
+    aid_recipients = metrics['aid_recipients']
+
+    # Financial-focused metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Tuition", f"AED {total_tuition:,.0f}",
+                 help="Gross tuition revenue from all students")
+
+    with col2:
+        st.metric("Financial Aid", f"AED {total_aid:,.0f}",
+                 delta=f"-{aid_coverage_pct:.1f}%",
+                 delta_color="inverse",
+                 help="Total aid distributed to students")
+
+    with col3:
+        st.metric("Net Revenue", f"AED {net_revenue:,.0f}",
+                 help="Tuition revenue after aid distribution")
+
+    with col4:
+        if aid_recipients > 0:
+            st.metric("Aid Recipients", f"{aid_recipients:,}",
+                     f"{metrics['aid_recipients_pct']:.1f}%",
+                     help="Students receiving financial aid")
+        else:
+            st.metric("Aid Coverage", f"{aid_coverage_pct:.1f}%",
+                     help="Aid as percentage of tuition revenue")
 
-                    except Exception as e:
-                        st.error(f"❌ Error loading file: {e}")
+    st.divider()
+
+    # AI Analysis Button and the cached LLM analysis it produces
+    _render_ai_analysis(df, metrics, 'financial')
+
+
+# ====================================================================================
+# TAB 8: DEMOGRAPHICS DEEP DIVE - AI-DRIVEN
+# ====================================================================================
+
+@st.fragment
+def _render_tab_demographics(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '👥 Demographics' tab"""
+    st.header("👥 Demographics Deep Dive - AI-Driven Deep Analysis")
+    st.caption("The AI analyzes diversity patterns, market concentration risks, and inclusion strategies")
+
+    # Calculate demographic metrics
+    unique_nationalities = metrics.get('unique_nationalities', 0)
+    uae_nationals = metrics.get('uae_nationals', 0)
+    uae_percentage = metrics.get('uae_percentage', 0)
+    international_students = metrics['international_students']
+    top_3_concentration = metrics['top_3_concentration']
+    gender_distribution = metrics['gender_distribution']
+
+    # Demographics-focused metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Nationalities", f"{unique_nationalities}",
+                 help="Number of different nationalities represented")
+
+    with col2:
+        st.metric("UAE Nationals", f"{uae_nationals:,}",
+                 f"{uae_percentage:.1f}%",
+                 help="UAE national students")
+
+    with col3:
+        st.metric("International Students", f"{international_students:,}",
+                 f"{metrics['international_pct']:.1f}%",
+                 help="Non-UAE international students")
+
+    with col4:
+        if top_3_concentration > 0:
+            risk_level = "🔴 High" if top_3_concentration > 60 else "🟠 Moderate" if top_3_concentration > 50 else "🟢 Low"
+            st.metric("Top 3 Concentration", f"{top_3_concentration:.1f}%",
+                     help=f"Concentration risk: {risk_level}")
+        elif len(gender_distribution) > 0:
+            most_common_gender = max(gender_distribution, key=gender_distribution.get)
+            st.metric("Gender Balance", f"{most_common_gender}: {gender_distribution[most_common_gender]:,}",
+                     help="Gender distribution")
         else:
-            st.caption("Load a pre-built sample dataset")
+            st.metric("Diversity Index", f"{unique_nationalities}",
+                     help="Number of nationalities")
 
-            if st.session_state.get('data') is not None and st.session_state.get('uploaded_filename') == 'sample_dataset':
-                df = st.session_state.data
-                # Check if sample dataset is outdated (missing new required fields)
-                required_new_fields = ['visa_status', 'enrollment_type', 'room_number', 'occupancy_status']
-                missing_new_fields = [f for f in required_new_fields if f not in df.columns]
+    st.divider()
 
-                if missing_new_fields:
-                    st.warning(f"⚠️ Sample dataset is outdated (missing {len(missing_new_fields)} new fields)")
-                    if st.button("🔄 Reload Updated Sample Data", width="stretch", type="primary"):
-                        df = create_sample_dataset_v3_final()
-                        set_main_data(df)
-                        st.session_state.uploaded_filename = 'sample_dataset'
-                        st.success(f"✅ Loaded updated sample dataset with ALL REQUIRED FIELDS!")
-                        st.balloons()
-                        st.rerun()
-                else:
-                    st.success(f"✅ Sample dataset already loaded | {len(df)} rows × {len(df.columns)} columns")
-            elif st.button("🔥 Load Fresh Sample Data", width="stretch", type="primary"):
-                # INLINE generation to bypass all caching
-                np.random.seed(42)
-                n = 1000
-                nats = np.random.choice(['United Arab Emirates', 'India', 'Pakistan', 'Egypt', 'Jordan',
-                                        'Saudi Arabia', 'Philippines', 'United States', 'United Kingdom',
-                                        'Canada'], n, p=[0.45, 0.15, 0.10, 0.08, 0.05, 0.05, 0.04, 0.03, 0.03, 0.02])
-                housed = np.random.choice([True, False], n, p=[0.6, 0.4])
+    # AI Analysis Button and the cached LLM analysis it produces
+    _render_ai_analysis(df, metrics, 'demographics')
 
-                df = pd.DataFrame({
-                    'student_id': [f'S{i:05d}' for i in range(1, n + 1)],
-                    'cumulative_gpa': np.random.normal(3.0, 0.6, n).clip(0, 4.0),
-                    'nationality': nats,
-                    'enrollment_enrollment_status': np.random.choice(['Active', 'Graduated', 'On Leave'], n, p=[0.8, 0.15, 0.05]),
-                    'enrollment_tuition_amount': np.random.uniform(50000, 100000, n),
-                    'financial_aid_monetary_amount': np.random.choice([0, 15000, 25000, 40000, 60000], n, p=[0.4, 0.2, 0.2, 0.15, 0.05]),
-                    'gender': np.random.choice(['Male', 'Female'], n),
-                    'cohort_year': np.random.choice([2020, 2021, 2022, 2023, 2024], n),
-                    'visa_status': ['UAE National' if nat == 'United Arab Emirates' else np.random.choice(['Student Visa', 'Resident Visa', 'Family Visa'])
-                                   for nat in nats],
-                    'enrollment_type': np.random.choice(['Full-Time', 'Part-Time'], n, p=[0.85, 0.15]),
-                    'room_number': [f'R{i:04d}' if h else None for i, h in enumerate(housed, 1)],
-                    'occupancy_status': ['Occupied' if h else None for h in housed],
-                    'rent_amount': [np.random.uniform(8000, 15000) if h else 0 for h in housed],
-                })
 
-                st.session_state.data = df
-                st.session_state.mapping_log = ["Fresh inline data - all 13 columns"]
-                st.session_state.uploaded_filename = 'sample_dataset'
-                st.session_state.metrics = calculate_core_metrics(df)
+# ====================================================================================
+# TAB 9: RISK & SUCCESS ANALYSIS - AI-DRIVEN
+# ====================================================================================
 
-                st.success(f"✅ {len(df)} rows × {len(df.columns)} columns loaded!")
-                st.balloons()
-                st.rerun()
+@st.fragment
+def _render_tab_risk(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '⚠️ Risk & Success' tab"""
+    st.header("⚠️ Risk & Success Analysis - AI-Driven Deep Analysis")
+    st.caption("The AI analyzes at-risk patterns, success predictors, and intervention effectiveness")
 
-        st.divider()
+    # Calculate risk metrics
+    at_risk = metrics.get('at_risk', 0)
+    high_performers = metrics.get('high_performers', 0)
+    mid_performers = metrics['mid_tier_students']
+    success_rate = metrics['success_rate']
+    at_risk_pct = metrics['at_risk_pct']
+    high_perf_pct = metrics['high_perf_pct']
+    risk_severity = metrics['risk_severity']
 
-        # ====================================================================================
-        # COLUMN MAPPING STATUS (Always show, but content depends on data)
-        # ====================================================================================
-        st.markdown("### 📊 Column Mapping Status")
+    # Risk-focused metrics
+    col1, col2, col3, col4 = st.columns(4)
 
-        if st.session_state.get('data') is None:
-            # No data loaded yet
-            st.info("💡 Load data first to see column mapping status")
-            st.caption("The mapping status will appear here after you load data")
-        else:
-            # Get current data and mapping log
-            df = st.session_state.data
-            mapping_log = st.session_state.get('mapping_log', [])
+    with col1:
+        st.metric("At-Risk Students", f"{at_risk:,}",
+                 delta=f"{at_risk_pct:.1f}%",
+                 delta_color="inverse",
+                 help="Students with GPA < 2.0")
 
-            # Check if required journey fields exist
-            required_journey_fields = [
-                'financial_aid_monetary_amount', 'cohort_year', 'enrollment_enrollment_status',
-                'enrollment_tuition_amount', 'enrollment_type', 'occupancy_status'
-            ]
-            present_required = [f for f in required_journey_fields if f in df.columns]
-            missing_required = [f for f in required_journey_fields if f not in df.columns]
+    with col2:
+        st.metric("Mid-Tier Students", f"{mid_performers:,}",
+                 f"{metrics['mid_tier_pct']:.1f}%",
+                 help="Students with 2.0 ≤ GPA < 3.5")
 
-            # Show required fields status
-            if len(present_required) == len(required_journey_fields):
-                st.success(f"✅ All {len(required_journey_fields)} journey fields present")
-            elif present_required:
-                st.info(f"ℹ️ {len(present_required)}/{len(required_journey_fields)} journey fields found")
-                st.caption(f"Optional fields not in CSV: {', '.join(missing_required)}")
-            else:
-                st.error(f"❌ 0/{len(required_journey_fields)} fields found")
-                st.caption(f"Missing: {', '.join(missing_required)}")
+    with col3:
+        st.metric("High Performers", f"{high_performers:,}",
+                 delta=f"{high_perf_pct:.1f}%",
+                 help="Students with GPA ≥ 3.5")
 
-            # Show status based on data quality
-            if not mapping_log and missing_required:
-                # Mapping not applied AND missing required fields
-                st.info(f"ℹ️ Column mapping not yet applied")
-                if st.button("🔄 Apply Column Mapping Now", type="primary", width='stretch', key="force_mapping"):
-                    mapped_df, new_mapping_log = apply_universal_column_mapping(df)
-                    st.session_state.data = mapped_df
-                    st.session_state.mapping_log = new_mapping_log if new_mapping_log else ["No mappings needed - all columns standard"]
-                    st.session_state.metrics = calculate_core_metrics(mapped_df)
-                    st.rerun()
-            elif not mapping_log and not missing_required:
-                # No mapping log but data is already perfect
-                st.success("✅ All columns already using standard names")
-                st.caption("No mapping needed - dataset is ready!")
-                st.session_state.mapping_log = ["Dataset already has standard column names"]
-            elif mapping_log and isinstance(mapping_log, list) and len(mapping_log) > 0:
-                # Mapping was applied
-                if mapping_log[0] == "Dataset already has standard column names":
-                    st.success("✅ Dataset uses standard column names")
-                elif mapping_log[0] == "No mappings needed - all columns standard":
-                    st.success("✅ All columns already standardized")
-                else:
-                    st.success(f"✅ Column mapping completed: {len(mapping_log)} columns")
+    with col4:
+        st.metric("Risk Severity", risk_severity,
+                 f"Success: {success_rate:.1f}%",
+                 help="Risk level based on at-risk percentage")
 
-            try:
-                from universal_columns_catalog import UNIVERSAL_COLUMNS_CATALOG
+    st.divider()
 
-                # Quick summary counts
-                mapped_count = len([log for log in mapping_log if '→' in log])
-                available_count = len([col for col in UNIVERSAL_COLUMNS_CATALOG.keys() if col in df.columns])
-                total_catalog = len(UNIVERSAL_COLUMNS_CATALOG)
+    # AI Analysis Button and the cached LLM analysis it produces
+    _render_ai_analysis(df, metrics, 'risk')
 
-                # Display summary metrics
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("✅ Available", f"{available_count}/{total_catalog}",
-                             delta=f"{available_count/total_catalog*100:.0f}%")
-                with col2:
-                    st.metric("🔄 Mapped", mapped_count,
-                             help="Columns translated from different names")
 
-                # Show mapping log in expander
-                if mapping_log:
-                    with st.expander(f"📋 View Mapping Details ({len(mapping_log)} mappings)", expanded=False):
-                        st.caption("Columns that were automatically standardized:")
-                        for log_entry in mapping_log:
-                            st.text(f"  • {log_entry}")
-                else:
-                    st.caption("✨ All columns already using standard names")
+# ====================================================================================
+# TAB 10: DATA LINEAGE & GENERATIVE DATA PROFILING
+# ====================================================================================
 
-                # Show detailed catalog status
-                with st.expander("🔍 Complete Catalog Status (136 columns)", expanded=False):
-                    # Categorize columns by status
-                    mapped_columns = []
-                    present_columns = []
-                    missing_columns = []
+@st.fragment
+def _render_tab_data_lineage(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '🔗 Data Lineage' tab"""
+    st.header("🔗 Data Lineage & Architecture")
 
-                    for col_name, col_info in UNIVERSAL_COLUMNS_CATALOG.items():
-                        if col_name in df.columns:
-                            was_mapped = any(col_name in log for log in mapping_log)
-                            if was_mapped:
-                                # Find the original name
-                                original_name = None
-                                for log in mapping_log:
-                                    if col_name in log:
-                                        original_name = log.split("'")[1]
-                                        break
-                                mapped_columns.append((col_name, col_info.description, original_name))
-                            else:
-                                present_columns.append((col_name, col_info.description))
-                        else:
-                            missing_columns.append((col_name, col_info.description))
+    st.info("📊 Dataset Overview - Comprehensive Statistics")
 
-                    # Create tabs
-                    tab1, tab2, tab3 = st.tabs([
-                        f"✅ Present ({len(present_columns)})",
-                        f"🔄 Mapped ({len(mapped_columns)})",
-                        f"⚠️ Missing ({len(missing_columns)})"
-                    ])
+    # Full-frame scans are cached per dataset, so widget reruns don't repeat them
+    stats = lineage_stats(dataset_key(df), df)
 
-                    with tab1:
-                        if present_columns:
-                            for col_name, description in sorted(present_columns)[:10]:
-                                st.caption(f"• `{col_name}`")
-                            if len(present_columns) > 10:
-                                st.caption(f"... and {len(present_columns) - 10} more")
-                        else:
-                            st.caption("No columns present with standard names")
+    # Overall table statistics
+    col1, col2, col3, col4 = st.columns(4)
 
-                    with tab2:
-                        if mapped_columns:
-                            for col_name, description, original_name in sorted(mapped_columns)[:10]:
-                                st.caption(f"• `{original_name}` → `{col_name}`")
-                            if len(mapped_columns) > 10:
-                                st.caption(f"... and {len(mapped_columns) - 10} more")
-                        else:
-                            st.caption("No columns were mapped")
+    with col1:
+        st.metric("Total Records", f"{len(df):,}")
 
-                    with tab3:
-                        if missing_columns:
-                            st.caption(f"📌 {len(missing_columns)} optional columns not in dataset")
-                            for col_name, description in sorted(missing_columns)[:5]:
-                                st.caption(f"• `{col_name}`")
-                            if len(missing_columns) > 5:
-                                st.caption(f"... and {len(missing_columns) - 5} more")
-                        else:
-                            st.caption("All catalog columns are present!")
+    with col2:
+        st.metric("Total Columns", len(df.columns))
 
-            except ImportError:
-                st.caption("📊 Column mapping applied")
-                if mapping_log:
-                    st.caption(f"✅ {len(mapping_log)} columns standardized")
+    with col3:
+        completeness = (stats['counts'].sum() / (len(df) * len(df.columns)) * 100)
+        st.metric("Completeness", f"{completeness:.1f}%")
 
-        st.divider()
+    with col4:
+        st.metric("Memory Usage", f"{stats['memory_mb']:.2f} MB")
 
-        # ====================================================================================
-        # AI CONFIGURATION (From gen_storytelling_app.py lines 1648-1768)
-        # ====================================================================================
-        st.markdown("### 🤖 AI Configuration")
-        st.markdown("**Ollama Server Location**")
+    st.divider()
 
-        previous_server_type = st.session_state.get('previous_ollama_server_type', None)
+    # ========== GENERATIVE DATA PROFILING WITH LLM ==========
+    st.subheader("🤖 Generative Data Profiling")
 
-        server_type = st.radio(
-            "Server Type",
-            options=["Cloudflare", "Local"],
-            index=0 if st.session_state.ollama_server_type == "Cloudflare" else 1,
-            help="Choose between Cloudflare (remote) or Local Ollama server",
-            horizontal=True,
-            label_visibility="collapsed"
+    # Analysis mode selection
+    analysis_mode = "Quick Analysis"
+    if len(df.columns) > 30:
+        st.markdown("### 🎯 Analysis Mode")
+        analysis_mode = st.radio(
+            "Choose analysis approach:",
+            ["Quick Analysis (Fast, top insights)", "Comprehensive Analysis (Detailed, all aspects)"],
+            key="profiling_mode",
+            help="**Quick**: Fast analysis with key insights (1-2 min)\n\n**Comprehensive**: Thorough analysis with detailed recommendations (3-5 min)"
         )
 
-        server_type_changed = (previous_server_type is not None and
-                               previous_server_type != server_type)
+    if st.session_state.ollama_connected and st.button("🔬 Generate AI Data Profile", key="lineage_btn", type="primary", width='stretch'):
+        # Test connection first
+        st.info(f"🔍 Testing connection to: {url}")
+        try:
+            test_response = get_ollama_session(url).get(f"{url}/api/tags", timeout=10)
+            if test_response.status_code == 200:
+                st.success(f"✅ Connection OK - Model: {model}")
+            else:
+                st.error(f"❌ Connection failed: HTTP {test_response.status_code}")
+                st.stop()
+        except Exception as conn_err:
+            st.error(f"❌ Connection test failed: {str(conn_err)}")
+            st.warning("💡 Make sure Ollama is running and accessible")
+            st.stop()
 
-        st.session_state.ollama_server_type = server_type
-        st.session_state.previous_ollama_server_type = server_type
+        # Show estimated time
+        use_comprehensive = "Comprehensive" in analysis_mode
 
-        if server_type == "Cloudflare":
-            st.caption("☁️ Using Cloudflare Ollama")
-            default_url = "https://ollama.exaliotechcom.uk"
+        # Calculate dynamic timeout based on dataset size
+        is_large_dataset = len(df.columns) > 100
+        base_timeout = 240 if is_large_dataset else 180
+
+        if use_comprehensive:
+            est_time = "4-6 minutes" if is_large_dataset else "3-5 minutes"
+            st.info(f"⏱️ **Comprehensive Mode**: Estimated time {est_time} with {model}")
         else:
-            st.caption("💻 Using Local Ollama")
-            default_url = "http://localhost:11434"
+            est_time = "2-4 minutes" if is_large_dataset else "1-2 minutes"
+            st.info(f"⚡ **Quick Mode**: Estimated time {est_time} with {model}")
 
-        st.caption(f"🏠 URL: {default_url}")
+        if is_large_dataset:
+            st.warning(f"⚠️ Large dataset detected ({len(df.columns)} columns). Analysis will take longer. Please be patient...")
 
-        if st.session_state.get('ollama_url') != default_url:
-            if 'custom_url_set' not in st.session_state:
-                st.session_state.ollama_url = default_url
-                st.session_state.ollama_connected = False
-                server_type_changed = True
+        # Prepare comprehensive data profile for LLM
+        with st.spinner("🔄 Phase 1/3: Analyzing dataset structure..."):
+            st.info(f"📊 Analyzing {len(df):,} records with {len(df.columns)} columns...")
 
-        if server_type_changed:
-            with st.spinner(f"🔄 Switching to {server_type} Ollama..."):
-                import time
-                health = verify_ollama_health(default_url)
-                if health['connected']:
-                    st.session_state.ollama_connected = True
-                    st.session_state.ollama_url = default_url
-                    st.success(f"✅ Connected to {server_type} Ollama")
-                    st.caption(f"📦 Found {health['model_count']} model(s)")
-                    time.sleep(0.5)
-                    st.rerun()
-                else:
-                    st.session_state.ollama_connected = False
-                    st.session_state.ollama_url = default_url
-                    st.error(f"❌ Failed to connect to {server_type} Ollama")
-                    st.caption(f"Error: {health.get('error', 'Unknown error')}")
-                    time.sleep(0.5)
-                    st.rerun()
+            # Calculate detailed statistics
+            numeric_cols = stats['numeric_cols']
+            categorical_cols = stats['categorical_cols']
+            datetime_cols = stats['datetime_cols']
 
-        with st.expander("🔧 Advanced: Custom URL"):
-            ollama_url = st.text_input(
-                "Custom Ollama URL",
-                value=st.session_state.get('ollama_url', default_url),
-                help="URL of your Ollama server"
-            )
-            if ollama_url != default_url:
-                st.session_state.custom_url_set = True
-            else:
-                st.session_state.pop('custom_url_set', None)
+            duplicate_rows = df.duplicated().sum()
+            columns_with_nulls = int((stats['nulls'] > 0).sum())
 
-            st.session_state.ollama_url = ollama_url
+            # Get missing data statistics
+            missing_by_col = stats['nulls']
+            missing_pct = (missing_by_col / len(df) * 100).round(2)
+            missing_df = pd.DataFrame({
+                'Column': missing_by_col.index,
+                'Missing Count': missing_by_col.values,
+                'Missing %': missing_pct.values
+            }).sort_values('Missing Count', ascending=False).head(15)
 
-            if st.button("Test Connection", width="stretch"):
-                with st.spinner("Testing connection..."):
-                    health = verify_ollama_health(ollama_url)
-                    if health['connected']:
-                        st.success(f"✅ Connected! Found {health['model_count']} models")
-                        st.session_state.ollama_connected = True
-                    else:
-                        st.error(f"❌ Connection failed: {health.get('error', 'Unknown error')}")
-                        st.session_state.ollama_connected = False
+            # Get sample columns (limit to 15 for large datasets to reduce prompt size)
+            sample_limit = 15 if is_large_dataset else 25
+            columns_sample = ', '.join(stats['columns'][:sample_limit])
+            if len(df.columns) > sample_limit:
+                columns_sample += f"... (+{len(df.columns) - sample_limit} more)"
 
-        if 'ollama_url' not in st.session_state:
-            st.session_state.ollama_url = default_url
+            # Calculate cardinality
+            high_cardinality_cols = [col for col, n_unique in stats['unique'].items() if n_unique / len(df) > 0.9]
+            low_cardinality_cols = [col for col, n_unique in stats['unique'].items() if n_unique < 20]
 
-        st.markdown("**Select AI Model**")
+            # Get data type summary
+            dtype_summary = df.dtypes.value_counts().to_string()
 
-        # Custom CSS for BLACK text in model dropdown - AGGRESSIVE OVERRIDE
-        st.markdown("""
-        <style>
-        /* FORCE BLACK TEXT - Override everything */
-        .stSelectbox, .stSelectbox * {
-            color: #000000 !important;
-        }
+            st.success(f"✅ Phase 1 complete: Identified {len(numeric_cols)} numeric, {len(categorical_cols)} categorical, {len(datetime_cols)} datetime columns")
 
-        /* Select input field */
-        .stSelectbox [data-baseweb="select"] {
-            background-color: #ffffff !important;
-        }
+        # Generate LLM insights
+        with st.spinner("🔄 Phase 2/3: Generating AI-powered insights..."):
+            st.info("🧠 LLM analyzing data patterns, quality, and business context...")
 
-        /* All text inside selectbox */
-        .stSelectbox div, .stSelectbox span, .stSelectbox p {
-            color: #000000 !important;
-        }
+            if use_comprehensive:
+                # Comprehensive mode - DEEP analysis (optimized for large datasets)
+                missing_data_rows = 10 if is_large_dataset else 15
+
+                # Get additional statistics for richer analysis
+                complete_cols = int((stats['nulls'] == 0).sum())
+                total_missing = stats['nulls'].sum()
+
+                # Get top 5 numeric columns by name for context
+                numeric_sample = ', '.join(numeric_cols[:5]) if numeric_cols else 'None'
+                categorical_sample = ', '.join(categorical_cols[:5]) if categorical_cols else 'None'
+
+                # Calculate additional depth statistics for comprehensive mode
+                # 1. Correlation analysis for numeric columns
+                correlation_insight = "No numeric columns"
+                if len(numeric_cols) >= 2:
+                    corr_matrix = df[numeric_cols[:10]].corr()  # Top 10 to avoid overload
+                    high_corr = []
+                    for i in range(len(corr_matrix.columns)):
+                        for j in range(i+1, len(corr_matrix.columns)):
+                            corr_val = corr_matrix.iloc[i, j]
+                            if abs(corr_val) > 0.7:
+                                high_corr.append(f"{corr_matrix.columns[i]} ↔ {corr_matrix.columns[j]} ({corr_val:.2f})")
+                    correlation_insight = ', '.join(high_corr[:5]) if high_corr else "No strong correlations found (>0.7)"
+
+                # 2. Distribution statistics for numeric columns
+                distribution_stats = ""
+                if numeric_cols:
+                    skewness_high = []
+                    for col in numeric_cols[:5]:
+                        skew = df[col].skew()
+                        if abs(skew) > 1:
+                            skewness_high.append(f"{col}({skew:.2f})")
+                    distribution_stats = f"Skewed distributions: {', '.join(skewness_high)}" if skewness_high else "Distributions appear normal"
+
+                # 3. Outlier detection
+                outlier_info = ""
+                if numeric_cols:
+                    outlier_cols = []
+                    for col in numeric_cols[:5]:
+                        Q1 = df[col].quantile(0.25)
+                        Q3 = df[col].quantile(0.75)
+                        IQR = Q3 - Q1
+                        outliers = ((df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))).sum()
+                        if outliers > 0:
+                            outlier_cols.append(f"{col}({outliers})")
+                    outlier_info = f"Columns with outliers: {', '.join(outlier_cols)}" if outlier_cols else "No significant outliers"
+
+                # 4. Categorical column analysis
+                categorical_insights = ""
+                if categorical_cols:
+                    high_cat_diversity = []
+                    low_cat_diversity = []
+                    for col in categorical_cols[:5]:
+                        unique_ratio = df[col].nunique() / len(df)
+                        if unique_ratio > 0.5:
+                            high_cat_diversity.append(col)
+                        elif unique_ratio < 0.05:
+                            low_cat_diversity.append(col)
+                    categorical_insights = f"High diversity: {', '.join(high_cat_diversity) or 'None'} | Low diversity: {', '.join(low_cat_diversity) or 'None'}"
+
+                prompt = f"""You are a senior data profiling expert. Analyze this student dataset and provide structured, deterministic output.
 
-        /* Dropdown options */
-        [data-baseweb="popover"] li,
-        [data-baseweb="popover"] div,
-        [data-baseweb="popover"] span {
-            color: #000000 !important;
-            background-color: #ffffff !important;
-        }
+**CRITICAL INSTRUCTIONS FOR REPRODUCIBLE OUTPUT:**
+1. Use ONLY the data provided below - do not make assumptions
+2. Follow the EXACT section structure and format specified
+3. Cite specific column names from the data
+4. Use factual, objective language
+5. Keep analysis consistent and deterministic
 
-        /* Selected value display */
-        [data-baseweb="select"] > div > div {
-            color: #000000 !important;
-        }
+**DATASET METRICS:**
+- Total Records: {len(df):,}
+- Total Attributes: {len(df.columns)}
+- Data Completeness: {completeness:.1f}%
+- Missing Cells: {total_missing:,} ({(total_missing/(len(df)*len(df.columns))*100):.2f}% of all cells)
+- Complete Columns: {complete_cols}/{len(df.columns)} ({(complete_cols/len(df.columns)*100):.1f}%)
+- Duplicate Rows: {duplicate_rows:,} ({(duplicate_rows/len(df)*100):.2f}%)
 
-        /* All listbox items */
-        ul[role="listbox"] li,
-        ul[role="listbox"] div,
-        ul[role="listbox"] span {
-            color: #000000 !important;
-        }
+**COLUMN TYPES:**
+- Numeric: {len(numeric_cols)} columns - Examples: {numeric_sample}
+- Categorical: {len(categorical_cols)} columns - Examples: {categorical_sample}
+- Datetime: {len(datetime_cols)} columns
+- High Cardinality (IDs): {len(high_cardinality_cols)} columns
+- Low Cardinality (Categories): {len(low_cardinality_cols)} columns
 
-        /* Nuclear option - force ALL sidebar selectboxes to black */
-        [data-testid="stSidebar"] .stSelectbox * {
-            color: #000000 !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+**COLUMN NAMES (First 25):** {columns_sample}
 
-        if st.session_state.get('ollama_connected'):
-            models = get_available_models(st.session_state.ollama_url)
-            if models:
-                selected_model = st.selectbox(
-                    "Model",
-                    options=models,
-                    index=0,
-                    help="Choose the LLM model for narrative generation",
-                    label_visibility="collapsed"
-                )
-                st.session_state.selected_model = selected_model
-                st.success(f"✅ Using: {selected_model}")
+**STATISTICAL ANALYSIS:**
+- Strong Correlations (>0.7): {correlation_insight}
+- Skewed Distributions (|skew|>1): {distribution_stats}
+- Outliers Detected (IQR method): {outlier_info}
+- Categorical Diversity Analysis: {categorical_insights}
 
-                # Model recommendations for deep analysis
-                st.caption("💡 **For Deep Analysis:**")
-                if any(x in selected_model.lower() for x in ['llama3.1:70b', 'qwen2.5:72b', 'mixtral:8x22b']):
-                    st.caption("🟢 Excellent - Large model ideal for comprehensive insights")
-                elif any(x in selected_model.lower() for x in ['llama3.1', 'qwen2.5:32b', 'gemma2:27b']):
-                    st.caption("🟡 Good - Balanced performance and quality")
-                else:
-                    st.caption("🟠 Basic - Consider larger model for richer analysis")
-                    with st.expander("📋 Recommended Models"):
-                        st.markdown("""
-                        **For Best Deep Analysis:**
-                        - `llama3.1:70b` - Excellent reasoning
-                        - `qwen2.5:72b` - Superior analytics
-                        - `qwen2.5:32b` - Balanced (good speed/quality)
-
-                        **Pull command:**
-                        ```bash
-                        ollama pull qwen2.5:32b
-                        ```
-                        """)
-            else:
-                st.warning("No models found. Please pull a model first.")
-        else:
-            health = verify_ollama_health(st.session_state.ollama_url)
-            if health['connected']:
-                st.session_state.ollama_connected = True
-                models = get_available_models(st.session_state.ollama_url)
-                if models:
-                    st.session_state.selected_model = models[0]
-                    st.success(f"✅ Auto-connected: {models[0]}")
-            else:
-                st.info("👆 Configure connection above")
+**TOP MISSING DATA ({missing_data_rows} columns):**
+{missing_df.head(missing_data_rows).to_string(index=False)}
 
-    # Main content area - Show welcome message if no data
-    if st.session_state.data is None:
-        st.markdown("""
-        <div style='text-align: center; padding: 3rem 2rem;'>
-            <h2 style='color: #6366f1; margin-bottom: 1rem;'>🎓 Welcome to Student 360 AI-Powered Analytics</h2>
-            <p style='font-size: 1.2rem; color: #94a3b8; margin-bottom: 2rem;'>
-                Your intelligent analytics dashboard powered by advanced AI
-            </p>
-            <p style='font-size: 1rem; color: #e2e8f0; margin-bottom: 0.5rem;'>
-                👈 Check the sidebar's <strong>Getting Started</strong> section to begin
-            </p>
-            <p style='font-size: 0.9rem; color: #94a3b8;'>
-                Configure Ollama connection → Select AI model → Upload student data
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+**OUTPUT REQUIREMENTS:**
+Provide exactly 8 sections using markdown headers (##). Be specific, factual, and deterministic. Use 600 words maximum.
 
-        # Show key features
-        st.divider()
-        st.markdown("### ✨ Key Features")
+**SECTION TEMPLATES (Follow exactly):**
 
-        col1, col2, col3 = st.columns(3)
+## 1. Dataset Purpose & Scope
+**Purpose**: [2-3 sentences describing what this dataset represents]
+**Temporal Scope**: [Time period, refresh frequency]
+**Stakeholders**: [Who uses this data]
+**Integration**: [System integration points inferred from columns]
 
-        with col1:
-            st.markdown("""
-            <div style='background: rgba(99, 102, 241, 0.1); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #6366f1;'>
-                <h4 style='color: #818cf8; margin-top: 0;'>🤖 AI-Driven Insights</h4>
-                <p style='color: #cbd5e1; margin-bottom: 0; font-size: 0.9rem;'>
-                    LLM analyzes your data and recommends optimal visualizations dynamically
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+## 2. Data Domain Breakdown
+**Academic Domain** ({len([c for c in df.columns if any(x in c.lower() for x in ['grade', 'gpa', 'course', 'credit', 'enrollment'])])} columns):
+- Columns: [List actual column names found]
+- Metrics: [What is measured]
 
-        with col2:
-            st.markdown("""
-            <div style='background: rgba(16, 185, 129, 0.1); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #10b981;'>
-                <h4 style='color: #34d399; margin-top: 0;'>📊 Dynamic Analytics</h4>
-                <p style='color: #cbd5e1; margin-bottom: 0; font-size: 0.9rem;'>
-                    Adaptive visualizations that change based on your specific data patterns
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+**Financial Domain** ({len([c for c in df.columns if any(x in c.lower() for x in ['amount', 'fee', 'aid', 'tuition', 'payment'])])} columns):
+- Columns: [List actual column names found]
+- Metrics: [Revenue vs cost identification]
 
-        with col3:
-            st.markdown("""
-            <div style='background: rgba(245, 158, 11, 0.1); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #f59e0b;'>
-                <h4 style='color: #fbbf24; margin-top: 0;'>🎯 Strategic Intelligence</h4>
-                <p style='color: #cbd5e1; margin-bottom: 0; font-size: 0.9rem;'>
-                    Comprehensive analysis across academics, financials, and student success
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+**Demographics** ({len([c for c in df.columns if any(x in c.lower() for x in ['age', 'gender', 'name', 'nationality', 'email', 'phone'])])} columns):
+- Columns: [List actual column names found]
+- Completeness: [Assess completeness]
 
-        return
+**Other Domains**:
+- [Any other domains with column examples]
 
-    # Get current data
-    df = st.session_state.data
+## 3. Data Quality Assessment
+**Completeness**: {completeness:.1f}% overall
+- Domain breakdown: [Which domains complete/incomplete]
+- Root cause: [Why data is missing]
 
-    # Apply column mapping - check if required fields exist
-    # This ensures mapping is applied even if user has old data
-    required_journey_fields = [
-        'financial_aid_monetary_amount', 'cohort_year', 'enrollment_enrollment_status',
-        'enrollment_tuition_amount', 'enrollment_type', 'occupancy_status'
-    ]
-    missing_required = [f for f in required_journey_fields if f not in df.columns]
+**Missing Pattern Type**: [MCAR/MAR/MNAR] because [reasoning based on missing data table]
 
-    # Apply mapping if: no mapping_log exists OR required fields are missing
-    if ('mapping_log' not in st.session_state or st.session_state.mapping_log is None) or missing_required:
-        df, mapping_log = apply_universal_column_mapping(df)
-        st.session_state.data = df
+**Duplicates**: {duplicate_rows:,} records ({(duplicate_rows/len(df)*100):.2f}%)
+- Assessment: [Legitimate vs data quality issue]
 
-        # Recheck missing fields after mapping
-        still_missing = [f for f in required_journey_fields if f not in df.columns]
+**Correlations**: {correlation_insight}
+- Business sense check: [Do correlations make sense?]
 
-        if mapping_log and len(mapping_log) > 0:
-            st.session_state.mapping_log = mapping_log
-            st.info(f"🔄 Applied column mapping: {len(mapping_log)} columns standardized")
-        else:
-            st.session_state.mapping_log = ["Dataset already has standard column names"]
-            st.success("✅ Dataset already uses standard column names")
+**Distributions**: {distribution_stats}
+- Implications: [What skewness indicates]
 
-        # If fields still missing after mapping, show informational message
-        if still_missing:
-            st.info(f"""
-            ℹ️ **Dataset Information**: Your CSV file doesn't include {len(still_missing)} optional column(s):
-            {', '.join([f'`{field}`' for field in still_missing])}
+**Outliers**: {outlier_info}
+- Assessment: [Errors or valid edge cases?]
 
-            Most analyses will work normally. Some advanced journey generation features may have limited data availability.
+**Severity**: [Critical/High/Medium/Low] because [justification]
 
-            💡 **Tip**: If you need these fields, please ensure your source CSV file includes them before uploading.
-            """)
+## 4. Column Relationships
+**Primary Keys**: [List high-cardinality columns] - These are PKs because [reason]
+**Foreign Keys**: [Potential FK relationships identified]
+**Derived Columns**: [Calculated/derived columns] vs Source: [source columns]
+**Hierarchies**: [Parent-child relationships]
+**Temporal**: [Time-series patterns]
 
-    # FORCE RECALCULATION: Always recalculate metrics to ensure fresh data
-    # This fixes issues with stale cached metrics (especially UAE nationals)
-    metrics = calculate_core_metrics(df)
-    st.session_state.metrics = metrics  # Update session state with fresh metrics
+## 5. Business Intelligence Value
+**Predictive Analytics**: Can predict [specific outcomes]. Key features: [column names]
+**Segmentation**: Students can be segmented by [specific criteria/columns]
+**Financial**: [Revenue forecasting/aid optimization opportunities with columns]
+**Operations**: [Process improvements from columns]
+**Compliance**: [FERPA/regulatory capabilities]
+**KPIs**: [List calculable KPIs from columns]
 
-    model = st.session_state.selected_model
-    url = st.session_state.ollama_url
+## 6. Action Plan
+**CRITICAL** (today):
+1. [Column]: [Problem] → [Solution] → [Outcome]
+2. [Column]: [Problem] → [Solution] → [Outcome]
+3. [Column]: [Problem] → [Solution] → [Outcome]
 
-    # Application tabs
-    tabs = st.tabs([
-        "📊 Executive Summary",
-        "📖 Data Storytelling AI Driven with Template Guidance",
-        "🔬 Data Storytelling Fully AI Driven",
-        "📚 Data Storytelling (PreDefined+LLM Narrative)",
-        "🎓 Academic Analytics",
-        "🏠 Housing Insights",
-        "💰 Financial Intelligence",
-        "👥 Demographics",
-        "⚠️ Risk & Success",
-        "🔗 Data Lineage",
-        "🔬 Data Explorer"
-    ])
+**HIGH** (this week):
+1. [Column/Domain]: [Issue] → [Fix] → [Impact]
+2. [Column/Domain]: [Issue] → [Fix] → [Impact]
 
-    # ====================================================================================
-    # TAB 1: TRUE LLM-DRIVEN EXECUTIVE SUMMARY
-    # ====================================================================================
-    with tabs[0]:
-        st.header("🤖 Executive Summary - AI-Driven Dynamic Analytics")
-        st.markdown("*The AI analyzes your data and decides what visualizations to create*")
+**MEDIUM** (this month):
+1. [Specific improvement]
+2. [Specific improvement]
 
-        # Description box
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, rgba(99, 102, 241, 0.15), rgba(139, 92, 246, 0.15)); padding: 1.2rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid #6366f1;'>
-            <strong>🧠 True LLM-Driven Approach:</strong> Unlike traditional dashboards where developers hardcode which graphs to show,
-            this system asks the <strong>AI to analyze your {metrics.get('total_students', 0):,} students</strong> and <strong>recommend the most insightful visualizations</strong>.
-            The LLM acts as your data analyst, choosing graph types, data columns, and insights based on what patterns it finds in YOUR data.
-        </div>
-        """, unsafe_allow_html=True)
+**LOW** (backlog):
+1. [Enhancement]
 
-        if not st.session_state.ollama_connected:
-            st.warning("⚠️ Connect to Ollama to enable AI-driven dynamic visualization generation")
+## 7. Risk Assessment
+**Decision Risk**: With {completeness:.1f}% completeness, [specific unsafe decisions]
+**Bias Risk**: Missing data in [columns] could bias [specific analyses]
+**Compliance**: [FERPA/privacy concerns with columns]
+**Financial**: [Specific financial risks from data quality]
+**Operational**: [Process failures possible]
+**Reputational**: [Consequences of wrong decisions]
+**Opportunity**: [Impossible insights listed]
 
-        # Generate dynamic visualizations button
-        if st.session_state.ollama_connected:
-            if st.button("🤖 Let AI Analyze Data & Create Visualizations", key="exec_dynamic_btn", type="primary", width="stretch"):
-                with st.spinner("🔄 AI is analyzing your data, identifying patterns, and recommending optimal visualizations... This may take 20-40 seconds"):
-                    viz_result = generate_dynamic_visualizations_llm(metrics, df, model, url, context_type="executive_summary")
-                    st.session_state.llm_cache['exec_dynamic_viz'] = viz_result
+## 8. Visualization Recommendations
+1. **[Chart Type]** of [Column X] vs [Column Y] → Reveals: [Specific insight]
+2. **[Chart Type]** of [Columns] grouped by [Column] → Shows: [Pattern]
+3. **[Chart Type]** for [Columns] → Identifies: [Issue]
+4. **[Chart Type]** tracking [Metrics] over [Time column] → Monitors: [KPI]
+5. **[Chart Type]** with [Dimensions] → Supports: [Decision]
 
-        # Display AI-generated visualizations if available
-        if 'exec_dynamic_viz' in st.session_state.llm_cache:
-            viz_result = st.session_state.llm_cache['exec_dynamic_viz']
+**CONSISTENCY RULES:**
+- Always reference actual column names in brackets
+- Use quantitative evidence (percentages, counts)
+- Follow section templates exactly
+- Be deterministic and factual"""
 
-            # AI Strategic Overview
-            st.markdown(f"""
-            <div class="insight-card" style="background: linear-gradient(135deg, rgba(99, 102, 241, 0.15), rgba(139, 92, 246, 0.15)); border-left: 4px solid #6366f1; margin-bottom: 2rem;">
-                <div class="insight-title">🎯 AI Strategic Analysis</div>
-                <div class="insight-text" style="font-size: 1.1rem; line-height: 1.8;">{viz_result.get('strategic_overview', '')}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            else:
+                # Quick mode - focused analysis (optimized for large datasets)
+                # For large datasets, reduce the missing data table size
+                missing_data_rows = 5 if is_large_dataset else 10
 
-            st.divider()
+                # Get additional context for quick mode
+                complete_cols = int((stats['nulls'] == 0).sum())
+                total_missing = stats['nulls'].sum()
 
-            # Key Metrics Dashboard (Static - Always show core metrics)
-            st.markdown("### 📊 Core Institutional Metrics")
+                # Get examples of each type
+                numeric_sample = ', '.join(numeric_cols[:3]) if numeric_cols else 'None'
+                categorical_sample = ', '.join(categorical_cols[:3]) if categorical_cols else 'None'
 
-            col1, col2, col3, col4, col5 = st.columns(5)
-            with col1:
-                st.metric("Total Students", f"{metrics.get('total_students', 0):,}")
-            with col2:
-                st.metric("Average GPA", f"{metrics.get('avg_gpa', 0):.2f}")
-            with col3:
-                st.metric("High Performers", f"{metrics.get('high_performers', 0):,}",
-                         f"{metrics.get('high_performers', 0)/metrics.get('total_students', 1)*100:.1f}%")
-            with col4:
-                st.metric("UAE Nationals", f"{metrics.get('uae_percentage', 0):.1f}%")
-            with col5:
-                st.metric("At-Risk", f"{metrics.get('at_risk', 0):,}",
-                         f"{metrics.get('at_risk', 0)/metrics.get('total_students', 1)*100:.1f}%",
-                         delta_color="inverse")
-
-            col1, col2, col3, col4, col5 = st.columns(5)
-            with col1:
-                st.metric("Nationalities", metrics.get('unique_nationalities', 0))
-            with col2:
-                st.metric("Tuition Revenue", f"AED {metrics.get('total_tuition', 0)/1000000:.1f}M")
-            with col3:
-                st.metric("Financial Aid", f"AED {metrics.get('total_aid', 0)/1000000:.1f}M")
-            with col4:
-                st.metric("Aid Coverage", f"{metrics.get('aid_coverage_pct', 0):.1f}%")
-            with col5:
-                st.metric("Revenue/Student", f"AED {metrics.get('total_tuition', 0)/metrics.get('total_students', 1) if metrics.get('total_students', 0) > 0 else 0:,.0f}")
+                prompt = f"""You are a data profiling expert. Provide quick, structured analysis of this student dataset.
 
-            st.divider()
+**REPRODUCIBILITY INSTRUCTIONS:**
+1. Use ONLY provided data - no assumptions
+2. Follow exact section structure below
+3. Cite specific column names
+4. Be factual and deterministic
+5. Keep output consistent across runs
 
-            # ========================================================================
-            # DYNAMIC AI-RECOMMENDED VISUALIZATIONS
-            # ========================================================================
-            st.markdown("### 📈 AI-Recommended Visualizations")
-            st.caption(f"The AI analyzed your data and recommends {len(viz_result.get('visualizations', []))} visualizations")
+**DATASET SUMMARY:**
+- Rows: {len(df):,} | Columns: {len(df.columns)} | Completeness: {completeness:.1f}%
+- Missing Cells: {total_missing:,} | Duplicates: {duplicate_rows:,}
+- Complete Columns: {complete_cols}/{len(df.columns)}
 
-            visualizations = viz_result.get('visualizations', [])
+**COLUMN TYPES:**
+- Numeric: {len(numeric_cols)} (Examples: {numeric_sample})
+- Categorical: {len(categorical_cols)} (Examples: {categorical_sample})
+- High Cardinality: {len(high_cardinality_cols)} (IDs)
 
-            if visualizations:
-                # Display visualizations in grid (2 columns)
-                for idx in range(0, len(visualizations), 2):
-                    cols = st.columns(2)
+**COLUMNS (First 25):** {columns_sample}
 
-                    for col_idx, col in enumerate(cols):
-                        viz_idx = idx + col_idx
-                        if viz_idx < len(visualizations):
-                            viz_spec = visualizations[viz_idx]
+**TOP MISSING DATA ({missing_data_rows} most affected):**
+{missing_df.head(missing_data_rows).to_string(index=False)}
 
-                            with col:
-                                st.markdown(f"#### {viz_spec.get('title', 'Visualization')}")
-                                st.caption(f"**Why this matters:** {viz_spec.get('reasoning', '')}")
+**OUTPUT FORMAT (Follow exactly - 250 words max):**
 
-                                # Build dynamic chart from AI specification
-                                chart = build_dynamic_chart(viz_spec, df)
+## 1. Dataset Overview
+[2-3 sentence factual description of dataset purpose and scope]
 
-                                if chart:
-                                    st.plotly_chart(chart, width="stretch")
+## 2. Data Domains Identified
+- 📚 **Academic** ({len([c for c in df.columns if any(x in c.lower() for x in ['grade', 'gpa', 'course'])])} cols): [List actual column names]
+- 💰 **Financial** ({len([c for c in df.columns if any(x in c.lower() for x in ['amount', 'fee', 'aid'])])} cols): [List actual column names]
+- 👤 **Demographics** ({len([c for c in df.columns if any(x in c.lower() for x in ['age', 'gender', 'name'])])} cols): [List actual column names]
+- 📊 **Other**: [Any other domains with column names]
 
-                                    # Display AI-generated insight
-                                    st.info(f"**AI Insight:** {viz_spec.get('insight', '')}")
-                                else:
-                                    st.warning(f"Could not generate chart for: {viz_spec.get('data_column', 'unknown column')}")
+## 3. Top 3 Quality Concerns
+1. **[Issue Type]**: [Specific columns affected] - [Impact]
+2. **[Issue Type]**: [Specific columns affected] - [Impact]
+3. **[Issue Type]**: [Specific columns affected] - [Impact]
 
-                st.divider()
+## 4. Key Findings
+- [Finding based on missing data table with %]
+- [Finding based on completeness metric with %]
+- [Finding based on column analysis with count]
 
-                # ========================================================================
-                # KEY FINDINGS (AI-Generated)
-                # ========================================================================
-                st.markdown("### 🔍 Key Findings")
+## 5. Immediate Actions
+1. **[Column/Domain]**: [Problem] → [Solution] → [Expected impact]
+2. **[Column/Domain]**: [Problem] → [Solution] → [Expected impact]
+3. **[Column/Domain]**: [Problem] → [Solution] → [Expected impact]
 
-                key_findings = viz_result.get('key_findings', [])
-                if key_findings:
-                    for idx, finding in enumerate(key_findings, 1):
-                        st.markdown(f"""
-                        <div style='background: rgba(59, 130, 246, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 0.8rem;'>
-                            <strong style='color: #60a5fa;'>Finding {idx}:</strong> {finding}
-                        </div>
-                        """, unsafe_allow_html=True)
+**RULES**: Use markdown (##). Always cite column names in brackets. Use quantitative data. Be deterministic."""
 
-                st.divider()
-
-                # ========================================================================
-                # RECOMMENDATIONS (AI-Generated with Priority & ROI)
-                # ========================================================================
-                st.markdown("### 💡 AI-Generated Strategic Recommendations")
-
-                recommendations = viz_result.get('recommendations', [])
-                if recommendations:
-                    for idx, rec in enumerate(recommendations, 1):
-                        # Handle both old format (string) and new enriched format (dict)
-                        if isinstance(rec, dict):
-                            # New enriched format with priority, impact, timeline, investment
-                            priority = rec.get('priority', 'MEDIUM')
-                            action = rec.get('action', '')
-                            expected_impact = rec.get('expected_impact', '')
-                            timeline = rec.get('timeline', 'short-term')
-                            investment = rec.get('investment', 'TBD')
-
-                            # Color-code by priority
-                            priority_colors = {
-                                'CRITICAL': ('#ef4444', 'rgba(239, 68, 68, 0.15)'),
-                                'HIGH': ('#f59e0b', 'rgba(245, 158, 11, 0.15)'),
-                                'MEDIUM': ('#10b981', 'rgba(16, 185, 129, 0.15)')
-                            }
-                            border_color, bg_gradient = priority_colors.get(priority, priority_colors['MEDIUM'])
-
-                            st.markdown(f"""
-                            <div style='background: {bg_gradient}; padding: 1.5rem; border-radius: 8px;
-                                        border-left: 4px solid {border_color}; margin-bottom: 1rem;'>
-                                <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.8rem;'>
-                                    <h4 style='color: {border_color}; margin: 0;'>
-                                        {'🔴' if priority == 'CRITICAL' else '🟠' if priority == 'HIGH' else '🟢'}
-                                        Recommendation {idx} - {priority} Priority
-                                    </h4>
-                                    <span style='background: rgba(0,0,0,0.3); padding: 0.3rem 0.8rem;
-                                                border-radius: 12px; font-size: 0.85rem; color: #cbd5e1;'>
-                                        {timeline.replace('_', ' ').title()}
-                                    </span>
-                                </div>
-                                <p style='color: #e2e8f0; margin-bottom: 0.8rem; line-height: 1.6; font-size: 1.05rem;'>
-                                    <strong>Action:</strong> {action}
-                                </p>
-                                <p style='color: #a5b4fc; margin-bottom: 0.8rem; line-height: 1.6;'>
-                                    <strong>📊 Expected Impact:</strong> {expected_impact}
-                                </p>
-                                <p style='color: #cbd5e1; margin-bottom: 0; line-height: 1.6; font-size: 0.95rem;'>
-                                    <strong>💰 Investment:</strong> {investment}
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            # Old format (simple string) - backwards compatible
-                            st.markdown(f"""
-                            <div style='background: linear-gradient(135deg, rgba(16, 185, 129, 0.1) 0%, rgba(5, 150, 105, 0.1) 100%);
-                                        padding: 1.2rem; border-radius: 8px; border-left: 4px solid #10b981; margin-bottom: 1rem;'>
-                                <h4 style='color: #10b981; margin-top: 0;'>Recommendation {idx}</h4>
-                                <p style='color: #e2e8f0; margin-bottom: 0; line-height: 1.6;'>
-                                    {rec}
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
+            # Generate deterministic seed from dataset properties for reproducibility
+            # Same dataset will always produce same seed
+            import hashlib
+            dataset_signature = f"{len(df)}_{len(df.columns)}_{completeness:.1f}_{duplicate_rows}"
+            seed_value = int(hashlib.md5(dataset_signature.encode()).hexdigest()[:8], 16) % 1000000
+
+            # Query LLM with deterministic parameters for reproducible output
+            llm_insights = query_ollama(
+                prompt,
+                model,
+                url,
+                temperature=0.0,  # Zero temperature for maximum determinism
+                num_predict=1000 if use_comprehensive else 400,  # Comprehensive needs more tokens for depth
+                timeout=base_timeout,  # Dynamic: 240s for large datasets, 180s for normal
+                auto_optimize=False,  # Use our custom timeout instead
+                seed=seed_value  # Fixed seed based on dataset for reproducibility
+            )
 
+            if llm_insights and not llm_insights.startswith('[ERROR]'):
+                st.success("✅ Phase 2 complete: AI insights generated successfully!")
+                st.info(f"🔒 **Reproducibility**: Analysis uses seed {seed_value} - same dataset will produce consistent results")
             else:
-                st.warning("No visualizations generated. Try regenerating with the button above.")
+                st.error(f"❌ LLM analysis failed: {llm_insights}")
+                st.warning("💡 Troubleshooting:")
+                st.warning(f"- Try switching to {'Quick' if use_comprehensive else 'Comprehensive'} mode")
+                st.warning(f"- Large model ({model}) may need more time. Consider smaller model like 'qwen2:7b'")
+                st.warning("- Check Ollama is running and not frozen")
+                st.warning("- For very large datasets, try filtering some rows first")
+                st.stop()
 
-    # ====================================================================================
-    # TAB 2: DATA STORYTELLING AI DRIVEN WITH TEMPLATE GUIDANCE
-    # ====================================================================================
-    with tabs[1]:
-        st.header("📖 Data Storytelling AI Driven with Template Guidance")
-        st.caption("AI identifies entities from your data and creates comprehensive journey stories tracking their lifecycle")
+        # Display comprehensive profiling results
+        with st.spinner("🔄 Phase 3/3: Compiling profiling report..."):
+            st.info("📝 Finalizing report...")
 
-        # Explanation box
-        st.markdown(f"""<div style='background: linear-gradient(135deg, rgba(99, 102, 241, 0.15), rgba(139, 92, 246, 0.15)); padding: 1.2rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid #6366f1;'>
-<p style='margin: 0; color: #e2e8f0;'><strong>🎯 Entity-Based Journey System:</strong> Unlike traditional dashboards that show aggregate statistics,
-this system uses AI to <strong>identify meaningful entities</strong> (student cohorts, programs, services, revenue segments) from your dataset
-and <strong>tracks their complete lifecycle</strong> through multiple stages with data-driven narratives.</p>
-<p style='margin: 0.5rem 0 0 0; color: #cbd5e1; font-size: 0.9rem;'>
-<strong>How it works:</strong><br>
-• <strong>Phase 1:</strong> AI analyzes your {metrics.get('total_students', 0):,} students and identifies exactly 6 meaningful entities<br>
-• <strong>Phase 2:</strong> AI defines 4-6 lifecycle stages for each entity<br>
-• <strong>Phase 3:</strong> AI generates compelling narratives for each stage using actual data
-</p>
-<p style='margin: 0.8rem 0 0 0; padding-top: 0.8rem; border-top: 1px solid rgba(99, 102, 241, 0.3); color: #cbd5e1; font-size: 0.9rem;'>
-<strong>🚀 Journeys are based on:</strong><br>
-• ✅ Dataset structure analysis (all {len(df.columns)} columns examined)<br>
-• ✅ Sample data patterns (first 5 rows analyzed for insights)<br>
-• ✅ Entity lifecycle concept (things that evolve: beginning → middle → end)<br>
-• ✅ Entity types: Student, Program, Financial Aid, Enrollment, Campus, Revenue<br>
-• ✅ AI pattern recognition of what constitutes a meaningful "journey"<br>
-• ✅ Status transitions (Active → At-Risk → Successful/Failed)
-</p>
-<p style='margin: 0.8rem 0 0 0; padding-top: 0.8rem; border-top: 1px solid rgba(99, 102, 241, 0.3); color: #cbd5e1; font-size: 0.9rem;'>
-<strong>📋 Stages within each journey are based on:</strong><br>
-• ✅ Your actual dataset columns and values<br>
-• ✅ The specific entity identified by AI<br>
-• ✅ Chronological/logical progression (enrollment → performance → outcomes)<br>
-• ✅ LLM's understanding of higher education lifecycles<br>
-• ✅ Data-driven insights specific to your institution's context
-</p>
-</div>""", unsafe_allow_html=True)
-
-        if not st.session_state.ollama_connected:
-            st.warning("⚠️ Connect to Ollama to generate entity journeys")
-        elif not LLM_ENTITY_JOURNEY_AVAILABLE:
-            st.error("❌ LLM Entity Journey System module not found. Please ensure llm_entity_journey_system.py is available.")
-        else:
-            # Button to generate entity journeys
-            col_btn, col_info = st.columns([2, 3])
-            with col_btn:
-                if st.button("🚀 Generate Entity Journeys", key="generate_entity_journeys_btn", type="primary", width='stretch'):
-                    # Test connection first
-                    st.info(f"🔍 Testing connection to: {url}")
-                    try:
-                        import requests
-                        test_response = requests.get(f"{url}/api/tags", timeout=10)
-                        if test_response.status_code == 200:
-                            st.success(f"✅ Connection OK - {len(test_response.json()['models'])} models available")
-                        else:
-                            st.error(f"❌ Connection failed: HTTP {test_response.status_code}")
-                            st.stop()
-                    except Exception as conn_err:
-                        st.error(f"❌ Connection test failed: {str(conn_err)}")
-                        st.warning("💡 Make sure your Colab tunnel is running if using Cloudflare")
-                        st.stop()
-
-                    try:
-                        # Capture print logs in a container
-                        log_container = st.container()
-                        import sys
-                        from io import StringIO
-
-                        # Create a custom stdout to capture prints
-                        captured_output = StringIO()
-                        old_stdout = sys.stdout
-                        sys.stdout = captured_output
-
-                        try:
-                            with st.spinner("🔄 Phase 1/3: Identifying meaningful entities from dataset..."):
-                                st.info(f"📊 Analyzing {len(df)} rows with {len(df.columns)} columns...")
-                                # Generate complete entity journeys using LLM
-                                entity_journeys = generate_complete_llm_journeys(df, model, url)
-                                st.session_state.llm_cache['entity_journeys'] = entity_journeys
-                        finally:
-                            # Restore stdout
-                            sys.stdout = old_stdout
-
-                        # Show captured logs in expander
-                        captured_logs = captured_output.getvalue()
-                        if captured_logs:
-                            with st.expander("📋 Show Generation Logs (for debugging)"):
-                                st.text(captured_logs)
-
-                        if entity_journeys:
-                            total_stages = sum(j['total_stages'] for j in entity_journeys)
-                            st.success(f"✅ Generated {len(entity_journeys)} entity journeys with {total_stages} total stages!")
-                        else:
-                            st.error("❌ No entity journeys generated (empty result)")
-                            st.warning("💡 The logs above show what happened. Possible causes:")
-                            st.warning("- LLM failed to generate valid JSON (check logs for 'JSON parsing error')")
-                            st.warning("- Dataset too small or lacks clear patterns")
-                            st.warning("- LLM timed out during generation (check logs for 'timeout')")
-                    except Exception as e:
-                        st.error(f"❌ Error generating entity journeys: {str(e)}")
-                        st.error(f"Error type: {type(e).__name__}")
-                        import traceback
-                        with st.expander("🔍 Show detailed error"):
-                            st.code(traceback.format_exc())
-                        st.warning("💡 Troubleshooting:")
-                        st.warning("1. Check Streamlit Cloud logs for full error")
-                        st.warning("2. Verify Colab tunnel is running (if using Cloudflare)")
-                        st.warning("3. Try with a smaller dataset first")
-                        st.warning("4. Check if model exists: " + model)
-
-            with col_info:
-                st.info("⏱️ **Estimated time:** 5-15 minutes depending on dataset complexity. The AI will make multiple LLM calls to build comprehensive stories.")
-
-            # Display entity journeys if available
-            if 'entity_journeys' in st.session_state.llm_cache:
-                entity_journeys = st.session_state.llm_cache['entity_journeys']
-
-                if not entity_journeys:
-                    st.warning("No entity journeys generated. Try again or check your dataset.")
-                else:
-                    st.markdown("---")
-                    st.markdown(f"### 🎯 {len(entity_journeys)} Entity Journeys Discovered")
-                    st.caption(f"*AI identified {len(entity_journeys)} meaningful entities and tracked their lifecycle through {sum(j['total_stages'] for j in entity_journeys)} total stages*")
-
-                    # Display each entity journey
-                    for journey_idx, journey in enumerate(entity_journeys, 1):
-                        entity_type_colors = {
-                            # Lifecycle entity types
-                            'student_lifecycle': ('#3b82f6', 'rgba(59, 130, 246, 0.1)'),
-                            'program_lifecycle': ('#8b5cf6', 'rgba(139, 92, 246, 0.1)'),
-                            'aid_lifecycle': ('#10b981', 'rgba(16, 185, 129, 0.1)'),
-                            'enrollment_lifecycle': ('#06b6d4', 'rgba(6, 182, 212, 0.1)'),
-                            'campus_lifecycle': ('#f59e0b', 'rgba(245, 158, 11, 0.1)'),
-                            'revenue_lifecycle': ('#22c55e', 'rgba(34, 197, 94, 0.1)'),
-                            'facility_lifecycle': ('#eab308', 'rgba(234, 179, 8, 0.1)'),
-                            # Legacy types (for backward compatibility)
-                            'student_cohort': ('#3b82f6', 'rgba(59, 130, 246, 0.1)'),
-                            'program': ('#8b5cf6', 'rgba(139, 92, 246, 0.1)'),
-                            'service': ('#06b6d4', 'rgba(6, 182, 212, 0.1)'),
-                            'revenue_segment': ('#10b981', 'rgba(16, 185, 129, 0.1)'),
-                            'operational': ('#f59e0b', 'rgba(245, 158, 11, 0.1)')
-                        }
+            # Display LLM-generated insights
+            st.markdown("""
+            <div class="insight-card">
+                <div class="insight-title">🤖 AI-Powered Data Profiling Report</div>
+            </div>
+            """, unsafe_allow_html=True)
 
-                        entity_type = journey.get('entity_type', 'student_lifecycle')
-                        color, bg_color = entity_type_colors.get(entity_type, ('#6366f1', 'rgba(99, 102, 241, 0.1)'))
-
-                        # Priority colors
-                        priority = journey.get('priority', 5)
-                        if priority >= 8:
-                            priority_color = '#dc2626'
-                            priority_label = '🚨 CRITICAL'
-                        elif priority >= 6:
-                            priority_color = '#f97316'
-                            priority_label = '⚡ HIGH'
-                        elif priority >= 4:
-                            priority_color = '#eab308'
-                            priority_label = '💡 MEDIUM'
-                        else:
-                            priority_color = '#10b981'
-                            priority_label = '✅ STANDARD'
+            st.markdown(llm_insights)
+
+            # Add metadata
+            st.caption(f"Generated using {model} | Mode: {'Comprehensive' if use_comprehensive else 'Quick'} | {len(df.columns)} columns analyzed | Seed: {seed_value} (reproducible)")
+
+            st.success("✅ Phase 3 complete: Generative Data Profiling finished!")
+
+            # Store profiling results in session state for visualization
+            st.session_state['profiling_results'] = {
+                'insights': llm_insights,
+                'mode': 'Comprehensive' if use_comprehensive else 'Quick',
+                'completeness': completeness,
+                'duplicate_rows': duplicate_rows,
+                'columns_with_nulls': columns_with_nulls,
+                'numeric_cols': len(numeric_cols),
+                'categorical_cols': len(categorical_cols),
+                'datetime_cols': len(datetime_cols),
+                'high_cardinality': len(high_cardinality_cols),
+                'low_cardinality': len(low_cardinality_cols),
+                'total_missing': total_missing,
+                'complete_cols': complete_cols
+            }
 
-                        # Entity Journey Card Header
-                        with st.expander(f"**{journey_idx}. {journey['entity_name']}** ({journey['total_stages']} stages) - {priority_label}", expanded=(journey_idx <= 2)):
-                            # Entity Overview
-                            st.markdown(f"""<div style='background: {bg_color}; padding: 1.5rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid {color};'>
-<div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.8rem;'>
-    <div>
-        <h3 style='font-size: 1.3rem; font-weight: 700; color: {color}; margin: 0 0 0.3rem 0;'>{journey['entity_name']}</h3>
-        <div style='color: #94a3b8; font-size: 0.85rem; text-transform: uppercase; letter-spacing: 0.5px;'>{journey['entity_type'].replace('_', ' ')}</div>
-    </div>
-    <div style='text-align: right;'>
-        <span style='background: {priority_color}; color: white; padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.75rem; font-weight: 600; display: inline-block;'>{priority_label}</span>
-    </div>
-</div>
-<p style='color: #e2e8f0; font-size: 1rem; line-height: 1.6; margin-bottom: 0.8rem;'>{journey.get('description', '')}</p>
-<div style='background: rgba(0,0,0,0.2); padding: 0.9rem; border-radius: 6px;'>
-    <p style='color: #e2e8f0; margin: 0; line-height: 1.6;'>
-        <strong style='color: #60a5fa;'>📊 Students:</strong> {journey.get('student_count', 'N/A')}
-    </p>
-    <p style='color: #e2e8f0; margin: 0.5rem 0 0 0; line-height: 1.6;'>
-        <strong style='color: #34d399;'>💡 Why Important:</strong> {journey.get('why_important', 'Strategic entity for institutional performance')}
-    </p>
-</div>
-</div>""", unsafe_allow_html=True)
+    st.divider()
 
-                            # Journey Stages
-                            st.markdown("#### 📋 Journey Lifecycle Stages")
+    # ========== VISUALIZE DATA PROFILING BUTTON ==========
+    if 'profiling_results' in st.session_state and st.button("📊 Visualize Data Profiling", key="viz_profiling_btn", type="secondary", width='stretch'):
+        st.subheader("📊 Data Profiling Visualization Dashboard")
+        st.caption("AI-generated visual insights from profiling analysis")
 
-                            for stage_idx, stage in enumerate(journey.get('stages', []), 1):
-                                stage_color = color
-                                stage_icon = ['🔵', '🟢', '🟡', '🟠', '🔴', '🟣'][min(stage_idx - 1, 5)]
+        profile_data = st.session_state['profiling_results']
 
-                                # Stage Header
-                                st.markdown(f"""<div style='display: flex; align-items: center; gap: 0.75rem; margin-bottom: 1rem; margin-top: 1.5rem;'>
-    <span style='font-size: 2rem;'>{stage_icon}</span>
-    <div style='flex: 1;'>
-        <h4 style='color: {stage_color}; margin: 0; font-size: 1.2rem;'>Stage {stage.get('stage_order', stage_idx)}: {stage.get('stage_name', 'Unknown Stage')}</h4>
-        <p style='color: #94a3b8; margin: 0.2rem 0 0 0; font-size: 0.9rem;'>{stage.get('description', '')}</p>
-    </div>
-</div>""", unsafe_allow_html=True)
+        # Create visual dashboard similar to Data Lineage tab
+        st.markdown("---")
 
-                                # Stage Narrative (like Executive Summary findings)
-                                st.markdown(f"""<div style='background: rgba(59, 130, 246, 0.1); padding: 1.2rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 1rem;'>
-    <strong style='color: #60a5fa; font-size: 0.9rem;'>📖 STAGE NARRATIVE</strong>
-    <p style='color: #e2e8f0; margin: 0.5rem 0 0 0; line-height: 1.6; font-size: 1rem;'>{stage.get('narrative_text', 'No narrative available.')}</p>
-</div>""", unsafe_allow_html=True)
+        # KPI Cards Row 1
+        col1, col2, col3, col4, col5 = st.columns(5)
 
-                                # Key Metrics (like Executive Summary recommendations)
-                                key_metrics = stage.get('key_metrics', [])
-                                if key_metrics:
-                                    st.markdown(f"""<div style='background: rgba(59, 130, 246, 0.15); padding: 1.2rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 1rem;'>
-    <h4 style='color: #60a5fa; margin: 0 0 0.8rem 0; font-size: 0.95rem;'>📊 KEY METRICS</h4>
-    {''.join([f"<p style='color: #e2e8f0; margin: 0 0 0.6rem 0; line-height: 1.6;'><strong style='color: #60a5fa;'>{m.get('metric', '')}:</strong> {m.get('value', '')} <span style='color: #a5b4fc; font-size: 0.9rem;'>({m.get('significance', '')})</span></p>" for m in key_metrics])}
-</div>""", unsafe_allow_html=True)
+        with col1:
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, #10b981, #059669); border-radius: 12px;
+                        padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+                <div style='font-size: 2rem; margin-bottom: 5px;'>✅</div>
+                <div style='font-size: 2rem; font-weight: bold; color: white;'>{profile_data['completeness']:.1f}%</div>
+                <div style='font-size: 0.85rem; color: #d1fae5; margin-top: 5px;'>Data Completeness</div>
+            </div>
+            """, unsafe_allow_html=True)
 
-                                # Insights (like Executive Summary findings)
-                                insights = stage.get('insights', [])
-                                if insights:
-                                    for idx, insight in enumerate(insights, 1):
-                                        st.markdown(f"""<div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #10b981; margin-bottom: 0.8rem;'>
-    <strong style='color: #34d399;'>💡 Insight {idx}:</strong> <span style='color: #e2e8f0;'>{insight}</span>
-</div>""", unsafe_allow_html=True)
+        with col2:
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, #6366f1, #4f46e5); border-radius: 12px;
+                        padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+                <div style='font-size: 2rem; margin-bottom: 5px;'>📊</div>
+                <div style='font-size: 2rem; font-weight: bold; color: white;'>{len(df.columns)}</div>
+                <div style='font-size: 0.85rem; color: #c7d2fe; margin-top: 5px;'>Total Attributes</div>
+            </div>
+            """, unsafe_allow_html=True)
 
-                                # Recommendations (like Executive Summary recommendations)
-                                recommendations = stage.get('recommendations', [])
-                                if recommendations:
-                                    st.markdown(f"""<div style='background: rgba(245, 158, 11, 0.15); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #f59e0b; margin-bottom: 1rem;'>
-    <h4 style='color: #fbbf24; margin: 0 0 0.8rem 0; font-size: 0.95rem;'>🎯 RECOMMENDATIONS</h4>
-    {''.join([f"<p style='color: #e2e8f0; margin: 0 0 0.6rem 0; line-height: 1.6;'><strong style='color: #fbbf24;'>→</strong> {rec}</p>" for rec in recommendations])}
-</div>""", unsafe_allow_html=True)
+        with col3:
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, #f59e0b, #d97706); border-radius: 12px;
+                        padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+                <div style='font-size: 2rem; margin-bottom: 5px;'>⚠️</div>
+                <div style='font-size: 2rem; font-weight: bold; color: white;'>{profile_data['columns_with_nulls']}</div>
+                <div style='font-size: 0.85rem; color: #fef3c7; margin-top: 5px;'>Columns w/ Nulls</div>
+            </div>
+            """, unsafe_allow_html=True)
 
-                                # Display LLM-recommended visualizations
-                                visualizations = stage.get('visualizations', [])
-                                if visualizations and LLM_ENTITY_JOURNEY_AVAILABLE:
-                                    # Get entity data for visualization
-                                    entity_data = filter_dataset_for_entity(df, journey)
-
-                                    # Try to generate visualizations first
-                                    successful_viz = []
-                                    for viz_idx, viz_spec in enumerate(visualizations, 1):
-                                        fig = generate_visualization(entity_data, viz_spec)
-                                        if fig:
-                                            successful_viz.append((viz_idx, viz_spec, fig))
-
-                                    # Only show header if we have successful visualizations
-                                    if successful_viz:
-                                        st.markdown("<h4 style='color: #e2e8f0; margin-top: 1.5rem;'>📊 Data Visualizations</h4>", unsafe_allow_html=True)
-                                        st.caption("*AI-selected visualizations to illustrate this stage*")
-
-                                        # Display the successful visualizations
-                                        for viz_idx, viz_spec, fig in successful_viz:
-                                            viz_title = viz_spec.get('title', f'Visualization {viz_idx}')
-                                            viz_desc = viz_spec.get('description', '')
-                                            viz_purpose = viz_spec.get('chart_purpose', '')
-
-                                            # Display chart with description (Executive Summary style)
-                                            st.markdown(f"""<div style='background: rgba(99, 102, 241, 0.1); padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #6366f1;'>
-    <h5 style='color: #818cf8; margin: 0 0 0.5rem 0; font-size: 1rem;'>{viz_title}</h5>
-    <p style='color: #cbd5e1; margin: 0; font-size: 0.9rem;'><strong>Why this matters:</strong> {viz_desc}</p>
-    {f"<p style='color: #a5b4fc; margin: 0.5rem 0 0 0; font-size: 0.85rem; font-style: italic;'>💡 {viz_purpose}</p>" if viz_purpose else ''}
-</div>""", unsafe_allow_html=True)
-                                            st.plotly_chart(fig, width='stretch', key=f"viz_{journey_idx}_{stage_idx}_{viz_idx}")
+        with col4:
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, #ec4899, #db2777); border-radius: 12px;
+                        padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+                <div style='font-size: 2rem; margin-bottom: 5px;'>🔄</div>
+                <div style='font-size: 2rem; font-weight: bold; color: white;'>{profile_data['duplicate_rows']:,}</div>
+                <div style='font-size: 0.85rem; color: #fce7f3; margin-top: 5px;'>Duplicate Rows</div>
+            </div>
+            """, unsafe_allow_html=True)
 
-                    st.markdown("---")
-                    st.success("✅ All entity journeys loaded successfully!")
+        with col5:
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, #8b5cf6, #7c3aed); border-radius: 12px;
+                        padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+                <div style='font-size: 2rem; margin-bottom: 5px;'>📁</div>
+                <div style='font-size: 2rem; font-weight: bold; color: white;'>{len(df):,}</div>
+                <div style='font-size: 0.85rem; color: #ede9fe; margin-top: 5px;'>Total Records</div>
+            </div>
+            """, unsafe_allow_html=True)
 
-            else:
-                # Show prompt to generate entity journeys
-                st.info("💡 Click 'Generate Entity Journeys' to let the AI analyze your dataset and create comprehensive entity lifecycle stories")
+        st.markdown("---")
 
-                # Example entity types
-                st.markdown("### 🎯 Example Lifecycle Entities")
-                st.markdown("""
-                The AI will identify **ENTITIES** that have **LIFECYCLES** and **STATUS CHANGES**:
+        # Three-column layout for Data Composition
+        st.markdown("### 🎨 Data Composition Breakdown")
 
-                **🎓 Student Entity**
-                - Lifecycle: Enrollment → Academic Progress → Performance Status → Graduation/Dropout
-                - Example Journey: "Student Academic Journey" tracking progression from entry to exit
+        col1, col2, col3 = st.columns(3)
 
-                **📚 Academic Program Entity**
-                - Lifecycle: Program Launch → Growth → Maturity → Optimization
-                - Example Journey: "Academic Program Lifecycle" showing how programs evolve
+        with col1:
+            st.markdown("""
+            <div style='background: rgba(99, 102, 241, 0.1); border: 2px solid #6366f1;
+                        border-radius: 12px; padding: 20px; height: 100%;'>
+                <h4 style='text-align: center; background: linear-gradient(135deg, #6366f1, #4f46e5);
+                           padding: 12px; border-radius: 8px; margin-bottom: 15px; color: white;'>
+                    🔢 Numeric Columns
+                </h4>
+                <p style='color: #94a3b8; font-size: 0.85rem; margin-bottom: 15px; text-align: center;'>
+                    Quantitative measurements and metrics
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
 
-                **💰 Financial Aid Entity**
-                - Lifecycle: Application → Approval → Disbursement → Impact Assessment
-                - Example Journey: "Financial Aid Journey" tracking aid effectiveness
+            st.metric("Count", profile_data['numeric_cols'],
+                     delta=f"{(profile_data['numeric_cols']/len(df.columns)*100):.1f}% of total")
 
-                **🏢 Campus/Facility Entity**
-                - Lifecycle: Opening → Expansion → Optimization
-                - Example Journey: "Campus Operations Journey" or "Dormitory Lifecycle"
+            # Show numeric column examples
+            numeric_cols_list = stats['numeric_cols'][:10]
+            if numeric_cols_list:
+                st.markdown("**Examples:**")
+                for col in numeric_cols_list[:5]:
+                    st.markdown(f"""
+                    <div style='background: rgba(30, 41, 59, 0.8); border-left: 3px solid #6366f1;
+                                padding: 8px; margin: 5px 0; font-size: 0.8rem;'>
+                        📊 {col}
+                    </div>
+                    """, unsafe_allow_html=True)
 
-                **📈 Enrollment Entity**
-                - Lifecycle: Application → Acceptance → Registration → Retention
-                - Example Journey: "Enrollment Journey" tracking student acquisition
+        with col2:
+            st.markdown("""
+            <div style='background: rgba(245, 158, 11, 0.1); border: 2px solid #f59e0b;
+                        border-radius: 12px; padding: 20px; height: 100%;'>
+                <h4 style='text-align: center; background: linear-gradient(135deg, #f59e0b, #d97706);
+                           padding: 12px; border-radius: 8px; margin-bottom: 15px; color: white;'>
+                    📝 Categorical Columns
+                </h4>
+                <p style='color: #94a3b8; font-size: 0.85rem; margin-bottom: 15px; text-align: center;'>
+                    Classifications and descriptive attributes
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
 
-                **💵 Revenue Entity**
-                - Lifecycle: Tuition Assessment → Payment → Collection → Revenue Recognition
-                - Example Journey: "Revenue Journey" tracking financial flows
+            st.metric("Count", profile_data['categorical_cols'],
+                     delta=f"{(profile_data['categorical_cols']/len(df.columns)*100):.1f}% of total")
 
-                ---
+            # Show categorical column examples
+            categorical_cols_list = stats['categorical_cols'][:10]
+            if categorical_cols_list:
+                st.markdown("**Examples:**")
+                for col in categorical_cols_list[:5]:
+                    st.markdown(f"""
+                    <div style='background: rgba(30, 41, 59, 0.8); border-left: 3px solid #f59e0b;
+                                padding: 8px; margin: 5px 0; font-size: 0.8rem;'>
+                        📝 {col}
+                    </div>
+                    """, unsafe_allow_html=True)
 
-                **Each entity will have:**
-                - Multiple lifecycle stages showing progression
-                - Data-driven narratives for each stage
-                - Nationality/demographic breakdowns in the stories
-                - Performance metrics and status indicators
-                - Actionable insights and recommendations
-                """)
+        with col3:
+            st.markdown("""
+            <div style='background: rgba(16, 185, 129, 0.1); border: 2px solid #10b981;
+                        border-radius: 12px; padding: 20px; height: 100%;'>
+                <h4 style='text-align: center; background: linear-gradient(135deg, #10b981, #059669);
+                           padding: 12px; border-radius: 8px; margin-bottom: 15px; color: white;'>
+                    🆔 Special Columns
+                </h4>
+                <p style='color: #94a3b8; font-size: 0.85rem; margin-bottom: 15px; text-align: center;'>
+                    Identifiers and unique attributes
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
 
-    # ====================================================================================
-    # TAB 3: DATA STORYTELLING FULLY AI DRIVEN
-    # ====================================================================================
-    with tabs[2]:
-        st.header("🔬 Data Storytelling Fully AI Driven")
-        st.caption("Pure AI-driven entity discovery with ZERO predefined examples or guidance")
+            st.metric("High Cardinality", profile_data['high_cardinality'],
+                     help="Likely IDs, unique identifiers, or highly unique fields")
+            st.metric("Low Cardinality", profile_data['low_cardinality'],
+                     help="Likely categories, statuses, or classification fields")
+
+        st.markdown("---")
+
+        # Missing Data Heatmap-style visualization
+        st.markdown("### 🔍 Missing Data Analysis")
+
+        missing_by_col = stats['nulls']
+        missing_pct = (missing_by_col / len(df) * 100).round(2)
+        missing_df_viz = pd.DataFrame({
+            'Column': missing_by_col.index,
+            'Missing Count': missing_by_col.values,
+            'Missing %': missing_pct.values
+        }).sort_values('Missing Count', ascending=False).head(20)
+
+        # Create bar chart for missing data
+        if len(missing_df_viz[missing_df_viz['Missing Count'] > 0]) > 0:
+            missing_display = missing_df_viz[missing_df_viz['Missing Count'] > 0].head(15)
+
+            fig_missing = px.bar(
+                missing_display,
+                x='Missing %',
+                y='Column',
+                orientation='h',
+                title="Top 15 Columns with Missing Data",
+                color='Missing %',
+                color_continuous_scale='reds',
+                labels={'Missing %': 'Missing Percentage (%)'}
+            )
+            fig_missing.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                font=dict(color='white'),
+                height=500,
+                yaxis={'categoryorder': 'total ascending'}
+            )
+            st.plotly_chart(fig_missing, width='stretch')
+        else:
+            st.success("✅ No missing data detected! This dataset is 100% complete.")
 
-        # Explanation box
-        st.markdown(f"""<div style='background: linear-gradient(135deg, rgba(139, 92, 246, 0.15), rgba(236, 72, 153, 0.15)); padding: 1.2rem; border-radius: 8px; margin-bottom: 1.5rem; border-left: 4px solid #8b5cf6;'>
-<p style='margin: 0; color: #e2e8f0;'><strong>🔬 PURE AUTONOMOUS DISCOVERY:</strong> This system operates with <strong>ZERO predefined templates or examples</strong>.
-The AI analyzes your {metrics.get('total_students', 0):,} students and <strong>discovers entities entirely from data patterns</strong> with no guidance on what to find.</p>
-<p style='margin: 0.5rem 0 0 0; color: #cbd5e1; font-size: 0.9rem;'>
-<strong>How it differs from guided discovery:</strong><br>
-• <strong>Guided System:</strong> AI gets examples like "Student Journey", "Program Lifecycle" → follows patterns<br>
-• <strong>Fully Dynamic:</strong> AI gets NO examples → discovers what exists in YOUR specific data<br>
-<br>
-<strong>What to expect:</strong> Unique entities specific to your institution that may not fit standard categories.
-</p>
-</div>""", unsafe_allow_html=True)
+        st.markdown("---")
 
-        if not st.session_state.ollama_connected:
-            st.warning("⚠️ Connect to Ollama to enable fully dynamic discovery")
-        elif not FULLY_DYNAMIC_DISCOVERY_AVAILABLE:
-            st.error("❌ Fully Dynamic Discovery module not found. Please ensure fully_dynamic_entity_discovery.py is available.")
-        else:
-            # Button to generate fully dynamic journeys
-            col_btn, col_info = st.columns([2, 3])
-            with col_btn:
-                if st.button("🔬 Discover Entities Autonomously", key="discover_dynamic_entities_btn", type="primary", width='stretch'):
-                    with st.spinner("🔄 AI is analyzing data patterns with NO guidance (this may discover unexpected entities)..."):
-                        # Generate fully dynamic journeys (NO templates, NO examples)
-                        dynamic_journeys = generate_fully_dynamic_journeys(df, model, url)
-                        st.session_state.llm_cache['dynamic_journeys'] = dynamic_journeys
-
-                        if dynamic_journeys:
-                            total_stages = sum(j['total_stages'] for j in dynamic_journeys)
-                            st.success(f"✅ DISCOVERED {len(dynamic_journeys)} unique entities autonomously with {total_stages} total lifecycle stages!")
-                        else:
-                            st.error("❌ Autonomous discovery failed. Please check your dataset and Ollama connection.")
+        # Data Type Distribution
+        st.markdown("### 📊 Data Type Distribution")
 
-            with col_info:
-                st.info("⏱️ **Estimated time:** 10-20 minutes. The AI will make multiple calls to discover patterns WITHOUT any predefined examples.")
+        col1, col2 = st.columns(2)
 
-            # Display fully dynamic journeys if available
-            if 'dynamic_journeys' in st.session_state.llm_cache:
-                dynamic_journeys = st.session_state.llm_cache['dynamic_journeys']
+        with col1:
+            # Pie chart for column types
+            type_data = pd.DataFrame({
+                'Type': ['Numeric', 'Categorical', 'Datetime'],
+                'Count': [profile_data['numeric_cols'], profile_data['categorical_cols'], profile_data['datetime_cols']]
+            })
+            type_data = type_data[type_data['Count'] > 0]
+
+            fig_types = px.pie(
+                type_data,
+                values='Count',
+                names='Type',
+                title='Column Type Distribution',
+                color_discrete_sequence=['#6366f1', '#f59e0b', '#10b981']
+            )
+            fig_types.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                font=dict(color='white'),
+                height=400
+            )
+            st.plotly_chart(fig_types, width='stretch')
 
-                if not dynamic_journeys:
-                    st.warning("No entities discovered autonomously. The AI may need clearer data patterns.")
-                else:
-                    st.markdown("---")
-                    st.markdown(f"### 🔬 {len(dynamic_journeys)} Entities Discovered Autonomously")
-                    st.caption(f"*AI discovered {len(dynamic_journeys)} unique entities by analyzing data patterns with ZERO guidance*")
+        with col2:
+            # Bar chart for cardinality distribution
+            cardinality_data = pd.DataFrame({
+                'Category': ['High Cardinality\n(Unique IDs)', 'Low Cardinality\n(Categories)', 'Other'],
+                'Count': [
+                    profile_data['high_cardinality'],
+                    profile_data['low_cardinality'],
+                    len(df.columns) - profile_data['high_cardinality'] - profile_data['low_cardinality']
+                ]
+            })
 
-                    # Display discovery method badge
-                    st.markdown("""<div style='background: rgba(139, 92, 246, 0.15); padding: 0.9rem; border-radius: 6px; margin-bottom: 1rem; border-left: 4px solid #8b5cf6;'>
-<div style='font-size: 0.85rem; font-weight: 600; color: #e2e8f0; margin-bottom: 0.4rem;'>🔬 DISCOVERY METHOD: FULLY AUTONOMOUS</div>
-<div style='font-size: 0.8rem; color: #cbd5e1;'>These entities were discovered purely from data patterns. No predefined templates or examples were used.</div>
-</div>""", unsafe_allow_html=True)
+            fig_card = px.bar(
+                cardinality_data,
+                x='Category',
+                y='Count',
+                title='Cardinality Distribution',
+                color='Count',
+                color_continuous_scale='viridis'
+            )
+            fig_card.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                font=dict(color='white'),
+                height=400,
+                showlegend=False
+            )
+            st.plotly_chart(fig_card, width='stretch')
 
-                    # Display each discovered journey
-                    for journey_idx, journey in enumerate(dynamic_journeys, 1):
-                        # Use different color scheme for dynamic discoveries
-                        color = '#8b5cf6'  # Purple for dynamic discoveries
-                        bg_color = 'rgba(139, 92, 246, 0.1)'
-
-                        # Priority colors
-                        priority = journey.get('priority', 5)
-                        if priority >= 8:
-                            priority_color = '#8b5cf6'
-                            priority_label = '🔬 HIGH DISCOVERY'
-                        elif priority >= 6:
-                            priority_color = '#a78bfa'
-                            priority_label = '🔍 MEDIUM DISCOVERY'
-                        else:
-                            priority_color = '#c4b5fd'
-                            priority_label = '💡 STANDARD DISCOVERY'
+        st.markdown("---")
 
-                        # Entity Journey Card Header
-                        with st.expander(f"**{journey_idx}. {journey['entity_name']}** (Discovered: {journey.get('entity_type', 'unknown')}) - {priority_label}", expanded=(journey_idx <= 2)):
-                            # Entity Overview with Discovery Rationale
-                            st.markdown(f"""<div style='background: {bg_color}; padding: 1.5rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid {color};'>
-<div style='display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;'>
-    <div>
-        <div style='font-size: 1.2rem; font-weight: 700; color: #e2e8f0; margin-bottom: 0.3rem;'>{journey['entity_name']}</div>
-        <div style='color: #94a3b8; font-size: 0.85rem; text-transform: uppercase; letter-spacing: 0.5px;'>{journey.get('entity_type', 'discovered_entity').replace('_', ' ')}</div>
-    </div>
-    <div style='text-align: right;'>
-        <div style='background: {priority_color}; color: white; padding: 0.3rem 0.6rem; border-radius: 6px; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.3rem;'>{priority_label}</div>
-        <div style='color: #94a3b8; font-size: 0.75rem;'>Priority {priority}</div>
-    </div>
-</div>
-<div style='color: #cbd5e1; font-size: 0.95rem; line-height: 1.6; margin-top: 0.75rem;'><strong>What is this entity:</strong> {journey.get('description', '')}</div>
-<div style='background: rgba(139, 92, 246, 0.2); padding: 0.8rem; border-radius: 6px; margin-top: 0.75rem; border-left: 3px solid #8b5cf6;'>
-    <div style='color: #e2e8f0; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.4rem;'>🔍 Discovery Rationale (Why AI identified this as an entity)</div>
-    <div style='color: #cbd5e1; font-size: 0.85rem; font-style: italic;'>{journey.get('discovery_rationale', 'Discovered from data patterns')}</div>
-</div>
-<div style='background: rgba(0,0,0,0.2); padding: 0.8rem; border-radius: 6px; margin-top: 0.75rem;'>
-    <div style='color: #e2e8f0; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.4rem;'>📊 Entity Metrics</div>
-    <div style='color: #cbd5e1; font-size: 0.85rem;'>
-        <strong>Students:</strong> {journey.get('student_count', 'N/A')} |
-        <strong>Lifecycle Indicators:</strong> {', '.join(journey.get('lifecycle_indicators', ['N/A']))}
-    </div>
-</div>
-</div>""", unsafe_allow_html=True)
+        # ========== ADVANCED VISUALIZATIONS ==========
+        st.markdown("### 🔬 Advanced Statistical Analysis")
 
-                            # Journey Stages
-                            st.markdown("#### 📋 Discovered Lifecycle Stages")
+        # Correlation Heatmap for Numeric Columns
+        numeric_cols_viz = stats['numeric_cols']
+        if len(numeric_cols_viz) >= 2:
+            st.markdown("#### 🔗 Correlation Heatmap (Top 15 Numeric Columns)")
+            st.caption("Identify relationships between numeric variables")
 
-                            for stage_idx, stage in enumerate(journey.get('stages', []), 1):
-                                stage_icon = ['🔵', '🟢', '🟡', '🟠', '🔴', '🟣'][min(stage_idx - 1, 5)]
+            # Limit to top 15 for readability
+            corr_data = df[numeric_cols_viz[:15]].corr()
 
-                                st.markdown(f"""<div style='background: rgba(30, 41, 59, 0.6); border: 2px solid {color}; border-radius: 8px; padding: 1.2rem; margin-bottom: 1rem;'>
-<div style='display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.75rem;'>
-    <span style='font-size: 1.5rem;'>{stage_icon}</span>
-    <div style='flex: 1;'>
-        <div style='font-size: 1.1rem; font-weight: 600; color: #e2e8f0;'>Stage {stage.get('stage_order', stage_idx)}: {stage.get('stage_name', 'Unknown Stage')}</div>
-        <div style='color: #94a3b8; font-size: 0.85rem;'>{stage.get('description', '')}</div>
-    </div>
-</div>
+            fig_corr = px.imshow(
+                corr_data,
+                labels=dict(color="Correlation"),
+                x=corr_data.columns,
+                y=corr_data.columns,
+                color_continuous_scale='RdBu_r',
+                zmin=-1, zmax=1,
+                title="Correlation Matrix - Strong correlations indicate relationships"
+            )
+            fig_corr.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                font=dict(color='white', size=9),
+                height=600
+            )
+            st.plotly_chart(fig_corr, width='stretch')
 
-<div style='background: rgba(139, 92, 246, 0.2); padding: 0.8rem; border-radius: 6px; margin-bottom: 0.75rem; border-left: 4px solid #8b5cf6;'>
-    <div style='color: #e2e8f0; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.4rem;'>🔍 Stage Discovery Rationale</div>
-    <div style='color: #cbd5e1; font-size: 0.85rem; font-style: italic;'>{stage.get('discovery_rationale', 'Discovered from data transitions')}</div>
-</div>
+            # Highlight strong correlations
+            strong_corr = []
+            for i in range(len(corr_data.columns)):
+                for j in range(i+1, len(corr_data.columns)):
+                    corr_val = corr_data.iloc[i, j]
+                    if abs(corr_val) > 0.7:
+                        strong_corr.append((corr_data.columns[i], corr_data.columns[j], corr_val))
 
-<div style='background: rgba(99, 102, 241, 0.15); padding: 0.9rem; border-radius: 6px; margin-bottom: 0.75rem; border-left: 4px solid #6366f1;'>
-    <div style='color: #e2e8f0; font-size: 0.85rem; font-weight: 600; margin-bottom: 0.5rem;'>📖 Stage Narrative</div>
-    <div style='color: #cbd5e1; font-size: 0.95rem; line-height: 1.7;'>{stage.get('narrative_text', 'No narrative available.')}</div>
-</div>
+            if strong_corr:
+                st.info(f"**💡 Strong Correlations Detected (>0.7):**")
+                for col1, col2, val in strong_corr[:5]:
+                    emoji = "🔴" if val > 0 else "🔵"
+                    st.markdown(f"{emoji} **{col1}** ↔ **{col2}**: {val:.3f}")
 
-<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.75rem; margin-bottom: 0.75rem;'>
-    <div style='background: rgba(59, 130, 246, 0.15); padding: 0.8rem; border-radius: 6px; border-left: 3px solid #3b82f6;'>
-        <div style='color: #60a5fa; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.5rem; text-transform: uppercase;'>📊 Key Metrics</div>
-        {''.join([f"<div style='color: #cbd5e1; font-size: 0.85rem; margin-bottom: 0.3rem; line-height: 1.5;'><strong style='color: #e2e8f0;'>{m.get('metric', '')}:</strong> {m.get('value', '')} <span style='color: #94a3b8; font-size: 0.8rem;'>({m.get('significance', '')})</span></div>" for m in stage.get('key_metrics', [])])}
-    </div>
-    <div style='background: rgba(16, 185, 129, 0.15); padding: 0.8rem; border-radius: 6px; border-left: 3px solid #10b981;'>
-        <div style='color: #34d399; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.5rem; text-transform: uppercase;'>💡 Insights</div>
-        {''.join([f"<div style='color: #cbd5e1; font-size: 0.85rem; margin-bottom: 0.3rem; line-height: 1.5;'>• {insight}</div>" for insight in stage.get('insights', [])])}
-    </div>
-</div>
+        st.markdown("---")
 
-<div style='background: rgba(245, 158, 11, 0.15); padding: 0.8rem; border-radius: 6px; border-left: 3px solid #f59e0b;'>
-    <div style='color: #fbbf24; font-size: 0.75rem; font-weight: 600; margin-bottom: 0.5rem; text-transform: uppercase;'>🎯 Recommendations</div>
-    {''.join([f"<div style='color: #cbd5e1; font-size: 0.85rem; margin-bottom: 0.3rem; line-height: 1.5;'>→ {rec}</div>" for rec in stage.get('recommendations', [])])}
-</div>
-</div>""", unsafe_allow_html=True)
+        # Distribution Analysis for Top Numeric Columns
+        if numeric_cols_viz:
+            st.markdown("#### 📊 Distribution Analysis (Top 6 Numeric Columns)")
+            st.caption("Understand data spread, skewness, and normality")
 
-                                # Display visualizations if available
-                                visualizations = stage.get('visualizations', [])
-                                if visualizations and LLM_ENTITY_JOURNEY_AVAILABLE:
-                                    # Get entity data for visualization
-                                    entity_data = filter_dataset_for_entity(df, journey)
-
-                                    # Try to generate visualizations first
-                                    successful_viz = []
-                                    for viz_idx, viz_spec in enumerate(visualizations, 1):
-                                        fig = generate_visualization(entity_data, viz_spec)
-                                        if fig:
-                                            successful_viz.append((viz_idx, viz_spec, fig))
-
-                                    # Only show header if we have successful visualizations
-                                    if successful_viz:
-                                        st.markdown("<h4 style='color: #e2e8f0; margin-top: 1.5rem;'>📊 Data Visualizations</h4>", unsafe_allow_html=True)
-                                        st.caption("*AI-selected visualizations for this discovered stage*")
-
-                                        # Display the successful visualizations
-                                        for viz_idx, viz_spec, fig in successful_viz:
-                                            viz_title = viz_spec.get('title', f'Visualization {viz_idx}')
-                                            viz_desc = viz_spec.get('description', '')
-                                            viz_purpose = viz_spec.get('chart_purpose', '')
-
-                                            st.markdown(f"""<div style='background: rgba(139, 92, 246, 0.15); padding: 0.8rem; border-radius: 6px; margin-bottom: 0.5rem; border-left: 3px solid #8b5cf6;'>
-                                                <div style='font-size: 0.9rem; font-weight: 600; color: #e2e8f0; margin-bottom: 0.3rem;'>{viz_title}</div>
-                                                <div style='font-size: 0.8rem; color: #cbd5e1;'>{viz_desc}</div>
-                                                {f"<div style='font-size: 0.8rem; color: #a5b4fc; margin-top: 0.3rem; font-style: italic;'>💡 {viz_purpose}</div>" if viz_purpose else ''}
-                                                </div>""", unsafe_allow_html=True)
-                                            st.plotly_chart(fig, width='stretch', key=f"dyn_viz_{journey_idx}_{stage_idx}_{viz_idx}")
-
-                    st.markdown("---")
-                    st.success(f"✅ All {len(dynamic_journeys)} dynamically discovered journeys loaded successfully!")
+            col1, col2, col3 = st.columns(3)
+            cols = [col1, col2, col3]
+
+            for idx, col_name in enumerate(numeric_cols_viz[:6]):
+                with cols[idx % 3]:
+                    fig_dist = px.histogram(
+                        df,
+                        x=col_name,
+                        nbins=30,
+                        title=f"{col_name[:20]}...",
+                        marginal="box"  # Add box plot on top
+                    )
+                    fig_dist.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                        font=dict(color='white'),
+                        height=300,
+                        showlegend=False
+                    )
+                    st.plotly_chart(fig_dist, width='stretch')
 
-            else:
-                # Show prompt to discover entities
-                st.info("💡 Click 'Discover Entities Autonomously' to let the AI analyze your data with ZERO predefined templates")
+                    # Show statistics
+                    skew = df[col_name].skew()
+                    skew_label = "Right-skewed" if skew > 0.5 else "Left-skewed" if skew < -0.5 else "Normal"
+                    st.caption(f"Skew: {skew:.2f} ({skew_label})")
 
-                # Comparison: Guided vs Fully Dynamic
-                st.markdown("### 🆚 Guided vs Fully Dynamic Discovery")
+        st.markdown("---")
 
-                col1, col2 = st.columns(2)
+        # Outlier Box Plots
+        if numeric_cols_viz:
+            st.markdown("#### 📦 Outlier Detection (Box Plots)")
+            st.caption("Identify outliers using IQR method (points beyond whiskers)")
 
-                with col1:
-                    st.markdown("""
-                    **📖 Guided Discovery (Tab 2)**
-                    - AI gets examples: "Student Journey", "Program Lifecycle", "Aid Journey"
-                    - Follows proven patterns
-                    - Predictable, consistent results
-                    - Best for: Standard institutional analysis
-                    """)
+            col1, col2 = st.columns(2)
 
-                with col2:
-                    st.markdown("""
-                    **🔬 Fully Dynamic Discovery (This Tab)**
-                    - AI gets ZERO examples or templates
-                    - Discovers entities purely from data patterns
-                    - Unexpected, unique discoveries
-                    - Best for: Finding hidden patterns specific to YOUR data
-                    """)
+            for idx, col_name in enumerate(numeric_cols_viz[:4]):
+                with col1 if idx % 2 == 0 else col2:
+                    fig_box = px.box(
+                        df,
+                        y=col_name,
+                        title=f"Outliers in {col_name[:25]}",
+                        points="outliers"  # Show only outlier points
+                    )
+                    fig_box.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                        font=dict(color='white'),
+                        height=350
+                    )
+                    st.plotly_chart(fig_box, width='stretch')
+
+                    # Calculate outlier count
+                    Q1 = df[col_name].quantile(0.25)
+                    Q3 = df[col_name].quantile(0.75)
+                    IQR = Q3 - Q1
+                    outlier_count = ((df[col_name] < (Q1 - 1.5 * IQR)) | (df[col_name] > (Q3 + 1.5 * IQR))).sum()
+                    if outlier_count > 0:
+                        st.warning(f"⚠️ {outlier_count} outliers detected ({(outlier_count/len(df)*100):.2f}%)")
+                    else:
+                        st.success(f"✅ No outliers detected")
+
+        st.markdown("---")
+
+        # Data Completeness by Column Type
+        st.markdown("#### 🎯 Completeness Breakdown by Column Type")
+        st.caption("Which column types have better data quality?")
+
+        completeness_by_type = []
+        for col_type, cols in [
+            ('Numeric', numeric_cols_viz),
+            ('Categorical', stats['categorical_cols']),
+            ('Datetime', stats['datetime_cols'])
+        ]:
+            if cols:
+                type_completeness = (stats['counts'][cols].sum() / (len(df) * len(cols)) * 100)
+                completeness_by_type.append({
+                    'Column Type': col_type,
+                    'Completeness %': type_completeness,
+                    'Column Count': len(cols)
+                })
 
-                st.markdown("---")
+        if completeness_by_type:
+            comp_df = pd.DataFrame(completeness_by_type)
+            fig_comp = px.bar(
+                comp_df,
+                x='Column Type',
+                y='Completeness %',
+                color='Completeness %',
+                color_continuous_scale='greens',
+                title='Data Completeness by Column Type',
+                text='Completeness %'
+            )
+            fig_comp.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+            fig_comp.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                font=dict(color='white'),
+                height=400,
+                yaxis_range=[0, 105]
+            )
+            st.plotly_chart(fig_comp, width='stretch')
 
-                st.markdown("### 🎯 What AI Might Discover")
-                st.markdown("""
-                Without predefined templates, the AI could discover unique entities like:
-                - **Payment Pattern Clusters** - Students grouped by payment behavior
-                - **Performance Trajectory Groups** - Students following similar GPA patterns
-                - **Aid-to-Success Pathways** - Different aid effectiveness patterns
-                - **Engagement Level Segments** - Students with different participation patterns
-                - **Market Risk Portfolios** - Nationality combinations affecting revenue stability
-                - **Capacity Utilization Zones** - Facility usage patterns
-
-                **The AI will discover what's ACTUALLY in your data, not what we expect to find!**
-                """)
+        st.markdown("---")
 
+        # Quality Score Gauge
+        st.markdown("#### 🎯 Overall Data Quality Score")
 
-    # TAB 3: DATA STORYTELLING - COMPLETE JOURNEY STORIES (PreDefined+LLM Narrative)
-    # ====================================================================================
-    with tabs[3]:
-        st.header("📚 Complete Journey Stories - PreDefined Structure + AI Narratives")
-        st.caption("Comprehensive analytics with pre-defined journeys enriched by LLM-generated narratives")
+        col1, col2, col3 = st.columns([2, 2, 1])
 
-        if not st.session_state.ollama_connected:
-            st.warning("⚠️ Connect to Ollama to generate journey narratives")
-        else:
-            st.markdown("""
-            <div style='background: linear-gradient(135deg, #7c3aed 0%, #a78bfa 100%); padding: 2rem; border-radius: 12px; margin: 2rem 0;'>
-                <h2 style='margin: 0; color: white; display: flex; align-items: center; gap: 0.75rem;'>
-                    📚 Complete Journey Stories
-                    <span style='background: rgba(255,255,255,0.2); padding: 0.35rem 1rem; border-radius: 20px; font-size: 0.65rem; font-weight: normal;'>COMPREHENSIVE ANALYTICS</span>
-                </h2>
-                <p style='margin: 0.75rem 0 0 0; color: #e9d5ff; font-size: 1rem; line-height: 1.6;'>
-                    📖 Deep-dive into 6 comprehensive journeys with detailed stories, metrics, insights, and action plans<br>
-                    🤖 AI-powered narratives combined with precise metric calculations<br>
-                    💼 Executive-ready business context, ROI analysis, and strategic recommendations
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+        with col1:
+            quality_score = profile_data['completeness']
+            fig_gauge = go.Figure(go.Indicator(
+                mode="gauge+number+delta",
+                value=quality_score,
+                title={'text': "Data Quality Score", 'font': {'color': 'white'}},
+                delta={'reference': 90, 'increasing': {'color': "green"}},
+                gauge={
+                    'axis': {'range': [0, 100], 'tickcolor': 'white'},
+                    'bar': {'color': "#10b981" if quality_score >= 90 else "#f59e0b" if quality_score >= 70 else "#ef4444"},
+                    'steps': [
+                        {'range': [0, 70], 'color': "rgba(239, 68, 68, 0.3)"},
+                        {'range': [70, 90], 'color': "rgba(245, 158, 11, 0.3)"},
+                        {'range': [90, 100], 'color': "rgba(16, 185, 129, 0.3)"}
+                    ],
+                    'threshold': {
+                        'line': {'color': "white", 'width': 4},
+                        'thickness': 0.75,
+                        'value': 90
+                    }
+                }
+            ))
+            fig_gauge.update_layout(
+                paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                font={'color': 'white'},
+                height=400
+            )
+            st.plotly_chart(fig_gauge, width='stretch')
 
-            if not JOURNEY_MODULES_AVAILABLE:
-                st.error("❌ Journey modules not available. Please ensure journey_definitions.py, journey_metrics.py, journey_narratives.py, and journey_assembler.py are in the same directory.")
+        with col2:
+            st.markdown("**Quality Score Interpretation:**")
+            if quality_score >= 90:
+                st.success("🌟 **EXCELLENT** (90-100%)\nData is highly reliable for analysis and decision-making")
+            elif quality_score >= 70:
+                st.warning("⚠️ **GOOD** (70-90%)\nData is usable but has some quality issues to address")
             else:
-                # Validate dataset
-                is_valid, missing_fields, journey_validation = validate_dataset_for_journeys(df)
-
-                if not is_valid:
-                    st.warning(f"⚠️ Dataset is missing some required fields for complete journey generation: {', '.join(missing_fields)}")
-                    st.caption("Some journeys may have incomplete data. The system will work with available fields.")
-
-                # Generation button
-                col_gen1, col_gen2 = st.columns([3, 1])
-                with col_gen1:
-                    if st.button("🚀 Generate Complete Journey Stories (All 6 Journeys)", key="generate_complete_journeys", type="primary", width='stretch'):
-                        # Progress container
-                        progress_container = st.empty()
-                        status_container = st.empty()
-
-                        def progress_callback(stage, current, total, message):
-                            """Update progress display"""
-                            if stage == 'validation':
-                                progress_container.progress(5)
-                                status_container.info(f"🔍 {message}")
-                            elif stage == 'metrics':
-                                progress = 5 + int((current / total) * 15)
-                                progress_container.progress(progress)
-                                status_container.info(f"📊 Calculating metrics: {current}/{total} stories")
-                            elif stage == 'narratives':
-                                progress = 20 + int((current / total) * 70)
-                                progress_container.progress(progress)
-                                status_container.info(f"✍️ Generating narratives: {current}/{total} components - {message}")
-                            elif stage == 'assembly':
-                                progress = 90 + int((current / total) * 10)
-                                progress_container.progress(progress)
-                                status_container.info(f"🔧 Assembling journeys: {current}/{total}")
-                            elif stage == 'error':
-                                status_container.error(f"❌ {message}")
-
-                        with st.spinner("🤖 Generating complete journeys... This may take 5-15 minutes depending on LLM speed"):
-                            from journey_assembler import generate_all_journeys
-
-                            # Generate all journeys
-                            journeys, metadata = generate_all_journeys(
-                                df,
-                                query_ollama,
-                                model,
-                                url,
-                                temperature=0.4,
-                                timeout=180,
-                                progress_callback=progress_callback
-                            )
-
-                            # Store in session state
-                            st.session_state.complete_journeys = journeys
-                            st.session_state.journey_generation_metadata = metadata
-
-                            progress_container.progress(100)
-
-                            if metadata.get('success'):
-                                duration = metadata.get('duration_seconds', 0)
-                                minutes = int(duration // 60)
-                                seconds = int(duration % 60)
-
-                                status_container.success(f"""
-                                ✅ **All journeys generated successfully!**
-                                - **{len(journeys)}** complete journeys
-                                - **{metadata['assembly']['total_stories']}** stories with full narratives
-                                - **{metadata['metrics']['total_metrics_calculated']}** metrics calculated
-                                - **{metadata['narratives']['total_components_generated']}** narrative components generated
-                                - **Time:** {minutes}m {seconds}s
-                                """)
-                            else:
-                                status_container.error(f"❌ Generation failed: {', '.join(metadata.get('errors', ['Unknown error']))}")
+                st.error("🚨 **NEEDS IMPROVEMENT** (<70%)\nSignificant data quality issues require immediate attention")
 
-                with col_gen2:
-                    if st.session_state.complete_journeys:
-                        if st.button("🗑️ Clear", key="clear_journeys"):
-                            st.session_state.complete_journeys = None
-                            st.session_state.journey_generation_metadata = None
-                            st.rerun()
+            st.markdown(f"""
+            **Score Components:**
+            - Completeness: {profile_data['completeness']:.1f}%
+            - Missing Cells: {profile_data['total_missing']:,}
+            - Duplicates: {profile_data['duplicate_rows']:,}
+            - Columns with Nulls: {profile_data['columns_with_nulls']}/{len(df.columns)}
+            """)
 
-                # Display complete journeys if available
-                if st.session_state.complete_journeys:
-                    journeys = st.session_state.complete_journeys
-
-                    st.markdown("---")
-
-                    # Create tabs for each journey
-                    journey_tabs = st.tabs([
-                        "📊 Journey 1: Enrollment",
-                        "💰 Journey 2: Revenue",
-                        "🏢 Journey 3: Operations",
-                        "🎓 Journey 4: Academics",
-                        "🎯 Journey 5: Retention",
-                        "⚠️ Journey 6: Risk"
-                    ])
+    st.divider()
 
-                    # Display each journey in its tab
-                    for tab_idx, (journey_tab, journey) in enumerate(zip(journey_tabs, journeys)):
-                        with journey_tab:
-                            # Journey header
-                            st.markdown(f"""
-                            <div style='background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%); padding: 1.5rem; border-radius: 10px; margin-bottom: 1.5rem;'>
-                                <h2 style='margin: 0; color: white;'>{journey['name']}</h2>
-                                <p style='margin: 0.5rem 0 0 0; color: #ddd6fe; font-size: 0.95rem;'>{journey['subtitle']}</p>
-                                <div style='margin-top: 1rem; display: flex; gap: 1rem;'>
-                                    <span style='background: rgba(255,255,255,0.2); padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.85rem;'>
-                                        📖 {journey['story_count']} Stories
-                                    </span>
-                                    <span style='background: rgba(255,255,255,0.2); padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.85rem;'>
-                                        📊 {journey['total_metrics_calculated']} Metrics
-                                    </span>
-                                    <span style='background: rgba(255,255,255,0.2); padding: 0.4rem 0.8rem; border-radius: 6px; font-size: 0.85rem;'>
-                                        ✅ {'Complete' if journey['is_complete'] else 'Partial'}
-                                    </span>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-
-                            # JOURNEY-LEVEL VISUALIZATIONS - Most Important Metrics
-                            st.markdown("""
-                            <div style='background: linear-gradient(135deg, rgba(59, 130, 246, 0.15), rgba(99, 102, 241, 0.15));
-                                        padding: 1.5rem; border-radius: 10px; margin: 2rem 0 1.5rem 0;
-                                        border-left: 5px solid #3b82f6;'>
-                                <h2 style='margin: 0 0 0.5rem 0; color: #1e293b; font-size: 1.5rem;'>
-                                    📊 Journey Insights - Key Metrics Overview
-                                </h2>
-                                <p style='margin: 0; color: #475569; font-size: 0.95rem; line-height: 1.6;'>
-                                    Visual analytics showing the most important performance indicators for this journey.
-                                    These metrics provide a comprehensive view of key trends, patterns, and opportunities.
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
-
-                            # Create 2 rows of 3 columns for 4-6 key metrics per journey
-                            viz_row1 = st.columns(3)
-                            viz_row2 = st.columns(3)
-
-                            # JOURNEY 1: ENROLLMENT
-                            if tab_idx == 0:
-                                st.markdown("""
-                                <div style='background: rgba(59, 130, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #3b82f6;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>📈 Diversity & Demographics Analysis</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Distribution of students by nationality, region, and enrollment status</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row1[0]:
-                                    if 'nationality' in df.columns:
-                                        st.caption("🌍 **Nationality Distribution**")
-                                        nat_counts = df['nationality'].value_counts().head(10)
-                                        fig = create_plotly_chart("bar", {"x": nat_counts.index.tolist(), "y": nat_counts.values.tolist()}, "Top 10 Nationalities")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_nat")
-
-                                with viz_row1[1]:
-                                    if 'nationality' in df.columns:
-                                        st.caption("🇦🇪 **UAE vs International Mix**")
-                                        uae_count = len(df[df['nationality'] == 'United Arab Emirates'])
-                                        intl_count = len(df) - uae_count
-                                        fig = create_plotly_chart("pie", {"labels": ["UAE Nationals", "International"], "values": [uae_count, intl_count]}, "UAE vs International Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_uae_intl")
-
-                                with viz_row1[2]:
-                                    if 'enrollment_enrollment_status' in df.columns:
-                                        st.caption("📋 **Student Status**")
-                                        status_counts = df['enrollment_enrollment_status'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": status_counts.index.tolist(), "values": status_counts.values.tolist()}, "Enrollment Status")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_status")
-
-                                st.markdown("""
-                                <div style='background: rgba(139, 92, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin: 1.5rem 0 1rem 0; border-left: 4px solid #8b5cf6;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>📊 Enrollment Trends & Program Performance</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Growth patterns by cohort, gender balance, and program popularity</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row2[0]:
-                                    if 'cohort_year' in df.columns:
-                                        st.caption("📅 **Cohort Trends Over Time**")
-                                        cohort_counts = df['cohort_year'].value_counts().sort_index()
-                                        fig = create_plotly_chart("bar", {"x": cohort_counts.index.tolist(), "y": cohort_counts.values.tolist()}, "Enrollment Trends by Cohort")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_cohort")
-
-                                with viz_row2[1]:
-                                    if 'gender' in df.columns:
-                                        st.caption("⚖️ **Gender Balance**")
-                                        gender_counts = df['gender'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": gender_counts.index.tolist(), "values": gender_counts.values.tolist()}, "Gender Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_gender")
-
-                                with viz_row2[2]:
-                                    if 'current_program' in df.columns:
-                                        st.caption("🎓 **Most Popular Programs**")
-                                        prog_counts = df['current_program'].value_counts().head(8)
-                                        fig = create_plotly_chart("bar", {"x": prog_counts.index.tolist(), "y": prog_counts.values.tolist()}, "Top Programs by Enrollment")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_programs")
-
-                            # JOURNEY 2: REVENUE
-                            elif tab_idx == 1:
-                                # Try multiple column name variations for tuition
-                                tuition_col = None
-                                for col_name in ['Total_Tuition', 'total_tuition', 'tuition', 'Tuition', 'tuition_fees', 'fees']:
-                                    if col_name in df.columns:
-                                        tuition_col = col_name
-                                        break
+    # ========== DATA QUALITY INDICATORS ==========
+    st.subheader("📊 Data Quality Dashboard")
 
-                                # Try multiple column name variations for aid
-                                aid_col = None
-                                for col_name in ['Total_Aid', 'total_aid', 'aid', 'Aid', 'financial_aid', 'scholarship']:
-                                    if col_name in df.columns:
-                                        aid_col = col_name
-                                        break
+    col1, col2, col3 = st.columns(3)
 
-                                st.markdown("""
-                                <div style='background: rgba(16, 185, 129, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #10b981;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>💰 Revenue Distribution & Financial Aid Analysis</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Revenue sources, tuition patterns, and financial aid allocation</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row1[0]:
-                                    if tuition_col and 'nationality' in df.columns:
-                                        st.caption("🌍 **Revenue by Nationality**")
-                                        rev_by_nat = df.groupby('nationality')[tuition_col].sum().sort_values(ascending=False).head(10)
-                                        fig = create_plotly_chart("bar", {"x": rev_by_nat.index.tolist(), "y": rev_by_nat.values.tolist()}, "Revenue by Nationality")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_rev_nat")
-                                    elif 'nationality' in df.columns:
-                                        # Fallback: show nationality distribution
-                                        nat_counts = df['nationality'].value_counts().head(10)
-                                        fig = create_plotly_chart("bar", {"x": nat_counts.index.tolist(), "y": nat_counts.values.tolist()}, "Student Distribution by Nationality")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_nat_dist")
-
-                                with viz_row1[1]:
-                                    if tuition_col:
-                                        st.caption("💵 **Tuition Fee Range**")
-                                        fig = create_plotly_chart("histogram", {"values": df[tuition_col].dropna()}, "Tuition Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_tuition_dist")
-                                    elif 'cohort_year' in df.columns:
-                                        st.caption("📅 **Students by Cohort**")
-                                        cohort_counts = df['cohort_year'].value_counts().sort_index()
-                                        fig = create_plotly_chart("bar", {"x": cohort_counts.index.tolist(), "y": cohort_counts.values.tolist()}, "Students by Cohort")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_cohort_fb")
-
-                                with viz_row1[2]:
-                                    if aid_col:
-                                        st.caption("🎓 **Financial Aid Coverage**")
-                                        aid_recipients = len(df[df[aid_col] > 0])
-                                        no_aid = len(df[df[aid_col] == 0])
-                                        fig = create_plotly_chart("pie", {"labels": ["With Financial Aid", "No Aid"], "values": [aid_recipients, no_aid]}, "Financial Aid Recipients")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_aid")
-                                    elif 'enrollment_enrollment_status' in df.columns:
-                                        # Fallback: show enrollment status
-                                        status_counts = df['enrollment_enrollment_status'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": status_counts.index.tolist(), "values": status_counts.values.tolist()}, "Enrollment Status")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_status_fb")
-
-                                st.markdown("**📊 Program Performance & Payment Status**")
-                                with viz_row2[0]:
-                                    if tuition_col and 'current_program' in df.columns:
-                                        rev_by_prog = df.groupby('current_program')[tuition_col].sum().sort_values(ascending=False).head(8)
-                                        fig = create_plotly_chart("bar", {"x": rev_by_prog.index.tolist(), "y": rev_by_prog.values.tolist()}, "Revenue by Program")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_rev_prog")
-                                    elif 'current_program' in df.columns:
-                                        # Fallback: show program enrollment
-                                        prog_counts = df['current_program'].value_counts().head(8)
-                                        fig = create_plotly_chart("bar", {"x": prog_counts.index.tolist(), "y": prog_counts.values.tolist()}, "Students by Program")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_prog_fb")
-
-                                with viz_row2[1]:
-                                    if 'payment_status' in df.columns:
-                                        pay_counts = df['payment_status'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": pay_counts.index.tolist(), "values": pay_counts.values.tolist()}, "Payment Status Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_payment")
-                                    elif 'gender' in df.columns:
-                                        # Fallback: show gender distribution
-                                        gender_counts = df['gender'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": gender_counts.index.tolist(), "values": gender_counts.values.tolist()}, "Gender Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_gender_fb")
-
-                            # JOURNEY 3: OPERATIONS
-                            elif tab_idx == 2:
-                                st.markdown("""
-                                <div style='background: rgba(139, 92, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #8b5cf6;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>⚙️ Operational Metrics & Cohort Analysis</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Student operational status, cohort distribution, and institutional capacity planning</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row1[0]:
-                                    if 'enrollment_enrollment_status' in df.columns:
-                                        st.caption("📊 **Operational Status Distribution**")
-                                        status_counts = df['enrollment_enrollment_status'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": status_counts.index.tolist(), "values": status_counts.values.tolist()}, "Operational Status")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_op_status")
-
-                                with viz_row1[1]:
-                                    if 'cohort_year' in df.columns:
-                                        st.caption("📅 **Students by Cohort Year**")
-                                        cohort_counts = df['cohort_year'].value_counts().sort_index()
-                                        fig = create_plotly_chart("bar", {"x": cohort_counts.index.tolist(), "y": cohort_counts.values.tolist()}, "Students by Cohort")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_cohort_ops")
-
-                            # JOURNEY 4: ACADEMICS
-                            elif tab_idx == 3:
-                                st.markdown("""
-                                <div style='background: rgba(245, 158, 11, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #f59e0b;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>🎓 Academic Performance Overview</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>GPA distribution, performance tiers, and program excellence analysis</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row1[0]:
-                                    if 'cumulative_gpa' in df.columns:
-                                        st.caption("📊 **Overall GPA Distribution**")
-                                        fig = create_plotly_chart("histogram", {"values": df['cumulative_gpa'].dropna()}, "GPA Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_gpa_dist")
-
-                                with viz_row1[1]:
-                                    if 'cumulative_gpa' in df.columns:
-                                        st.caption("🎯 **Performance Tiers**")
-                                        high = len(df[df['cumulative_gpa'] >= 3.5])
-                                        mid = len(df[(df['cumulative_gpa'] >= 2.5) & (df['cumulative_gpa'] < 3.5)])
-                                        low = len(df[df['cumulative_gpa'] < 2.5])
-                                        fig = create_plotly_chart("pie", {"labels": ["High Performers (≥3.5)", "Mid Performers (2.5-3.5)", "At Risk (<2.5)"], "values": [high, mid, low]}, "Performance Tiers")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_perf_tiers")
-
-                                with viz_row1[2]:
-                                    if 'cumulative_gpa' in df.columns and 'current_program' in df.columns:
-                                        st.caption("🏆 **Top Performing Programs**")
-                                        gpa_by_prog = df.groupby('current_program')['cumulative_gpa'].mean().sort_values(ascending=False).head(8)
-                                        fig = create_plotly_chart("bar", {"x": gpa_by_prog.index.tolist(), "y": gpa_by_prog.values.tolist()}, "Average GPA by Program")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_gpa_prog")
-
-                                st.markdown("""
-                                <div style='background: rgba(139, 92, 246, 0.1); padding: 0.75rem; border-radius: 8px; margin: 1.5rem 0 1rem 0; border-left: 4px solid #8b5cf6;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>📊 Performance by Demographics & Workload</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Achievement patterns across nationalities and credit hour loads</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row2[0]:
-                                    if 'cumulative_gpa' in df.columns and 'nationality' in df.columns:
-                                        st.caption("🌍 **GPA by Nationality**")
-                                        gpa_by_nat = df.groupby('nationality')['cumulative_gpa'].mean().sort_values(ascending=False).head(10)
-                                        fig = create_plotly_chart("bar", {"x": gpa_by_nat.index.tolist(), "y": gpa_by_nat.values.tolist()}, "Average GPA by Nationality")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_gpa_nat")
-
-                                with viz_row2[1]:
-                                    if 'total_credit_hours' in df.columns:
-                                        st.caption("📚 **Student Workload**")
-                                        fig = create_plotly_chart("histogram", {"values": df['total_credit_hours'].dropna()}, "Credit Hours Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_credits")
-
-                            # JOURNEY 5: RETENTION
-                            elif tab_idx == 4:
-                                st.markdown("""
-                                <div style='background: rgba(34, 197, 94, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #22c55e;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>🎯 Retention & Persistence Indicators</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Student enrollment continuity, academic standing, and retention risk factors</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row1[0]:
-                                    if 'enrollment_enrollment_status' in df.columns:
-                                        st.caption("📊 **Student Enrollment Status**")
-                                        status_counts = df['enrollment_enrollment_status'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": status_counts.index.tolist(), "values": status_counts.values.tolist()}, "Student Status")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_retention_status")
-
-                                with viz_row1[1]:
-                                    if 'cumulative_gpa' in df.columns:
-                                        st.caption("📈 **Academic Performance Distribution**")
-                                        fig = create_plotly_chart("histogram", {"values": df['cumulative_gpa'].dropna()}, "GPA Distribution")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_retention_gpa")
-
-                            # JOURNEY 6: RISK
-                            elif tab_idx == 5:
-                                st.markdown("""
-                                <div style='background: rgba(239, 68, 68, 0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ef4444;'>
-                                    <div style='font-weight: 600; color: #1e293b; font-size: 0.95rem;'>⚠️ Risk Assessment & Early Warning Indicators</div>
-                                    <div style='font-size: 0.85rem; color: #475569; margin-top: 0.25rem;'>Academic performance risk, financial obligations, and student success predictors</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                with viz_row1[0]:
-                                    if 'cumulative_gpa' in df.columns:
-                                        st.caption("📉 **Academic Risk Levels**")
-                                        at_risk = len(df[df['cumulative_gpa'] < 2.5])
-                                        ok = len(df[df['cumulative_gpa'] >= 2.5])
-                                        fig = create_plotly_chart("pie", {"labels": ["At Risk (<2.5 GPA)", "Acceptable (≥2.5)"], "values": [at_risk, ok]}, "Academic Risk Assessment")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_risk_gpa")
-
-                                with viz_row1[1]:
-                                    if 'payment_status' in df.columns:
-                                        st.caption("💳 **Payment Status & Financial Risk**")
-                                        pay_counts = df['payment_status'].value_counts()
-                                        fig = create_plotly_chart("pie", {"labels": pay_counts.index.tolist(), "values": pay_counts.values.tolist()}, "Payment Risk")
-                                        st.plotly_chart(fig, width='stretch', key=f"journey_{tab_idx}_risk_payment")
-
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            st.markdown("""
-                            <div style='background: linear-gradient(135deg, rgba(139, 92, 246, 0.15), rgba(168, 85, 247, 0.15));
-                                        padding: 1.5rem; border-radius: 10px; margin: 2rem 0 1.5rem 0;
-                                        border-left: 5px solid #8b5cf6;'>
-                                <h2 style='margin: 0 0 0.5rem 0; color: #1e293b; font-size: 1.5rem;'>
-                                    📖 Journey Stories - Detailed Narratives
-                                </h2>
-                                <p style='margin: 0; color: #475569; font-size: 0.95rem; line-height: 1.6;'>
-                                    AI-generated narratives providing business context, strategic insights, and actionable recommendations
-                                    for each aspect of this journey. Expand each story to explore detailed analysis.
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
+    with col1:
+        duplicate_rows = df.duplicated().sum()
+        st.markdown(f"""
+        <div class="insight-card">
+            <h4 style="color: #6366f1;">🔄 Duplicate Rows</h4>
+            <p style="color: #e2e8f0; font-size: 1.2rem;">
+                {duplicate_rows:,} ({(duplicate_rows/len(df)*100):.2f}%)
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-                            # Import html for escaping (once per journey)
-                            import html
+    with col2:
+        columns_with_nulls = int((stats['nulls'] > 0).sum())
+        st.markdown(f"""
+        <div class="insight-card">
+            <h4 style="color: #f59e0b;">⚠️ Columns with Nulls</h4>
+            <p style="color: #e2e8f0; font-size: 1.2rem;">
+                {columns_with_nulls} / {len(df.columns)}
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-                            # Display each story
-                            for story_idx, story in enumerate(journey['stories'], 1):
-                                with st.expander(f"📄 Story {story_idx}: {story['title']}", expanded=(story_idx == 1)):
-                                    # Story subtitle
-                                    if story.get('subtitle'):
-                                        st.caption(f"*{story['subtitle']}*")
+    with col3:
+        numeric_cols_count = len(stats['numeric_cols'])
+        st.markdown(f"""
+        <div class="insight-card">
+            <h4 style="color: #10b981;">🔢 Numeric Columns</h4>
+            <p style="color: #e2e8f0; font-size: 1.2rem;">
+                {numeric_cols_count} / {len(df.columns)}
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-                                    st.markdown("---")
+    st.divider()
 
-                                    # VISUAL FLOW DIAGRAM - Story Analysis
-                                    st.markdown("#### 📊 Story Analysis Flow")
+    # ========== COLUMN-LEVEL PROFILING ==========
+    with st.expander("📋 Column-Level Analysis", expanded=False):
+        st.markdown("#### Detailed Column Profiling")
 
-                                    # Extract and escape content properly
-                                    opening = html.escape(story.get('opening_narrative', 'N/A')[:200].replace('\n', ' ').replace('  ', ' '))
-                                    insights = html.escape(story.get('data_insights', 'Key data patterns and trends identified')[:180].replace('\n', ' ').replace('  ', ' '))
-                                    impact = html.escape(story.get('business_impact', 'N/A')[:180].replace('\n', ' ').replace('  ', ' '))
-                                    action = html.escape(story.get('action_plan', 'Strategic recommendations')[:180].replace('\n', ' ').replace('  ', ' '))
+        # Select column to profile
+        profile_column = st.selectbox("Select Column to Profile", df.columns, key="profile_col")
 
-                                    # Stage 1: Current Situation
-                                    st.markdown(f"""
-                                    <div style='background: linear-gradient(135deg, #3b82f6, #2563eb); color: white; padding: 1.2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(59, 130, 246, 0.3); margin-bottom: 0.5rem;'>
-                                        <div style='font-size: 0.75rem; text-transform: uppercase; letter-spacing: 1px; opacity: 0.9; margin-bottom: 0.4rem; font-weight: 600;'>📌 CURRENT SITUATION</div>
-                                        <div style='font-size: 0.95rem; line-height: 1.6; opacity: 0.95;'>{opening}...</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
+        if profile_column:
+            col1, col2 = st.columns(2)
 
-                                    st.markdown("<div style='text-align: center; font-size: 2rem; color: #3b82f6; margin: 0.5rem 0;'>↓</div>", unsafe_allow_html=True)
+            with col1:
+                # Basic stats
+                st.markdown("**Basic Statistics**")
+                stats_df = pd.DataFrame({
+                    'Metric': ['Count', 'Unique Values', 'Null Count', 'Null %', 'Most Common'],
+                    'Value': [
+                        f"{df[profile_column].count():,}",
+                        f"{df[profile_column].nunique():,}",
+                        f"{df[profile_column].isnull().sum():,}",
+                        f"{(df[profile_column].isnull().sum() / len(df) * 100):.2f}%",
+                        str(df[profile_column].mode()[0]) if len(df[profile_column].mode()) > 0 else 'N/A'
+                    ]
+                })
+                st.dataframe(stats_df, width='stretch', hide_index=True)
 
-                                    # Stage 2: Key Insights
-                                    st.markdown(f"""
-                                    <div style='background: linear-gradient(135deg, #8b5cf6, #7c3aed); color: white; padding: 1.2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(139, 92, 246, 0.3); margin-bottom: 0.5rem;'>
-                                        <div style='font-size: 0.75rem; text-transform: uppercase; letter-spacing: 1px; opacity: 0.9; margin-bottom: 0.4rem; font-weight: 600;'>📈 KEY INSIGHTS</div>
-                                        <div style='font-size: 0.95rem; line-height: 1.6; opacity: 0.95;'>{insights}...</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
+                # Numeric statistics if applicable
+                if pd.api.types.is_numeric_dtype(df[profile_column]):
+                    st.markdown("**Numeric Statistics**")
+                    numeric_stats = pd.DataFrame({
+                        'Metric': ['Mean', 'Median', 'Std Dev', 'Min', 'Max', 'Q1', 'Q3'],
+                        'Value': [
+                            f"{df[profile_column].mean():.2f}",
+                            f"{df[profile_column].median():.2f}",
+                            f"{df[profile_column].std():.2f}",
+                            f"{df[profile_column].min():.2f}",
+                            f"{df[profile_column].max():.2f}",
+                            f"{df[profile_column].quantile(0.25):.2f}",
+                            f"{df[profile_column].quantile(0.75):.2f}"
+                        ]
+                    })
+                    st.dataframe(numeric_stats, width='stretch', hide_index=True)
 
-                                    st.markdown("<div style='text-align: center; font-size: 2rem; color: #8b5cf6; margin: 0.5rem 0;'>↓</div>", unsafe_allow_html=True)
+            with col2:
+                # Value distribution
+                st.markdown("**Value Distribution (Top 10)**")
+                value_counts = df[profile_column].value_counts().head(10)
+
+                if pd.api.types.is_numeric_dtype(df[profile_column]):
+                    # Histogram for numeric columns
+                    fig_dist = px.histogram(
+                        df, x=profile_column,
+                        nbins=30,
+                        title=f"Distribution of {profile_column}"
+                    )
+                    fig_dist.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                        font=dict(color='white'),
+                        height=300
+                    )
+                    st.plotly_chart(fig_dist, width='stretch')
+                else:
+                    # Bar chart for categorical columns
+                    fig_dist = px.bar(
+                        x=value_counts.index.astype(str),
+                        y=value_counts.values,
+                        title=f"Top 10 Values in {profile_column}"
+                    )
+                    fig_dist.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(30, 41, 59, 0.85)',
+                        font=dict(color='white'),
+                        height=300,
+                        xaxis_title="Value",
+                        yaxis_title="Count"
+                    )
+                    st.plotly_chart(fig_dist, width='stretch')
 
-                                    # Stage 3: Business Impact
-                                    st.markdown(f"""
-                                    <div style='background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 1.2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3); margin-bottom: 0.5rem;'>
-                                        <div style='font-size: 0.75rem; text-transform: uppercase; letter-spacing: 1px; opacity: 0.9; margin-bottom: 0.4rem; font-weight: 600;'>💼 BUSINESS IMPACT</div>
-                                        <div style='font-size: 0.95rem; line-height: 1.6; opacity: 0.95;'>{impact}...</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
+    # ========== CARDINALITY ANALYSIS ==========
+    with st.expander("🔍 Cardinality Analysis", expanded=False):
+        st.markdown("#### Column Cardinality (Uniqueness)")
 
-                                    st.markdown("<div style='text-align: center; font-size: 2rem; color: #10b981; margin: 0.5rem 0;'>↓</div>", unsafe_allow_html=True)
+        cardinality_df = pd.DataFrame({
+            'Column': df.columns,
+            'Unique Values': stats['unique'].values,
+            'Cardinality %': stats['unique'].values / len(df) * 100
+        })
+        cardinality_df = cardinality_df.sort_values('Unique Values', ascending=False)
+
+        fig_card = px.bar(
+            cardinality_df.head(15),
+            x='Column',
+            y='Unique Values',
+            title="Top 15 Columns by Cardinality",
+            color='Cardinality %',
+            color_continuous_scale='viridis'
+        )
+        fig_card.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(30, 41, 59, 0.85)',
+            font=dict(color='white'),
+            height=400
+        )
+        st.plotly_chart(fig_card, width='stretch')
 
-                                    # Stage 4: Recommended Actions
-                                    st.markdown(f"""
-                                    <div style='background: linear-gradient(135deg, #f59e0b, #d97706); color: white; padding: 1.2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(245, 158, 11, 0.3); margin-bottom: 1rem;'>
-                                        <div style='font-size: 0.75rem; text-transform: uppercase; letter-spacing: 1px; opacity: 0.9; margin-bottom: 0.4rem; font-weight: 600;'>🎯 RECOMMENDED ACTIONS</div>
-                                        <div style='font-size: 0.95rem; line-height: 1.6; opacity: 0.95;'>{action}...</div>
-                                    </div>
-                                    """, unsafe_allow_html=True)
+        st.dataframe(cardinality_df, width='stretch', height=300)
 
-                                    st.markdown("---")
+    # ========== ALL COLUMNS TABLE ==========
+    with st.expander("📋 View All Columns", expanded=False):
+        st.dataframe(
+            pd.DataFrame({
+                'Column': df.columns,
+                'Type': stats['dtypes'],
+                'Non-Null Count': stats['counts'],
+                'Null Count': stats['nulls'],
+                'Null %': (stats['nulls'] / len(df) * 100).round(2),
+                'Unique Values': stats['unique']
+            }),
+            width='stretch',
+            height=400
+        )
 
-                                    # Detailed sections in expander
-                                    with st.expander("📋 View Full Analysis Details", expanded=False):
-                                        # Complete Narrative
-                                        st.markdown("##### 📖 Complete Narrative")
-                                        full_narrative = html.escape(story.get('opening_narrative', 'N/A')).replace('\n', '<br>')
-                                        st.markdown(f"""
-                                        <div style='background: rgba(139, 92, 246, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #8b5cf6; margin-bottom: 1rem;'>
-                                            <p style='margin: 0; color: #1e293b; line-height: 1.6;'>{full_narrative}</p>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-
-                                        # Full Data Insights
-                                        st.markdown("##### 📊 Complete Data Insights")
-                                        full_insights = html.escape(story.get('data_insights', 'N/A')).replace('\n', '<br>')
-                                        st.markdown(f"""
-                                        <div style='background: rgba(59, 130, 246, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #3b82f6; margin-bottom: 1rem;'>
-                                            <p style='margin: 0; color: #1e293b; line-height: 1.6;'>{full_insights}</p>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-
-                                        # Full Business Impact
-                                        st.markdown("##### 💼 Full Business Impact Analysis")
-                                        full_impact = html.escape(story.get('business_impact', 'N/A')).replace('\n', '<br>')
-                                        st.markdown(f"""
-                                        <div style='background: rgba(34, 197, 94, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #22c55e; margin-bottom: 1rem;'>
-                                            <p style='margin: 0; color: #1e293b; line-height: 1.6;'>{full_impact}</p>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-
-                                        # Key Findings
-                                        st.markdown("##### 🔍 Key Findings")
-                                        full_findings = html.escape(story.get('findings_summary', 'N/A')).replace('\n', '<br>')
-                                        st.markdown(f"""
-                                        <div style='background: rgba(251, 146, 60, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #fb923c; margin-bottom: 1rem;'>
-                                            <div style='color: #1e293b; line-height: 1.8;'>{full_findings}</div>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-
-                                        # Complete Action Plan
-                                        st.markdown("##### 🎯 Complete Action Plan")
-                                        full_action = html.escape(story.get('action_plan', 'N/A')).replace('\n', '<br>')
-                                        st.markdown(f"""
-                                        <div style='background: rgba(245, 158, 11, 0.1); padding: 1rem; border-radius: 8px; border-left: 4px solid #f59e0b; margin-bottom: 1rem;'>
-                                            <div style='color: #1e293b; line-height: 1.8;'>{full_action}</div>
-                                        </div>
-                                        """, unsafe_allow_html=True)
+    st.divider()
 
-    # ====================================================================================
-    # TAB 5: ACADEMIC ANALYTICS - HYBRID AI-DRIVEN
-    # ====================================================================================
-    with tabs[4]:
-        st.header("🎓 Academic Analytics - AI-Driven Deep Analysis")
-        st.caption("The AI analyzes academic performance patterns and recommends targeted interventions")
+    # ========== AI-POWERED DATA INSIGHTS & RECOMMENDATIONS ==========
+    st.markdown("### 🧠 AI-Powered Data Insights & Recommendations")
+    st.caption("Generate comprehensive business insights and actionable recommendations using AI analysis")
 
-        # Academic-focused metrics
-        col1, col2, col3, col4 = st.columns(4)
+    if st.session_state.ollama_connected:
+        # Initialize session state for insights
+        if 'ai_insights' not in st.session_state:
+            st.session_state['ai_insights'] = {}
 
-        with col1:
-            st.metric("High Performers", f"{metrics.get('high_performers', 0):,}",
-                     f"{metrics.get('high_performers', 0)/metrics.get('total_students', 1)*100:.1f}%")
+        col_btn, col_info = st.columns([2, 3])
 
-        with col2:
-            st.metric("Average GPA", f"{metrics.get('avg_gpa', 0):.2f}")
+        with col_btn:
+            if st.button("🧠 Generate AI Insights & Recommendations", type="primary", key="ai_insights_btn", width='stretch'):
+                st.session_state['generating_insights'] = True
 
-        with col3:
-            st.metric("At-Risk Students", f"{metrics.get('at_risk', 0):,}",
-                     delta=f"-{metrics.get('at_risk', 0)/metrics.get('total_students', 1)*100:.1f}%",
-                     delta_color="inverse")
+        with col_info:
+            is_cloudflare = "cloudflare" in url.lower() or "exalio" in url.lower()
+            timeout_msg = "5-10 minutes" if is_cloudflare else "1-2 minutes"
+            st.caption(f"⏱️ Estimated time: {timeout_msg} | Uses: {model}")
 
-        with col4:
-            # Calculate mid-performers
-            mid_performers = metrics.get('total_students', 0) - metrics.get('high_performers', 0) - metrics.get('at_risk', 0)
-            st.metric("Mid-Performers", f"{mid_performers:,}",
-                     f"{mid_performers/metrics.get('total_students', 1)*100:.1f}%")
+        # Generate insights if button clicked
+        if st.session_state.get('generating_insights', False):
+            try:
+                with st.spinner(f"🔍 Discovering insights, patterns, and generating recommendations... (this may take {timeout_msg})"):
 
-        st.divider()
+                    # Step 1: Auto-discover insights
+                    st.info("📊 Step 1/2: Analyzing data quality, correlations, trends, outliers, and patterns...")
+                    auto_insights = auto_discover_insights(df, model, url)
 
-        # AI Analysis Button
-        if st.session_state.ollama_connected and st.button("🤖 Generate Academic Performance Analysis & Visualizations", key="academic_btn", type="primary", width='stretch'):
+                    if not auto_insights:
+                        st.error("❌ Failed to generate insights. Please try again.")
+                        st.session_state['generating_insights'] = False
+                        st.stop()
 
-            # Generate academic-focused analysis using hybrid approach
-            academic_analysis = generate_dynamic_visualizations_llm(
-                metrics,
-                df,
-                st.session_state.selected_model,
-                st.session_state.ollama_url,
-                context_type="academic"  # Academic-focused context
-            )
+                    st.session_state.ai_insights['auto_insights'] = auto_insights
+                    st.success("✅ Step 1 complete: Insights discovered!")
 
-            if academic_analysis:
-                # Display strategic overview
-                st.markdown("### 🎯 Academic Performance Analysis")
-                st.info(academic_analysis.get('strategic_overview', ''))
+                    # Step 2: Generate recommendations
+                    st.info("💡 Step 2/2: Generating actionable business recommendations...")
+                    recommendations = generate_business_recommendations(df, auto_insights, model, url)
 
-                st.divider()
+                    st.session_state.ai_insights['recommendations'] = recommendations
+                    st.success("✅ Step 2 complete: Recommendations generated!")
 
-                # Display visualizations with insights
-                st.markdown("### 📊 AI-Recommended Academic Visualizations")
-                viz_list = academic_analysis.get('visualizations', [])
-                st.caption(f"The AI analyzed your data and recommends {len(viz_list)} academic visualizations")
+                    st.session_state['generating_insights'] = False
+                    st.rerun()
 
-                for i, viz_spec in enumerate(viz_list):
-                    with st.container():
-                        st.markdown(f"#### {viz_spec.get('title', f'Visualization {i+1}')}")
-                        st.caption(f"**Why this matters:** {viz_spec.get('reasoning', 'Academic performance indicator')}")
+            except Exception as e:
+                st.error(f"❌ Error generating insights: {str(e)}")
+                st.session_state['generating_insights'] = False
+                st.stop()
 
-                        # Build and display chart
-                        fig = build_dynamic_chart(viz_spec, df)
-                        if fig:
-                            st.plotly_chart(fig, width='stretch', key=f"academic_viz_{i}")
-                        else:
-                            st.warning(f"⚠️ Could not generate chart for: {viz_spec.get('data_column', 'unknown')}")
-
-                        # Display AI insight
-                        insight = viz_spec.get('insight', '')
-                        if insight:
-                            st.markdown(f"""
-                            <div class="insight-card">
-                                <div class="insight-title">🎓 Academic Insight</div>
-                                <div class="insight-text">{insight}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+        # Display insights if available
+        if 'auto_insights' in st.session_state.ai_insights:
+            st.markdown("---")
 
-                        st.divider()
+            # Create tabs for insights and recommendations
+            insight_tab, recommend_tab = st.tabs(["🔍 Key Data Insights", "✅ Recommendations"])
 
-                # Display key findings
-                st.markdown("### 🔍 Key Academic Findings")
-                findings = academic_analysis.get('key_findings', [])
-                for i, finding in enumerate(findings, 1):
-                    st.markdown(f"**Finding {i}:** {finding}")
+            with insight_tab:
+                st.subheader("💡 Key Data Insights")
 
-                st.divider()
+                insights_data = st.session_state.ai_insights['auto_insights']
 
-                # Display recommendations
-                st.markdown("### 💡 Academic Intervention Recommendations")
-                recommendations = academic_analysis.get('recommendations', [])
+                # Display key findings
+                if 'key_findings' in insights_data:
+                    st.markdown(insights_data['key_findings'])
 
-                for i, rec in enumerate(recommendations, 1):
-                    # Color code by priority (first = high priority)
-                    priority_color = "🔴" if i == 1 else "🟠" if i == 2 else "🟢"
+                st.markdown("---")
 
-                    with st.container():
-                        st.markdown(f"""
-                        <div class="recommendation-card">
-                            <div class="recommendation-priority">{priority_color} Priority {i}</div>
-                            <div class="recommendation-text">{rec}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                # Display detailed analysis in expandable sections
+                col1, col2 = st.columns(2)
 
-        elif not st.session_state.ollama_connected:
-            st.warning("⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered academic analysis.")
+                with col1:
+                    # Data Quality
+                    with st.expander("📊 Data Quality Analysis", expanded=False):
+                        quality = insights_data.get('data_quality', {})
+                        st.metric("Total Records", f"{quality.get('total_records', 0):,}")
+                        st.metric("Total Columns", quality.get('total_columns', 0))
+
+                        issues = quality.get('quality_issues', [])
+                        if issues and issues[0] != 'No significant quality issues':
+                            st.warning("**Quality Issues Detected:**")
+                            for issue in issues:
+                                st.markdown(f"- {issue}")
+                        else:
+                            st.success("✅ Excellent data quality!")
 
-    # ====================================================================================
-    # TAB 6: HOUSING INSIGHTS - AI-DRIVEN
-    # ====================================================================================
-    with tabs[5]:
-        st.header("🏠 Housing Insights - AI-Driven Deep Analysis")
-        st.caption("The AI analyzes housing patterns, occupancy trends, and their impact on student success")
+                    # Correlations
+                    with st.expander("🔗 Strong Correlations", expanded=False):
+                        correlations = insights_data.get('correlations', [])
+                        if correlations:
+                            for corr in correlations:
+                                st.markdown(f"""
+                                **{corr['col1']} ↔ {corr['col2']}**
+                                Correlation: `{corr['correlation']}`
+                                Strength: {corr['strength']}
+                                """)
+                        else:
+                            st.info("No strong correlations (>0.7) detected")
+
+                    # Patterns
+                    with st.expander("🎯 Categorical Patterns", expanded=False):
+                        patterns = insights_data.get('patterns', {}).get('categorical', [])
+                        if patterns:
+                            for pattern in patterns:
+                                st.markdown(f"- {pattern}")
+                        else:
+                            st.info("No dominant categorical patterns detected")
 
-        # Check for housing data
-        housing_col = None
-        for col in ['room_number', 'housing_status', 'residence_hall', 'housing', 'residence', 'dormitory']:
-            if col in df.columns:
-                housing_col = col
-                break
+                with col2:
+                    # Outliers
+                    with st.expander("⚡ Outliers Detected", expanded=False):
+                        outliers = insights_data.get('outliers', {})
+                        if outliers:
+                            for col_name, outlier_info in outliers.items():
+                                st.markdown(f"""
+                                **{col_name}**
+                                Count: `{outlier_info['count']}`
+                                Percentage: {outlier_info['percentage']}%
+                                """)
+                        else:
+                            st.success("✅ No significant outliers detected")
+
+                    # Trends
+                    with st.expander("📈 Trends Analysis", expanded=False):
+                        trends = insights_data.get('trends', {})
+                        if trends:
+                            for col_name, trend_info in trends.items():
+                                direction_icon = "📈" if trend_info['direction'] == 'increasing' else "📉"
+                                st.markdown(f"""
+                                {direction_icon} **{col_name}**
+                                Direction: {trend_info['direction'].title()}
+                                Change: {trend_info['change_percentage']}%
+                                """)
+                        else:
+                            st.info("No significant trends detected (requires datetime column)")
 
-        if housing_col:
-            on_campus = df[df[housing_col].notna()].shape[0]
-            off_campus = df[df[housing_col].isna()].shape[0]
-            housing_utilization = (on_campus / len(df) * 100) if len(df) > 0 else 0
-
-            # Calculate housing impact on GPA if GPA column exists
-            gpa_col = None
-            for col in ['gpa', 'cumulative_gpa', 'cgpa']:
-                if col in df.columns:
-                    gpa_col = col
-                    break
+            with recommend_tab:
+                st.subheader("✅ Business Recommendations")
 
-            on_campus_gpa = 0
-            off_campus_gpa = 0
-            if gpa_col:
-                on_campus_gpa = df[df[housing_col].notna()][gpa_col].mean()
-                off_campus_gpa = df[df[housing_col].isna()][gpa_col].mean()
+                if 'recommendations' in st.session_state.ai_insights:
+                    recommendations = st.session_state.ai_insights['recommendations']
 
-            # Housing-focused metrics
-            col1, col2, col3, col4 = st.columns(4)
+                    if recommendations:
+                        # Group by priority
+                        high_priority = [r for r in recommendations if r['priority'] == 'HIGH']
+                        medium_priority = [r for r in recommendations if r['priority'] == 'MEDIUM']
+                        low_priority = [r for r in recommendations if r['priority'] == 'LOW']
 
-            with col1:
-                st.metric("On-Campus Residents", f"{on_campus:,}",
-                         f"{housing_utilization:.1f}%")
+                        # Display HIGH priority first
+                        if high_priority:
+                            st.markdown("### 🔴 High Priority")
+                            for idx, rec in enumerate(high_priority, 1):
+                                with st.container():
+                                    st.markdown(f"""
+                                    <div style='background: rgba(239, 68, 68, 0.1); border-left: 4px solid #ef4444; padding: 15px; margin: 10px 0; border-radius: 8px;'>
+                                        <p style='margin: 0; color: #e2e8f0;'><strong>{idx}. {rec['recommendation']}</strong></p>
+                                        <p style='margin: 5px 0 0 0; color: #94a3b8; font-size: 0.85rem;'>Category: {rec['category']}</p>
+                                    </div>
+                                    """, unsafe_allow_html=True)
 
-            with col2:
-                st.metric("Off-Campus Students", f"{off_campus:,}",
-                         f"{(off_campus/len(df)*100):.1f}%")
+                        # Display MEDIUM priority
+                        if medium_priority:
+                            st.markdown("### 🟡 Medium Priority")
+                            for idx, rec in enumerate(medium_priority, 1):
+                                with st.container():
+                                    st.markdown(f"""
+                                    <div style='background: rgba(245, 158, 11, 0.1); border-left: 4px solid #f59e0b; padding: 15px; margin: 10px 0; border-radius: 8px;'>
+                                        <p style='margin: 0; color: #e2e8f0;'><strong>{idx}. {rec['recommendation']}</strong></p>
+                                        <p style='margin: 5px 0 0 0; color: #94a3b8; font-size: 0.85rem;'>Category: {rec['category']}</p>
+                                    </div>
+                                    """, unsafe_allow_html=True)
 
-            with col3:
-                if gpa_col and on_campus_gpa > 0:
-                    st.metric("On-Campus Avg GPA", f"{on_campus_gpa:.2f}",
-                             delta=f"{on_campus_gpa - off_campus_gpa:+.2f}" if off_campus_gpa > 0 else None)
+                        # Display LOW priority
+                        if low_priority:
+                            st.markdown("### 🟢 Low Priority")
+                            for idx, rec in enumerate(low_priority, 1):
+                                with st.container():
+                                    st.markdown(f"""
+                                    <div style='background: rgba(16, 185, 129, 0.1); border-left: 4px solid #10b981; padding: 15px; margin: 10px 0; border-radius: 8px;'>
+                                        <p style='margin: 0; color: #e2e8f0;'><strong>{idx}. {rec['recommendation']}</strong></p>
+                                        <p style='margin: 5px 0 0 0; color: #94a3b8; font-size: 0.85rem;'>Category: {rec['category']}</p>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                    else:
+                        st.info("No recommendations generated yet")
                 else:
-                    st.metric("Housing Utilization", f"{housing_utilization:.1f}%")
+                    st.info("Generate insights first to see recommendations")
+    else:
+        st.warning("⚠️ Please connect to Ollama to use AI-powered insights and recommendations")
 
-            with col4:
-                if gpa_col and off_campus_gpa > 0:
-                    st.metric("Off-Campus Avg GPA", f"{off_campus_gpa:.2f}",
-                             delta=f"{off_campus_gpa - on_campus_gpa:+.2f}" if on_campus_gpa > 0 else None)
-                else:
-                    # Count unique residence halls if available
-                    unique_residences = df[housing_col].nunique()
-                    st.metric("Residence Options", f"{unique_residences:,}")
 
-            st.divider()
+# ====================================================================================
+# TAB 11: DATA EXPLORER WITH LLM Q&A
+# ====================================================================================
 
-            # AI Analysis Button
-            if st.session_state.ollama_connected and st.button("🤖 Generate Housing Impact Analysis & Visualizations", key="housing_btn", type="primary", width='stretch'):
+@st.fragment
+def _render_tab_data_explorer(df: pd.DataFrame, metrics: dict, model: str, url: str):
+    """Render the '🔬 Data Explorer' tab"""
+    st.header("🔬 Data Explorer - AI-Powered Q&A")
+
+    st.info("💡 Ask questions about your data in natural language!")
+
+    # Data preview
+    st.subheader("📊 Data Preview")
+    st.dataframe(data_preview(dataset_key(df), df), width="stretch")
+
+    # Browse the full dataset one chunk at a time instead of rendering every row at once; an expander
+    # would still send its body on every rerun, so the page is only rendered while the box is ticked
+    if st.checkbox("📄 Browse all rows", value=False, key="explorer_browse_rows"):
+        chunk_size = 1000
+        n_chunks = max(1, -(-len(df) // chunk_size))
+        chunk_idx = st.number_input(f"Rows page (1-{n_chunks}, {chunk_size:,} rows each)", min_value=1,
+                                    max_value=n_chunks, value=1, step=1, key="explorer_rows_page")
+        start = (int(chunk_idx) - 1) * chunk_size
+        st.dataframe(df.iloc[start:start + chunk_size], width="stretch", height=400)
+
+    st.divider()
+
+    # AI Q&A Interface
+    if st.session_state.ollama_connected:
+        user_question = st.text_area(
+            "Ask a question about the data:",
+            placeholder="Example: What percentage of students are performing below 2.5 GPA? What trends do you see in the financial aid distribution?",
+            height=100
+        )
 
-                # Generate housing-focused analysis using hybrid approach
-                housing_analysis = generate_dynamic_visualizations_llm(
-                    metrics,
-                    df,
-                    st.session_state.selected_model,
-                    st.session_state.ollama_url,
-                    context_type="housing"  # Housing-focused context
-                )
+        data_key = dataset_key(df)
+        if st.button("🤖 Ask AI", key="qa_btn"):
+            if user_question.strip():
+                qa_key = (model, url, data_key, user_question.strip())
+                st.session_state.qa_last = qa_key
 
-                if housing_analysis:
-                    # Display strategic overview
-                    st.markdown("### 🏠 Housing Impact Analysis")
-                    st.info(housing_analysis.get('strategic_overview', ''))
+                # An identical question on the same dataset and model is answered from session state
+                if qa_key not in st.session_state.qa_answers:
+                    with st.spinner("🔄 AI is analyzing your question..."):
+                        # Serialized data context, built once per dataset
+                        metrics_json, summary_json = qa_prompt_context(data_key, df, metrics)
 
-                    st.divider()
+                        prompt = f"""You are analyzing a student dataset with {len(df):,} records.
 
-                    # Display visualizations with insights
-                    st.markdown("### 📊 AI-Recommended Housing Visualizations")
-                    viz_list = housing_analysis.get('visualizations', [])
-                    st.caption(f"The AI analyzed your data and recommends {len(viz_list)} housing-related visualizations")
+**Available Metrics:**
+{metrics_json}
 
-                    for i, viz_spec in enumerate(viz_list):
-                        with st.container():
-                            st.markdown(f"#### {viz_spec.get('title', f'Visualization {i+1}')}")
-                            st.caption(f"**Why this matters:** {viz_spec.get('reasoning', 'Housing performance indicator')}")
+**Data Summary:**
+{summary_json}
 
-                            # Build and display chart
-                            fig = build_dynamic_chart(viz_spec, df)
-                            if fig:
-                                st.plotly_chart(fig, width='stretch', key=f"housing_viz_{i}")
-                            else:
-                                st.warning(f"⚠️ Could not generate chart for: {viz_spec.get('data_column', 'unknown')}")
+**User Question:**
+{user_question}
 
-                            # Display AI insight
-                            insight = viz_spec.get('insight', '')
-                            if insight:
-                                st.markdown(f"""
-                                <div class="insight-card">
-                                    <div class="insight-title">🏠 Housing Insight</div>
-                                    <div class="insight-text">{insight}</div>
-                                </div>
-                                """, unsafe_allow_html=True)
+Provide a clear, data-driven answer based on the available metrics and data summary. If you need specific data that's not provided, explain what insights you can provide with available information."""
 
-                            st.divider()
+                        qa_options = dict(temperature=0.5, num_predict=600, auto_optimize=True)
+                        # Show tokens as they arrive, then swap in the styled card once complete
+                        answer_slot = st.empty()
+                        stream_errors = []
+                        with answer_slot.container():
+                            response = st.write_stream(stream_ollama(prompt, model, url, stream_errors, **qa_options))
+                        answer_slot.empty()
+                        if stream_errors:
+                            # Partial text before a failure is discarded, never cached as an answer
+                            response = f"[ERROR] {stream_errors[0]}"
 
-                    # Display key findings
-                    st.markdown("### 🔍 Key Housing Findings")
-                    findings = housing_analysis.get('key_findings', [])
-                    for i, finding in enumerate(findings, 1):
-                        st.markdown(f"**Finding {i}:** {finding}")
+                        if response and not response.startswith('[ERROR]'):
+                            st.session_state.qa_answers[qa_key] = response
+                        else:
+                            st.error(f"Error generating response: {response}")
+            else:
+                st.warning("Please enter a question")
 
-                    st.divider()
+        # Last answer stays on screen across reruns while the dataset and model are unchanged
+        qa_last = st.session_state.qa_last
+        if qa_last and qa_last[:3] == (model, url, data_key) and qa_last in st.session_state.qa_answers:
+            st.markdown(f"""
+            <div class="insight-card">
+                <div class="insight-title">🤖 AI Response</div>
+                <div class="insight-text">{st.session_state.qa_answers[qa_last]}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ Connect to Ollama to use AI-powered Q&A")
+
+
+# Tab label -> renderer, in display order. The AI analysis, Data Lineage and Data Explorer tabs are
+# st.fragment renderers, so their buttons and inputs rerun only that tab instead of the whole script.
+APP_TABS = [
+    ("📊 Executive Summary", _render_tab_executive_summary),
+    ("📖 Data Storytelling AI Driven with Template Guidance", _render_tab_guided_journeys),
+    ("🔬 Data Storytelling Fully AI Driven", _render_tab_fully_dynamic),
+    ("📚 Data Storytelling (PreDefined+LLM Narrative)", _render_tab_complete_journeys),
+    ("🎓 Academic Analytics", _render_tab_academic),
+    ("🏠 Housing Insights", _render_tab_housing),
+    ("💰 Financial Intelligence", _render_tab_financial),
+    ("👥 Demographics", _render_tab_demographics),
+    ("⚠️ Risk & Success", _render_tab_risk),
+    ("🔗 Data Lineage", _render_tab_data_lineage),
+    ("🔬 Data Explorer", _render_tab_data_explorer),
+]
 
-                    # Display recommendations
-                    st.markdown("### 💡 Housing Strategy Recommendations")
-                    recommendations = housing_analysis.get('recommendations', [])
 
-                    for i, rec in enumerate(recommendations, 1):
-                        # Color code by priority (first = high priority)
-                        priority_color = "🔴" if i == 1 else "🟠" if i == 2 else "🟢"
+# ====================================================================================
+# MAIN APPLICATION
+# ====================================================================================
 
-                        with st.container():
-                            st.markdown(f"""
-                            <div class="recommendation-card">
-                                <div class="recommendation-priority">{priority_color} Priority {i}</div>
-                                <div class="recommendation-text">{rec}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+def main():
+    """Main application entry point"""
 
-            elif not st.session_state.ollama_connected:
-                st.warning("⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered housing analysis.")
-        else:
-            st.info("Housing data not available in current dataset. Please ensure your dataset includes housing-related columns (e.g., 'room_number', 'housing_status', 'residence_hall').")
+    # Initialize
+    inject_custom_css()
+    initialize_session_state()
+    warmup_journey_kernels()
+
+    # Header
+    st.markdown("""
+    <div class="hero-section">
+        <div class="hero-title">🎓 Student 360 AI-Powered Analytics <span style="font-size: 0.5em; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 4px 12px; border-radius: 20px; margin-left: 10px;">V2.0</span></div>
+        <div class="hero-subtitle">Transform Student Data into Strategic Intelligence with Large Language Models</div>
+    </div>
+    """, unsafe_allow_html=True)
 
     # ====================================================================================
-    # TAB 7: FINANCIAL INTELLIGENCE - AI-DRIVEN
+    # SIDEBAR - EXACT IMPLEMENTATION FROM GEN_STORYTELLING_APP.PY
     # ====================================================================================
-    with tabs[6]:
-        st.header("💰 Financial Intelligence - AI-Driven Deep Analysis")
-        st.caption("The AI analyzes financial sustainability, aid effectiveness, and revenue optimization strategies")
-
-        # Check for financial data
-        aid_col = None
-        for col in ['financial_aid_monetary_amount', 'financial_aid', 'aid', 'scholarship', 'scholarship_amount']:
-            if col in df.columns:
-                aid_col = col
-                break
-
-        tuition_col = None
-        for col in ['tuition_fees', 'tuition', 'fees', 'annual_tuition']:
-            if col in df.columns:
-                tuition_col = col
-                break
-
-        # Calculate financial metrics
-        total_tuition = metrics.get('total_tuition', 0)
-        total_aid = metrics.get('total_aid', 0)
-        aid_coverage_pct = (total_aid / total_tuition * 100) if total_tuition > 0 else 0
+    with st.sidebar:
+        st.markdown("### 📚 Help & Documentation")
+        st.caption("🎓 Student 360 AI-Powered Analytics")
 
-        aid_recipients = 0
-        avg_aid_amount = 0
-        net_revenue = total_tuition - total_aid
+        # Version info
+        st.markdown("""
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 8px 12px; border-radius: 8px; margin: 10px 0;">
+            <div style="color: white; font-weight: 600; font-size: 0.9em;">Version 2.0</div>
+            <div style="color: rgba(255,255,255,0.8); font-size: 0.75em;">Production Release • Feb 2026</div>
+            <div style="color: rgba(255,255,255,0.9); font-size: 0.7em; margin-top: 4px;">✨ Pre-loaded Dataset</div>
+        </div>
+        """, unsafe_allow_html=True)
 
-        if aid_col and aid_col in df.columns:
-            aid_recipients = df[df[aid_col] > 0].shape[0]
-            avg_aid_amount = df[df[aid_col] > 0][aid_col].mean() if aid_recipients > 0 else 0
+        st.divider()
 
-        # Financial-focused metrics
-        col1, col2, col3, col4 = st.columns(4)
+        # ====================================================================================
+        # GETTING STARTED GUIDE
+        # ====================================================================================
+        st.markdown("### 📋 Getting Started")
+        st.caption("🔄 **App Version: 3.1** - Function Rename Fix (No More Cache!) ✨")
+        st.caption("---")
 
-        with col1:
-            st.metric("Total Tuition", f"AED {total_tuition:,.0f}",
-                     help="Gross tuition revenue from all students")
+        # Status indicators
+        ollama_status = st.session_state.get('ollama_connected', False)
+        data_loaded = st.session_state.data is not None
 
-        with col2:
-            st.metric("Financial Aid", f"AED {total_aid:,.0f}",
-                     delta=f"-{aid_coverage_pct:.1f}%",
-                     delta_color="inverse",
-                     help="Total aid distributed to students")
+        if ollama_status:
+            st.success("✅ Ollama Connected")
+            st.caption("Ready to generate AI-powered insights")
+        else:
+            st.warning("⚠️ Ollama Not Connected")
+            st.caption("Configure connection below")
 
-        with col3:
-            st.metric("Net Revenue", f"AED {net_revenue:,.0f}",
-                     help="Tuition revenue after aid distribution")
+        if data_loaded:
+            st.success("✅ Data Loaded")
+            st.caption(f"{len(st.session_state.data):,} student records")
+        else:
+            st.info("📁 No Data Loaded")
+            st.caption("Upload CSV in Data Source section")
 
-        with col4:
-            if aid_recipients > 0:
-                st.metric("Aid Recipients", f"{aid_recipients:,}",
-                         f"{(aid_recipients/len(df)*100):.1f}%",
-                         help="Students receiving financial aid")
-            else:
-                st.metric("Aid Coverage", f"{aid_coverage_pct:.1f}%",
-                         help="Aid as percentage of tuition revenue")
+        if st.session_state.llm_cache or st.session_state.complete_journeys:
+            if st.button("🗑️ Free journey memory", key="free_journey_memory", width="stretch"):
+                free_llm_memory()
+                st.rerun()
 
         st.divider()
 
-        # AI Analysis Button
-        if st.session_state.ollama_connected and st.button("🤖 Generate Financial Sustainability Analysis & Visualizations", key="finance_btn", type="primary", width='stretch'):
-
-            # Generate financial-focused analysis using hybrid approach
-            financial_analysis = generate_dynamic_visualizations_llm(
-                metrics,
-                df,
-                st.session_state.selected_model,
-                st.session_state.ollama_url,
-                context_type="financial"  # Financial-focused context
-            )
+        # ====================================================================================
+        # LLM & PROMPT ENHANCEMENT GUIDE
+        # ====================================================================================
+        if st.button("🧠 LLM & Prompt Enhancement Guide", width='stretch', type="secondary"):
+            st.session_state.show_llm_guide = not st.session_state.get('show_llm_guide', False)
 
-            if financial_analysis:
-                # Display strategic overview
-                st.markdown("### 💰 Financial Sustainability Analysis")
-                st.info(financial_analysis.get('strategic_overview', ''))
+        if st.session_state.get('show_llm_guide', False):
+            with st.expander("📖 LLM Enhancement Techniques Used", expanded=True):
+                st.markdown("""
+                <style>
+                .guide-content {
+                    background-color: #1e1e1e;
+                    color: #e0e0e0;
+                    padding: 20px;
+                    border-radius: 10px;
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                }
+                .guide-content h2 {
+                    color: #4CAF50;
+                    border-bottom: 2px solid #4CAF50;
+                    padding-bottom: 10px;
+                }
+                .guide-content h3 {
+                    color: #2196F3;
+                }
+                .guide-content h4 {
+                    color: #FF9800;
+                }
+                .guide-content table {
+                    background-color: #2d2d2d;
+                    color: #e0e0e0;
+                    border-collapse: collapse;
+                    width: 100%;
+                    margin: 10px 0;
+                }
+                .guide-content th {
+                    background-color: #3d3d3d;
+                    color: #4CAF50;
+                    padding: 10px;
+                    border: 1px solid #555;
+                }
+                .guide-content td {
+                    padding: 8px;
+                    border: 1px solid #555;
+                }
+                .guide-content code {
+                    background-color: #2d2d2d;
+                    color: #ffa500;
+                    padding: 2px 6px;
+                    border-radius: 3px;
+                }
+                .guide-content pre {
+                    background-color: #2d2d2d;
+                    color: #e0e0e0;
+                    padding: 15px;
+                    border-radius: 5px;
+                    border-left: 4px solid #4CAF50;
+                    overflow-x: auto;
+                }
+                .guide-content blockquote {
+                    background-color: #2d2d2d;
+                    border-left: 4px solid #2196F3;
+                    padding: 10px 20px;
+                    margin: 10px 0;
+                    color: #e0e0e0;
+                }
+                .guide-content ul, .guide-content ol {
+                    color: #e0e0e0;
+                }
+                .guide-content strong {
+                    color: #FFD700;
+                }
+                </style>
+                <div class="guide-content">
 
-                st.divider()
+                <h2>🎯 Prompt Enhancement Strategies</h2>
 
-                # Display visualizations with insights
-                st.markdown("### 📊 AI-Recommended Financial Visualizations")
-                viz_list = financial_analysis.get('visualizations', [])
-                st.caption(f"The AI analyzed your data and recommends {len(viz_list)} financial visualizations")
+                ### 1. **Modular Prompt System**
+                We use specialized prompts for different narrative types:
 
-                for i, viz_spec in enumerate(viz_list):
-                    with st.container():
-                        st.markdown(f"#### {viz_spec.get('title', f'Visualization {i+1}')}")
-                        st.caption(f"**Why this matters:** {viz_spec.get('reasoning', 'Financial performance indicator')}")
+                **Example - Business Context Prompt:**
+                ```
+                You are a higher education business analyst...
 
-                        # Build and display chart
-                        fig = build_dynamic_chart(viz_spec, df)
-                        if fig:
-                            st.plotly_chart(fig, width='stretch', key=f"financial_viz_{i}")
-                        else:
-                            st.warning(f"⚠️ Could not generate chart for: {viz_spec.get('data_column', 'unknown')}")
-
-                        # Display AI insight
-                        insight = viz_spec.get('insight', '')
-                        if insight:
-                            st.markdown(f"""
-                            <div class="insight-card">
-                                <div class="insight-title">💰 Financial Insight</div>
-                                <div class="insight-text">{insight}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                Write a compelling 3-4 sentence paragraph that:
+                1. Explains WHY this analysis matters
+                2. Connects to strategic goals
+                3. Sets up business importance
+                4. Uses professional language
 
-                        st.divider()
+                Do NOT include raw numbers.
+                Focus on strategic importance.
+                ```
 
-                # Display key findings
-                st.markdown("### 🔍 Key Financial Findings")
-                findings = financial_analysis.get('key_findings', [])
-                for i, finding in enumerate(findings, 1):
-                    st.markdown(f"**Finding {i}:** {finding}")
+                **Example - Data Insights Prompt:**
+                ```
+                You are a university data analyst...
 
-                st.divider()
+                Write comprehensive analysis (6-8 sentences):
+                1. Analyze patterns and trends
+                2. Make comparisons
+                3. Identify correlations
+                4. Include 8-10 specific numbers
+                5. Use "The data reveals...", "Notably..."
+                ```
 
-                # Display recommendations
-                st.markdown("### 💡 Financial Strategy Recommendations")
-                recommendations = financial_analysis.get('recommendations', [])
+                ---
 
-                for i, rec in enumerate(recommendations, 1):
-                    # Color code by priority (first = high priority)
-                    priority_color = "🔴" if i == 1 else "🟠" if i == 2 else "🟢"
+                ## ⚙️ LLM Parameter Optimization
 
-                    with st.container():
-                        st.markdown(f"""
-                        <div class="recommendation-card">
-                            <div class="recommendation-priority">{priority_color} Priority {i}</div>
-                            <div class="recommendation-text">{rec}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                ### 2. **Auto-Optimization System**
+                The app detects your hardware and adjusts parameters:
 
-        elif not st.session_state.ollama_connected:
-            st.warning("⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered financial analysis.")
+                | Your Hardware | Context Size | Tokens | Speed |
+                |--------------|--------------|---------|--------|
+                | **High-end** (16GB+ RAM, GPU) | 8192 | 2048 | ⚡⚡⚡ |
+                | **Medium** (8GB+ RAM) | 4096 | 1024 | ⚡⚡ |
+                | **Cloudflare** | 4096 | 1024 | ⚡ |
+                | **Low-end** (<8GB RAM) | 2048 | 512 | ⚡ |
 
-    # ====================================================================================
-    # TAB 8: DEMOGRAPHICS DEEP DIVE - AI-DRIVEN
-    # ====================================================================================
-    with tabs[7]:
-        st.header("👥 Demographics Deep Dive - AI-Driven Deep Analysis")
-        st.caption("The AI analyzes diversity patterns, market concentration risks, and inclusion strategies")
+                **Key Parameters:**
+                - `num_ctx`: Context window (2048-8192)
+                - `num_predict`: Max tokens generated
+                - `num_batch`: Parallel processing
+                - `num_thread`: CPU cores used
+                - `timeout`: 6x multiplier for Cloudflare
 
-        # Check for demographic data
-        nationality_col = None
-        for col in ['nationality', 'country', 'citizenship', 'origin']:
-            if col in df.columns:
-                nationality_col = col
-                break
+                ---
 
-        gender_col = None
-        for col in ['gender', 'sex']:
-            if col in df.columns:
-                gender_col = col
-                break
+                ## 🧠 Temperature Control
 
-        # Calculate demographic metrics
-        unique_nationalities = metrics.get('unique_nationalities', 0)
-        uae_nationals = metrics.get('uae_nationals', 0)
-        uae_percentage = metrics.get('uae_percentage', 0)
-        international_students = metrics.get('total_students', 0) - uae_nationals
+                ### 3. **Task-Specific Temperatures**
 
-        # Calculate top 3 concentration if nationality column available
-        top_3_concentration = 0
-        if nationality_col and nationality_col in df.columns:
-            top_nat = df[nationality_col].value_counts().head(3)
-            top_3_concentration = (top_nat.sum() / len(df) * 100) if len(df) > 0 else 0
+                | Task | Temp | Why |
+                |------|------|-----|
+                | **Data Analysis** | 0.3-0.4 | Factual, precise |
+                | **Business Context** | 0.4-0.5 | Professional, focused |
+                | **Opening Narrative** | 0.5-0.7 | Engaging, creative |
+                | **Recommendations** | 0.6-0.7 | Strategic variety |
 
-        # Gender distribution if available
-        gender_distribution = {}
-        if gender_col and gender_col in df.columns:
-            gender_counts = df[gender_col].value_counts()
-            gender_distribution = {str(k): int(v) for k, v in gender_counts.items()}
+                **Example Implementation:**
+                ```python
+                # Analytical content
+                query_ollama(prompt, model, url,
+                    temperature=0.3)  # Precise
 
-        # Demographics-focused metrics
-        col1, col2, col3, col4 = st.columns(4)
+                # Creative content
+                query_ollama(prompt, model, url,
+                    temperature=0.7)  # Varied
+                ```
 
-        with col1:
-            st.metric("Total Nationalities", f"{unique_nationalities}",
-                     help="Number of different nationalities represented")
+                ---
 
-        with col2:
-            st.metric("UAE Nationals", f"{uae_nationals:,}",
-                     f"{uae_percentage:.1f}%",
-                     help="UAE national students")
+                ## 📊 Metrics Formatting
 
-        with col3:
-            st.metric("International Students", f"{international_students:,}",
-                     f"{(international_students/metrics.get('total_students', 1)*100):.1f}%",
-                     help="Non-UAE international students")
+                ### 4. **Data-Driven Prompts**
 
-        with col4:
-            if top_3_concentration > 0:
-                risk_level = "🔴 High" if top_3_concentration > 60 else "🟠 Moderate" if top_3_concentration > 50 else "🟢 Low"
-                st.metric("Top 3 Concentration", f"{top_3_concentration:.1f}%",
-                         help=f"Concentration risk: {risk_level}")
-            elif len(gender_distribution) > 0:
-                most_common_gender = max(gender_distribution, key=gender_distribution.get)
-                st.metric("Gender Balance", f"{most_common_gender}: {gender_distribution[most_common_gender]:,}",
-                         help="Gender distribution")
-            else:
-                st.metric("Diversity Index", f"{unique_nationalities}",
-                         help="Number of nationalities")
+                We format metrics for LLM consumption:
 
-        st.divider()
+                **Raw Metrics:**
+                ```python
+                {
+                    'total_students': 1000,
+                    'avg_gpa': 3.234567,
+                    'revenue': 75500000
+                }
+                ```
 
-        # AI Analysis Button
-        if st.session_state.ollama_connected and st.button("🤖 Generate Diversity & Inclusion Analysis & Visualizations", key="demo_btn", type="primary", width='stretch'):
+                **Formatted for Prompt:**
+                ```
+                - Total Students: 1,000
+                - Average GPA: 3.2
+                - Total Revenue: AED 75.5M
+                - High Performers: 450 (45.0%)
+                ```
 
-            # Generate demographics-focused analysis using hybrid approach
-            demographics_analysis = generate_dynamic_visualizations_llm(
-                metrics,
-                df,
-                st.session_state.selected_model,
-                st.session_state.ollama_url,
-                context_type="demographics"  # Demographics-focused context
-            )
+                ---
 
-            if demographics_analysis:
-                # Display strategic overview
-                st.markdown("### 🌍 Diversity & Inclusion Analysis")
-                st.info(demographics_analysis.get('strategic_overview', ''))
+                ## 🔄 Context Chaining
 
-                st.divider()
+                ### 5. **Progressive Context Building**
 
-                # Display visualizations with insights
-                st.markdown("### 📊 AI-Recommended Demographic Visualizations")
-                viz_list = demographics_analysis.get('visualizations', [])
-                st.caption(f"The AI analyzed your data and recommends {len(viz_list)} demographic visualizations")
+                Each component receives context from previous:
 
-                for i, viz_spec in enumerate(viz_list):
-                    with st.container():
-                        st.markdown(f"#### {viz_spec.get('title', f'Visualization {i+1}')}")
-                        st.caption(f"**Why this matters:** {viz_spec.get('reasoning', 'Demographic indicator')}")
+                ```python
+                # Step 1: Business Context
+                context = generate_business_context(...)
 
-                        # Build and display chart
-                        fig = build_dynamic_chart(viz_spec, df)
-                        if fig:
-                            st.plotly_chart(fig, width='stretch', key=f"demographics_viz_{i}")
-                        else:
-                            st.warning(f"⚠️ Could not generate chart for: {viz_spec.get('data_column', 'unknown')}")
-
-                        # Display AI insight
-                        insight = viz_spec.get('insight', '')
-                        if insight:
-                            st.markdown(f"""
-                            <div class="insight-card">
-                                <div class="insight-title">🌍 Demographic Insight</div>
-                                <div class="insight-text">{insight}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                # Step 2: Data Insights (with context)
+                insights = generate_insights(
+                    context={'business': context}
+                )
 
-                        st.divider()
+                # Step 3: Impact (with both)
+                impact = generate_impact(
+                    context={
+                        'business': context,
+                        'insights': insights
+                    }
+                )
+                ```
 
-                # Display key findings
-                st.markdown("### 🔍 Key Demographic Findings")
-                findings = demographics_analysis.get('key_findings', [])
-                for i, finding in enumerate(findings, 1):
-                    st.markdown(f"**Finding {i}:** {finding}")
+                **Benefit:** Each narrative builds on previous,
+                creating coherent stories.
 
-                st.divider()
+                ---
 
-                # Display recommendations
-                st.markdown("### 💡 Diversity & Recruitment Strategy Recommendations")
-                recommendations = demographics_analysis.get('recommendations', [])
+                ## 🛡️ Fallback System
 
-                for i, rec in enumerate(recommendations, 1):
-                    # Color code by priority (first = high priority)
-                    priority_color = "🔴" if i == 1 else "🟠" if i == 2 else "🟢"
+                ### 6. **3-Tier Quality Assurance**
 
-                    with st.container():
-                        st.markdown(f"""
-                        <div class="recommendation-card">
-                            <div class="recommendation-priority">{priority_color} Priority {i}</div>
-                            <div class="recommendation-text">{rec}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                ```
+                Tier 1: Try LLM Generation
+                   ↓ (if fails)
+                Tier 2: Statistical Enrichment
+                   ↓ (if fails)
+                Tier 3: Template-Based Content
+                ```
 
-        elif not st.session_state.ollama_connected:
-            st.warning("⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered diversity analysis.")
+                **Result:** 100% uptime, always functional
 
-    # ====================================================================================
-    # TAB 9: RISK & SUCCESS ANALYSIS - AI-DRIVEN
-    # ====================================================================================
-    with tabs[8]:
-        st.header("⚠️ Risk & Success Analysis - AI-Driven Deep Analysis")
-        st.caption("The AI analyzes at-risk patterns, success predictors, and intervention effectiveness")
-
-        # Calculate risk metrics
-        at_risk = metrics.get('at_risk', 0)
-        high_performers = metrics.get('high_performers', 0)
-        total_students = metrics.get('total_students', 1)
-        mid_performers = total_students - at_risk - high_performers
-        success_rate = ((total_students - at_risk) / total_students * 100) if total_students > 0 else 0
-        at_risk_pct = (at_risk / total_students * 100) if total_students > 0 else 0
-        high_perf_pct = (high_performers / total_students * 100) if total_students > 0 else 0
+                ---
 
-        # Determine risk severity
-        risk_severity = "🔴 CRITICAL" if at_risk_pct > 25 else "🟠 HIGH" if at_risk_pct > 15 else "🟢 MODERATE"
+                ## 🎨 Real-World Example
 
-        # Risk-focused metrics
-        col1, col2, col3, col4 = st.columns(4)
+                ### Complete Narrative Generation:
 
-        with col1:
-            st.metric("At-Risk Students", f"{at_risk:,}",
-                     delta=f"{at_risk_pct:.1f}%",
-                     delta_color="inverse",
-                     help="Students with GPA < 2.0")
+                **Input Metrics:**
+                ```
+                total_students: 1000
+                housed_students: 663
+                occupancy_rate: 66.3%
+                avg_gpa_housed: 3.1
+                avg_gpa_not_housed: 2.8
+                ```
 
-        with col2:
-            st.metric("Mid-Tier Students", f"{mid_performers:,}",
-                     f"{(mid_performers/total_students*100):.1f}%",
-                     help="Students with 2.0 ≤ GPA < 3.5")
+                **Generated Opening:**
+                > "Our analysis reveals striking patterns in housing
+                > impact: 663 students (66.3%) live on campus, and
+                > they outperform off-campus peers by 0.3 GPA points
+                > (3.1 vs 2.8). This 10.7% performance advantage
+                > translates to measurable retention value..."
 
-        with col3:
-            st.metric("High Performers", f"{high_performers:,}",
-                     delta=f"{high_perf_pct:.1f}%",
-                     help="Students with GPA ≥ 3.5")
+                **Why it works:**
+                - Specific numbers (663, 66.3%, 3.1, 2.8)
+                - Comparative analysis (10.7% advantage)
+                - Business impact (retention value)
+                - Engaging narrative flow
 
-        with col4:
-            st.metric("Risk Severity", risk_severity,
-                     f"Success: {success_rate:.1f}%",
-                     help="Risk level based on at-risk percentage")
+                ---
 
-        st.divider()
+                ## 📈 Recommendations for Enhancement
 
-        # AI Analysis Button
-        if st.session_state.ollama_connected and st.button("🤖 Generate Risk & Success Analysis & Visualizations", key="risk_btn", type="primary", width='stretch'):
+                ### **Currently NOT Used (Opportunities):**
 
-            # Generate risk-focused analysis using hybrid approach
-            risk_analysis = generate_dynamic_visualizations_llm(
-                metrics,
-                df,
-                st.session_state.selected_model,
-                st.session_state.ollama_url,
-                context_type="risk"  # Risk-focused context
-            )
+                #### A. **RAG (Retrieval Augmented Generation)**
+                - Add vector database for historical insights
+                - Reference past reports automatically
+                - **Expected Impact:** +30% contextual relevance
 
-            if risk_analysis:
-                # Display strategic overview
-                st.markdown("### ⚠️ Risk & Success Strategic Analysis")
-                st.info(risk_analysis.get('strategic_overview', ''))
+                #### B. **Chain-of-Thought Prompting**
+                ```
+                "Let's analyze this step by step:
+                1. First, identify the trend...
+                2. Then, calculate the impact...
+                3. Finally, recommend actions..."
+                ```
+                - **Expected Impact:** +25% reasoning quality
 
-                st.divider()
+                #### C. **Few-Shot Learning**
+                ```
+                "Example 1:
+                Input: {...}
+                Output: {...}
 
-                # Display visualizations with insights
-                st.markdown("### 📊 AI-Recommended Risk Analysis Visualizations")
-                viz_list = risk_analysis.get('visualizations', [])
-                st.caption(f"The AI analyzed your data and recommends {len(viz_list)} risk analysis visualizations")
+                Example 2:
+                Input: {...}
+                Output: {...}
 
-                for i, viz_spec in enumerate(viz_list):
-                    with st.container():
-                        st.markdown(f"#### {viz_spec.get('title', f'Visualization {i+1}')}")
-                        st.caption(f"**Why this matters:** {viz_spec.get('reasoning', 'Risk indicator')}")
+                Now analyze: {...}"
+                ```
+                - **Expected Impact:** +20% consistency
 
-                        # Build and display chart
-                        fig = build_dynamic_chart(viz_spec, df)
-                        if fig:
-                            st.plotly_chart(fig, width='stretch', key=f"risk_viz_{i}")
-                        else:
-                            st.warning(f"⚠️ Could not generate chart for: {viz_spec.get('data_column', 'unknown')}")
-
-                        # Display AI insight
-                        insight = viz_spec.get('insight', '')
-                        if insight:
-                            st.markdown(f"""
-                            <div class="insight-card">
-                                <div class="insight-title">⚠️ Risk Insight</div>
-                                <div class="insight-text">{insight}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                #### D. **Ensemble Generation**
+                - Generate 3 variants, pick best
+                - Use multiple models for consensus
+                - **Expected Impact:** +35% quality
 
-                        st.divider()
+                #### E. **Fine-Tuning**
+                - Train on higher education reports
+                - Domain-specific vocabulary
+                - **Expected Impact:** +40% relevance
 
-                # Display key findings
-                st.markdown("### 🔍 Key Risk & Success Findings")
-                findings = risk_analysis.get('key_findings', [])
-                for i, finding in enumerate(findings, 1):
-                    st.markdown(f"**Finding {i}:** {finding}")
+                #### F. **Prompt Caching**
+                - Cache expensive prompt processing
+                - Reuse common contexts
+                - **Expected Impact:** +50% speed
 
-                st.divider()
+                #### G. **Streaming Responses**
+                - Show progressive generation
+                - Better user experience
+                - **Expected Impact:** Perceived -70% latency
 
-                # Display recommendations
-                st.markdown("### 💡 Intervention & Success Strategy Recommendations")
-                recommendations = risk_analysis.get('recommendations', [])
+                ---
 
-                for i, rec in enumerate(recommendations, 1):
-                    # Color code by priority (first = high priority)
-                    priority_color = "🔴" if i == 1 else "🟠" if i == 2 else "🟢"
+                ## 🔬 Current System Performance
 
-                    with st.container():
-                        st.markdown(f"""
-                        <div class="recommendation-card">
-                            <div class="recommendation-priority">{priority_color} Priority {i}</div>
-                            <div class="recommendation-text">{rec}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                **Metrics:**
+                - **108 narratives** generated per journey set
+                - **Avg generation time:** 3-5 minutes (all journeys)
+                - **Success rate:** >95% with fallbacks = 100%
+                - **Context utilization:** 2048-8192 tokens
+                - **Response quality:** Professional grade
 
-        elif not st.session_state.ollama_connected:
-            st.warning("⚠️ Please connect to Ollama first (see sidebar) to generate AI-powered risk analysis.")
+                **Architecture:**
+                ```
+                Data → Metrics → Prompts → LLM → Narratives → UI
+                         ↓          ↓        ↓
+                    Format    Optimize  Fallback
+                ```
 
-    # ====================================================================================
-    # TAB 10: DATA LINEAGE & GENERATIVE DATA PROFILING
-    # ====================================================================================
-    with tabs[9]:
-        st.header("🔗 Data Lineage & Architecture")
+                ---
 
-        st.info("📊 Dataset Overview - Comprehensive Statistics")
+                ## 💡 Quick Tips for Best Results
 
-        # Overall table statistics
-        col1, col2, col3, col4 = st.columns(4)
+                1. **Use Cloudflare tunnel** for remote access
+                2. **Select larger models** (7B+ params) for quality
+                3. **Ensure >8GB RAM** for optimal performance
+                4. **Enable auto-optimize** (default on)
+                5. **Use sample dataset** to test first
+                6. **Check Ollama logs** if generation fails
 
-        with col1:
-            st.metric("Total Records", f"{len(df):,}")
+                ---
 
-        with col2:
-            st.metric("Total Columns", len(df.columns))
+                ## 📚 Technical References
 
-        with col3:
-            completeness = (df.count().sum() / (len(df) * len(df.columns)) * 100)
-            st.metric("Completeness", f"{completeness:.1f}%")
+                **Implemented Techniques:**
+                - ✅ Role-based prompting
+                - ✅ Structured instructions
+                - ✅ Constraint guidance
+                - ✅ Dynamic parameter tuning
+                - ✅ Temperature control
+                - ✅ Context chaining
+                - ✅ Metrics formatting
+                - ✅ Fallback strategies
 
-        with col4:
-            memory_usage = df.memory_usage(deep=True).sum() / (1024 ** 2)
-            st.metric("Memory Usage", f"{memory_usage:.2f} MB")
+                **Code Locations:**
+                - Prompt engineering: `journey_narratives.py`
+                - LLM optimization: `student_360_llm_powered.py:689-934`
+                - Generation pipeline: `journey_assembler.py`
+                - Metrics formatting: `journey_narratives.py:252-307`
 
-        st.divider()
+                ---
 
-        # ========== GENERATIVE DATA PROFILING WITH LLM ==========
-        st.subheader("🤖 Generative Data Profiling")
-
-        # Analysis mode selection
-        analysis_mode = "Quick Analysis"
-        if len(df.columns) > 30:
-            st.markdown("### 🎯 Analysis Mode")
-            analysis_mode = st.radio(
-                "Choose analysis approach:",
-                ["Quick Analysis (Fast, top insights)", "Comprehensive Analysis (Detailed, all aspects)"],
-                key="profiling_mode",
-                help="**Quick**: Fast analysis with key insights (1-2 min)\n\n**Comprehensive**: Thorough analysis with detailed recommendations (3-5 min)"
-            )
+                <p><em>This guide documents the production-grade LLM
+                enhancement strategies powering Student 360 Analytics.</em></p>
 
-        if st.session_state.ollama_connected and st.button("🔬 Generate AI Data Profile", key="lineage_btn", type="primary", width='stretch'):
-            # Test connection first
-            st.info(f"🔍 Testing connection to: {url}")
-            try:
-                import requests
-                test_response = requests.get(f"{url}/api/tags", timeout=10)
-                if test_response.status_code == 200:
-                    st.success(f"✅ Connection OK - Model: {model}")
-                else:
-                    st.error(f"❌ Connection failed: HTTP {test_response.status_code}")
-                    st.stop()
-            except Exception as conn_err:
-                st.error(f"❌ Connection test failed: {str(conn_err)}")
-                st.warning("💡 Make sure Ollama is running and accessible")
-                st.stop()
+                </div>
+                """, unsafe_allow_html=True)
+
+        st.divider()
 
-            # Show estimated time
-            use_comprehensive = "Comprehensive" in analysis_mode
+        # ====================================================================================
+        # OLLAMA CONNECTION STATUS (From gen_storytelling_app.py lines 1116-1298)
+        # ====================================================================================
+        st.markdown("### 🔌 Ollama Connection Status")
 
-            # Calculate dynamic timeout based on dataset size
-            is_large_dataset = len(df.columns) > 100
-            base_timeout = 240 if is_large_dataset else 180
+        # Determine connection status
+        is_connected = False
+        model_count = 0
+        error_msg = None
 
-            if use_comprehensive:
-                est_time = "4-6 minutes" if is_large_dataset else "3-5 minutes"
-                st.info(f"⏱️ **Comprehensive Mode**: Estimated time {est_time} with {model}")
+        if st.session_state.get('ollama_url'):
+            if st.session_state.get('ollama_connected'):
+                is_connected = True
+                models = get_available_models(st.session_state.ollama_url)
+                model_count = len(models)
             else:
-                est_time = "2-4 minutes" if is_large_dataset else "1-2 minutes"
-                st.info(f"⚡ **Quick Mode**: Estimated time {est_time} with {model}")
-
-            if is_large_dataset:
-                st.warning(f"⚠️ Large dataset detected ({len(df.columns)} columns). Analysis will take longer. Please be patient...")
-
-            # Prepare comprehensive data profile for LLM
-            with st.spinner("🔄 Phase 1/3: Analyzing dataset structure..."):
-                st.info(f"📊 Analyzing {len(df):,} records with {len(df.columns)} columns...")
-
-                # Calculate detailed statistics
-                numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-                datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
-
-                duplicate_rows = df.duplicated().sum()
-                columns_with_nulls = df.isnull().any().sum()
-
-                # Get missing data statistics
-                missing_by_col = df.isnull().sum()
-                missing_pct = (missing_by_col / len(df) * 100).round(2)
-                missing_df = pd.DataFrame({
-                    'Column': missing_by_col.index,
-                    'Missing Count': missing_by_col.values,
-                    'Missing %': missing_pct.values
-                }).sort_values('Missing Count', ascending=False).head(15)
-
-                # Get sample columns (limit to 15 for large datasets to reduce prompt size)
-                sample_limit = 15 if is_large_dataset else 25
-                columns_sample = ', '.join(df.columns[:sample_limit].tolist())
-                if len(df.columns) > sample_limit:
-                    columns_sample += f"... (+{len(df.columns) - sample_limit} more)"
-
-                # Calculate cardinality
-                high_cardinality_cols = [col for col in df.columns if df[col].nunique() / len(df) > 0.9]
-                low_cardinality_cols = [col for col in df.columns if df[col].nunique() < 20]
-
-                # Get data type summary
-                dtype_summary = df.dtypes.value_counts().to_string()
-
-                st.success(f"✅ Phase 1 complete: Identified {len(numeric_cols)} numeric, {len(categorical_cols)} categorical, {len(datetime_cols)} datetime columns")
-
-            # Generate LLM insights
-            with st.spinner("🔄 Phase 2/3: Generating AI-powered insights..."):
-                st.info("🧠 LLM analyzing data patterns, quality, and business context...")
-
-                if use_comprehensive:
-                    # Comprehensive mode - DEEP analysis (optimized for large datasets)
-                    missing_data_rows = 10 if is_large_dataset else 15
-
-                    # Get additional statistics for richer analysis
-                    complete_cols = len([col for col in df.columns if df[col].notna().all()])
-                    total_missing = df.isnull().sum().sum()
-
-                    # Get top 5 numeric columns by name for context
-                    numeric_sample = ', '.join(numeric_cols[:5]) if numeric_cols else 'None'
-                    categorical_sample = ', '.join(categorical_cols[:5]) if categorical_cols else 'None'
-
-                    # Calculate additional depth statistics for comprehensive mode
-                    # 1. Correlation analysis for numeric columns
-                    correlation_insight = "No numeric columns"
-                    if len(numeric_cols) >= 2:
-                        corr_matrix = df[numeric_cols[:10]].corr()  # Top 10 to avoid overload
-                        high_corr = []
-                        for i in range(len(corr_matrix.columns)):
-                            for j in range(i+1, len(corr_matrix.columns)):
-                                corr_val = corr_matrix.iloc[i, j]
-                                if abs(corr_val) > 0.7:
-                                    high_corr.append(f"{corr_matrix.columns[i]} ↔ {corr_matrix.columns[j]} ({corr_val:.2f})")
-                        correlation_insight = ', '.join(high_corr[:5]) if high_corr else "No strong correlations found (>0.7)"
-
-                    # 2. Distribution statistics for numeric columns
-                    distribution_stats = ""
-                    if numeric_cols:
-                        skewness_high = []
-                        for col in numeric_cols[:5]:
-                            skew = df[col].skew()
-                            if abs(skew) > 1:
-                                skewness_high.append(f"{col}({skew:.2f})")
-                        distribution_stats = f"Skewed distributions: {', '.join(skewness_high)}" if skewness_high else "Distributions appear normal"
-
-                    # 3. Outlier detection
-                    outlier_info = ""
-                    if numeric_cols:
-                        outlier_cols = []
-                        for col in numeric_cols[:5]:
-                            Q1 = df[col].quantile(0.25)
-                            Q3 = df[col].quantile(0.75)
-                            IQR = Q3 - Q1
-                            outliers = ((df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))).sum()
-                            if outliers > 0:
-                                outlier_cols.append(f"{col}({outliers})")
-                        outlier_info = f"Columns with outliers: {', '.join(outlier_cols)}" if outlier_cols else "No significant outliers"
-
-                    # 4. Categorical column analysis
-                    categorical_insights = ""
-                    if categorical_cols:
-                        high_cat_diversity = []
-                        low_cat_diversity = []
-                        for col in categorical_cols[:5]:
-                            unique_ratio = df[col].nunique() / len(df)
-                            if unique_ratio > 0.5:
-                                high_cat_diversity.append(col)
-                            elif unique_ratio < 0.05:
-                                low_cat_diversity.append(col)
-                        categorical_insights = f"High diversity: {', '.join(high_cat_diversity) or 'None'} | Low diversity: {', '.join(low_cat_diversity) or 'None'}"
-
-                    prompt = f"""You are a senior data profiling expert. Analyze this student dataset and provide structured, deterministic output.
+                health = verify_ollama_health(st.session_state.ollama_url)
+                st.session_state.health_check_count += 1
 
-**CRITICAL INSTRUCTIONS FOR REPRODUCIBLE OUTPUT:**
-1. Use ONLY the data provided below - do not make assumptions
-2. Follow the EXACT section structure and format specified
-3. Cite specific column names from the data
-4. Use factual, objective language
-5. Keep analysis consistent and deterministic
+                if health['connected']:
+                    is_connected = True
+                    model_count = health['model_count']
+                    st.session_state.ollama_connected = True
+                else:
+                    is_connected = False
+                    error_msg = health.get('error', 'Unknown')
 
-**DATASET METRICS:**
-- Total Records: {len(df):,}
-- Total Attributes: {len(df.columns)}
-- Data Completeness: {completeness:.1f}%
-- Missing Cells: {total_missing:,} ({(total_missing/(len(df)*len(df.columns))*100):.2f}% of all cells)
-- Complete Columns: {complete_cols}/{len(df.columns)} ({(complete_cols/len(df.columns)*100):.1f}%)
-- Duplicate Rows: {duplicate_rows:,} ({(duplicate_rows/len(df)*100):.2f}%)
+        # Display status
+        if is_connected:
+            st.success("✅ Connected & Active")
 
-**COLUMN TYPES:**
-- Numeric: {len(numeric_cols)} columns - Examples: {numeric_sample}
-- Categorical: {len(categorical_cols)} columns - Examples: {categorical_sample}
-- Datetime: {len(datetime_cols)} columns
-- High Cardinality (IDs): {len(high_cardinality_cols)} columns
-- Low Cardinality (Categories): {len(low_cardinality_cols)} columns
+            current_url = st.session_state.get('ollama_url', 'Unknown')
+            if 'cloudflare' in current_url.lower() or 'exalio' in current_url.lower():
+                endpoint_type = "☁️ Cloudflare"
+            elif 'localhost' in current_url.lower():
+                endpoint_type = "💻 Local"
+            else:
+                endpoint_type = "🔧 Custom"
 
-**COLUMN NAMES (First 25):** {columns_sample}
+            st.caption(f"📦 {model_count} model(s) available from {endpoint_type}")
+            if st.session_state.get('selected_model'):
+                st.caption(f"🤖 Active: {st.session_state.selected_model}")
+            st.caption(f"🕐 Health checks: {st.session_state.health_check_count}")
+        elif st.session_state.get('ollama_url'):
+            st.error("❌ Disconnected")
+            if error_msg:
+                st.caption(f"Error: {error_msg}")
 
-**STATISTICAL ANALYSIS:**
-- Strong Correlations (>0.7): {correlation_insight}
-- Skewed Distributions (|skew|>1): {distribution_stats}
-- Outliers Detected (IQR method): {outlier_info}
-- Categorical Diversity Analysis: {categorical_insights}
+            col_retry1, col_retry2 = st.columns([3, 2])
+            with col_retry1:
+                if st.button("🔄 Reconnect Now", type="primary", width="stretch"):
+                    with st.spinner("🔄 Attempting to reconnect..."):
+                        import time
+                        connected, models, status_msg = ensure_ollama_connection(
+                            st.session_state.ollama_url,
+                            auto_reconnect=True,
+                            max_retries=3
+                        )
 
-**TOP MISSING DATA ({missing_data_rows} columns):**
-{missing_df.head(missing_data_rows).to_string(index=False)}
+                        if connected:
+                            st.session_state.ollama_connected = True
+                            st.session_state.selected_model = models[0] if models else None
+                            st.success(f"✅ {status_msg}")
+                            st.success(f"📦 Found {len(models)} model(s)")
+                            time.sleep(1)
+                            st.rerun()
+                        else:
+                            st.error(f"❌ {status_msg}")
+                            st.info("💡 **Troubleshooting:**\n- Check if Ollama is running\n- Verify URL is correct\n- Check network connection")
 
-**OUTPUT REQUIREMENTS:**
-Provide exactly 8 sections using markdown headers (##). Be specific, factual, and deterministic. Use 600 words maximum.
+            with col_retry2:
+                if st.button("ℹ️ Help", width="stretch"):
+                    st.session_state.show_connection_help = not st.session_state.get('show_connection_help', False)
 
-**SECTION TEMPLATES (Follow exactly):**
+            if st.session_state.get('show_connection_help', False):
+                with st.expander("🔧 Connection Troubleshooting", expanded=True):
+                    st.markdown("""
+                    **Common Issues:**
 
-## 1. Dataset Purpose & Scope
-**Purpose**: [2-3 sentences describing what this dataset represents]
-**Temporal Scope**: [Time period, refresh frequency]
-**Stakeholders**: [Who uses this data]
-**Integration**: [System integration points inferred from columns]
+                    1. **Ollama not running**
+                       ```bash
+                       ollama serve
+                       ```
 
-## 2. Data Domain Breakdown
-**Academic Domain** ({len([c for c in df.columns if any(x in c.lower() for x in ['grade', 'gpa', 'course', 'credit', 'enrollment'])])} columns):
-- Columns: [List actual column names found]
-- Metrics: [What is measured]
+                    2. **Wrong URL**
+                       - Local: `http://localhost:11434`
+                       - Cloudflare: Check tunnel URL
 
-**Financial Domain** ({len([c for c in df.columns if any(x in c.lower() for x in ['amount', 'fee', 'aid', 'tuition', 'payment'])])} columns):
-- Columns: [List actual column names found]
-- Metrics: [Revenue vs cost identification]
+                    3. **Firewall blocking**
+                       - Allow port 11434
+                       - Check antivirus settings
 
-**Demographics** ({len([c for c in df.columns if any(x in c.lower() for x in ['age', 'gender', 'name', 'nationality', 'email', 'phone'])])} columns):
-- Columns: [List actual column names found]
-- Completeness: [Assess completeness]
+                    4. **No models installed**
+                       ```bash
+                       ollama pull tinyllama
+                       ```
 
-**Other Domains**:
-- [Any other domains with column examples]
+                    5. **AI tab analysis is slow**
+                       - Insight prompts are sent concurrently; let the server run them in parallel:
+                       ```bash
+                       OLLAMA_NUM_PARALLEL=4 ollama serve
+                       ```
+                    """)
+        else:
+            st.warning("⚠️ Not configured")
 
-## 3. Data Quality Assessment
-**Completeness**: {completeness:.1f}% overall
-- Domain breakdown: [Which domains complete/incomplete]
-- Root cause: [Why data is missing]
+        # Auto-refresh toggle
+        auto_refresh = st.checkbox(
+            "🔄 Enable Auto-refresh",
+            value=st.session_state.get('auto_refresh', False),
+            help="Automatically refresh connection status"
+        )
+        st.session_state.auto_refresh = auto_refresh
 
-**Missing Pattern Type**: [MCAR/MAR/MNAR] because [reasoning based on missing data table]
+        if not auto_refresh:
+            st.caption("❌ Auto-refresh disabled")
 
-**Duplicates**: {duplicate_rows:,} records ({(duplicate_rows/len(df)*100):.2f}%)
-- Assessment: [Legitimate vs data quality issue]
+        # Connection details
+        if st.session_state.get('ollama_url'):
+            with st.expander("📊 Connection Details", expanded=False):
+                st.markdown("**Connection Information:**")
 
-**Correlations**: {correlation_insight}
-- Business sense check: [Do correlations make sense?]
+                if is_connected:
+                    st.markdown("- Status: ✅ **Active**")
+                    st.markdown(f"- Endpoint: {endpoint_type}")
+                    st.markdown(f"- Models: {model_count} available")
+                else:
+                    st.markdown("- Status: ❌ **Disconnected**")
+                    if error_msg:
+                        st.markdown(f"- Error: `{error_msg}`")
 
-**Distributions**: {distribution_stats}
-- Implications: [What skewness indicates]
+                st.markdown(f"- URL: `{st.session_state.ollama_url}`")
+                st.markdown(f"- Health checks: {st.session_state.health_check_count}")
 
-**Outliers**: {outlier_info}
-- Assessment: [Errors or valid edge cases?]
+        st.divider()
 
-**Severity**: [Critical/High/Medium/Low] because [justification]
+        # ====================================================================================
+        # SYSTEM RESOURCES & OPTIMIZATION (From gen_storytelling_app.py lines 1300-1434)
+        # ====================================================================================
+        st.markdown("### 🖥️ System Resources & Optimization")
 
-## 4. Column Relationships
-**Primary Keys**: [List high-cardinality columns] - These are PKs because [reason]
-**Foreign Keys**: [Potential FK relationships identified]
-**Derived Columns**: [Calculated/derived columns] vs Source: [source columns]
-**Hierarchies**: [Parent-child relationships]
-**Temporal**: [Time-series patterns]
+        is_cloudflare = st.session_state.get('ollama_server_type') == "Cloudflare"
+        cloudflare_connected = is_connected if is_cloudflare else True
 
-## 5. Business Intelligence Value
-**Predictive Analytics**: Can predict [specific outcomes]. Key features: [column names]
-**Segmentation**: Students can be segmented by [specific criteria/columns]
-**Financial**: [Revenue forecasting/aid optimization opportunities with columns]
-**Operations**: [Process improvements from columns]
-**Compliance**: [FERPA/regulatory capabilities]
-**KPIs**: [List calculable KPIs from columns]
+        if is_cloudflare and not cloudflare_connected:
+            resources = None
+            opt_tier = "⚠️ Unavailable"
+            opt_desc = "Connect to Cloudflare to see resources"
+        elif is_cloudflare and cloudflare_connected:
+            remote_resources = fetch_remote_system_resources(st.session_state.get('ollama_url', ''))
+            if remote_resources:
+                resources = remote_resources
+            else:
+                resources = get_system_resources()
 
-## 6. Action Plan
-**CRITICAL** (today):
-1. [Column]: [Problem] → [Solution] → [Outcome]
-2. [Column]: [Problem] → [Solution] → [Outcome]
-3. [Column]: [Problem] → [Solution] → [Outcome]
+            if resources and resources['gpu_available']:
+                if resources['ram_available_gb'] > 30:
+                    opt_tier = "🚀 High-End"
+                    opt_desc = "Optimal for large models"
+                else:
+                    opt_tier = "⚡ Medium"
+                    opt_desc = "Good for most tasks"
+            else:
+                opt_tier = "💻 Basic"
+                opt_desc = "CPU-only mode"
+        else:
+            resources = get_system_resources()
 
-**HIGH** (this week):
-1. [Column/Domain]: [Issue] → [Fix] → [Impact]
-2. [Column/Domain]: [Issue] → [Fix] → [Impact]
+            if resources['gpu_available']:
+                if resources['ram_available_gb'] > 30:
+                    opt_tier = "🚀 High-End"
+                    opt_desc = "Optimal for large models"
+                else:
+                    opt_tier = "⚡ Medium"
+                    opt_desc = "Good for most tasks"
+            else:
+                opt_tier = "💻 Basic"
+                opt_desc = "CPU-only mode"
 
-**MEDIUM** (this month):
-1. [Specific improvement]
-2. [Specific improvement]
+        st.info(f"**Optimization Tier:** {opt_tier}")
+        st.caption(opt_desc)
 
-**LOW** (backlog):
-1. [Enhancement]
+        if resources is None:
+            st.warning("⚠️ **System resources not available**")
+            st.caption("📡 Resources from: ❌ Not connected to Cloudflare")
+            st.caption("💡 Connect to Cloudflare Ollama to view remote resources")
 
-## 7. Risk Assessment
-**Decision Risk**: With {completeness:.1f}% completeness, [specific unsafe decisions]
-**Bias Risk**: Missing data in [columns] could bias [specific analyses]
-**Compliance**: [FERPA/privacy concerns with columns]
-**Financial**: [Specific financial risks from data quality]
-**Operational**: [Process failures possible]
-**Reputational**: [Consequences of wrong decisions]
-**Opportunity**: [Impossible insights listed]
-
-## 8. Visualization Recommendations
-1. **[Chart Type]** of [Column X] vs [Column Y] → Reveals: [Specific insight]
-2. **[Chart Type]** of [Columns] grouped by [Column] → Shows: [Pattern]
-3. **[Chart Type]** for [Columns] → Identifies: [Issue]
-4. **[Chart Type]** tracking [Metrics] over [Time column] → Monitors: [KPI]
-5. **[Chart Type]** with [Dimensions] → Supports: [Decision]
-
-**CONSISTENCY RULES:**
-- Always reference actual column names in brackets
-- Use quantitative evidence (percentages, counts)
-- Follow section templates exactly
-- Be deterministic and factual"""
+            col_res1, col_res2 = st.columns(2)
+            with col_res1:
+                st.caption("🔲 CPU: N/A")
+                st.caption("💾 RAM: N/A")
+            with col_res2:
+                st.caption("🎮 GPU: N/A")
+                st.caption("⚙️ CPU: N/A")
+        else:
+            if resources.get('source') == 'remote_colab':
+                st.caption(f"📡 Resources from: ☁️ Remote Colab")
+            else:
+                device_type = "💻 Laptop" if resources['ram_available_gb'] < 50 else "🖥️ Server"
+                st.caption(f"📡 Resources from: {device_type}")
 
+            col_res1, col_res2 = st.columns(2)
+            with col_res1:
+                st.caption(f"🔲 CPU: {resources['cpu_count']} cores")
+                st.caption(f"💾 RAM: {resources['ram_available_gb']:.1f}GB free")
+            with col_res2:
+                if resources['gpu_available']:
+                    st.caption(f"🎮 GPU: {resources.get('gpu_name', 'Available')[:15]}")
                 else:
-                    # Quick mode - focused analysis (optimized for large datasets)
-                    # For large datasets, reduce the missing data table size
-                    missing_data_rows = 5 if is_large_dataset else 10
-
-                    # Get additional context for quick mode
-                    complete_cols = len([col for col in df.columns if df[col].notna().all()])
-                    total_missing = df.isnull().sum().sum()
-
-                    # Get examples of each type
-                    numeric_sample = ', '.join(numeric_cols[:3]) if numeric_cols else 'None'
-                    categorical_sample = ', '.join(categorical_cols[:3]) if categorical_cols else 'None'
+                    st.caption("🎮 GPU: N/A")
+                if resources.get('cpu_percent', 0) > 0:
+                    st.caption(f"⚙️ CPU: {resources['cpu_percent']:.0f}% used")
+                else:
+                    st.caption("⚙️ CPU: N/A")
 
-                    prompt = f"""You are a data profiling expert. Provide quick, structured analysis of this student dataset.
+        with st.expander("📊 View Optimization Details"):
+            if resources is None:
+                st.markdown("**Current Configuration:**")
+                st.text(f"Tier: {opt_tier}")
+                st.text("Platform: Not available (Cloudflare not connected)")
+                st.text("CPU: N/A")
+                st.text("RAM: N/A")
+                st.text("GPU: N/A")
 
-**REPRODUCIBILITY INSTRUCTIONS:**
-1. Use ONLY provided data - no assumptions
-2. Follow exact section structure below
-3. Cite specific column names
-4. Be factual and deterministic
-5. Keep output consistent across runs
+                st.markdown("---")
+                st.warning("⚠️ **Connect to Cloudflare Ollama to view remote system resources**")
+            else:
+                st.markdown("**Current Configuration:**")
+                st.text(f"Tier: {opt_tier}")
+                st.text(f"Platform: {resources.get('platform', 'Unknown')}")
+                st.text(f"CPU: {resources['cpu_count']} cores ({resources.get('cpu_percent', 0):.1f}% usage)")
+                st.text(f"RAM: {resources['ram_available_gb']:.1f}/{resources.get('ram_total_gb', 0):.1f} GB available")
+                if resources.get('ram_percent', 0) > 0:
+                    st.text(f"RAM Usage: {resources['ram_percent']:.1f}%")
+                if resources['gpu_available']:
+                    st.text(f"GPU: {resources.get('gpu_name', 'Available')}")
+                else:
+                    st.text("GPU: Not detected")
 
-**DATASET SUMMARY:**
-- Rows: {len(df):,} | Columns: {len(df.columns)} | Completeness: {completeness:.1f}%
-- Missing Cells: {total_missing:,} | Duplicates: {duplicate_rows:,}
-- Complete Columns: {complete_cols}/{len(df.columns)}
+        st.divider()
 
-**COLUMN TYPES:**
-- Numeric: {len(numeric_cols)} (Examples: {numeric_sample})
-- Categorical: {len(categorical_cols)} (Examples: {categorical_sample})
-- High Cardinality: {len(high_cardinality_cols)} (IDs)
+        # ====================================================================================
+        # VERSION 1.0 RELEASE NOTES
+        # ====================================================================================
+        with st.expander("📝 Version 1.0 Release Notes", expanded=False):
+            st.markdown("""
+            **🎉 What's New in Version 1.0**
 
-**COLUMNS (First 25):** {columns_sample}
+            **Major Features:**
+            - ✅ **5 Advanced AI-Driven Analysis Tabs**
+              - Academic Analytics with AI-driven deep analysis
+              - Housing Insights with impact analysis
+              - Financial Intelligence with sustainability metrics
+              - Demographics Deep Dive with diversity analysis
+              - Risk & Success Analysis with predictive insights
 
-**TOP MISSING DATA ({missing_data_rows} most affected):**
-{missing_df.head(missing_data_rows).to_string(index=False)}
+            - ✅ **Context-Aware Visualizations**
+              - AI automatically recommends relevant charts for each context
+              - 6 visualization types per analysis tab
+              - Intelligent data column selection
 
-**OUTPUT FORMAT (Follow exactly - 250 words max):**
+            - ✅ **Strategic Insights & Recommendations**
+              - Root cause analysis for all findings
+              - Business impact quantification
+              - Priority-coded actionable recommendations
+              - LLM-enriched insights for every visualization
 
-## 1. Dataset Overview
-[2-3 sentence factual description of dataset purpose and scope]
+            **Technical Improvements:**
+            - Hybrid approach: Rule-based + LLM enrichment
+            - Optimized for performance and reliability
+            - Enhanced error handling and fallbacks
+            - Deep data profiling for better AI insights
 
-## 2. Data Domains Identified
-- 📚 **Academic** ({len([c for c in df.columns if any(x in c.lower() for x in ['grade', 'gpa', 'course'])])} cols): [List actual column names]
-- 💰 **Financial** ({len([c for c in df.columns if any(x in c.lower() for x in ['amount', 'fee', 'aid'])])} cols): [List actual column names]
-- 👤 **Demographics** ({len([c for c in df.columns if any(x in c.lower() for x in ['age', 'gender', 'name'])])} cols): [List actual column names]
-- 📊 **Other**: [Any other domains with column names]
+            **Release Date:** February 2, 2026
+            **Status:** Production Release
+            """)
 
-## 3. Top 3 Quality Concerns
-1. **[Issue Type]**: [Specific columns affected] - [Impact]
-2. **[Issue Type]**: [Specific columns affected] - [Impact]
-3. **[Issue Type]**: [Specific columns affected] - [Impact]
+        st.divider()
 
-## 4. Key Findings
-- [Finding based on missing data table with %]
-- [Finding based on completeness metric with %]
-- [Finding based on column analysis with count]
+        # ====================================================================================
+        # DATA SOURCE (From gen_storytelling_app.py lines 1436-1632)
+        # ====================================================================================
+        st.markdown("### 📁 Data Source")
 
-## 5. Immediate Actions
-1. **[Column/Domain]**: [Problem] → [Solution] → [Expected impact]
-2. **[Column/Domain]**: [Problem] → [Solution] → [Expected impact]
-3. **[Column/Domain]**: [Problem] → [Solution] → [Expected impact]
+        if not st.session_state.get('ollama_connected'):
+            st.info("💡 **You can load data without Ollama connection** - AI features will be available once you connect")
 
-**RULES**: Use markdown (##). Always cite column names in brackets. Use quantitative data. Be deterministic."""
+        data_source = st.radio(
+            "Choose data source:",
+            options=["Pre-loaded Dataset (Student_360_View)", "Upload File", "Use Sample Dataset"],
+            index=0,
+            key="data_source_selector"
+        )
 
-                # Generate deterministic seed from dataset properties for reproducibility
-                # Same dataset will always produce same seed
-                import hashlib
-                dataset_signature = f"{len(df)}_{len(df.columns)}_{completeness:.1f}_{duplicate_rows}"
-                seed_value = int(hashlib.md5(dataset_signature.encode()).hexdigest()[:8], 16) % 1000000
-
-                # Query LLM with deterministic parameters for reproducible output
-                llm_insights = query_ollama(
-                    prompt,
-                    model,
-                    url,
-                    temperature=0.0,  # Zero temperature for maximum determinism
-                    num_predict=1000 if use_comprehensive else 400,  # Comprehensive needs more tokens for depth
-                    timeout=base_timeout,  # Dynamic: 240s for large datasets, 180s for normal
-                    auto_optimize=False,  # Use our custom timeout instead
-                    seed=seed_value  # Fixed seed based on dataset for reproducibility
-                )
+        if data_source == "Pre-loaded Dataset (Student_360_View)":
+            st.caption("📊 Student 360 View Dataset - Comprehensive student analytics data")
 
-                if llm_insights and not llm_insights.startswith('[ERROR]'):
-                    st.success("✅ Phase 2 complete: AI insights generated successfully!")
-                    st.info(f"🔒 **Reproducibility**: Analysis uses seed {seed_value} - same dataset will produce consistent results")
-                else:
-                    st.error(f"❌ LLM analysis failed: {llm_insights}")
-                    st.warning("💡 Troubleshooting:")
-                    st.warning(f"- Try switching to {'Quick' if use_comprehensive else 'Comprehensive'} mode")
-                    st.warning(f"- Large model ({model}) may need more time. Consider smaller model like 'qwen2:7b'")
-                    st.warning("- Check Ollama is running and not frozen")
-                    st.warning("- For very large datasets, try filtering some rows first")
-                    st.stop()
+            # Define the path to the pre-loaded dataset (works locally and on cloud)
+            import os
+            # Try multiple path options for flexibility
+            script_dir = os.path.dirname(os.path.abspath(__file__))
 
-            # Display comprehensive profiling results
-            with st.spinner("🔄 Phase 3/3: Compiling profiling report..."):
-                st.info("📝 Finalizing report...")
+            # Option 1: data folder in same directory as script
+            path_option_1 = os.path.join(script_dir, "data", "Student_360_View.csv")
+            # Option 2: data folder in parent directory
+            path_option_2 = os.path.join(os.path.dirname(script_dir), "data", "Student_360_View.csv")
+            # Option 3: Original local path (for backward compatibility)
+            path_option_3 = r"D:\exalio_work\RFP\Ankbut\MVP\cons\Sample DataSet\Student_360_View.csv"
 
-                # Display LLM-generated insights
-                st.markdown("""
-                <div class="insight-card">
-                    <div class="insight-title">🤖 AI-Powered Data Profiling Report</div>
-                </div>
-                """, unsafe_allow_html=True)
+            # Find which path exists
+            preloaded_dataset_path = None
+            for path in [path_option_1, path_option_2, path_option_3]:
+                if os.path.exists(path):
+                    preloaded_dataset_path = path
+                    break
 
-                st.markdown(llm_insights)
-
-                # Add metadata
-                st.caption(f"Generated using {model} | Mode: {'Comprehensive' if use_comprehensive else 'Quick'} | {len(df.columns)} columns analyzed | Seed: {seed_value} (reproducible)")
-
-                st.success("✅ Phase 3 complete: Generative Data Profiling finished!")
-
-                # Store profiling results in session state for visualization
-                st.session_state['profiling_results'] = {
-                    'insights': llm_insights,
-                    'mode': 'Comprehensive' if use_comprehensive else 'Quick',
-                    'completeness': completeness,
-                    'duplicate_rows': duplicate_rows,
-                    'columns_with_nulls': columns_with_nulls,
-                    'numeric_cols': len(numeric_cols),
-                    'categorical_cols': len(categorical_cols),
-                    'datetime_cols': len(datetime_cols),
-                    'high_cardinality': len(high_cardinality_cols),
-                    'low_cardinality': len(low_cardinality_cols),
-                    'total_missing': total_missing,
-                    'complete_cols': complete_cols
-                }
+            if preloaded_dataset_path is None:
+                # Default to option 1 for error message
+                preloaded_dataset_path = path_option_1
 
-        st.divider()
+            # Check if already loaded
+            if st.session_state.get('data') is not None and st.session_state.get('data_source_type') == 'preloaded':
+                df = st.session_state.data
+                st.success(f"📄 ✅ Pre-loaded dataset active | {len(df)} rows × {len(df.columns)} columns")
 
-        # ========== VISUALIZE DATA PROFILING BUTTON ==========
-        if 'profiling_results' in st.session_state and st.button("📊 Visualize Data Profiling", key="viz_profiling_btn", type="secondary", width='stretch'):
-            st.subheader("📊 Data Profiling Visualization Dashboard")
-            st.caption("AI-generated visual insights from profiling analysis")
+                with st.expander("📊 Dataset Information"):
+                    st.markdown(f"""
+                    **Dataset:** Student_360_View.csv
+                    **Rows:** {len(df):,}
+                    **Columns:** {len(df.columns)}
+                    **Source:** {preloaded_dataset_path}
+                    """)
 
-            profile_data = st.session_state['profiling_results']
+                    st.dataframe(df.head(5), width="stretch")
 
-            # Create visual dashboard similar to Data Lineage tab
-            st.markdown("---")
+                if st.button("🔄 Reload Dataset", key="reload_preloaded"):
+                    st.session_state.force_reload = True
+                    st.rerun()
+            else:
+                # Load the pre-loaded dataset
+                try:
+                    if os.path.exists(preloaded_dataset_path):
+                        with st.spinner("Loading pre-loaded dataset..."):
+                            df = pd.read_csv(preloaded_dataset_path, encoding='utf-8', low_memory=False)
 
-            # KPI Cards Row 1
-            col1, col2, col3, col4, col5 = st.columns(5)
+                            if df is not None and not df.empty:
+                                set_main_data(df)
+                                st.session_state.data_source_type = 'preloaded'
+                                st.session_state.uploaded_filename = 'Student_360_View.csv'
+                                st.success(f"📄 ✅ Pre-loaded dataset loaded successfully | {len(df)} rows × {len(df.columns)} columns")
 
-            with col1:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #10b981, #059669); border-radius: 12px;
-                            padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                    <div style='font-size: 2rem; margin-bottom: 5px;'>✅</div>
-                    <div style='font-size: 2rem; font-weight: bold; color: white;'>{profile_data['completeness']:.1f}%</div>
-                    <div style='font-size: 0.85rem; color: #d1fae5; margin-top: 5px;'>Data Completeness</div>
-                </div>
-                """, unsafe_allow_html=True)
+                                with st.expander("📊 Dataset Preview"):
+                                    st.dataframe(df.head(10), width="stretch")
 
-            with col2:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #6366f1, #4f46e5); border-radius: 12px;
-                            padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                    <div style='font-size: 2rem; margin-bottom: 5px;'>📊</div>
-                    <div style='font-size: 2rem; font-weight: bold; color: white;'>{len(df.columns)}</div>
-                    <div style='font-size: 0.85rem; color: #c7d2fe; margin-top: 5px;'>Total Attributes</div>
-                </div>
-                """, unsafe_allow_html=True)
+                                st.info("💡 Dataset is ready for analysis. Navigate to Analytics tabs to explore insights.")
+                                st.rerun()
+                            else:
+                                st.error("❌ Failed to load dataset - file is empty")
+                    else:
+                        st.error(f"❌ Pre-loaded dataset not found at: {preloaded_dataset_path}")
+                        st.info("💡 Please ensure the dataset file exists at the specified location or use 'Upload File' option.")
+                except Exception as e:
+                    st.error(f"❌ Error loading pre-loaded dataset: {str(e)}")
+                    st.info("💡 Try using 'Upload File' option instead.")
 
-            with col3:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #f59e0b, #d97706); border-radius: 12px;
-                            padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                    <div style='font-size: 2rem; margin-bottom: 5px;'>⚠️</div>
-                    <div style='font-size: 2rem; font-weight: bold; color: white;'>{profile_data['columns_with_nulls']}</div>
-                    <div style='font-size: 0.85rem; color: #fef3c7; margin-top: 5px;'>Columns w/ Nulls</div>
-                </div>
-                """, unsafe_allow_html=True)
+        elif data_source == "Upload File":
+            st.caption("Choose a file (CSV, Excel, or TXT)")
 
-            with col4:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #ec4899, #db2777); border-radius: 12px;
-                            padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                    <div style='font-size: 2rem; margin-bottom: 5px;'>🔄</div>
-                    <div style='font-size: 2rem; font-weight: bold; color: white;'>{profile_data['duplicate_rows']:,}</div>
-                    <div style='font-size: 0.85rem; color: #fce7f3; margin-top: 5px;'>Duplicate Rows</div>
-                </div>
-                """, unsafe_allow_html=True)
+            uploaded_file = st.file_uploader(
+                "Drag and drop file here",
+                type=['csv', 'xlsx', 'xls', 'txt'],
+                help="Limit 200MB per file • CSV, XLSX, XLS, TXT",
+                label_visibility="collapsed"
+            )
 
-            with col5:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #8b5cf6, #7c3aed); border-radius: 12px;
-                            padding: 20px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                    <div style='font-size: 2rem; margin-bottom: 5px;'>📁</div>
-                    <div style='font-size: 2rem; font-weight: bold; color: white;'>{len(df):,}</div>
-                    <div style='font-size: 0.85rem; color: #ede9fe; margin-top: 5px;'>Total Records</div>
-                </div>
-                """, unsafe_allow_html=True)
+            if uploaded_file is not None:
+                st.caption(f"📄 {uploaded_file.name}")
+                st.caption(f"{uploaded_file.size / 1024:.1f}KB")
 
-            st.markdown("---")
+                already_loaded = (
+                    st.session_state.get('uploaded_filename') == uploaded_file.name and
+                    st.session_state.get('data') is not None
+                )
 
-            # Three-column layout for Data Composition
-            st.markdown("### 🎨 Data Composition Breakdown")
+                if already_loaded:
+                    df = st.session_state.data
+                    st.success(f"📄 ✅ Already loaded (preserving data transformations) | {len(df)} rows × {len(df.columns)} columns")
 
-            col1, col2, col3 = st.columns(3)
+                    datetime_cols = column_kinds(df)['datetime']
+                    if datetime_cols:
+                        st.info(f"🔄 Transformations applied: {len(datetime_cols)} datetime column(s) converted")
 
-            with col1:
-                st.markdown("""
-                <div style='background: rgba(99, 102, 241, 0.1); border: 2px solid #6366f1;
-                            border-radius: 12px; padding: 20px; height: 100%;'>
-                    <h4 style='text-align: center; background: linear-gradient(135deg, #6366f1, #4f46e5);
-                               padding: 12px; border-radius: 8px; margin-bottom: 15px; color: white;'>
-                        🔢 Numeric Columns
-                    </h4>
-                    <p style='color: #94a3b8; font-size: 0.85rem; margin-bottom: 15px; text-align: center;'>
-                        Quantitative measurements and metrics
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                    if st.button("🔄 Reload Original File (discard transformations)", width="stretch", key="reload_original_file"):
+                        st.session_state.force_reload = True
+                        st.rerun()
+                else:
+                    try:
+                        if uploaded_file.name.endswith('.csv') or uploaded_file.name.endswith('.txt'):
+                            df = load_csv_file(uploaded_file)
+                        else:
+                            df = load_excel_file(uploaded_file)
 
-                st.metric("Count", profile_data['numeric_cols'],
-                         delta=f"{(profile_data['numeric_cols']/len(df.columns)*100):.1f}% of total")
+                        if df is not None:
+                            set_main_data(df)
+                            st.session_state.uploaded_filename = uploaded_file.name
+                            st.session_state.force_reload = False
+                            st.success(f"📄 ✅ Loaded successfully | {len(df)} rows × {len(df.columns)} columns")
 
-                # Show numeric column examples
-                numeric_cols_list = df.select_dtypes(include=['number']).columns.tolist()[:10]
-                if numeric_cols_list:
-                    st.markdown("**Examples:**")
-                    for col in numeric_cols_list[:5]:
-                        st.markdown(f"""
-                        <div style='background: rgba(30, 41, 59, 0.8); border-left: 3px solid #6366f1;
-                                    padding: 8px; margin: 5px 0; font-size: 0.8rem;'>
-                            📊 {col}
-                        </div>
-                        """, unsafe_allow_html=True)
+                            with st.expander("📊 Data Preview (first 5 rows)"):
+                                st.dataframe(df.head(5), width="stretch")
 
-            with col2:
-                st.markdown("""
-                <div style='background: rgba(245, 158, 11, 0.1); border: 2px solid #f59e0b;
-                            border-radius: 12px; padding: 20px; height: 100%;'>
-                    <h4 style='text-align: center; background: linear-gradient(135deg, #f59e0b, #d97706);
-                               padding: 12px; border-radius: 8px; margin-bottom: 15px; color: white;'>
-                        📝 Categorical Columns
-                    </h4>
-                    <p style='color: #94a3b8; font-size: 0.85rem; margin-bottom: 15px; text-align: center;'>
-                        Classifications and descriptive attributes
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                            # Show comprehensive 136-column mapping status
+                            mapping_log = st.session_state.get('mapping_log', [])
+                            with st.expander("📊 Complete 136-Column Catalog Status", expanded=False):
+                                st.markdown("### Universal Column Catalog - Data Availability Report")
+                                st.markdown("*Showing all 136 columns from the universal catalog with their status in your dataset*")
 
-                st.metric("Count", profile_data['categorical_cols'],
-                         delta=f"{(profile_data['categorical_cols']/len(df.columns)*100):.1f}% of total")
+                                # Import the universal catalog
+                                try:
+                                    from universal_columns_catalog import UNIVERSAL_COLUMNS_CATALOG
 
-                # Show categorical column examples
-                categorical_cols_list = df.select_dtypes(include=['object']).columns.tolist()[:10]
-                if categorical_cols_list:
-                    st.markdown("**Examples:**")
-                    for col in categorical_cols_list[:5]:
-                        st.markdown(f"""
-                        <div style='background: rgba(30, 41, 59, 0.8); border-left: 3px solid #f59e0b;
-                                    padding: 8px; margin: 5px 0; font-size: 0.8rem;'>
-                            📝 {col}
-                        </div>
-                        """, unsafe_allow_html=True)
+                                    # Categorize columns by status
+                                    mapped_columns = []
+                                    present_columns = []
+                                    missing_columns = []
 
-            with col3:
-                st.markdown("""
-                <div style='background: rgba(16, 185, 129, 0.1); border: 2px solid #10b981;
-                            border-radius: 12px; padding: 20px; height: 100%;'>
-                    <h4 style='text-align: center; background: linear-gradient(135deg, #10b981, #059669);
-                               padding: 12px; border-radius: 8px; margin-bottom: 15px; color: white;'>
-                        🆔 Special Columns
-                    </h4>
-                    <p style='color: #94a3b8; font-size: 0.85rem; margin-bottom: 15px; text-align: center;'>
-                        Identifiers and unique attributes
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                                    for col_name, col_info in UNIVERSAL_COLUMNS_CATALOG.items():
+                                        if col_name in df.columns:
+                                            # Check if it was mapped from a different name
+                                            was_mapped = any(col_name in log for log in mapping_log)
+                                            if was_mapped:
+                                                # Find the original name
+                                                original_name = None
+                                                for log in mapping_log:
+                                                    if col_name in log:
+                                                        original_name = log.split("'")[1]  # Extract original name
+                                                        break
+                                                mapped_columns.append((col_name, col_info.description, original_name))
+                                            else:
+                                                present_columns.append((col_name, col_info.description))
+                                        else:
+                                            missing_columns.append((col_name, col_info.description))
 
-                st.metric("High Cardinality", profile_data['high_cardinality'],
-                         help="Likely IDs, unique identifiers, or highly unique fields")
-                st.metric("Low Cardinality", profile_data['low_cardinality'],
-                         help="Likely categories, statuses, or classification fields")
+                                    # Summary metrics
+                                    col1, col2, col3, col4 = st.columns(4)
+                                    with col1:
+                                        st.metric("📋 Total Catalog", "136 columns", help="Complete universal catalog size")
+                                    with col2:
+                                        st.metric("✅ Available", f"{len(mapped_columns) + len(present_columns)}",
+                                                 delta=f"{(len(mapped_columns) + len(present_columns))/136*100:.1f}%")
+                                    with col3:
+                                        st.metric("🔄 Mapped", f"{len(mapped_columns)}",
+                                                 help="Columns that were translated from different names")
+                                    with col4:
+                                        st.metric("⚠️ Missing", f"{len(missing_columns)}",
+                                                 delta=f"{len(missing_columns)/136*100:.1f}%", delta_color="inverse")
 
-            st.markdown("---")
+                                    st.markdown("---")
 
-            # Missing Data Heatmap-style visualization
-            st.markdown("### 🔍 Missing Data Analysis")
+                                    # Create tabs for different statuses
+                                    status_tab1, status_tab2, status_tab3 = st.tabs(["✅ Available Columns", "🔄 Mapped Columns", "⚠️ Missing Columns"])
 
-            missing_by_col = df.isnull().sum()
-            missing_pct = (missing_by_col / len(df) * 100).round(2)
-            missing_df_viz = pd.DataFrame({
-                'Column': missing_by_col.index,
-                'Missing Count': missing_by_col.values,
-                'Missing %': missing_pct.values
-            }).sort_values('Missing Count', ascending=False).head(20)
-
-            # Create bar chart for missing data
-            if len(missing_df_viz[missing_df_viz['Missing Count'] > 0]) > 0:
-                missing_display = missing_df_viz[missing_df_viz['Missing Count'] > 0].head(15)
-
-                fig_missing = px.bar(
-                    missing_display,
-                    x='Missing %',
-                    y='Column',
-                    orientation='h',
-                    title="Top 15 Columns with Missing Data",
-                    color='Missing %',
-                    color_continuous_scale='reds',
-                    labels={'Missing %': 'Missing Percentage (%)'}
-                )
-                fig_missing.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                    font=dict(color='white'),
-                    height=500,
-                    yaxis={'categoryorder': 'total ascending'}
-                )
-                st.plotly_chart(fig_missing, width='stretch')
-            else:
-                st.success("✅ No missing data detected! This dataset is 100% complete.")
+                                    with status_tab1:
+                                        st.markdown(f"**{len(present_columns)} columns present** with standard names (no mapping needed)")
+                                        if present_columns:
+                                            # Group by category
+                                            from universal_columns_catalog import UNIVERSAL_COLUMNS_CATALOG
+                                            for col_name, description in sorted(present_columns):
+                                                col_info = UNIVERSAL_COLUMNS_CATALOG.get(col_name, {})
+                                                category = col_info.category.value if hasattr(col_info, 'category') else 'Other'
+                                                st.markdown(f"- **`{col_name}`** ({category})")
+                                                if description:
+                                                    st.markdown(f"  <small style='color: #94a3b8;'>{description}</small>", unsafe_allow_html=True)
 
-            st.markdown("---")
+                                    with status_tab2:
+                                        st.markdown(f"**{len(mapped_columns)} columns mapped** from non-standard names")
+                                        if mapped_columns:
+                                            for col_name, description, original_name in sorted(mapped_columns):
+                                                col_info = UNIVERSAL_COLUMNS_CATALOG.get(col_name, {})
+                                                category = col_info.category.value if hasattr(col_info, 'category') else 'Other'
+                                                st.markdown(f"- **`{original_name}`** → **`{col_name}`** ({category})")
+                                                if description:
+                                                    st.markdown(f"  <small style='color: #94a3b8;'>{description}</small>", unsafe_allow_html=True)
 
-            # Data Type Distribution
-            st.markdown("### 📊 Data Type Distribution")
+                                    with status_tab3:
+                                        st.markdown(f"**{len(missing_columns)} columns not present** in your dataset (optional columns)")
+                                        st.info("💡 These columns are part of the universal catalog but not in your current data file. The application will function normally with graceful fallbacks.")
 
-            col1, col2 = st.columns(2)
+                                        if missing_columns:
+                                            # Group by category
+                                            missing_by_category = {}
+                                            for col_name, description in missing_columns:
+                                                col_info = UNIVERSAL_COLUMNS_CATALOG.get(col_name, {})
+                                                category = col_info.category.value if hasattr(col_info, 'category') else 'Other'
+                                                if category not in missing_by_category:
+                                                    missing_by_category[category] = []
+                                                missing_by_category[category].append((col_name, description))
 
-            with col1:
-                # Pie chart for column types
-                type_data = pd.DataFrame({
-                    'Type': ['Numeric', 'Categorical', 'Datetime'],
-                    'Count': [profile_data['numeric_cols'], profile_data['categorical_cols'], profile_data['datetime_cols']]
-                })
-                type_data = type_data[type_data['Count'] > 0]
-
-                fig_types = px.pie(
-                    type_data,
-                    values='Count',
-                    names='Type',
-                    title='Column Type Distribution',
-                    color_discrete_sequence=['#6366f1', '#f59e0b', '#10b981']
-                )
-                fig_types.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                    font=dict(color='white'),
-                    height=400
-                )
-                st.plotly_chart(fig_types, width='stretch')
+                                            # Show by category
+                                            for category in sorted(missing_by_category.keys()):
+                                                with st.expander(f"📁 {category} ({len(missing_by_category[category])} columns)", expanded=False):
+                                                    for col_name, description in sorted(missing_by_category[category]):
+                                                        st.markdown(f"- **`{col_name}`**")
+                                                        if description:
+                                                            st.markdown(f"  <small style='color: #94a3b8;'>{description}</small>", unsafe_allow_html=True)
 
-            with col2:
-                # Bar chart for cardinality distribution
-                cardinality_data = pd.DataFrame({
-                    'Category': ['High Cardinality\n(Unique IDs)', 'Low Cardinality\n(Categories)', 'Other'],
-                    'Count': [
-                        profile_data['high_cardinality'],
-                        profile_data['low_cardinality'],
-                        len(df.columns) - profile_data['high_cardinality'] - profile_data['low_cardinality']
-                    ]
+                                except ImportError:
+                                    # Fallback if catalog not available
+                                    st.warning("⚠️ Universal catalog module not found. Showing basic mapping info.")
+                                    st.success(f"✅ Successfully mapped {len(mapping_log)} columns to standardized format")
+                                    for log_entry in mapping_log[:10]:
+                                        st.text(f"  • {log_entry}")
+                                    if len(mapping_log) > 10:
+                                        st.text(f"  ... and {len(mapping_log) - 10} more")
+
+                    except Exception as e:
+                        st.error(f"❌ Error loading file: {e}")
+        else:
+            st.caption("Load a pre-built sample dataset")
+
+            if st.session_state.get('data') is not None and st.session_state.get('uploaded_filename') == 'sample_dataset':
+                df = st.session_state.data
+                # Check if sample dataset is outdated (missing new required fields)
+                required_new_fields = ['visa_status', 'enrollment_type', 'room_number', 'occupancy_status']
+                missing_new_fields = [f for f in required_new_fields if f not in df.columns]
+
+                if missing_new_fields:
+                    st.warning(f"⚠️ Sample dataset is outdated (missing {len(missing_new_fields)} new fields)")
+                    if st.button("🔄 Reload Updated Sample Data", width="stretch", type="primary"):
+                        df = create_sample_dataset_v3_final()
+                        set_main_data(df)
+                        st.session_state.uploaded_filename = 'sample_dataset'
+                        st.success(f"✅ Loaded updated sample dataset with ALL REQUIRED FIELDS!")
+                        st.balloons()
+                        st.rerun()
+                else:
+                    st.success(f"✅ Sample dataset already loaded | {len(df)} rows × {len(df.columns)} columns")
+            elif st.button("🔥 Load Fresh Sample Data", width="stretch", type="primary"):
+                # INLINE generation to bypass all caching
+                np.random.seed(42)
+                n = 1000
+                nats = np.random.choice(['United Arab Emirates', 'India', 'Pakistan', 'Egypt', 'Jordan',
+                                        'Saudi Arabia', 'Philippines', 'United States', 'United Kingdom',
+                                        'Canada'], n, p=[0.45, 0.15, 0.10, 0.08, 0.05, 0.05, 0.04, 0.03, 0.03, 0.02])
+                housed = np.random.choice([True, False], n, p=[0.6, 0.4])
+
+                df = pd.DataFrame({
+                    'student_id': [f'S{i:05d}' for i in range(1, n + 1)],
+                    'cumulative_gpa': np.random.normal(3.0, 0.6, n).clip(0, 4.0),
+                    'nationality': nats,
+                    'enrollment_enrollment_status': np.random.choice(['Active', 'Graduated', 'On Leave'], n, p=[0.8, 0.15, 0.05]),
+                    'enrollment_tuition_amount': np.random.uniform(50000, 100000, n),
+                    'financial_aid_monetary_amount': np.random.choice([0, 15000, 25000, 40000, 60000], n, p=[0.4, 0.2, 0.2, 0.15, 0.05]),
+                    'gender': np.random.choice(['Male', 'Female'], n),
+                    'cohort_year': np.random.choice([2020, 2021, 2022, 2023, 2024], n),
+                    'visa_status': ['UAE National' if nat == 'United Arab Emirates' else np.random.choice(['Student Visa', 'Resident Visa', 'Family Visa'])
+                                   for nat in nats],
+                    'enrollment_type': np.random.choice(['Full-Time', 'Part-Time'], n, p=[0.85, 0.15]),
+                    'room_number': [f'R{i:04d}' if h else None for i, h in enumerate(housed, 1)],
+                    'occupancy_status': ['Occupied' if h else None for h in housed],
+                    'rent_amount': [np.random.uniform(8000, 15000) if h else 0 for h in housed],
                 })
 
-                fig_card = px.bar(
-                    cardinality_data,
-                    x='Category',
-                    y='Count',
-                    title='Cardinality Distribution',
-                    color='Count',
-                    color_continuous_scale='viridis'
-                )
-                fig_card.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                    font=dict(color='white'),
-                    height=400,
-                    showlegend=False
-                )
-                st.plotly_chart(fig_card, width='stretch')
+                st.session_state.data = df
+                st.session_state.mapping_log = ["Fresh inline data - all 13 columns"]
+                st.session_state.uploaded_filename = 'sample_dataset'
+                st.session_state.metrics = calculate_core_metrics(df)
 
-            st.markdown("---")
+                st.success(f"✅ {len(df)} rows × {len(df.columns)} columns loaded!")
+                st.balloons()
+                st.rerun()
 
-            # ========== ADVANCED VISUALIZATIONS ==========
-            st.markdown("### 🔬 Advanced Statistical Analysis")
-
-            # Correlation Heatmap for Numeric Columns
-            numeric_cols_viz = df.select_dtypes(include=['number']).columns.tolist()
-            if len(numeric_cols_viz) >= 2:
-                st.markdown("#### 🔗 Correlation Heatmap (Top 15 Numeric Columns)")
-                st.caption("Identify relationships between numeric variables")
-
-                # Limit to top 15 for readability
-                corr_data = df[numeric_cols_viz[:15]].corr()
-
-                fig_corr = px.imshow(
-                    corr_data,
-                    labels=dict(color="Correlation"),
-                    x=corr_data.columns,
-                    y=corr_data.columns,
-                    color_continuous_scale='RdBu_r',
-                    zmin=-1, zmax=1,
-                    title="Correlation Matrix - Strong correlations indicate relationships"
-                )
-                fig_corr.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                    font=dict(color='white', size=9),
-                    height=600
-                )
-                st.plotly_chart(fig_corr, width='stretch')
-
-                # Highlight strong correlations
-                strong_corr = []
-                for i in range(len(corr_data.columns)):
-                    for j in range(i+1, len(corr_data.columns)):
-                        corr_val = corr_data.iloc[i, j]
-                        if abs(corr_val) > 0.7:
-                            strong_corr.append((corr_data.columns[i], corr_data.columns[j], corr_val))
-
-                if strong_corr:
-                    st.info(f"**💡 Strong Correlations Detected (>0.7):**")
-                    for col1, col2, val in strong_corr[:5]:
-                        emoji = "🔴" if val > 0 else "🔵"
-                        st.markdown(f"{emoji} **{col1}** ↔ **{col2}**: {val:.3f}")
+        st.divider()
 
-            st.markdown("---")
+        # ====================================================================================
+        # COLUMN MAPPING STATUS (Always show, but content depends on data)
+        # ====================================================================================
+        st.markdown("### 📊 Column Mapping Status")
 
-            # Distribution Analysis for Top Numeric Columns
-            if numeric_cols_viz:
-                st.markdown("#### 📊 Distribution Analysis (Top 6 Numeric Columns)")
-                st.caption("Understand data spread, skewness, and normality")
+        if st.session_state.get('data') is None:
+            # No data loaded yet
+            st.info("💡 Load data first to see column mapping status")
+            st.caption("The mapping status will appear here after you load data")
+        else:
+            # Get current data and mapping log
+            df = st.session_state.data
+            mapping_log = st.session_state.get('mapping_log', [])
 
-                col1, col2, col3 = st.columns(3)
-                cols = [col1, col2, col3]
+            # Check if required journey fields exist
+            required_journey_fields = [
+                'financial_aid_monetary_amount', 'cohort_year', 'enrollment_enrollment_status',
+                'enrollment_tuition_amount', 'enrollment_type', 'occupancy_status'
+            ]
+            present_required = [f for f in required_journey_fields if f in df.columns]
+            missing_required = [f for f in required_journey_fields if f not in df.columns]
 
-                for idx, col_name in enumerate(numeric_cols_viz[:6]):
-                    with cols[idx % 3]:
-                        fig_dist = px.histogram(
-                            df,
-                            x=col_name,
-                            nbins=30,
-                            title=f"{col_name[:20]}...",
-                            marginal="box"  # Add box plot on top
-                        )
-                        fig_dist.update_layout(
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                            font=dict(color='white'),
-                            height=300,
-                            showlegend=False
-                        )
-                        st.plotly_chart(fig_dist, width='stretch')
+            # Show required fields status
+            if len(present_required) == len(required_journey_fields):
+                st.success(f"✅ All {len(required_journey_fields)} journey fields present")
+            elif present_required:
+                st.info(f"ℹ️ {len(present_required)}/{len(required_journey_fields)} journey fields found")
+                st.caption(f"Optional fields not in CSV: {', '.join(missing_required)}")
+            else:
+                st.error(f"❌ 0/{len(required_journey_fields)} fields found")
+                st.caption(f"Missing: {', '.join(missing_required)}")
 
-                        # Show statistics
-                        skew = df[col_name].skew()
-                        skew_label = "Right-skewed" if skew > 0.5 else "Left-skewed" if skew < -0.5 else "Normal"
-                        st.caption(f"Skew: {skew:.2f} ({skew_label})")
+            # Show status based on data quality
+            if not mapping_log and missing_required:
+                # Mapping not applied AND missing required fields
+                st.info(f"ℹ️ Column mapping not yet applied")
+                if st.button("🔄 Apply Column Mapping Now", type="primary", width='stretch', key="force_mapping"):
+                    mapped_df, new_mapping_log = apply_universal_column_mapping(df)
+                    st.session_state.data = mapped_df
+                    st.session_state.mapping_log = new_mapping_log if new_mapping_log else ["No mappings needed - all columns standard"]
+                    st.session_state.metrics = calculate_core_metrics(mapped_df)
+                    st.rerun()
+            elif not mapping_log and not missing_required:
+                # No mapping log but data is already perfect
+                st.success("✅ All columns already using standard names")
+                st.caption("No mapping needed - dataset is ready!")
+                st.session_state.mapping_log = ["Dataset already has standard column names"]
+            elif mapping_log and isinstance(mapping_log, list) and len(mapping_log) > 0:
+                # Mapping was applied
+                if mapping_log[0] == "Dataset already has standard column names":
+                    st.success("✅ Dataset uses standard column names")
+                elif mapping_log[0] == "No mappings needed - all columns standard":
+                    st.success("✅ All columns already standardized")
+                else:
+                    st.success(f"✅ Column mapping completed: {len(mapping_log)} columns")
 
-            st.markdown("---")
+            try:
+                from universal_columns_catalog import UNIVERSAL_COLUMNS_CATALOG
 
-            # Outlier Box Plots
-            if numeric_cols_viz:
-                st.markdown("#### 📦 Outlier Detection (Box Plots)")
-                st.caption("Identify outliers using IQR method (points beyond whiskers)")
+                # Quick summary counts
+                mapped_count = len([log for log in mapping_log if '→' in log])
+                available_count = len([col for col in UNIVERSAL_COLUMNS_CATALOG.keys() if col in df.columns])
+                total_catalog = len(UNIVERSAL_COLUMNS_CATALOG)
 
+                # Display summary metrics
                 col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("✅ Available", f"{available_count}/{total_catalog}",
+                             delta=f"{available_count/total_catalog*100:.0f}%")
+                with col2:
+                    st.metric("🔄 Mapped", mapped_count,
+                             help="Columns translated from different names")
 
-                for idx, col_name in enumerate(numeric_cols_viz[:4]):
-                    with col1 if idx % 2 == 0 else col2:
-                        fig_box = px.box(
-                            df,
-                            y=col_name,
-                            title=f"Outliers in {col_name[:25]}",
-                            points="outliers"  # Show only outlier points
-                        )
-                        fig_box.update_layout(
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                            font=dict(color='white'),
-                            height=350
-                        )
-                        st.plotly_chart(fig_box, width='stretch')
+                # Show mapping log in expander
+                if mapping_log:
+                    with st.expander(f"📋 View Mapping Details ({len(mapping_log)} mappings)", expanded=False):
+                        st.caption("Columns that were automatically standardized:")
+                        for log_entry in mapping_log:
+                            st.text(f"  • {log_entry}")
+                else:
+                    st.caption("✨ All columns already using standard names")
 
-                        # Calculate outlier count
-                        Q1 = df[col_name].quantile(0.25)
-                        Q3 = df[col_name].quantile(0.75)
-                        IQR = Q3 - Q1
-                        outlier_count = ((df[col_name] < (Q1 - 1.5 * IQR)) | (df[col_name] > (Q3 + 1.5 * IQR))).sum()
-                        if outlier_count > 0:
-                            st.warning(f"⚠️ {outlier_count} outliers detected ({(outlier_count/len(df)*100):.2f}%)")
+                # Show detailed catalog status
+                with st.expander("🔍 Complete Catalog Status (136 columns)", expanded=False):
+                    # Categorize columns by status
+                    mapped_columns = []
+                    present_columns = []
+                    missing_columns = []
+
+                    for col_name, col_info in UNIVERSAL_COLUMNS_CATALOG.items():
+                        if col_name in df.columns:
+                            was_mapped = any(col_name in log for log in mapping_log)
+                            if was_mapped:
+                                # Find the original name
+                                original_name = None
+                                for log in mapping_log:
+                                    if col_name in log:
+                                        original_name = log.split("'")[1]
+                                        break
+                                mapped_columns.append((col_name, col_info.description, original_name))
+                            else:
+                                present_columns.append((col_name, col_info.description))
                         else:
-                            st.success(f"✅ No outliers detected")
+                            missing_columns.append((col_name, col_info.description))
 
-            st.markdown("---")
+                    # Create tabs
+                    tab1, tab2, tab3 = st.tabs([
+                        f"✅ Present ({len(present_columns)})",
+                        f"🔄 Mapped ({len(mapped_columns)})",
+                        f"⚠️ Missing ({len(missing_columns)})"
+                    ])
+
+                    with tab1:
+                        if present_columns:
+                            for col_name, description in sorted(present_columns)[:10]:
+                                st.caption(f"• `{col_name}`")
+                            if len(present_columns) > 10:
+                                st.caption(f"... and {len(present_columns) - 10} more")
+                        else:
+                            st.caption("No columns present with standard names")
+
+                    with tab2:
+                        if mapped_columns:
+                            for col_name, description, original_name in sorted(mapped_columns)[:10]:
+                                st.caption(f"• `{original_name}` → `{col_name}`")
+                            if len(mapped_columns) > 10:
+                                st.caption(f"... and {len(mapped_columns) - 10} more")
+                        else:
+                            st.caption("No columns were mapped")
+
+                    with tab3:
+                        if missing_columns:
+                            st.caption(f"📌 {len(missing_columns)} optional columns not in dataset")
+                            for col_name, description in sorted(missing_columns)[:5]:
+                                st.caption(f"• `{col_name}`")
+                            if len(missing_columns) > 5:
+                                st.caption(f"... and {len(missing_columns) - 5} more")
+                        else:
+                            st.caption("All catalog columns are present!")
+
+            except ImportError:
+                st.caption("📊 Column mapping applied")
+                if mapping_log:
+                    st.caption(f"✅ {len(mapping_log)} columns standardized")
+
+        st.divider()
+
+        # ====================================================================================
+        # AI CONFIGURATION (From gen_storytelling_app.py lines 1648-1768)
+        # ====================================================================================
+        st.markdown("### 🤖 AI Configuration")
+        st.markdown("**Ollama Server Location**")
+
+        previous_server_type = st.session_state.get('previous_ollama_server_type', None)
+
+        server_type = st.radio(
+            "Server Type",
+            options=["Cloudflare", "Local"],
+            index=0 if st.session_state.ollama_server_type == "Cloudflare" else 1,
+            help="Choose between Cloudflare (remote) or Local Ollama server",
+            horizontal=True,
+            label_visibility="collapsed"
+        )
+
+        server_type_changed = (previous_server_type is not None and
+                               previous_server_type != server_type)
+
+        st.session_state.ollama_server_type = server_type
+        st.session_state.previous_ollama_server_type = server_type
+
+        if server_type == "Cloudflare":
+            st.caption("☁️ Using Cloudflare Ollama")
+            default_url = "https://ollama.exaliotechcom.uk"
+        else:
+            st.caption("💻 Using Local Ollama")
+            default_url = "http://localhost:11434"
+
+        st.caption(f"🏠 URL: {default_url}")
+
+        if st.session_state.get('ollama_url') != default_url:
+            if 'custom_url_set' not in st.session_state:
+                st.session_state.ollama_url = default_url
+                st.session_state.ollama_connected = False
+                server_type_changed = True
+
+        if server_type_changed:
+            with st.spinner(f"🔄 Switching to {server_type} Ollama..."):
+                import time
+                health = verify_ollama_health(default_url)
+                if health['connected']:
+                    st.session_state.ollama_connected = True
+                    st.session_state.ollama_url = default_url
+                    st.success(f"✅ Connected to {server_type} Ollama")
+                    st.caption(f"📦 Found {health['model_count']} model(s)")
+                    time.sleep(0.5)
+                    st.rerun()
+                else:
+                    st.session_state.ollama_connected = False
+                    st.session_state.ollama_url = default_url
+                    st.error(f"❌ Failed to connect to {server_type} Ollama")
+                    st.caption(f"Error: {health.get('error', 'Unknown error')}")
+                    time.sleep(0.5)
+                    st.rerun()
+
+        with st.expander("🔧 Advanced: Custom URL"):
+            ollama_url = st.text_input(
+                "Custom Ollama URL",
+                value=st.session_state.get('ollama_url', default_url),
+                help="URL of your Ollama server"
+            )
+            if ollama_url != default_url:
+                st.session_state.custom_url_set = True
+            else:
+                st.session_state.pop('custom_url_set', None)
+
+            st.session_state.ollama_url = ollama_url
+
+            if st.button("Test Connection", width="stretch"):
+                with st.spinner("Testing connection..."):
+                    health = verify_ollama_health(ollama_url)
+                    if health['connected']:
+                        st.success(f"✅ Connected! Found {health['model_count']} models")
+                        st.session_state.ollama_connected = True
+                    else:
+                        st.error(f"❌ Connection failed: {health.get('error', 'Unknown error')}")
+                        st.session_state.ollama_connected = False
+
+        if 'ollama_url' not in st.session_state:
+            st.session_state.ollama_url = default_url
+
+        st.markdown("**Select AI Model**")
+
+        # Custom CSS for BLACK text in model dropdown - AGGRESSIVE OVERRIDE
+        st.markdown("""
+        <style>
+        /* FORCE BLACK TEXT - Override everything */
+        .stSelectbox, .stSelectbox * {
+            color: #000000 !important;
+        }
+
+        /* Select input field */
+        .stSelectbox [data-baseweb="select"] {
+            background-color: #ffffff !important;
+        }
 
-            # Data Completeness by Column Type
-            st.markdown("#### 🎯 Completeness Breakdown by Column Type")
-            st.caption("Which column types have better data quality?")
-
-            completeness_by_type = []
-            for col_type, cols in [
-                ('Numeric', numeric_cols_viz),
-                ('Categorical', df.select_dtypes(include=['object']).columns.tolist()),
-                ('Datetime', df.select_dtypes(include=['datetime64']).columns.tolist())
-            ]:
-                if cols:
-                    type_completeness = (df[cols].count().sum() / (len(df) * len(cols)) * 100)
-                    completeness_by_type.append({
-                        'Column Type': col_type,
-                        'Completeness %': type_completeness,
-                        'Column Count': len(cols)
-                    })
+        /* All text inside selectbox */
+        .stSelectbox div, .stSelectbox span, .stSelectbox p {
+            color: #000000 !important;
+        }
 
-            if completeness_by_type:
-                comp_df = pd.DataFrame(completeness_by_type)
-                fig_comp = px.bar(
-                    comp_df,
-                    x='Column Type',
-                    y='Completeness %',
-                    color='Completeness %',
-                    color_continuous_scale='greens',
-                    title='Data Completeness by Column Type',
-                    text='Completeness %'
-                )
-                fig_comp.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-                fig_comp.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                    font=dict(color='white'),
-                    height=400,
-                    yaxis_range=[0, 105]
-                )
-                st.plotly_chart(fig_comp, width='stretch')
+        /* Dropdown options */
+        [data-baseweb="popover"] li,
+        [data-baseweb="popover"] div,
+        [data-baseweb="popover"] span {
+            color: #000000 !important;
+            background-color: #ffffff !important;
+        }
 
-            st.markdown("---")
+        /* Selected value display */
+        [data-baseweb="select"] > div > div {
+            color: #000000 !important;
+        }
 
-            # Quality Score Gauge
-            st.markdown("#### 🎯 Overall Data Quality Score")
+        /* All listbox items */
+        ul[role="listbox"] li,
+        ul[role="listbox"] div,
+        ul[role="listbox"] span {
+            color: #000000 !important;
+        }
 
-            col1, col2, col3 = st.columns([2, 2, 1])
+        /* Nuclear option - force ALL sidebar selectboxes to black */
+        [data-testid="stSidebar"] .stSelectbox * {
+            color: #000000 !important;
+        }
+        </style>
+        """, unsafe_allow_html=True)
 
-            with col1:
-                quality_score = profile_data['completeness']
-                fig_gauge = go.Figure(go.Indicator(
-                    mode="gauge+number+delta",
-                    value=quality_score,
-                    title={'text': "Data Quality Score", 'font': {'color': 'white'}},
-                    delta={'reference': 90, 'increasing': {'color': "green"}},
-                    gauge={
-                        'axis': {'range': [0, 100], 'tickcolor': 'white'},
-                        'bar': {'color': "#10b981" if quality_score >= 90 else "#f59e0b" if quality_score >= 70 else "#ef4444"},
-                        'steps': [
-                            {'range': [0, 70], 'color': "rgba(239, 68, 68, 0.3)"},
-                            {'range': [70, 90], 'color': "rgba(245, 158, 11, 0.3)"},
-                            {'range': [90, 100], 'color': "rgba(16, 185, 129, 0.3)"}
-                        ],
-                        'threshold': {
-                            'line': {'color': "white", 'width': 4},
-                            'thickness': 0.75,
-                            'value': 90
-                        }
-                    }
-                ))
-                fig_gauge.update_layout(
-                    paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                    font={'color': 'white'},
-                    height=400
+        if st.session_state.get('ollama_connected'):
+            models = get_available_models(st.session_state.ollama_url)
+            if models:
+                selected_model = st.selectbox(
+                    "Model",
+                    options=models,
+                    index=0,
+                    help="Choose the LLM model for narrative generation",
+                    label_visibility="collapsed"
                 )
-                st.plotly_chart(fig_gauge, width='stretch')
+                st.session_state.selected_model = selected_model
+                st.success(f"✅ Using: {selected_model}")
 
-            with col2:
-                st.markdown("**Quality Score Interpretation:**")
-                if quality_score >= 90:
-                    st.success("🌟 **EXCELLENT** (90-100%)\nData is highly reliable for analysis and decision-making")
-                elif quality_score >= 70:
-                    st.warning("⚠️ **GOOD** (70-90%)\nData is usable but has some quality issues to address")
+                # Model recommendations for deep analysis
+                st.caption("💡 **For Deep Analysis:**")
+                if any(x in selected_model.lower() for x in ['llama3.1:70b', 'qwen2.5:72b', 'mixtral:8x22b']):
+                    st.caption("🟢 Excellent - Large model ideal for comprehensive insights")
+                elif any(x in selected_model.lower() for x in ['llama3.1', 'qwen2.5:32b', 'gemma2:27b']):
+                    st.caption("🟡 Good - Balanced performance and quality")
                 else:
-                    st.error("🚨 **NEEDS IMPROVEMENT** (<70%)\nSignificant data quality issues require immediate attention")
-
-                st.markdown(f"""
-                **Score Components:**
-                - Completeness: {profile_data['completeness']:.1f}%
-                - Missing Cells: {profile_data['total_missing']:,}
-                - Duplicates: {profile_data['duplicate_rows']:,}
-                - Columns with Nulls: {profile_data['columns_with_nulls']}/{len(df.columns)}
-                """)
+                    st.caption("🟠 Basic - Consider larger model for richer analysis")
+                    with st.expander("📋 Recommended Models"):
+                        st.markdown("""
+                        **For Best Deep Analysis:**
+                        - `llama3.1:70b` - Excellent reasoning
+                        - `qwen2.5:72b` - Superior analytics
+                        - `qwen2.5:32b` - Balanced (good speed/quality)
 
-        st.divider()
+                        **Pull command:**
+                        ```bash
+                        ollama pull qwen2.5:32b
+                        ```
+                        """)
+            else:
+                st.warning("No models found. Please pull a model first.")
+        else:
+            health = verify_ollama_health(st.session_state.ollama_url)
+            if health['connected']:
+                st.session_state.ollama_connected = True
+                models = get_available_models(st.session_state.ollama_url)
+                if models:
+                    st.session_state.selected_model = models[0]
+                    st.success(f"✅ Auto-connected: {models[0]}")
+            else:
+                st.info("👆 Configure connection above")
+
+    # Main content area - Show welcome message if no data
+    if st.session_state.data is None:
+        st.markdown("""
+        <div style='text-align: center; padding: 3rem 2rem;'>
+            <h2 style='color: #6366f1; margin-bottom: 1rem;'>🎓 Welcome to Student 360 AI-Powered Analytics</h2>
+            <p style='font-size: 1.2rem; color: #94a3b8; margin-bottom: 2rem;'>
+                Your intelligent analytics dashboard powered by advanced AI
+            </p>
+            <p style='font-size: 1rem; color: #e2e8f0; margin-bottom: 0.5rem;'>
+                👈 Check the sidebar's <strong>Getting Started</strong> section to begin
+            </p>
+            <p style='font-size: 0.9rem; color: #94a3b8;'>
+                Configure Ollama connection → Select AI model → Upload student data
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
-        # ========== DATA QUALITY INDICATORS ==========
-        st.subheader("📊 Data Quality Dashboard")
+        # Show key features
+        st.divider()
+        st.markdown("### ✨ Key Features")
 
         col1, col2, col3 = st.columns(3)
 
         with col1:
-            duplicate_rows = df.duplicated().sum()
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4 style="color: #6366f1;">🔄 Duplicate Rows</h4>
-                <p style="color: #e2e8f0; font-size: 1.2rem;">
-                    {duplicate_rows:,} ({(duplicate_rows/len(df)*100):.2f}%)
+            st.markdown("""
+            <div style='background: rgba(99, 102, 241, 0.1); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #6366f1;'>
+                <h4 style='color: #818cf8; margin-top: 0;'>🤖 AI-Driven Insights</h4>
+                <p style='color: #cbd5e1; margin-bottom: 0; font-size: 0.9rem;'>
+                    LLM analyzes your data and recommends optimal visualizations dynamically
                 </p>
             </div>
             """, unsafe_allow_html=True)
 
         with col2:
-            columns_with_nulls = df.isnull().any().sum()
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4 style="color: #f59e0b;">⚠️ Columns with Nulls</h4>
-                <p style="color: #e2e8f0; font-size: 1.2rem;">
-                    {columns_with_nulls} / {len(df.columns)}
+            st.markdown("""
+            <div style='background: rgba(16, 185, 129, 0.1); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #10b981;'>
+                <h4 style='color: #34d399; margin-top: 0;'>📊 Dynamic Analytics</h4>
+                <p style='color: #cbd5e1; margin-bottom: 0; font-size: 0.9rem;'>
+                    Adaptive visualizations that change based on your specific data patterns
                 </p>
             </div>
             """, unsafe_allow_html=True)
 
         with col3:
-            numeric_cols_count = len(df.select_dtypes(include=['number']).columns)
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4 style="color: #10b981;">🔢 Numeric Columns</h4>
-                <p style="color: #e2e8f0; font-size: 1.2rem;">
-                    {numeric_cols_count} / {len(df.columns)}
+            st.markdown("""
+            <div style='background: rgba(245, 158, 11, 0.1); padding: 1.5rem; border-radius: 8px; border-left: 4px solid #f59e0b;'>
+                <h4 style='color: #fbbf24; margin-top: 0;'>🎯 Strategic Intelligence</h4>
+                <p style='color: #cbd5e1; margin-bottom: 0; font-size: 0.9rem;'>
+                    Comprehensive analysis across academics, financials, and student success
                 </p>
             </div>
             """, unsafe_allow_html=True)
 
-        st.divider()
-
-        # ========== COLUMN-LEVEL PROFILING ==========
-        with st.expander("📋 Column-Level Analysis", expanded=False):
-            st.markdown("#### Detailed Column Profiling")
-
-            # Select column to profile
-            profile_column = st.selectbox("Select Column to Profile", df.columns, key="profile_col")
-
-            if profile_column:
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    # Basic stats
-                    st.markdown("**Basic Statistics**")
-                    stats_df = pd.DataFrame({
-                        'Metric': ['Count', 'Unique Values', 'Null Count', 'Null %', 'Most Common'],
-                        'Value': [
-                            f"{df[profile_column].count():,}",
-                            f"{df[profile_column].nunique():,}",
-                            f"{df[profile_column].isnull().sum():,}",
-                            f"{(df[profile_column].isnull().sum() / len(df) * 100):.2f}%",
-                            str(df[profile_column].mode()[0]) if len(df[profile_column].mode()) > 0 else 'N/A'
-                        ]
-                    })
-                    st.dataframe(stats_df, width='stretch', hide_index=True)
-
-                    # Numeric statistics if applicable
-                    if pd.api.types.is_numeric_dtype(df[profile_column]):
-                        st.markdown("**Numeric Statistics**")
-                        numeric_stats = pd.DataFrame({
-                            'Metric': ['Mean', 'Median', 'Std Dev', 'Min', 'Max', 'Q1', 'Q3'],
-                            'Value': [
-                                f"{df[profile_column].mean():.2f}",
-                                f"{df[profile_column].median():.2f}",
-                                f"{df[profile_column].std():.2f}",
-                                f"{df[profile_column].min():.2f}",
-                                f"{df[profile_column].max():.2f}",
-                                f"{df[profile_column].quantile(0.25):.2f}",
-                                f"{df[profile_column].quantile(0.75):.2f}"
-                            ]
-                        })
-                        st.dataframe(numeric_stats, width='stretch', hide_index=True)
-
-                with col2:
-                    # Value distribution
-                    st.markdown("**Value Distribution (Top 10)**")
-                    value_counts = df[profile_column].value_counts().head(10)
-
-                    if pd.api.types.is_numeric_dtype(df[profile_column]):
-                        # Histogram for numeric columns
-                        fig_dist = px.histogram(
-                            df, x=profile_column,
-                            nbins=30,
-                            title=f"Distribution of {profile_column}"
-                        )
-                        fig_dist.update_layout(
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                            font=dict(color='white'),
-                            height=300
-                        )
-                        st.plotly_chart(fig_dist, width='stretch')
-                    else:
-                        # Bar chart for categorical columns
-                        fig_dist = px.bar(
-                            x=value_counts.index.astype(str),
-                            y=value_counts.values,
-                            title=f"Top 10 Values in {profile_column}"
-                        )
-                        fig_dist.update_layout(
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                            font=dict(color='white'),
-                            height=300,
-                            xaxis_title="Value",
-                            yaxis_title="Count"
-                        )
-                        st.plotly_chart(fig_dist, width='stretch')
-
-        # ========== CARDINALITY ANALYSIS ==========
-        with st.expander("🔍 Cardinality Analysis", expanded=False):
-            st.markdown("#### Column Cardinality (Uniqueness)")
-
-            cardinality_df = pd.DataFrame({
-                'Column': df.columns,
-                'Unique Values': [df[col].nunique() for col in df.columns],
-                'Cardinality %': [(df[col].nunique() / len(df) * 100) for col in df.columns]
-            })
-            cardinality_df = cardinality_df.sort_values('Unique Values', ascending=False)
-
-            fig_card = px.bar(
-                cardinality_df.head(15),
-                x='Column',
-                y='Unique Values',
-                title="Top 15 Columns by Cardinality",
-                color='Cardinality %',
-                color_continuous_scale='viridis'
-            )
-            fig_card.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(30, 41, 59, 0.85)',
-                font=dict(color='white'),
-                height=400
-            )
-            st.plotly_chart(fig_card, width='stretch')
-
-            st.dataframe(cardinality_df, width='stretch', height=300)
-
-        # ========== ALL COLUMNS TABLE ==========
-        with st.expander("📋 View All Columns", expanded=False):
-            st.dataframe(
-                pd.DataFrame({
-                    'Column': df.columns,
-                    'Type': df.dtypes.astype(str),
-                    'Non-Null Count': df.count(),
-                    'Null Count': df.isnull().sum(),
-                    'Null %': (df.isnull().sum() / len(df) * 100).round(2),
-                    'Unique Values': [df[col].nunique() for col in df.columns]
-                }),
-                width='stretch',
-                height=400
-            )
-
-        st.divider()
-
-        # ========== AI-POWERED DATA INSIGHTS & RECOMMENDATIONS ==========
-        st.markdown("### 🧠 AI-Powered Data Insights & Recommendations")
-        st.caption("Generate comprehensive business insights and actionable recommendations using AI analysis")
-
-        if st.session_state.ollama_connected:
-            # Initialize session state for insights
-            if 'ai_insights' not in st.session_state:
-                st.session_state['ai_insights'] = {}
-
-            col_btn, col_info = st.columns([2, 3])
-
-            with col_btn:
-                if st.button("🧠 Generate AI Insights & Recommendations", type="primary", key="ai_insights_btn", width='stretch'):
-                    st.session_state['generating_insights'] = True
-
-            with col_info:
-                is_cloudflare = "cloudflare" in url.lower() or "exalio" in url.lower()
-                timeout_msg = "5-10 minutes" if is_cloudflare else "1-2 minutes"
-                st.caption(f"⏱️ Estimated time: {timeout_msg} | Uses: {model}")
-
-            # Generate insights if button clicked
-            if st.session_state.get('generating_insights', False):
-                try:
-                    with st.spinner(f"🔍 Discovering insights, patterns, and generating recommendations... (this may take {timeout_msg})"):
-
-                        # Step 1: Auto-discover insights
-                        st.info("📊 Step 1/2: Analyzing data quality, correlations, trends, outliers, and patterns...")
-                        auto_insights = auto_discover_insights(df, model, url)
-
-                        if not auto_insights:
-                            st.error("❌ Failed to generate insights. Please try again.")
-                            st.session_state['generating_insights'] = False
-                            st.stop()
-
-                        st.session_state.ai_insights['auto_insights'] = auto_insights
-                        st.success("✅ Step 1 complete: Insights discovered!")
-
-                        # Step 2: Generate recommendations
-                        st.info("💡 Step 2/2: Generating actionable business recommendations...")
-                        recommendations = generate_business_recommendations(df, auto_insights, model, url)
-
-                        st.session_state.ai_insights['recommendations'] = recommendations
-                        st.success("✅ Step 2 complete: Recommendations generated!")
-
-                        st.session_state['generating_insights'] = False
-                        st.rerun()
-
-                except Exception as e:
-                    st.error(f"❌ Error generating insights: {str(e)}")
-                    st.session_state['generating_insights'] = False
-                    st.stop()
-
-            # Display insights if available
-            if 'auto_insights' in st.session_state.ai_insights:
-                st.markdown("---")
-
-                # Create tabs for insights and recommendations
-                insight_tab, recommend_tab = st.tabs(["🔍 Key Data Insights", "✅ Recommendations"])
-
-                with insight_tab:
-                    st.subheader("💡 Key Data Insights")
-
-                    insights_data = st.session_state.ai_insights['auto_insights']
-
-                    # Display key findings
-                    if 'key_findings' in insights_data:
-                        st.markdown(insights_data['key_findings'])
+        return
 
-                    st.markdown("---")
+    # Get current data
+    df = st.session_state.data
 
-                    # Display detailed analysis in expandable sections
-                    col1, col2 = st.columns(2)
+    # Apply column mapping - check if required fields exist
+    # This ensures mapping is applied even if user has old data
+    required_journey_fields = [
+        'financial_aid_monetary_amount', 'cohort_year', 'enrollment_enrollment_status',
+        'enrollment_tuition_amount', 'enrollment_type', 'occupancy_status'
+    ]
+    missing_required = [f for f in required_journey_fields if f not in df.columns]
 
-                    with col1:
-                        # Data Quality
-                        with st.expander("📊 Data Quality Analysis", expanded=False):
-                            quality = insights_data.get('data_quality', {})
-                            st.metric("Total Records", f"{quality.get('total_records', 0):,}")
-                            st.metric("Total Columns", quality.get('total_columns', 0))
+    # Apply mapping if: no mapping_log exists OR required fields are missing
+    if ('mapping_log' not in st.session_state or st.session_state.mapping_log is None) or missing_required:
+        df, mapping_log = apply_universal_column_mapping(df)
+        st.session_state.data = df
 
-                            issues = quality.get('quality_issues', [])
-                            if issues and issues[0] != 'No significant quality issues':
-                                st.warning("**Quality Issues Detected:**")
-                                for issue in issues:
-                                    st.markdown(f"- {issue}")
-                            else:
-                                st.success("✅ Excellent data quality!")
+        # Recheck missing fields after mapping
+        still_missing = [f for f in required_journey_fields if f not in df.columns]
 
-                        # Correlations
-                        with st.expander("🔗 Strong Correlations", expanded=False):
-                            correlations = insights_data.get('correlations', [])
-                            if correlations:
-                                for corr in correlations:
-                                    st.markdown(f"""
-                                    **{corr['col1']} ↔ {corr['col2']}**
-                                    Correlation: `{corr['correlation']}`
-                                    Strength: {corr['strength']}
-                                    """)
-                            else:
-                                st.info("No strong correlations (>0.7) detected")
-
-                        # Patterns
-                        with st.expander("🎯 Categorical Patterns", expanded=False):
-                            patterns = insights_data.get('patterns', {}).get('categorical', [])
-                            if patterns:
-                                for pattern in patterns:
-                                    st.markdown(f"- {pattern}")
-                            else:
-                                st.info("No dominant categorical patterns detected")
-
-                    with col2:
-                        # Outliers
-                        with st.expander("⚡ Outliers Detected", expanded=False):
-                            outliers = insights_data.get('outliers', {})
-                            if outliers:
-                                for col_name, outlier_info in outliers.items():
-                                    st.markdown(f"""
-                                    **{col_name}**
-                                    Count: `{outlier_info['count']}`
-                                    Percentage: {outlier_info['percentage']}%
-                                    """)
-                            else:
-                                st.success("✅ No significant outliers detected")
-
-                        # Trends
-                        with st.expander("📈 Trends Analysis", expanded=False):
-                            trends = insights_data.get('trends', {})
-                            if trends:
-                                for col_name, trend_info in trends.items():
-                                    direction_icon = "📈" if trend_info['direction'] == 'increasing' else "📉"
-                                    st.markdown(f"""
-                                    {direction_icon} **{col_name}**
-                                    Direction: {trend_info['direction'].title()}
-                                    Change: {trend_info['change_percentage']}%
-                                    """)
-                            else:
-                                st.info("No significant trends detected (requires datetime column)")
-
-                with recommend_tab:
-                    st.subheader("✅ Business Recommendations")
-
-                    if 'recommendations' in st.session_state.ai_insights:
-                        recommendations = st.session_state.ai_insights['recommendations']
-
-                        if recommendations:
-                            # Group by priority
-                            high_priority = [r for r in recommendations if r['priority'] == 'HIGH']
-                            medium_priority = [r for r in recommendations if r['priority'] == 'MEDIUM']
-                            low_priority = [r for r in recommendations if r['priority'] == 'LOW']
-
-                            # Display HIGH priority first
-                            if high_priority:
-                                st.markdown("### 🔴 High Priority")
-                                for idx, rec in enumerate(high_priority, 1):
-                                    with st.container():
-                                        st.markdown(f"""
-                                        <div style='background: rgba(239, 68, 68, 0.1); border-left: 4px solid #ef4444; padding: 15px; margin: 10px 0; border-radius: 8px;'>
-                                            <p style='margin: 0; color: #e2e8f0;'><strong>{idx}. {rec['recommendation']}</strong></p>
-                                            <p style='margin: 5px 0 0 0; color: #94a3b8; font-size: 0.85rem;'>Category: {rec['category']}</p>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-
-                            # Display MEDIUM priority
-                            if medium_priority:
-                                st.markdown("### 🟡 Medium Priority")
-                                for idx, rec in enumerate(medium_priority, 1):
-                                    with st.container():
-                                        st.markdown(f"""
-                                        <div style='background: rgba(245, 158, 11, 0.1); border-left: 4px solid #f59e0b; padding: 15px; margin: 10px 0; border-radius: 8px;'>
-                                            <p style='margin: 0; color: #e2e8f0;'><strong>{idx}. {rec['recommendation']}</strong></p>
-                                            <p style='margin: 5px 0 0 0; color: #94a3b8; font-size: 0.85rem;'>Category: {rec['category']}</p>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-
-                            # Display LOW priority
-                            if low_priority:
-                                st.markdown("### 🟢 Low Priority")
-                                for idx, rec in enumerate(low_priority, 1):
-                                    with st.container():
-                                        st.markdown(f"""
-                                        <div style='background: rgba(16, 185, 129, 0.1); border-left: 4px solid #10b981; padding: 15px; margin: 10px 0; border-radius: 8px;'>
-                                            <p style='margin: 0; color: #e2e8f0;'><strong>{idx}. {rec['recommendation']}</strong></p>
-                                            <p style='margin: 5px 0 0 0; color: #94a3b8; font-size: 0.85rem;'>Category: {rec['category']}</p>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                        else:
-                            st.info("No recommendations generated yet")
-                    else:
-                        st.info("Generate insights first to see recommendations")
+        if mapping_log and len(mapping_log) > 0:
+            st.session_state.mapping_log = mapping_log
+            st.info(f"🔄 Applied column mapping: {len(mapping_log)} columns standardized")
         else:
-            st.warning("⚠️ Please connect to Ollama to use AI-powered insights and recommendations")
-
-    # ====================================================================================
-    # TAB 11: DATA EXPLORER WITH LLM Q&A
-    # ====================================================================================
-    with tabs[10]:
-        st.header("🔬 Data Explorer - AI-Powered Q&A")
-
-        st.info("💡 Ask questions about your data in natural language!")
-
-        # Data preview
-        st.subheader("📊 Data Preview")
-        st.dataframe(df.head(10), width="stretch")
-
-        st.divider()
-
-        # AI Q&A Interface
-        if st.session_state.ollama_connected:
-            user_question = st.text_area(
-                "Ask a question about the data:",
-                placeholder="Example: What percentage of students are performing below 2.5 GPA? What trends do you see in the financial aid distribution?",
-                height=100
-            )
-
-            if st.button("🤖 Ask AI", key="qa_btn"):
-                if user_question.strip():
-                    with st.spinner("🔄 AI is analyzing your question..."):
-                        # Prepare data context
-                        data_summary = {
-                            'total_records': len(df),
-                            'columns': df.columns.tolist()[:30],
-                            'sample_stats': {}
-                        }
-
-                        # Add numeric column stats
-                        numeric_cols = df.select_dtypes(include=[np.number]).columns[:10]
-                        for col in numeric_cols:
-                            data_summary['sample_stats'][col] = {
-                                'mean': float(df[col].mean()),
-                                'min': float(df[col].min()),
-                                'max': float(df[col].max())
-                            }
-
-                        prompt = f"""You are analyzing a student dataset with {len(df):,} records.
+            st.session_state.mapping_log = ["Dataset already has standard column names"]
+            st.success("✅ Dataset already uses standard column names")
 
-**Available Metrics:**
-{json.dumps(metrics, indent=2)}
+        # If fields still missing after mapping, show informational message
+        if still_missing:
+            st.info(f"""
+            ℹ️ **Dataset Information**: Your CSV file doesn't include {len(still_missing)} optional column(s):
+            {', '.join([f'`{field}`' for field in still_missing])}
 
-**Data Summary:**
-{json.dumps(data_summary, indent=2)[:1000]}
+            Most analyses will work normally. Some advanced journey generation features may have limited data availability.
 
-**User Question:**
-{user_question}
+            💡 **Tip**: If you need these fields, please ensure your source CSV file includes them before uploading.
+            """)
 
-Provide a clear, data-driven answer based on the available metrics and data summary. If you need specific data that's not provided, explain what insights you can provide with available information."""
+    # Metrics are keyed on the dataset's content hash, so any data change recomputes them
+    # (fixes stale cached metrics, especially UAE nationals) while plain reruns reuse them
+    metrics = build_full_metrics(dataset_key(df), df)
+    st.session_state.metrics = metrics  # Update session state with fresh metrics
 
-                        response = query_ollama(prompt, model, url, temperature=0.5, num_predict=600, auto_optimize=True)
+    model = st.session_state.selected_model
+    url = st.session_state.ollama_url
 
-                        if response and not response.startswith('[ERROR]'):
-                            st.markdown(f"""
-                            <div class="insight-card">
-                                <div class="insight-title">🤖 AI Response</div>
-                                <div class="insight-text">{response}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            st.error(f"Error generating response: {response}")
-                else:
-                    st.warning("Please enter a question")
-        else:
-            st.warning("⚠️ Connect to Ollama to use AI-powered Q&A")
+    # Application tabs (only the active tab body is rendered per rerun)
+    tab_names = [name for name, _ in APP_TABS]
+    active_tab = st.radio("View", tab_names, horizontal=True, key='active_tab', label_visibility='collapsed')
+    dict(APP_TABS)[active_tab](df, metrics, model, url)
 
 if __name__ == "__main__":
     main()